@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the MySQL MCP Server tool layer
+
+Drives every @mcp.tool() function against the in-process MySQL stand-in (fake_mysql.py) and
+reports calls/s, p50/p99 latency and peak memory per tool, so regressions in wrapper, logging and
+serialization overhead are caught without a database.
+
+Usage:
+    python benchmark_tools.py --iterations 500 --rows 1000 --columns 20
+    python benchmark_tools.py --output bench.json
+    python benchmark_tools.py --baseline bench.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Dict, List, Any
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep benchmark logs out of the configured application log unless LOG_FILE is set explicitly
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.gettempdir(), 'mcp_mysql_benchmark.log'))
+os.environ.setdefault('DATA_FILE_DIR', os.path.join(tempfile.gettempdir(), 'mcp_mysql_benchmark_files'))
+
+import fake_mysql
+import mcp_mysql_server as server
+
+BENCH_DATABASE = "bench"
+
+# Arguments for tools whose parameters cannot be derived from their names
+TOOL_ARGUMENTS: Dict[str, Dict[str, Any]] = {
+    "create_table": {"table_name": "bench_new", "columns": [
+        {"name": "id", "type": "INT", "constraints": ["PRIMARY KEY", "AUTO_INCREMENT"]},
+        {"name": "name", "type": "VARCHAR(100)", "constraints": ["NOT NULL"]}
+    ]},
+    "create_table_from_sql": {"create_table_sql": "CREATE TABLE bench_new (id INT PRIMARY KEY, name VARCHAR(100))"},
+    "write_table": {"table_name": "bench_table", "data": {"col_1": 1, "col_2": "value"}},
+    "update_table": {"table_name": "bench_table", "data": {"col_2": "value"}, "where_conditions": {"col_0": 1}},
+    "delete_from_table": {"table_name": "bench_table", "where_conditions": {"col_0": 1}},
+    "execute_sql": {"query": "SELECT * FROM bench_table"},
+    "execute_batch": {"statements": [{"query": "SELECT * FROM bench_table WHERE col_0 = %s", "params": [1]},
+                                     {"query": "INSERT INTO bench_table (col_1) VALUES (%s)", "params": [1]},
+                                     {"query": "SELECT COUNT(*) FROM bench_table"}]},
+    "execute_sql_sharded": {"query": "SELECT col_0, col_1 FROM bench_table ORDER BY col_1 LIMIT 10", "databases": ["bench", "bench_copy"]},
+    "switch_datasource": {"datasource_name": "default"},
+    "prepare_statement": {"query": "SELECT * FROM bench_table WHERE col_0 = %s"},
+    "execute_prepared": {"statement_id": "missing", "params": [1]},
+    "deallocate_prepared": {"statement_id": "missing"},
+    "search_table": {"table_name": "bench_table", "search_column": "col_2", "search_value": "v1"},
+    "create_database": {"database_name": "bench_created"},
+    "delete_database": {"database_name": "bench_old", "force": True},
+    "copy_database": {"source_database": BENCH_DATABASE, "target_database": "bench_copy"},
+    "rename_database": {"old_name": "bench_old", "new_name": "bench_renamed"},
+    "add_column": {"table_name": "bench_table", "column_name": "bench_col", "column_type": "INT"},
+    "drop_column": {"table_name": "bench_table", "column_name": "col_9"},
+    "modify_column": {"table_name": "bench_table", "column_name": "col_2", "new_type": "VARCHAR(64)"},
+    "rename_table": {"old_table_name": "bench_table", "new_table_name": "bench_renamed"},
+    "create_index": {"table_name": "bench_table", "index_name": "idx_bench", "columns": ["col_1", "col_2"]},
+    "cancel_index_build": {"job_id": "missing"},
+    "export_query": {"query": "SELECT * FROM bench_table", "file_path": "bench/query.csv", "overwrite": True},
+    "export_table": {"table_name": "bench_table", "file_path": "bench/table.jsonl", "file_format": "jsonl", "parts": 2, "overwrite": True},
+    "import_file": {"table_name": "bench_table", "file_path": "bench/query.csv", "column_map": {"col_0": "column_name_0", "col_1": "column_name_1"}},
+    "backup_database": {"directory": "bench/backup", "chunk_rows": 1000, "overwrite": True},
+    "restore_database": {"directory": "bench/backup", "drop_existing": True},
+    "compare_tables": {"table_name": "bench_table", "target_database": "bench_copy"}
+}
+
+def default_argument(name: str, schema: Dict[str, Any]) -> Any:
+    """Derive a plausible argument value from a parameter name and JSON schema"""
+    if name in ("table_name", "old_table_name"):
+        return "bench_table"
+    if name in ("database_name", "source_database", "old_name"):
+        return BENCH_DATABASE
+    if name.endswith("column_name") or name.endswith("_column"):
+        return "col_1"
+    if name == "index_name":
+        return "idx_col_1"
+    schema_type = schema.get("type") or next((s.get("type") for s in schema.get("anyOf", []) if s.get("type") != "null"), "string")
+    return {"integer": 10, "number": 1.0, "boolean": False, "array": ["col_1"], "object": {"col_1": 1}}.get(schema_type, "bench")
+
+def build_tool_arguments() -> Dict[str, Dict[str, Any]]:
+    """Build benchmark arguments for every registered tool"""
+    arguments = {}
+    for tool in server.mcp._tool_manager.list_tools():
+        if tool.name in TOOL_ARGUMENTS:
+            arguments[tool.name] = TOOL_ARGUMENTS[tool.name]
+            continue
+        properties = tool.parameters.get("properties", {})
+        required = tool.parameters.get("required", [])
+        arguments[tool.name] = {name: default_argument(name, properties[name]) for name in required}
+    return arguments
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+def make_caller(mode: str, loop: asyncio.AbstractEventLoop):
+    """Return a function that invokes a tool through the MCP layer or as a plain Python call"""
+    if mode == "mcp":
+        def call(name: str, args: Dict[str, Any]) -> Any:
+            return loop.run_until_complete(server.mcp.call_tool(name, args))
+    else:
+        functions = {tool.name: tool.fn for tool in server.mcp._tool_manager.list_tools()}
+
+        def call(name: str, args: Dict[str, Any]) -> Any:
+            return functions[name](**args)
+    return call
+
+def benchmark_tool(call, name: str, args: Dict[str, Any], iterations: int, warmup: int, memory_iterations: int) -> Dict[str, Any]:
+    """Measure latency and peak memory for one tool"""
+    for _ in range(warmup):
+        server.CURRENT_DATABASE = BENCH_DATABASE
+        call(name, args)
+
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(iterations):
+        server.CURRENT_DATABASE = BENCH_DATABASE
+        call_start = time.perf_counter()
+        try:
+            call(name, args)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - call_start)
+    wall = time.perf_counter() - started
+
+    # Memory is measured in a separate pass because tracemalloc distorts timings
+    peak = 0
+    tracemalloc.start()
+    try:
+        for _ in range(memory_iterations):
+            server.CURRENT_DATABASE = BENCH_DATABASE
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+            try:
+                call(name, args)
+            except Exception:
+                pass
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "calls_per_second": round(iterations / wall, 1) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 4),
+        "max_ms": round(latencies[-1] * 1000, 4) if latencies else 0.0,
+        "peak_memory_kb": round(peak / 1024, 1),
+        "errors": errors
+    }
+
+def compare_with_baseline(results: Dict[str, Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """List tools whose p50 latency or peak memory regressed beyond the tolerance"""
+    with open(baseline_path, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)["tools"]
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        for metric in ("p50_ms", "peak_memory_kb"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {previous[metric]} -> {current[metric]}")
+    return regressions
+
+def main() -> int:
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="Benchmark the MySQL MCP Server tool layer without a database")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per tool")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed calls per tool before measuring")
+    parser.add_argument("--memory-iterations", type=int, default=5, help="Calls per tool traced with tracemalloc")
+    parser.add_argument("--rows", type=int, default=100, help="Rows in synthetic result sets")
+    parser.add_argument("--columns", type=int, default=10, help="Columns in synthetic result sets")
+    parser.add_argument("--value-size", type=int, default=32, help="Length of synthetic string values")
+    parser.add_argument("--mode", choices=["mcp", "direct"], default="mcp",
+                        help="'mcp' calls through FastMCP (validation + serialization), 'direct' calls the Python functions")
+    parser.add_argument("--tools", nargs="*", help="Only benchmark these tools")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression against the baseline")
+    args = parser.parse_args()
+
+    print("⏱️  MySQL MCP Server - Tool Layer Benchmark")
+    print(f"   mode={args.mode} rows={args.rows} columns={args.columns} value_size={args.value_size} iterations={args.iterations}")
+    print("=" * 96)
+
+    tool_arguments = build_tool_arguments()
+    selected = [name for name in tool_arguments if not args.tools or name in args.tools]
+
+    results = {}
+    loop = asyncio.new_event_loop()
+    try:
+        with fake_mysql.fake_mysql_connector(rows=args.rows, columns=args.columns, value_size=args.value_size):
+            call = make_caller(args.mode, loop)
+            print(f"{'tool':<28}{'calls/s':>12}{'p50 ms':>12}{'p99 ms':>12}{'max ms':>12}{'peak KB':>12}{'errors':>8}")
+            print("-" * 96)
+            for name in selected:
+                result = benchmark_tool(call, name, tool_arguments[name], args.iterations, args.warmup, args.memory_iterations)
+                results[name] = result
+                print(f"{name:<28}{result['calls_per_second']:>12}{result['p50_ms']:>12}{result['p99_ms']:>12}"
+                      f"{result['max_ms']:>12}{result['peak_memory_kb']:>12}{result['errors']:>8}")
+    finally:
+        loop.close()
+
+    print("=" * 96)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({
+                "config": {"mode": args.mode, "rows": args.rows, "columns": args.columns,
+                           "value_size": args.value_size, "iterations": args.iterations},
+                "tools": results
+            }, output_file, indent=2)
+        print(f"📄 Results written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"⚠️  {len(regressions)} regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"   ✗ {regression}")
+            return 1
+        print(f"✓ No regressions beyond {args.tolerance:.0%} against {args.baseline}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 Configuration file for MySQL MCP Server
 """
 
+import json
 import os
 from typing import Dict, Any
 
@@ -25,7 +26,7 @@ SERVER_CONFIG: Dict[str, Any] = {
     'name': 'MySQL MCP Server',
     'port': int(os.getenv('MCP_PORT', '8002')),
     'host': os.getenv('MCP_HOST', '0.0.0.0'),
-    'transport': 'stdio'
+    'transport': os.getenv('MCP_TRANSPORT', 'stdio')  # stdio, sse or streamable-http
 }
 
 # Logging configuration
@@ -54,4 +55,184 @@ DB_MANAGEMENT_CONFIG: Dict[str, Any] = {
     'max_database_name_length': 64,  # Maximum length for database names
     'backup_before_delete': True,  # Whether to create backup before deleting database
     'auto_switch_on_create': True  # Whether to automatically switch to newly created database
-} 
\ No newline at end of file
+} 
+# Online schema change configuration (add_column / modify_column / drop_column)
+ONLINE_DDL_CONFIG: Dict[str, Any] = {
+    'try_instant': True,  # Request ALGORITHM=INSTANT first
+    'try_inplace': True,  # Then ALGORITHM=INPLACE, LOCK=NONE
+    'allow_blocking_fallback': os.getenv('ONLINE_DDL_ALLOW_BLOCKING', 'true').lower() == 'true',  # Fall back to a plain ALTER TABLE when no online algorithm applies
+    'shadow_chunk_size': int(os.getenv('ONLINE_DDL_CHUNK_SIZE', '1000')),  # Rows copied per chunk in shadow-table migrations
+    'shadow_chunk_pause': float(os.getenv('ONLINE_DDL_CHUNK_PAUSE', '0')),  # Seconds to sleep between chunks to throttle the copy
+    'drop_old_table': True  # Drop the original table after the shadow table has been swapped in
+}
+
+# Index build configuration (create_index)
+INDEX_BUILD_CONFIG: Dict[str, Any] = {
+    'online': True,  # Request ALGORITHM=INPLACE, LOCK=NONE for index builds
+    'enable_stage_instruments': True,  # Enable performance_schema stage instruments while builds run so progress can be reported (restored afterwards)
+    'read_timeout': None,  # Client read timeout for index builds (None: wait for the build to finish)
+    'max_jobs_retained': 50  # Number of finished index build jobs kept for get_index_build_status
+}
+
+# Query digest statistics configuration (get_query_stats)
+QUERY_STATS_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('QUERY_STATS_ENABLED', 'true').lower() == 'true',
+    'max_digests': int(os.getenv('QUERY_STATS_MAX_DIGESTS', '1000')),  # Least recently seen digests are evicted beyond this
+    'latency_buckets_ms': [1, 5, 10, 50, 100, 500, 1000, 5000, 10000],  # Histogram bucket upper bounds
+    'sample_query_length': 2000,  # Maximum length of the sample statement kept per digest
+    'collect_rows_examined': os.getenv('QUERY_STATS_ROWS_EXAMINED', 'false').lower() == 'true'  # Read rows examined from performance_schema (one extra round trip per statement)
+}
+
+# Index advisor configuration (advise_indexes)
+INDEX_ADVISOR_CONFIG: Dict[str, Any] = {
+    'max_index_columns': 5,  # Maximum number of columns in a proposed composite index
+    'max_validations': 5,  # Maximum number of candidates built as invisible indexes when validating
+    'index_name_prefix': 'adv_',  # Prefix for indexes created by the advisor
+    'min_rows_examined': 100  # Ignore table accesses that examine fewer rows per scan than this
+}
+
+# Metrics configuration (/metrics endpoint and get_metrics)
+METRICS_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('METRICS_ENABLED', 'true').lower() == 'true',
+    'path': os.getenv('METRICS_PATH', '/metrics'),  # HTTP path of the Prometheus endpoint (non-stdio transports)
+    'latency_buckets_seconds': [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30],
+    # Off by default: counting response bytes serializes every tool result a second time, doubling the cost for large results
+    'measure_response_bytes': os.getenv('METRICS_MEASURE_RESPONSE_BYTES', 'false').lower() == 'true'
+}
+
+# Tracing configuration (per-call spans exported as OTLP JSON lines to a local file)
+TRACING_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('TRACING_ENABLED', 'false').lower() == 'true',
+    'sample_rate': float(os.getenv('TRACING_SAMPLE_RATE', '0.1')),  # Head-based sampling: fraction of tool calls traced
+    'file_path': os.getenv('TRACING_FILE', os.path.join(os.path.dirname(LOGGING_CONFIG['file_path']), 'traces.jsonl')),
+    'service_name': os.getenv('TRACING_SERVICE_NAME', 'mcp-mysql-server')
+}
+
+# Profiling configuration (start_profiler / stop_profiler)
+PROFILING_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('PROFILING_ENABLED', 'true').lower() == 'true',  # Allow the profiling admin tools
+    'output_dir': os.getenv('PROFILING_DIR', os.path.join(os.path.dirname(LOGGING_CONFIG['file_path']), 'profiles')),
+    'max_duration_seconds': 600,  # Sessions are stopped automatically after this long
+    'sample_interval_ms': 5,  # Stack sampling interval of the sampling profiler
+    'tracemalloc_frames': 10,  # Frames kept per allocation in memory mode
+    'top_n': 30  # Entries included in the returned report
+}
+
+# Memory budget configuration (rows fetched by a single tool call)
+MEMORY_BUDGET_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('MEMORY_BUDGET_ENABLED', 'true').lower() == 'true',
+    'default_bytes': int(os.getenv('MEMORY_BUDGET_BYTES', str(64 * 1024 * 1024))),  # Estimated in-memory size of the fetched rows per call
+    'tool_bytes': {},  # Per-tool overrides, e.g. {'execute_sql': 256 * 1024 * 1024}
+    'fetch_batch_size': 500  # Rows fetched from the server per round
+}
+
+# Query timeout configuration (execution deadlines enforced on the MySQL server)
+QUERY_TIMEOUT_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('QUERY_TIMEOUT_ENABLED', 'true').lower() == 'true',
+    'default_seconds': float(os.getenv('QUERY_TIMEOUT_SECONDS', '0')),  # Deadline per tool call, 0 = none
+    'tool_seconds': {'read_table': 60, 'search_table': 60, 'execute_sql': 300, 'execute_sql_sharded': 300, 'execute_batch': 300, 'execute_prepared': 300, 'fetch_cursor': 300},  # Per-tool deadlines, override the default
+    'kill_grace_seconds': 1.0,  # Extra time before KILL QUERY for SELECTs already bounded by MAX_EXECUTION_TIME
+    'run_tools_in_threads': True  # Run MCP tool calls off the event loop so client cancellation can kill their queries
+}
+
+# Cost guard configuration (EXPLAIN pre-flight check in execute_sql)
+COST_GUARD_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('COST_GUARD_ENABLED', 'false').lower() == 'true',
+    'confirm_rows_examined': int(os.getenv('COST_GUARD_CONFIRM_ROWS', '1000000')),  # Above this, execute_sql requires confirm=True
+    'confirm_query_cost': float(os.getenv('COST_GUARD_CONFIRM_COST', '1000000')),
+    'reject_rows_examined': int(os.getenv('COST_GUARD_REJECT_ROWS', '100000000')),  # Above this, execute_sql refuses to run the query
+    'reject_query_cost': float(os.getenv('COST_GUARD_REJECT_COST', '100000000')),
+    'cache_size': 1000,  # Verdicts cached per (database, query digest)
+    'cache_ttl_seconds': 300  # Re-EXPLAIN a digest after this long, as table sizes change
+}
+
+# Read replica configuration (read/write splitting)
+REPLICA_CONFIG: Dict[str, Any] = {
+    # MYSQL_REPLICAS="replica1:3306,replica2:3306"; replicas use the primary's user and password
+    'replicas': [
+        {'host': item.strip().split(':')[0], 'port': int(item.strip().split(':')[1]) if ':' in item else 3306}
+        for item in os.getenv('MYSQL_REPLICAS', '').split(',') if item.strip()
+    ],
+    'balancing': os.getenv('REPLICA_BALANCING', 'round_robin'),  # round_robin or least_connections
+    'max_lag_seconds': float(os.getenv('REPLICA_MAX_LAG', '5')),  # Replicas lagging more than this receive no reads
+    'lag_check_interval': float(os.getenv('REPLICA_LAG_CHECK_INTERVAL', '10')),  # Seconds between replication lag checks
+    'read_your_writes_seconds': float(os.getenv('REPLICA_STICKY_SECONDS', '5')),  # Reads go to the primary this long after a session writes
+    'fallback_to_primary': True,  # Read from the primary when no replica is usable
+    'read_only_tools': ['list_tables', 'get_table_schema', 'read_table', 'get_table_stats', 'search_table',
+                        'get_database_info', 'list_databases', 'get_database_details', 'get_table_indexes']
+}
+
+# Named datasources: each entry overrides DB_CONFIG keys ('host', 'port', 'user', 'password', ...) and may
+# set a default 'database' and its own 'replicas' ([{'host': ..., 'port': ...}]). 'default' is DB_CONFIG itself.
+# MYSQL_DATASOURCES='{"analytics": {"host": "10.0.0.5", "user": "reader", "password": "...", "database": "events"}}'
+DATASOURCES: Dict[str, Dict[str, Any]] = {
+    'default': {'replicas': REPLICA_CONFIG['replicas']},
+    **json.loads(os.getenv('MYSQL_DATASOURCES', '{}'))
+}
+DEFAULT_DATASOURCE = os.getenv('MYSQL_DEFAULT_DATASOURCE', 'default')
+
+# Connection pool configuration (one pool per datasource server, created on first use)
+POOL_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('POOL_ENABLED', 'true').lower() == 'true',
+    'max_size': int(os.getenv('POOL_MAX_SIZE', '10')),  # Open connections per server, idle or in use
+    'acquire_timeout': float(os.getenv('POOL_ACQUIRE_TIMEOUT', '10')),  # Seconds to wait for a free connection
+    'idle_timeout': float(os.getenv('POOL_IDLE_TIMEOUT', '300')),  # Idle connections older than this are closed
+    'validate_after_idle': 30,  # Ping connections idle longer than this before reusing them
+    'reset_on_release': True  # COM_RESET_CONNECTION on return after statements that changed session state (SET, temp tables, locks)
+}
+
+# Scatter-gather configuration (execute_sql_sharded)
+SHARD_QUERY_CONFIG: Dict[str, Any] = {
+    'max_parallel': int(os.getenv('SHARD_QUERY_MAX_PARALLEL', '8')),  # Shards queried concurrently (keep within POOL_MAX_SIZE)
+    'max_databases': int(os.getenv('SHARD_QUERY_MAX_DATABASES', '256'))  # Upper bound on shards per call
+}
+
+# Batch configuration (execute_batch)
+BATCH_CONFIG: Dict[str, Any] = {
+    'max_statements': int(os.getenv('BATCH_MAX_STATEMENTS', '100')),  # Statements per execute_batch call
+    'max_parallel': int(os.getenv('BATCH_MAX_PARALLEL', '8'))  # Concurrent statements with parallel=True (keep within POOL_MAX_SIZE)
+}
+
+# Prepared statement configuration (execute_sql params, prepare_statement / execute_prepared)
+PREPARED_STATEMENT_CONFIG: Dict[str, Any] = {
+    'cache_size': int(os.getenv('PREPARED_CACHE_SIZE', '64')),  # Server-side statements cached per pooled connection
+    'max_handles': int(os.getenv('PREPARED_MAX_HANDLES', '32')),  # Open prepare_statement handles per client session
+    'idle_timeout_seconds': float(os.getenv('PREPARED_IDLE_TIMEOUT', '600'))  # Unused handles are deallocated after this
+}
+
+# Server-held cursor configuration (execute_sql page_size / fetch_cursor)
+CURSOR_CONFIG: Dict[str, Any] = {
+    'max_open': int(os.getenv('CURSOR_MAX_OPEN', '8')),  # Open cursors per client session, each holding a connection (keep within POOL_MAX_SIZE)
+    'idle_timeout_seconds': float(os.getenv('CURSOR_IDLE_TIMEOUT', '300'))  # Cursors not read for this long are closed
+}
+
+# Result store configuration (rows of server-held cursors, spilled to memory-mapped temporary files)
+RESULT_STORE_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('RESULT_STORE_ENABLED', 'true').lower() == 'true',  # Read cursor results into the store and release the connection
+    'memory_threshold_bytes': int(os.getenv('RESULT_STORE_MEMORY_BYTES', str(8 * 1024 * 1024))),  # Encoded rows kept in memory per result before spilling
+    'max_result_bytes': int(os.getenv('RESULT_STORE_MAX_RESULT_BYTES', str(1024 * 1024 * 1024))),  # Beyond this the rest is streamed from the held connection
+    'max_disk_bytes': int(os.getenv('RESULT_STORE_MAX_DISK_BYTES', str(8 * 1024 * 1024 * 1024))),  # Temporary file space across all results
+    'directory': os.getenv('RESULT_STORE_DIR') or None  # Directory for the temporary files (default: the system temp directory)
+}
+
+# Data file configuration (export_query / export_table / import_file / backup_database / restore_database)
+DATA_FILE_CONFIG: Dict[str, Any] = {
+    'directory': os.getenv('DATA_FILE_DIR', './data_files'),  # Tools read and write local files only below this directory
+    'chunk_rows': int(os.getenv('DATA_FILE_CHUNK_ROWS', '10000')),  # Rows fetched and written per chunk
+    'max_parallel': int(os.getenv('DATA_FILE_MAX_PARALLEL', '4')),  # Concurrent export_table parts / import_file batches / restore_database chunks (keep within POOL_MAX_SIZE)
+    'batch_rows': int(os.getenv('DATA_FILE_BATCH_ROWS', '1000')),  # Rows per multi-row INSERT in import_file and restore_database
+    'max_errors': int(os.getenv('DATA_FILE_MAX_ERRORS', '1000')),  # Rejected rows tolerated before import_file stops
+    'load_data_local': os.getenv('DATA_FILE_LOAD_DATA_LOCAL', 'true').lower() == 'true',  # Use LOAD DATA LOCAL INFILE when the server permits it
+    'backup_chunk_rows': int(os.getenv('BACKUP_CHUNK_ROWS', '100000')),  # Approximate rows per backup_database chunk file
+    'snapshot_lock_wait_seconds': int(os.getenv('BACKUP_SNAPSHOT_LOCK_WAIT', '10')),  # Wait for FLUSH TABLES WITH READ LOCK before falling back to one connection
+    'max_jobs_retained': 20,  # Number of finished restore jobs kept for get_restore_status
+    'compression_level': int(os.getenv('DATA_FILE_COMPRESSION_LEVEL', '3')),  # gzip / zstd level; low levels keep up with the database
+    'csv_null': os.getenv('DATA_FILE_CSV_NULL', '\\N')  # CSV spelling of NULL (MySQL's own, unambiguous against empty strings)
+}
+
+# Table checksum configuration (checksum_table / compare_tables)
+CHECKSUM_CONFIG: Dict[str, Any] = {
+    'chunk_rows': int(os.getenv('CHECKSUM_CHUNK_ROWS', '100000')),  # Approximate rows per checksummed primary key range
+    'max_parallel': int(os.getenv('CHECKSUM_MAX_PARALLEL', '4')),  # Concurrent chunk checksums across both tables (keep within POOL_MAX_SIZE)
+    'max_differences': int(os.getenv('CHECKSUM_MAX_DIFFERENCES', '1000'))  # Differing keys listed by compare_tables
+}
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+In-process MySQL stand-in for benchmarks and load tests
+
+Replaces mysql.connector.connect with a fake connection whose cursors answer the statements issued
+by the MySQL MCP Server tools with synthetic result sets, so the server's own overhead (wrappers,
+logging, serialization) can be measured without a database.
+"""
+
+import json
+import re
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Tuple
+
+import mysql.connector
+
+# Shape of synthetic result sets returned for data queries
+SYNTHETIC_RESULT: Dict[str, Any] = {
+    'rows': 100,  # Rows returned by data SELECTs (capped by LIMIT)
+    'columns': 10,  # Number of columns in synthetic tables
+    'value_size': 32,  # Length of string values
+    'metadata_rows': 3  # Rows returned by information_schema / performance_schema queries
+}
+
+_connection_ids = iter(range(1, 1 << 62))
+_connection_id_lock = threading.Lock()
+_template_cache: Dict[Tuple[int, int, int], Tuple[List[str], List[tuple]]] = {}
+
+def configure(rows: int = None, columns: int = None, value_size: int = None, metadata_rows: int = None) -> None:
+    """Change the shape of synthetic result sets"""
+    for key, value in (('rows', rows), ('columns', columns), ('value_size', value_size), ('metadata_rows', metadata_rows)):
+        if value is not None:
+            SYNTHETIC_RESULT[key] = value
+
+def synthetic_columns() -> List[str]:
+    """Column names of the synthetic table"""
+    return [f"col_{i}" for i in range(SYNTHETIC_RESULT['columns'])]
+
+def synthetic_template() -> Tuple[List[str], List[tuple]]:
+    """Build (and cache) the synthetic rows for the current result shape"""
+    key = (SYNTHETIC_RESULT['rows'], SYNTHETIC_RESULT['columns'], SYNTHETIC_RESULT['value_size'])
+    if key not in _template_cache:
+        columns = synthetic_columns()
+        base_time = datetime(2024, 1, 1)
+        rows = []
+        for r in range(SYNTHETIC_RESULT['rows']):
+            row = []
+            for c in range(len(columns)):
+                kind = c % 4
+                if c == 0 or kind == 1:
+                    row.append(r * len(columns) + c)
+                elif kind == 2:
+                    row.append(("v%d_" % r + "x" * SYNTHETIC_RESULT['value_size'])[:SYNTHETIC_RESULT['value_size']])
+                elif kind == 3:
+                    row.append(r + c / 100.0)
+                else:
+                    row.append(base_time + timedelta(seconds=r))
+            rows.append(tuple(row))
+        _template_cache[key] = (columns, rows)
+    return _template_cache[key]
+
+def explain_plan(query: str) -> str:
+    """A plausible EXPLAIN FORMAT=JSON plan with a full table scan"""
+    table = re.search(r"\bFROM\s+`?(\w+)`?", query, re.I)
+    return json.dumps({
+        "query_block": {
+            "select_id": 1,
+            "cost_info": {"query_cost": "1024.50"},
+            "table": {
+                "table_name": table.group(1) if table else "t",
+                "access_type": "ALL",
+                "rows_examined_per_scan": 10000,
+                "filtered": "10.00",
+                "attached_condition": ""
+            }
+        }
+    })
+
+def split_select_list(query: str) -> List[str]:
+    """Split the select list of a SELECT statement at top-level commas"""
+    match = re.search(r"^\s*SELECT\s+(.*?)\s+FROM\s", query, re.I | re.S)
+    if not match:
+        return ["value"]
+    items, depth, current = [], 0, ""
+    for char in match.group(1):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            items.append(current)
+            current = ""
+        else:
+            current += char
+    items.append(current)
+    return [item.strip() for item in items]
+
+def metadata_value(expression: str, row_index: int) -> Any:
+    """Synthesize a value for a metadata select-list expression from its name"""
+    name = expression.lower().split(" as ")[-1]
+    if "sub_part" in name:
+        return None
+    if "data_type" in name:
+        return "int"
+    if "table_type" in name:
+        return "BASE TABLE"
+    if "routine_type" in name:
+        return "PROCEDURE"
+    if name == "engine":
+        return "InnoDB"
+    if any(word in name for word in ("name", "schema", "type", "text", "digest", "event", "stage", "sql")):
+        return f"{name.strip('`')}_{row_index}"
+    return (row_index + 1) * 1024
+
+class FakeCursor:
+    """Cursor answering server statements with synthetic results"""
+
+    def __init__(self, connection, dictionary: bool = False):
+        self.connection = connection
+        self.dictionary = dictionary
+        self.column_names: Tuple[str, ...] = ()
+        self.rowcount = -1
+        self.lastrowid = None
+        self._rows: List[Any] = []
+        self._position = 0
+
+    @property
+    def with_rows(self) -> bool:
+        return bool(self.column_names)
+
+    @property
+    def description(self):
+        return [(name, 253, None, None, None, None, 1, 0, 45) for name in self.column_names] or None
+
+    def _set_result(self, columns: List[str], rows: List[tuple]) -> None:
+        self.column_names = tuple(columns)
+        self._rows = [dict(zip(columns, row)) for row in rows] if self.dictionary else list(rows)
+        self._position = 0
+        self.rowcount = len(rows)
+
+    def execute(self, query: str, params: Any = None) -> None:
+        self.column_names = ()
+        self._rows = []
+        self._position = 0
+        sql = re.sub(r"/\*\+.*?\*/\s*", "", query).strip()  # Optimizer hints do not change the synthetic result
+        upper = sql[:40].upper()
+
+        if upper.startswith("SELECT DATABASE()"):
+            self._set_result(["DATABASE()"], [(self.connection.database,)])
+        elif upper.startswith("SHOW TABLES"):
+            self._set_result(["Tables_in_db"], [("bench_table",)] + [(f"table_{i}",) for i in range(SYNTHETIC_RESULT['metadata_rows'])])
+        elif upper.startswith("SHOW DATABASES"):
+            self._set_result(["Database"], [("bench",), ("information_schema",), ("mysql",)])
+        elif upper.startswith(("DESCRIBE", "SHOW COLUMNS")):
+            self._set_result(["Field", "Type", "Null", "Key", "Default", "Extra"],
+                             [(name, "int" if i == 0 else "varchar(255)", "NO" if i == 0 else "YES", "PRI" if i == 0 else "", None, "")
+                              for i, name in enumerate(synthetic_columns())])
+        elif upper.startswith("SHOW INDEX"):
+            self._set_result(["Table", "Non_unique", "Key_name", "Seq_in_index", "Column_name", "Collation", "Cardinality",
+                              "Sub_part", "Packed", "Null", "Index_type", "Comment", "Index_comment", "Visible", "Expression"],
+                             [("bench_table", 0, "PRIMARY", 1, "col_0", "A", 1000, None, None, "", "BTREE", "", "", "YES", None),
+                              ("bench_table", 1, "idx_col_1", 1, "col_1", "A", 100, None, None, "YES", "BTREE", "", "", "YES", None)])
+        elif upper.startswith("SHOW CREATE TABLE"):
+            table = re.findall(r"`?(\w+)`?", sql)[-1]
+            definition = ",\n  ".join(f"`{name}` varchar(255)" for name in synthetic_columns())
+            self._set_result(["Table", "Create Table"], [(table, f"CREATE TABLE `{table}` (\n  {definition},\n  PRIMARY KEY (`col_0`)\n)")])
+        elif upper.startswith(("SHOW CREATE VIEW", "SHOW CREATE PROCEDURE", "SHOW CREATE FUNCTION", "SHOW CREATE TRIGGER")):
+            kind, name = upper.split()[2].lower(), re.findall(r"`?(\w+)`?", sql)[-1]
+            if kind == "view":
+                self._set_result(["View", "Create View", "character_set_client", "collation_connection"],
+                                 [(name, f"CREATE VIEW `{name}` AS select `col_0` AS `col_0` from `bench_table`", "utf8mb4", "utf8mb4_0900_ai_ci")])
+            else:
+                body = f"CREATE TRIGGER `{name}` BEFORE INSERT ON `bench_table` FOR EACH ROW SET NEW.col_1 = 1" if kind == "trigger" \
+                    else f"CREATE {kind.upper()} `{name}`() BEGIN SELECT 1; END"
+                self._set_result([kind.capitalize(), "sql_mode", "SQL Original Statement" if kind == "trigger" else f"Create {kind.capitalize()}"],
+                                 [(name, "STRICT_TRANS_TABLES", body)])
+        elif upper.startswith("SHOW WARNINGS"):
+            self._set_result(["Level", "Code", "Message"], [("Warning", 1265, "Data truncated for column 'col_1' at row 1")])
+        elif upper.startswith("SHOW"):
+            name = re.search(r"LIKE\s+'([^']*)'", sql, re.I)
+            self._set_result(["Variable_name", "Value"], [(name.group(1) if name else "Uptime", "86400")])
+        elif upper.startswith("EXPLAIN"):
+            self._set_result(["EXPLAIN"], [(explain_plan(sql),)])
+        elif upper.startswith("SELECT COUNT(*), COALESCE(BIT_XOR("):
+            # Range checksum: the same for every copy of the synthetic table
+            self._set_result(["COUNT(*)", "checksum"], [(SYNTHETIC_RESULT['rows'], zlib.crc32(repr(params).encode()))])
+        elif upper.startswith("SELECT COUNT(*)"):
+            self._set_result(["COUNT(*)"], [(SYNTHETIC_RESULT['rows'],)])
+        elif upper.startswith("SELECT MIN("):
+            # Key range of the synthetic table, whose first column steps by the column count
+            self._set_result(["MIN", "MAX"], [(0, (SYNTHETIC_RESULT['rows'] - 1) * SYNTHETIC_RESULT['columns'])])
+        elif upper.startswith("SELECT") and re.search(r"information_schema|performance_schema|\bmysql\.|\bsys\.", sql, re.I):
+            expressions = split_select_list(sql)
+            self._set_result(expressions, [tuple(metadata_value(e, r) for e in expressions) for r in range(SYNTHETIC_RESULT['metadata_rows'])])
+        elif upper.startswith(("SELECT", "WITH", "(")):
+            columns, rows = synthetic_template()
+            limit = re.search(r"\bLIMIT\s+(\d+)(?:\s*,\s*(\d+))?", sql, re.I)
+            if limit:
+                rows = rows[:int(limit.group(2) or limit.group(1))]
+            self._set_result(columns, rows)
+        else:
+            # DDL / DML: no result set, one affected row
+            self.rowcount = 1
+            if upper.startswith(("INSERT", "REPLACE")):
+                self.connection.last_insert_id += 1
+                self.lastrowid = self.connection.last_insert_id
+            elif upper.startswith("USE"):
+                self.connection.database = re.findall(r"`?(\w+)`?", sql)[-1]
+
+    def fetchone(self) -> Optional[Any]:
+        if self._position >= len(self._rows):
+            return None
+        row = self._rows[self._position]
+        self._position += 1
+        return row
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        rows = self._rows[self._position:self._position + size]
+        self._position += len(rows)
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        rows = self._rows[self._position:]
+        self._position = len(self._rows)
+        return rows
+
+    def close(self) -> None:
+        self._rows = []
+
+class FakeConnection:
+    """Connection object compatible with the parts of mysql.connector used by the server"""
+
+    def __init__(self, database: Optional[str] = None, **kwargs):
+        with _connection_id_lock:
+            self.connection_id = next(_connection_ids)
+        self.database = database
+        self.autocommit = kwargs.get('autocommit', True)
+        self.last_insert_id = 0
+        self.last_statement_id = 0
+        self._connected = True
+
+    def is_connected(self) -> bool:
+        return self._connected
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0) -> None:
+        return None
+
+    def get_server_info(self) -> str:
+        return "8.0.36-fake"
+
+    def cursor(self, dictionary: bool = False, **kwargs) -> FakeCursor:
+        return FakeCursor(self, dictionary=dictionary)
+
+    @property
+    def unread_result(self) -> bool:
+        return False
+
+    @property
+    def in_transaction(self) -> bool:
+        return False
+
+    def cmd_init_db(self, database: str) -> None:
+        self.database = database
+
+    def cmd_reset_connection(self) -> bool:
+        return True
+
+    def consume_results(self) -> None:
+        return None
+
+    def cmd_stmt_prepare(self, statement: bytes) -> Dict[str, Any]:
+        self.last_statement_id += 1
+        return {"statement_id": self.last_statement_id, "parameters": [None] * statement.count(b"?"), "columns": []}
+
+    def cmd_stmt_close(self, statement_id: int) -> None:
+        return None
+
+    def start_transaction(self, **kwargs) -> None:
+        return None
+
+    def commit(self) -> None:
+        return None
+
+    def rollback(self) -> None:
+        return None
+
+    def close(self) -> None:
+        self._connected = False
+
+def fake_connect(*args, **kwargs) -> FakeConnection:
+    """Drop-in replacement for mysql.connector.connect"""
+    return FakeConnection(**kwargs)
+
+@contextmanager
+def fake_mysql_connector(**result_shape):
+    """
+    Context manager that routes mysql.connector.connect to the in-process stand-in
+
+    Args:
+        result_shape: Optional rows / columns / value_size / metadata_rows overrides
+    """
+    configure(**result_shape)
+    original_connect = mysql.connector.connect
+    mysql.connector.connect = fake_connect
+    try:
+        yield
+    finally:
+        mysql.connector.connect = original_connect
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Concurrent load generator for the MySQL MCP Server HTTP transports
+
+Replays a weighted mix of tool calls from a scenario file over MCP (streamable-http or sse), either
+at a target request rate (open loop) or with a fixed number of concurrent clients (closed loop),
+and reports throughput, latency percentiles and error rates overall and per tool.
+
+Usage:
+    # Against a running server (MCP_TRANSPORT=streamable-http python mcp_mysql_server.py)
+    python load_test.py load_scenario.json --url http://127.0.0.1:8002/mcp --concurrency 16 --duration 60
+
+    # Against an in-process server backed by the MySQL stand-in, at 200 calls/s
+    python load_test.py load_scenario.json --spawn-server --fake-mysql --rate 200 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from contextlib import AsyncExitStack, ExitStack
+from typing import Dict, List, Any, Optional
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def load_scenario(path: str) -> Dict[str, Any]:
+    """Load and validate a scenario file"""
+    with open(path, encoding="utf-8") as scenario_file:
+        scenario = json.load(scenario_file)
+    if not scenario.get("mix"):
+        raise ValueError("Scenario must define a non-empty 'mix' of tool calls")
+    for entry in scenario["mix"]:
+        if "tool" not in entry:
+            raise ValueError(f"Mix entry without 'tool': {entry}")
+        entry.setdefault("weight", 1)
+        entry.setdefault("arguments", {})
+    return scenario
+
+def spawn_server(port: int, transport: str) -> None:
+    """Start the MCP server in a background thread of this process"""
+    os.environ.setdefault('LOG_FILE', os.path.join(tempfile.gettempdir(), 'mcp_mysql_load_test.log'))
+    import mcp_mysql_server as server
+
+    server.mcp.settings.host = "127.0.0.1"
+    server.mcp.settings.port = port
+    threading.Thread(target=server.mcp.run, kwargs={"transport": transport}, name="mcp-server", daemon=True).start()
+
+async def open_session(stack: AsyncExitStack, url: str, transport: str) -> ClientSession:
+    """Open and initialize one MCP client session"""
+    if transport == "sse":
+        read_stream, write_stream = await stack.enter_async_context(sse_client(url))
+    else:
+        read_stream, write_stream, _ = await stack.enter_async_context(streamablehttp_client(url))
+    session = await stack.enter_async_context(ClientSession(read_stream, write_stream))
+    await session.initialize()
+    return session
+
+async def wait_for_server(url: str, transport: str, timeout: float) -> None:
+    """Retry connecting until the server accepts MCP sessions"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            async with AsyncExitStack() as stack:
+                await open_session(stack, url, transport)
+            return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.2)
+
+def is_error_result(result: Any) -> bool:
+    """Whether an MCP tool result is a protocol error or a tool-level {'status': 'error'} payload"""
+    if result.isError:
+        return True
+    for content in result.content:
+        text = getattr(content, "text", None)
+        if text and '"status"' in text:
+            try:
+                return json.loads(text).get("status") == "error"
+            except ValueError:
+                return False
+    return False
+
+class LoadStats:
+    """Latency and error accounting per tool"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.exceptions: Dict[str, int] = {}
+
+    def record(self, tool: str, latency: float, error: bool, exception: bool) -> None:
+        self.latencies.setdefault(tool, []).append(latency)
+        self.errors[tool] = self.errors.get(tool, 0) + (1 if error else 0)
+        self.exceptions[tool] = self.exceptions.get(tool, 0) + (1 if exception else 0)
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """Throughput, latency percentiles and error rate for a list of call latencies"""
+    values = sorted(latencies)
+
+    def pick(fraction: float) -> float:
+        return round(values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))] * 1000, 2) if values else 0.0
+
+    return {
+        "calls": len(values),
+        "throughput": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        "error_rate": round(errors / len(values), 4) if values else 0.0
+    }
+
+async def call_once(session: ClientSession, entry: Dict[str, Any], stats: LoadStats, timeout: float,
+                    scheduled: Optional[float] = None) -> None:
+    """
+    Issue one tool call and record its outcome.
+    
+    Latency is measured from the scheduled send time when one is given (open loop), so time spent
+    waiting for an in-flight slot or behind a late scheduler counts against the server.
+    """
+    start = time.perf_counter() if scheduled is None else scheduled
+    try:
+        result = await asyncio.wait_for(session.call_tool(entry["tool"], entry["arguments"]), timeout)
+        stats.record(entry["tool"], time.perf_counter() - start, is_error_result(result), False)
+    except Exception:
+        stats.record(entry["tool"], time.perf_counter() - start, True, True)
+
+async def run_load(args: argparse.Namespace, scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Open the client sessions, run the setup calls and replay the mix until the duration elapses"""
+    mix = scenario["mix"]
+    weights = [entry["weight"] for entry in mix]
+    stats = LoadStats()
+    sessions_needed = args.concurrency if not args.rate else min(args.concurrency, max(1, int(args.rate)))
+
+    async with AsyncExitStack() as stack:
+        sessions = [await open_session(stack, args.url, args.transport) for _ in range(sessions_needed)]
+        for session in sessions:
+            for setup in scenario.get("setup", []):
+                await session.call_tool(setup["tool"], setup.get("arguments", {}))
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+
+        if args.rate:
+            # Open loop: schedule calls at the target rate regardless of response times
+            in_flight = asyncio.Semaphore(args.max_in_flight)
+            tasks = set()
+            interval = 1.0 / args.rate
+            next_send = started
+            index = 0
+
+            async def limited(session, entry, scheduled):
+                async with in_flight:
+                    await call_once(session, entry, stats, args.timeout, scheduled)
+
+            while next_send < deadline:
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                entry = random.choices(mix, weights)[0]
+                task = asyncio.create_task(limited(sessions[index % len(sessions)], entry, next_send))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                index += 1
+                next_send += interval
+            if tasks:
+                await asyncio.gather(*tasks)
+        else:
+            # Closed loop: each client issues its next call as soon as the previous one returns
+            async def worker(session):
+                while time.perf_counter() < deadline:
+                    await call_once(session, random.choices(mix, weights)[0], stats, args.timeout)
+
+            await asyncio.gather(*(worker(session) for session in sessions))
+
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [latency for values in stats.latencies.values() for latency in values]
+    report = {
+        "config": {"url": args.url, "transport": args.transport, "duration": args.duration,
+                   "rate": args.rate, "concurrency": args.concurrency},
+        "elapsed_seconds": round(elapsed, 2),
+        "overall": summarize(all_latencies, sum(stats.errors.values()), elapsed),
+        "tools": {tool: dict(summarize(values, stats.errors[tool], elapsed), exceptions=stats.exceptions[tool])
+                  for tool, values in sorted(stats.latencies.items())}
+    }
+    return report
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the load test report as a table"""
+    print("=" * 100)
+    print(f"{'tool':<28}{'calls':>9}{'calls/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'errors':>10}")
+    print("-" * 100)
+    rows = list(report["tools"].items()) + [("TOTAL", report["overall"])]
+    for tool, summary in rows:
+        print(f"{tool:<28}{summary['calls']:>9}{summary['throughput']:>10}{summary['p50_ms']:>10}{summary['p90_ms']:>10}"
+              f"{summary['p99_ms']:>10}{summary['max_ms']:>10}{summary['error_rate']:>10.2%}")
+    print("=" * 100)
+
+def main() -> int:
+    """Main load test function"""
+    parser = argparse.ArgumentParser(description="Load test the MySQL MCP Server over its HTTP transport")
+    parser.add_argument("scenario", help="Scenario JSON file with 'setup' and weighted 'mix' tool calls")
+    parser.add_argument("--url", help="Server endpoint (default: http://127.0.0.1:<port>/mcp, or /sse for --transport sse)")
+    parser.add_argument("--transport", choices=["streamable-http", "sse"], default="streamable-http")
+    parser.add_argument("--port", type=int, default=int(os.getenv('MCP_PORT', '8002')), help="Port for the default URL and --spawn-server")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to generate load")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients (closed loop) or client sessions (with --rate)")
+    parser.add_argument("--rate", type=float, help="Target calls per second (open loop); overrides closed-loop mode")
+    parser.add_argument("--max-in-flight", type=int, default=256, help="Cap on outstanding calls in --rate mode")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-call timeout in seconds")
+    parser.add_argument("--spawn-server", action="store_true", help="Start the server in this process")
+    parser.add_argument("--fake-mysql", action="store_true", help="With --spawn-server, back the server with the in-process MySQL stand-in")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    args = parser.parse_args()
+
+    scenario = load_scenario(args.scenario)
+    args.url = args.url or f"http://127.0.0.1:{args.port}{'/sse' if args.transport == 'sse' else '/mcp'}"
+
+    print("🚀 MySQL MCP Server - Load Test")
+    mode = f"rate={args.rate}/s" if args.rate else f"concurrency={args.concurrency}"
+    print(f"   url={args.url} transport={args.transport} {mode} duration={args.duration}s")
+
+    with ExitStack() as stack:
+        if args.spawn_server:
+            if args.fake_mysql:
+                import fake_mysql
+                stack.enter_context(fake_mysql.fake_mysql_connector())
+            spawn_server(args.port, args.transport)
+            asyncio.run(wait_for_server(args.url, args.transport, timeout=15))
+
+        report = asyncio.run(run_load(args, scenario))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+        print(f"📄 Report written to {args.output}")
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
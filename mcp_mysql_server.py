@@ -1,16 +1,57 @@
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, errorcode
+from mysql.connector.constants import FieldFlag, FieldType
+import os
 import sys
 import logging
 import re
-from datetime import datetime
-from typing import Dict, List, Any, Optional, Union
-from contextlib import contextmanager
+import json
+import random
+import time
+import hashlib
+import heapq
+import inspect
+import itertools
+import cProfile
+import csv
+import gzip
+import io
+import pstats
+import tracemalloc
+import mmap
+import pickle
+import struct
+import tempfile
+import uuid
+import threading
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import cmp_to_key, lru_cache, wraps
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar, copy_context
+import anyio
 from mcp.server.fastmcp import FastMCP
-from config import DB_CONFIG, SERVER_CONFIG, LOGGING_CONFIG, SECURITY_CONFIG, DB_MANAGEMENT_CONFIG
+from starlette.responses import PlainTextResponse
+from config import DB_CONFIG, SERVER_CONFIG, LOGGING_CONFIG, SECURITY_CONFIG, DB_MANAGEMENT_CONFIG, ONLINE_DDL_CONFIG, INDEX_BUILD_CONFIG, QUERY_STATS_CONFIG, INDEX_ADVISOR_CONFIG, METRICS_CONFIG, TRACING_CONFIG, PROFILING_CONFIG, MEMORY_BUDGET_CONFIG, QUERY_TIMEOUT_CONFIG, COST_GUARD_CONFIG, REPLICA_CONFIG, DATASOURCES, DEFAULT_DATASOURCE, POOL_CONFIG, SHARD_QUERY_CONFIG, BATCH_CONFIG, PREPARED_STATEMENT_CONFIG, CURSOR_CONFIG, RESULT_STORE_CONFIG, DATA_FILE_CONFIG, CHECKSUM_CONFIG
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet files are optional
+    pyarrow = None
+try:
+    import zstandard
+except ImportError:  # zstd compression is optional
+    zstandard = None
 
 # Global variable to track current database
-CURRENT_DATABASE: Optional[str] = None
+CURRENT_DATABASE: Optional[str] = DATASOURCES.get(DEFAULT_DATASOURCE, {}).get('database')
 
 # Configure logging
 logger = logging.getLogger()
@@ -68,163 +109,1402 @@ def log_sql_execution(func):
             raise
     return wrapper
 
+# Query deadlines and cancellation
+# State of the tool call running in the current context: deadline, active statements and cancellation flag
+CALL_CONTEXT: ContextVar[Optional[Dict[str, Any]]] = ContextVar("call_context", default=None)
+WATCHDOG_CONDITION = threading.Condition()
+WATCHDOG_QUEUE: List[Tuple[float, int, Dict[str, Any]]] = []  # Heap of (kill_at, sequence, statement watch)
+WATCHDOG_SEQUENCE = itertools.count()
+WATCHDOG_THREAD: Optional[threading.Thread] = None
+SELECT_HINT_PATTERN = re.compile(r"^(\s*(?:/\*(?!\+).*?\*/\s*)*\(?\s*SELECT\b)(\s*/\*\+)?", re.I | re.S)
+
+class QueryTimeoutError(Exception):
+    """A statement was stopped because the tool call's deadline passed"""
+
+class QueryCancelledError(Exception):
+    """A statement was stopped because the MCP request was cancelled"""
+
+def new_call_state(tool_name: str) -> Dict[str, Any]:
+    """Create the per-call state tracked in CALL_CONTEXT"""
+    return {"tool": tool_name, "deadline": None, "timeout": None, "cancelled": False, "read_only": tool_name in REPLICA_CONFIG['read_only_tools'],
+            "watches": {}, "lock": threading.Lock()}
+
+def get_tool_timeout(tool_name: str) -> Optional[float]:
+    """Configured execution deadline in seconds for a tool (None when unbounded)"""
+    if not QUERY_TIMEOUT_CONFIG['enabled']:
+        return None
+    seconds = QUERY_TIMEOUT_CONFIG['tool_seconds'].get(tool_name, QUERY_TIMEOUT_CONFIG['default_seconds'])
+    return seconds if seconds and seconds > 0 else None
+
+def set_call_timeout(seconds: Optional[float]) -> None:
+    """Set the deadline of the current tool call, counted from now"""
+    state = CALL_CONTEXT.get()
+    if state is not None:
+        state["timeout"] = seconds if seconds and seconds > 0 else None
+        state["deadline"] = time.monotonic() + state["timeout"] if state["timeout"] else None
+
+def set_call_read_only(read_only: bool) -> None:
+    """Mark whether the current tool call only reads, making it eligible for a read replica"""
+    state = CALL_CONTEXT.get()
+    if state is not None:
+        state["read_only"] = read_only
+
+def add_max_execution_time_hint(query: str, milliseconds: int) -> Optional[str]:
+    """Add a MAX_EXECUTION_TIME optimizer hint to a SELECT; None if the statement cannot take one"""
+    if "MAX_EXECUTION_TIME" in query.upper():
+        return None
+    match = SELECT_HINT_PATTERN.match(query)
+    if not match:
+        return None
+    if match.group(2):
+        # Only the first hint comment of a query block is honoured, so merge into it
+        return f"{query[:match.end()]} MAX_EXECUTION_TIME({milliseconds}){query[match.end():]}"
+    return f"{query[:match.end(1)]} /*+ MAX_EXECUTION_TIME({milliseconds}) */{query[match.end(1):]}"
+
+def kill_query(connection_id: int, reason: str, server: Optional[Dict[str, Any]] = None) -> None:
+    """Stop the statement running on a connection from a side connection to the same server"""
+    try:
+        # A dedicated connection: the pool may be exhausted by the very statements being killed
+        target = {"host": server["host"], "port": server["port"]} if server else {"host": get_datasource_config()['host']}
+        with open_connection(server["datasource"] if server else CURRENT_DATASOURCE, None, target) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"KILL QUERY {int(connection_id)}")
+            cursor.close()
+        logger.warning(f"Killed query on connection {connection_id}: {reason}")
+    except Exception as e:
+        logger.error(f"Failed to kill query on connection {connection_id}: {e}")
+
+def start_statement_watch(state: Dict[str, Any], connection_id: Optional[int], kill_at: Optional[float], server: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Register a running statement with its call and, if it has a deadline, with the watchdog"""
+    global WATCHDOG_THREAD
+    watch = {"connection_id": connection_id, "server": server, "timed_out": False, "cancelled": False, "done": False, "timeout": state["timeout"]}
+    with state["lock"]:
+        state["watches"][id(watch)] = watch
+    if kill_at is not None and connection_id is not None:
+        with WATCHDOG_CONDITION:
+            heapq.heappush(WATCHDOG_QUEUE, (kill_at, next(WATCHDOG_SEQUENCE), watch))
+            if WATCHDOG_THREAD is None:
+                WATCHDOG_THREAD = threading.Thread(target=run_query_watchdog, name="mcp-query-watchdog", daemon=True)
+                WATCHDOG_THREAD.start()
+            WATCHDOG_CONDITION.notify()
+    return watch
+
+def stop_statement_watch(state: Dict[str, Any], watch: Dict[str, Any]) -> None:
+    """Unregister a finished statement (the watchdog drops it lazily)"""
+    watch["done"] = True
+    with state["lock"]:
+        state["watches"].pop(id(watch), None)
+
+def run_query_watchdog() -> None:
+    """Watchdog thread: KILL QUERY statements still running at their deadline"""
+    while True:
+        with WATCHDOG_CONDITION:
+            while not WATCHDOG_QUEUE or WATCHDOG_QUEUE[0][2]["done"] or WATCHDOG_QUEUE[0][0] > time.monotonic():
+                if WATCHDOG_QUEUE and WATCHDOG_QUEUE[0][2]["done"]:
+                    heapq.heappop(WATCHDOG_QUEUE)
+                    continue
+                WATCHDOG_CONDITION.wait(WATCHDOG_QUEUE[0][0] - time.monotonic() if WATCHDOG_QUEUE else None)
+            _, _, watch = heapq.heappop(WATCHDOG_QUEUE)
+            watch["timed_out"] = True
+        kill_query(watch["connection_id"], f"deadline of {watch['timeout']}s exceeded", watch["server"])
+
+def cancel_call(state: Dict[str, Any]) -> None:
+    """Cancel a tool call: refuse further statements and kill the ones running"""
+    with state["lock"]:
+        state["cancelled"] = True
+        watches = [watch for watch in state["watches"].values() if not watch["done"]]
+    for watch in watches:
+        watch["cancelled"] = True
+        if watch["connection_id"] is not None:
+            threading.Thread(target=kill_query, args=(watch["connection_id"], f"{state['tool']} request cancelled", watch["server"]), daemon=True).start()
+
+def run_tool_in_thread(fn: Callable) -> Callable:
+    """Wrap a synchronous tool so MCP calls run in a worker thread and cancellation kills its queries"""
+    @wraps(fn)
+    async def runner(*args, **kwargs):
+        state = new_call_state(fn.__name__)
+        token = CALL_CONTEXT.set(state)
+        try:
+            return await anyio.to_thread.run_sync(lambda: fn(*args, **kwargs), abandon_on_cancel=True)
+        except anyio.get_cancelled_exc_class():
+            logger.warning(f"[CLIENT CALL] {fn.__name__} cancelled by the client")
+            cancel_call(state)
+            raise
+        finally:
+            CALL_CONTEXT.reset(token)
+    return runner
+
+class MySQLFastMCP(FastMCP):
+    """FastMCP server whose synchronous tools run off the event loop (see run_tool_in_thread)"""
+    
+    def add_tool(self, fn, *args, **kwargs):
+        if QUERY_TIMEOUT_CONFIG['run_tools_in_threads'] and not inspect.iscoroutinefunction(fn):
+            fn = run_tool_in_thread(fn)
+        super().add_tool(fn, *args, **kwargs)
+
 # Initialize MCP server
 if SERVER_CONFIG['transport'] == 'stdio':
-    mcp = FastMCP(SERVER_CONFIG['name'])
+    mcp = MySQLFastMCP(SERVER_CONFIG['name'])
 else:
-    mcp = FastMCP(SERVER_CONFIG['name'], port=SERVER_CONFIG['port'], host=SERVER_CONFIG['host'])
+    mcp = MySQLFastMCP(SERVER_CONFIG['name'], port=SERVER_CONFIG['port'], host=SERVER_CONFIG['host'])
+
+# Operational metrics
+METRICS_LOCK = threading.Lock()
+TOOL_METRICS: Dict[str, Dict[str, Any]] = {}
+STATEMENT_METRICS: Dict[str, Any] = {"count": 0, "errors": 0, "rows": 0, "timeouts": 0, "cancellations": 0, "sum": 0.0, "buckets": [0] * (len(METRICS_CONFIG['latency_buckets_seconds']) + 1)}
+CONNECTION_METRICS: Dict[str, Any] = {"in_use": 0, "opened": 0, "sum": 0.0, "buckets": [0] * (len(METRICS_CONFIG['latency_buckets_seconds']) + 1)}
+TOOL_CALLS_IN_FLIGHT = 0
+
+# Cache name -> callable returning (hits, misses); caches register themselves where they are defined
+CACHE_STATS_PROVIDERS: Dict[str, Callable[[], Tuple[int, int]]] = {}
+
+def observe_latency(histogram: Dict[str, Any], seconds: float) -> None:
+    """Add one observation to a histogram dict (caller holds METRICS_LOCK)"""
+    histogram["sum"] += seconds
+    histogram["buckets"][bisect_left(METRICS_CONFIG['latency_buckets_seconds'], seconds)] += 1
+
+def begin_tool_call() -> None:
+    """Mark a tool call as in flight"""
+    global TOOL_CALLS_IN_FLIGHT
+    with METRICS_LOCK:
+        TOOL_CALLS_IN_FLIGHT += 1
+
+def end_tool_call(tool_name: str, elapsed: float, error: bool, result: Any) -> None:
+    """Record a finished tool call: latency, error, rows and response bytes"""
+    global TOOL_CALLS_IN_FLIGHT
+    rows = 0
+    response_bytes = 0
+    budget_hit = False
+    if isinstance(result, dict):
+        data = result.get("data")
+        if isinstance(data, dict) and isinstance(data.get("count"), int):
+            rows = data["count"]
+            budget_hit = data.get("truncated") is True
+        if METRICS_CONFIG['enabled'] and METRICS_CONFIG['measure_response_bytes']:
+            with trace_span("serialize") as span:
+                response_bytes = len(json.dumps(result, default=str))
+                if span is not None:
+                    span["attributes"]["mcp.response.bytes"] = response_bytes
+    
+    with METRICS_LOCK:
+        TOOL_CALLS_IN_FLIGHT -= 1
+        if not METRICS_CONFIG['enabled']:
+            return
+        metrics = TOOL_METRICS.get(tool_name)
+        if metrics is None:
+            metrics = TOOL_METRICS[tool_name] = {
+                "count": 0, "errors": 0, "rows": 0, "bytes": 0, "budget_hits": 0, "sum": 0.0,
+                "buckets": [0] * (len(METRICS_CONFIG['latency_buckets_seconds']) + 1)
+            }
+        metrics["count"] += 1
+        metrics["errors"] += 1 if error else 0
+        metrics["rows"] += rows
+        metrics["bytes"] += response_bytes
+        metrics["budget_hits"] += 1 if budget_hit else 0
+        observe_latency(metrics, elapsed)
+
+def record_statement_metrics(elapsed: float, rows: int, error: bool) -> None:
+    """Record one SQL statement executed through the cursor layer"""
+    if not METRICS_CONFIG['enabled']:
+        return
+    with METRICS_LOCK:
+        STATEMENT_METRICS["count"] += 1
+        STATEMENT_METRICS["errors"] += 1 if error else 0
+        STATEMENT_METRICS["rows"] += rows
+        observe_latency(STATEMENT_METRICS, elapsed)
+
+def record_statement_interrupted(timed_out: bool) -> None:
+    """Count a statement stopped by its deadline or by client cancellation"""
+    with METRICS_LOCK:
+        STATEMENT_METRICS["timeouts" if timed_out else "cancellations"] += 1
+
+def record_connection_acquired(wait_seconds: float) -> None:
+    """Record a connection checkout and the time spent waiting for it"""
+    with METRICS_LOCK:
+        CONNECTION_METRICS["in_use"] += 1
+        CONNECTION_METRICS["opened"] += 1
+        observe_latency(CONNECTION_METRICS, wait_seconds)
+
+def record_connection_released() -> None:
+    """Record a connection being returned"""
+    with METRICS_LOCK:
+        CONNECTION_METRICS["in_use"] -= 1
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Collect hit/miss counters from all registered caches"""
+    caches = {}
+    for name, provider in CACHE_STATS_PROVIDERS.items():
+        hits, misses = provider()
+        total = hits + misses
+        caches[name] = {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 4) if total else None}
+    return caches
+
+def snapshot_metrics() -> Dict[str, Any]:
+    """Take a consistent copy of all metrics"""
+    with METRICS_LOCK:
+        return {
+            "tools": {name: dict(m, buckets=list(m["buckets"])) for name, m in TOOL_METRICS.items()},
+            "statements": dict(STATEMENT_METRICS, buckets=list(STATEMENT_METRICS["buckets"])),
+            "connections": dict(CONNECTION_METRICS, buckets=list(CONNECTION_METRICS["buckets"])),
+            "tool_calls_in_flight": TOOL_CALLS_IN_FLIGHT,
+            "caches": get_cache_stats(),
+            "replicas": [{key: replica[key] for key in ("name", "datasource", "healthy", "lag_seconds", "in_use", "routed", "last_checked", "last_error")}
+                         for replica in REPLICA_STATE],
+            "pools": [dict(pool.snapshot(), datasource=key[0]) for key, pool in list(POOLS.items())],
+            "result_store": dict(RESULT_STORE_USAGE)
+        }
+
+def render_prometheus_histogram(lines: List[str], name: str, histogram: Dict[str, Any], labels: str = "") -> None:
+    """Append a histogram in Prometheus text format (cumulative buckets)"""
+    cumulative = 0
+    label_prefix = f"{labels}," if labels else ""
+    for bound, count in zip(METRICS_CONFIG['latency_buckets_seconds'] + ["+Inf"], histogram["buckets"]):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{label_prefix}le="{bound}"}} {cumulative}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{name}_sum{suffix} {histogram['sum']}")
+    lines.append(f"{name}_count{suffix} {cumulative}")
+
+def render_prometheus_metrics() -> str:
+    """Render all metrics in the Prometheus text exposition format"""
+    snapshot = snapshot_metrics()
+    lines = []
+    
+    tool_counters = [
+        ("mcp_mysql_tool_calls_total", "count", "Tool calls"),
+        ("mcp_mysql_tool_errors_total", "errors", "Tool calls that failed or returned an error"),
+        ("mcp_mysql_tool_rows_returned_total", "rows", "Rows returned by tools"),
+        ("mcp_mysql_tool_response_bytes_total", "bytes", "Serialized response bytes returned by tools (0 unless METRICS_MEASURE_RESPONSE_BYTES is enabled)"),
+        ("mcp_mysql_tool_memory_budget_hits_total", "budget_hits", "Tool results truncated by the memory budget")
+    ]
+    for name, key, help_text in tool_counters:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        lines += [f'{name}{{tool="{tool}"}} {m[key]}' for tool, m in snapshot["tools"].items()]
+    
+    lines += ["# HELP mcp_mysql_tool_duration_seconds Tool call latency", "# TYPE mcp_mysql_tool_duration_seconds histogram"]
+    for tool, m in snapshot["tools"].items():
+        render_prometheus_histogram(lines, "mcp_mysql_tool_duration_seconds", m, f'tool="{tool}"')
+    
+    lines += ["# HELP mcp_mysql_tool_calls_in_flight Tool calls currently executing", "# TYPE mcp_mysql_tool_calls_in_flight gauge",
+              f"mcp_mysql_tool_calls_in_flight {snapshot['tool_calls_in_flight']}"]
+    
+    statements = snapshot["statements"]
+    lines += ["# HELP mcp_mysql_statements_total SQL statements executed", "# TYPE mcp_mysql_statements_total counter",
+              f"mcp_mysql_statements_total {statements['count']}",
+              "# HELP mcp_mysql_statement_errors_total SQL statements that failed", "# TYPE mcp_mysql_statement_errors_total counter",
+              f"mcp_mysql_statement_errors_total {statements['errors']}",
+              "# HELP mcp_mysql_statement_rows_total Rows fetched by SQL statements", "# TYPE mcp_mysql_statement_rows_total counter",
+              f"mcp_mysql_statement_rows_total {statements['rows']}",
+              "# HELP mcp_mysql_statement_timeouts_total SQL statements stopped by their deadline", "# TYPE mcp_mysql_statement_timeouts_total counter",
+              f"mcp_mysql_statement_timeouts_total {statements['timeouts']}",
+              "# HELP mcp_mysql_statement_cancellations_total SQL statements killed because the request was cancelled", "# TYPE mcp_mysql_statement_cancellations_total counter",
+              f"mcp_mysql_statement_cancellations_total {statements['cancellations']}",
+              "# HELP mcp_mysql_statement_duration_seconds SQL statement latency including fetch", "# TYPE mcp_mysql_statement_duration_seconds histogram"]
+    render_prometheus_histogram(lines, "mcp_mysql_statement_duration_seconds", statements)
+    
+    connections = snapshot["connections"]
+    lines += ["# HELP mcp_mysql_connections_in_use Connections currently checked out", "# TYPE mcp_mysql_connections_in_use gauge",
+              f"mcp_mysql_connections_in_use {connections['in_use']}",
+              "# HELP mcp_mysql_connections_opened_total Connections checked out", "# TYPE mcp_mysql_connections_opened_total counter",
+              f"mcp_mysql_connections_opened_total {connections['opened']}",
+              "# HELP mcp_mysql_connection_acquire_seconds Time spent waiting for a connection", "# TYPE mcp_mysql_connection_acquire_seconds histogram"]
+    render_prometheus_histogram(lines, "mcp_mysql_connection_acquire_seconds", connections)
+    
+    replica_metrics = [
+        ("mcp_mysql_replica_healthy", "healthy", "gauge", "Whether the replica is reachable and replicating"),
+        ("mcp_mysql_replica_lag_seconds", "lag_seconds", "gauge", "Replication lag of the replica"),
+        ("mcp_mysql_replica_connections_in_use", "in_use", "gauge", "Connections currently open to the replica"),
+        ("mcp_mysql_replica_routed_total", "routed", "counter", "Read connections routed to the replica")
+    ]
+    for name, key, metric_type, help_text in replica_metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        lines += [f'{name}{{datasource="{replica["datasource"]}",replica="{replica["name"]}"}} {"NaN" if replica[key] is None else int(replica[key]) if isinstance(replica[key], bool) else replica[key]}'
+                  for replica in snapshot["replicas"]]
+    
+    pool_metrics = [
+        ("mcp_mysql_pool_connections_open", "open", "gauge", "Connections open in the pool, idle or in use"),
+        ("mcp_mysql_pool_connections_idle", "idle", "gauge", "Idle connections in the pool"),
+        ("mcp_mysql_pool_checkouts_total", "checkouts", "counter", "Connections checked out of the pool"),
+        ("mcp_mysql_pool_connections_created_total", "created", "counter", "Connections opened by the pool"),
+        ("mcp_mysql_pool_connect_errors_total", "connect_errors", "counter", "Failed connection attempts"),
+        ("mcp_mysql_pool_timeouts_total", "timeouts", "counter", "Checkouts that timed out waiting for a free connection"),
+        ("mcp_mysql_pool_connect_seconds_total", "connect_seconds", "counter", "Time spent opening connections"),
+        ("mcp_mysql_pool_wait_seconds_total", "wait_seconds", "counter", "Time spent waiting for a free connection")
+    ]
+    for name, key, metric_type, help_text in pool_metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        lines += [f'{name}{{datasource="{pool["datasource"]}",server="{pool["server"]}"}} {pool[key]}' for pool in snapshot["pools"]]
+    
+    result_store = snapshot["result_store"]
+    lines += ["# HELP mcp_mysql_result_store_disk_bytes Temporary file space used by stored cursor results", "# TYPE mcp_mysql_result_store_disk_bytes gauge",
+              f"mcp_mysql_result_store_disk_bytes {result_store['disk_bytes']}",
+              "# HELP mcp_mysql_result_store_open Cursor results currently held in the result store", "# TYPE mcp_mysql_result_store_open gauge",
+              f"mcp_mysql_result_store_open {result_store['open']}",
+              "# HELP mcp_mysql_result_store_spilled_total Results spilled to a temporary file", "# TYPE mcp_mysql_result_store_spilled_total counter",
+              f"mcp_mysql_result_store_spilled_total {result_store['spilled']}"]
+    
+    cache_metrics = [
+        ("mcp_mysql_cache_hits_total", "hits", "counter", "Cache hits"),
+        ("mcp_mysql_cache_misses_total", "misses", "counter", "Cache misses"),
+        ("mcp_mysql_cache_hit_ratio", "hit_ratio", "gauge", "Cache hit ratio")
+    ]
+    for name, key, metric_type, help_text in cache_metrics:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+        lines += [f'{name}{{cache="{cache}"}} {stats[key] if stats[key] is not None else "NaN"}' for cache, stats in snapshot["caches"].items()]
+    
+    return "\n".join(lines) + "\n"
+
+# Tracing
+CURRENT_SPAN: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_span", default=None)
+TRACE_EXPORT_LOCK = threading.Lock()
+
+@contextmanager
+def trace_span(name: str, attributes: Optional[Dict[str, Any]] = None, root: bool = False, kind: int = 1):
+    """
+    Record a span as a child of the current span.
+    
+    A new trace is only started when root is True and the head-based sampler selects it; otherwise,
+    without a current span, this yields None and records nothing. The trace is exported when its
+    root span ends.
+    
+    Args:
+        name: Span name
+        attributes: Initial span attributes
+        root: Whether this span may start a new trace
+        kind: OTLP span kind (1 internal, 3 client)
+    """
+    parent = CURRENT_SPAN.get()
+    if parent is None:
+        if not root or not TRACING_CONFIG['enabled'] or random.random() >= TRACING_CONFIG['sample_rate']:
+            yield None
+            return
+        trace = {"trace_id": os.urandom(16).hex(), "spans": []}
+    else:
+        trace = parent["trace"]
+    
+    span = {
+        "trace": trace,
+        "span_id": os.urandom(8).hex(),
+        "parent_id": parent["span_id"] if parent else None,
+        "name": name,
+        "kind": kind,
+        "start": time.time_ns(),
+        "end": None,
+        "attributes": dict(attributes or {}),
+        "error": None
+    }
+    token = CURRENT_SPAN.set(span)
+    try:
+        yield span
+    except Exception as e:
+        span["error"] = str(e)
+        raise
+    finally:
+        span["end"] = time.time_ns()
+        CURRENT_SPAN.reset(token)
+        trace["spans"].append(span)
+        if parent is None:
+            export_trace(trace)
+
+def otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Convert a dict into OTLP JSON key/value attributes"""
+    converted = []
+    for key, value in attributes.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            converted.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            converted.append({"key": key, "value": {"intValue": str(value)}})
+        elif isinstance(value, float):
+            converted.append({"key": key, "value": {"doubleValue": value}})
+        else:
+            converted.append({"key": key, "value": {"stringValue": str(value)}})
+    return converted
+
+def export_trace(trace: Dict[str, Any]) -> None:
+    """Append a finished trace to the trace file as one OTLP/JSON ExportTraceServiceRequest per line"""
+    spans = []
+    for span in trace["spans"]:
+        otlp_span = {
+            "traceId": trace["trace_id"],
+            "spanId": span["span_id"],
+            "name": span["name"],
+            "kind": span["kind"],
+            "startTimeUnixNano": str(span["start"]),
+            "endTimeUnixNano": str(span["end"]),
+            "attributes": otlp_attributes(span["attributes"]),
+            "status": {"code": 2, "message": span["error"]} if span["error"] else {"code": 1}
+        }
+        if span["parent_id"]:
+            otlp_span["parentSpanId"] = span["parent_id"]
+        spans.append(otlp_span)
+    
+    request = {
+        "resourceSpans": [{
+            "resource": {"attributes": otlp_attributes({"service.name": TRACING_CONFIG['service_name']})},
+            "scopeSpans": [{"scope": {"name": "mcp_mysql_server"}, "spans": spans}]
+        }]
+    }
+    try:
+        line = json.dumps(request, default=str)
+        with TRACE_EXPORT_LOCK:
+            with open(TRACING_CONFIG['file_path'], "a", encoding="utf-8") as trace_file:
+                trace_file.write(line + "\n")
+    except Exception as e:
+        logger.warning(f"Failed to export trace {trace['trace_id']}: {e}")
+
+# Profiling
+PROFILER_LOCK = threading.Lock()
+PROFILER_SESSION: Optional[Dict[str, Any]] = None
+LAST_PROFILE_REPORT: Optional[Dict[str, Any]] = None
+# The profiler's own tools are never profiled (stop_profiler waits for the profiled call to finish)
+PROFILER_TOOLS = ("start_profiler", "stop_profiler", "get_profiler_status")
+
+def start_profiler_session(mode: str, duration_seconds: Optional[float], max_calls: Optional[int], tools: Optional[List[str]]) -> Dict[str, Any]:
+    """Create the active profiling session; raises ValueError if one is already running"""
+    global PROFILER_SESSION
+    with PROFILER_LOCK:
+        if PROFILER_SESSION is not None:
+            raise ValueError(f"Profiler session {PROFILER_SESSION['session_id']} ({PROFILER_SESSION['mode']}) is already running")
+        session = {
+            "session_id": uuid.uuid4().hex[:12],
+            "mode": mode,
+            "tools": set(tools) if tools else None,
+            "max_calls": max_calls,
+            "calls": 0,
+            "skipped_calls": 0,
+            "started_at": datetime.now().isoformat(),
+            "started": time.perf_counter(),
+            # Only one call is profiled at a time; concurrent calls run unprofiled and are counted as skipped
+            "call_lock": threading.Lock(),
+            "profiler": cProfile.Profile() if mode == "cprofile" else None,
+            "stacks": Counter(),
+            "samples": 0,
+            "active_threads": {},
+            "memory": {},
+            "stop_event": threading.Event()
+        }
+        if mode == "sampling":
+            session["sampler"] = threading.Thread(target=sample_stacks, args=(session,), name="mcp-profiler-sampler", daemon=True)
+            session["sampler"].start()
+        elif mode == "memory":
+            session["started_tracemalloc"] = not tracemalloc.is_tracing()
+            if session["started_tracemalloc"]:
+                tracemalloc.start(PROFILING_CONFIG['tracemalloc_frames'])
+        timeout = min(duration_seconds or PROFILING_CONFIG['max_duration_seconds'], PROFILING_CONFIG['max_duration_seconds'])
+        session["timer"] = threading.Timer(timeout, stop_profiler_session, args=(session["session_id"],))
+        session["timer"].daemon = True
+        session["timer"].start()
+        PROFILER_SESSION = session
+        return session
+
+def sample_stacks(session: Dict[str, Any]) -> None:
+    """Sampler thread: record the collapsed stacks of threads currently running a profiled tool"""
+    interval = PROFILING_CONFIG['sample_interval_ms'] / 1000.0
+    while not session["stop_event"].wait(interval):
+        active = dict(session["active_threads"])
+        if not active:
+            continue
+        frames = sys._current_frames()
+        for thread_id, tool_name in active.items():
+            frame = frames.get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            stack.append(tool_name)
+            session["stacks"][";".join(reversed(stack))] += 1
+            session["samples"] += 1
+
+def profiled_call(tool_name: str, func: Callable, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    """Run a tool call, profiling it if a profiling session is active and selects this tool"""
+    session = PROFILER_SESSION
+    if session is None or tool_name in PROFILER_TOOLS or (session["tools"] and tool_name not in session["tools"]):
+        return func(*args, **kwargs)
+    if not session["call_lock"].acquire(blocking=False):
+        session["skipped_calls"] += 1
+        return func(*args, **kwargs)
+    
+    try:
+        if session["mode"] == "cprofile":
+            session["profiler"].enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                session["profiler"].disable()
+        elif session["mode"] == "sampling":
+            session["active_threads"][threading.get_ident()] = tool_name
+            try:
+                return func(*args, **kwargs)
+            finally:
+                session["active_threads"].pop(threading.get_ident(), None)
+        else:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                current, peak = tracemalloc.get_traced_memory()
+                stats = session["memory"].setdefault(tool_name, {"calls": 0, "peak_bytes_max": 0, "peak_bytes_total": 0, "retained_bytes_total": 0})
+                stats["calls"] += 1
+                stats["peak_bytes_max"] = max(stats["peak_bytes_max"], peak - before)
+                stats["peak_bytes_total"] += peak - before
+                stats["retained_bytes_total"] += current - before
+    finally:
+        session["call_lock"].release()
+        session["calls"] += 1
+        if session["max_calls"] and session["calls"] >= session["max_calls"]:
+            threading.Thread(target=stop_profiler_session, args=(session["session_id"],), daemon=True).start()
+
+def stop_profiler_session(session_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Stop the active session (if it matches session_id), write its output files and return the report"""
+    global PROFILER_SESSION, LAST_PROFILE_REPORT
+    with PROFILER_LOCK:
+        session = PROFILER_SESSION
+        if session is None or (session_id and session["session_id"] != session_id):
+            return None
+        PROFILER_SESSION = None
+    
+    session["timer"].cancel()
+    session["stop_event"].set()
+    # Let an in-flight profiled call finish before reading its data
+    with session["call_lock"]:
+        pass
+    
+    top_n = PROFILING_CONFIG['top_n']
+    os.makedirs(PROFILING_CONFIG['output_dir'], exist_ok=True)
+    base_path = os.path.join(PROFILING_CONFIG['output_dir'], f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{session['session_id']}")
+    report = {
+        "session_id": session["session_id"],
+        "mode": session["mode"],
+        "started_at": session["started_at"],
+        "duration_seconds": round(time.perf_counter() - session["started"], 3),
+        "profiled_calls": session["calls"],
+        "skipped_calls": session["skipped_calls"],
+        "files": {}
+    }
+    
+    if session["mode"] == "cprofile":
+        stats = pstats.Stats(session["profiler"]) if session["profiler"].getstats() else None
+        if stats:
+            report["files"]["pstats"] = base_path + ".prof"
+            stats.dump_stats(report["files"]["pstats"])
+            entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top_n]
+            report["top_functions"] = [{
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": total_calls,
+                "total_time_ms": round(total_time * 1000, 3),
+                "cumulative_time_ms": round(cumulative * 1000, 3)
+            } for (filename, line, name), (_, total_calls, total_time, cumulative, _) in entries]
+        else:
+            report["top_functions"] = []
+    elif session["mode"] == "sampling":
+        report["samples"] = session["samples"]
+        report["sample_interval_ms"] = PROFILING_CONFIG['sample_interval_ms']
+        report["files"]["collapsed"] = base_path + ".folded"
+        with open(report["files"]["collapsed"], "w", encoding="utf-8") as collapsed_file:
+            for stack, count in session["stacks"].most_common():
+                collapsed_file.write(f"{stack} {count}\n")
+        report["top_stacks"] = [{"stack": stack, "samples": count} for stack, count in session["stacks"].most_common(top_n)]
+    else:
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        if session["started_tracemalloc"]:
+            tracemalloc.stop()
+        report["tools"] = {tool_name: {
+            "calls": stats["calls"],
+            "peak_kb_max": round(stats["peak_bytes_max"] / 1024, 1),
+            "peak_kb_avg": round(stats["peak_bytes_total"] / stats["calls"] / 1024, 1),
+            "retained_kb_total": round(stats["retained_bytes_total"] / 1024, 1)
+        } for tool_name, stats in session["memory"].items()}
+        top_sites = snapshot.statistics("lineno")[:top_n]
+        report["top_allocation_sites"] = [{
+            "site": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "size_kb": round(stat.size / 1024, 1),
+            "blocks": stat.count
+        } for stat in top_sites]
+        report["files"]["allocations"] = base_path + ".allocations.txt"
+        with open(report["files"]["allocations"], "w", encoding="utf-8") as allocations_file:
+            for stat in snapshot.statistics("traceback")[:top_n]:
+                allocations_file.write(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                allocations_file.write("\n".join(stat.traceback.format()) + "\n\n")
+    
+    LAST_PROFILE_REPORT = report
+    logger.info(f"Profiler session {session['session_id']} stopped: {report['profiled_calls']} calls profiled, files: {report['files']}")
+    return report
 
 def log_client_call(func):
-    """Decorator to log client function calls"""
+    """Decorator to log client function calls, record per-tool metrics and trace the call"""
+    @wraps(func)
     def wrapper(*args, **kwargs):
         logger.info(f"[CLIENT CALL] {func.__name__} called with args={args}, kwargs={kwargs}")
+        state = CALL_CONTEXT.get()
+        token = CALL_CONTEXT.set(new_call_state(func.__name__)) if state is None else None
+        set_call_timeout(get_tool_timeout(func.__name__))
+        with trace_span(f"tool {func.__name__}", {"mcp.tool.name": func.__name__, "db.name": CURRENT_DATABASE}, root=True) as span:
+            start = time.perf_counter()
+            error = True
+            result = None
+            begin_tool_call()
+            try:
+                result = profiled_call(func.__name__, func, args, kwargs)
+                error = isinstance(result, dict) and result.get("status") == "error"
+                logger.info(f"[CLIENT CALL] {func.__name__} completed successfully")
+                return result
+            except Exception as e:
+                logger.error(f"[CLIENT CALL] {func.__name__} failed with error: {e}")
+                raise
+            finally:
+                end_tool_call(func.__name__, time.perf_counter() - start, error, result)
+                if span is not None and isinstance(result, dict):
+                    span["attributes"]["mcp.tool.status"] = result.get("status")
+                    if error:
+                        span["error"] = result.get("error")
+                if token is not None:
+                    CALL_CONTEXT.reset(token)
+    return wrapper
+
+# Query digest statistics
+QUERY_DIGEST_STATS: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+QUERY_DIGEST_LOCK = threading.Lock()
+QUERY_DIGEST_EVICTIONS = 0
+
+SQL_COMMENT_PATTERN = re.compile(r"/\*.*?\*/|--[^\n]*|#[^\n]*", re.S)
+SQL_LITERAL_PATTERN = re.compile(
+    r"'(?:[^'\\]|\\.|'')*'"              # single-quoted strings
+    r'|"(?:[^"\\]|\\.|"")*"'             # double-quoted strings
+    r"|\b[xX]'[0-9a-fA-F]*'|\b0x[0-9a-fA-F]+\b"  # hex literals
+    r"|(?<![\w`])[-+]?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?\b"  # numbers not inside identifiers
+    r"|%s|%\(\w+\)s"                     # client-side placeholders
+)
+SQL_VALUE_LIST_PATTERN = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))*")
+
+@lru_cache(maxsize=4096)
+def digest_sql(query: str) -> Tuple[str, str]:
+    """
+    Normalize a SQL statement into a digest with literals stripped.
+    
+    Returns:
+        Tuple of (digest id, normalized digest text)
+    """
+    text = SQL_COMMENT_PATTERN.sub(" ", query)
+    text = SQL_LITERAL_PATTERN.sub("?", text)
+    # IN (?, ?, ?) and multi-row VALUES lists collapse to a single shape regardless of length
+    text = SQL_VALUE_LIST_PATTERN.sub("(...)", text)
+    text = " ".join(text.split()).rstrip(";").strip()
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32], text
+
+CACHE_STATS_PROVIDERS["sql_digest"] = lambda: (digest_sql.cache_info().hits, digest_sql.cache_info().misses)
+
+def record_query_digest(query: str, params: Any, elapsed: float, rows_returned: int = 0, rows_affected: int = 0, rows_examined: Optional[int] = None, error: bool = False) -> None:
+    """Add one statement execution to the bounded per-digest statistics table"""
+    global QUERY_DIGEST_EVICTIONS
+    
+    if not QUERY_STATS_CONFIG['enabled']:
+        return
+    
+    digest, digest_text = digest_sql(query)
+    elapsed_ms = elapsed * 1000.0
+    buckets = QUERY_STATS_CONFIG['latency_buckets_ms']
+    
+    with QUERY_DIGEST_LOCK:
+        stats = QUERY_DIGEST_STATS.get(digest)
+        if stats is None:
+            stats = {
+                "digest": digest,
+                "digest_text": digest_text,
+                "sample_query": query[:QUERY_STATS_CONFIG['sample_query_length']],
+                "sample_params": params,
+                "calls": 0,
+                "errors": 0,
+                "total_time_ms": 0.0,
+                "min_time_ms": None,
+                "max_time_ms": 0.0,
+                "latency_histogram": [0] * (len(buckets) + 1),
+                "rows_returned": 0,
+                "rows_affected": 0,
+                "rows_examined": 0,
+                "first_seen": datetime.now().isoformat(),
+                "last_seen": None
+            }
+            QUERY_DIGEST_STATS[digest] = stats
+            # Evict the least recently seen digest once the table is full
+            while len(QUERY_DIGEST_STATS) > QUERY_STATS_CONFIG['max_digests']:
+                QUERY_DIGEST_STATS.popitem(last=False)
+                QUERY_DIGEST_EVICTIONS += 1
+        else:
+            QUERY_DIGEST_STATS.move_to_end(digest)
+        
+        stats["calls"] += 1
+        stats["errors"] += 1 if error else 0
+        stats["total_time_ms"] += elapsed_ms
+        stats["min_time_ms"] = elapsed_ms if stats["min_time_ms"] is None else min(stats["min_time_ms"], elapsed_ms)
+        stats["max_time_ms"] = max(stats["max_time_ms"], elapsed_ms)
+        stats["latency_histogram"][bisect_left(buckets, elapsed_ms)] += 1
+        stats["rows_returned"] += rows_returned
+        stats["rows_affected"] += max(rows_affected or 0, 0)
+        if rows_examined:
+            stats["rows_examined"] += rows_examined
+        stats["last_seen"] = datetime.now().isoformat()
+
+# Prepared statement cache: server-side statements kept per pooled connection, keyed by SQL text
+STATEMENT_CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+# Statements that leave state behind in the session; connections that ran one are reset before reuse
+SESSION_STATE_PATTERN = re.compile(r"^\s*(?:/\*.*?\*/\s*)*(SET|CREATE\s+TEMPORARY|LOCK|PREPARE|HANDLER|XA|BEGIN|START|CALL)\b|:=|\bINTO\s+@|\bGET_LOCK\s*\(", re.I | re.S)
+
+CACHE_STATS_PROVIDERS["prepared_statements"] = lambda: (STATEMENT_CACHE_STATS["hits"], STATEMENT_CACHE_STATS["misses"])
+
+class LoggingCursor:
+    """Cursor wrapper that logs SQL statements and records per-digest execution statistics"""
+    
+    def __init__(self, cursor, raw_cursor_factory=None, connection_id=None, server=None, cursor_options=None):
+        self.cursor = cursor
+        self.raw_cursor_factory = raw_cursor_factory
+        self.connection_id = connection_id
+        self.server = server
+        self.cursor_options = cursor_options or {}
+        self.prepared = bool(self.cursor_options.get("prepared"))
+        # Prepared cursors of a tracked connection share its statement cache instead of preparing per cursor
+        self.statements = server.get("statements") if self.prepared and server is not None else None
+        self._cached = False
+        # Held results are read across tool calls, each of which re-arms the deadline watch for its own reads
+        self.held = False
+        self._statement = None
+        self._watch = None
+    
+    def _begin_statement(self, query, params):
+        self._finish_statement()
+        self._statement = {"query": query, "params": params, "elapsed": 0.0, "rows": 0, "error": False}
+    
+    def _prepare_deadline(self, query):
+        """Check the call's deadline and cancellation, register the statement and bound SELECTs with MAX_EXECUTION_TIME"""
+        state = CALL_CONTEXT.get()
+        if state is None:
+            return query
+        if state["cancelled"]:
+            raise QueryCancelledError(f"{state['tool']} was cancelled")
+        kill_at = None
+        if state["deadline"] is not None:
+            remaining = state["deadline"] - time.monotonic()
+            if remaining <= 0:
+                record_statement_interrupted(timed_out=True)
+                raise QueryTimeoutError(f"Deadline of {state['timeout']}s for {state['tool']} exceeded before the statement started")
+            # Prepared statements are reused by identity of their SQL text, so they are bounded by KILL QUERY alone
+            hinted = None if self.prepared or self.held else add_max_execution_time_hint(query, max(1, int(remaining * 1000)))
+            if hinted:
+                query = hinted
+            kill_at = state["deadline"] + (QUERY_TIMEOUT_CONFIG['kill_grace_seconds'] if hinted else 0)
+        self._watch = (state, start_statement_watch(state, self.connection_id, kill_at, self.server))
+        return query
+    
+    def _interrupted_error(self, error: Exception) -> Optional[Exception]:
+        """Translate a statement error caused by our deadline or cancellation"""
+        watch = self._watch[1] if self._watch else None
+        errno = getattr(error, "errno", None)
+        if (watch and watch["timed_out"]) or errno == errorcode.ER_QUERY_TIMEOUT:
+            record_statement_interrupted(timed_out=True)
+            timeout = watch["timeout"] if watch else None
+            return QueryTimeoutError(f"Query exceeded the deadline of {timeout}s and was stopped on the server: {error}")
+        if watch and watch["cancelled"]:
+            record_statement_interrupted(timed_out=False)
+            return QueryCancelledError(f"Query was cancelled by the client and killed on the server: {error}")
+        return None
+    
+    def _finish_statement(self, consumed: bool = False):
+        if self._watch is not None:
+            stop_statement_watch(*self._watch)
+            self._watch = None
+        statement, self._statement = self._statement, None
+        if statement is None:
+            return
+        record_statement_metrics(statement["elapsed"], statement["rows"], statement["error"])
+        if not QUERY_STATS_CONFIG['enabled']:
+            return
+        rows_affected = 0 if statement["rows"] else self.cursor.rowcount
+        rows_examined = self._read_rows_examined() if consumed and not statement["error"] else None
+        record_query_digest(statement["query"], statement["params"], statement["elapsed"],
+                            rows_returned=statement["rows"], rows_affected=rows_affected,
+                            rows_examined=rows_examined, error=statement["error"])
+    
+    def _read_rows_examined(self) -> Optional[int]:
+        """Read rows examined for the last statement on this connection from performance_schema (opt-in)"""
+        if not QUERY_STATS_CONFIG['collect_rows_examined'] or not self.raw_cursor_factory:
+            return None
         try:
-            result = func(*args, **kwargs)
-            logger.info(f"[CLIENT CALL] {func.__name__} completed successfully")
-            return result
+            cursor = self.raw_cursor_factory()
+            cursor.execute("""
+                SELECT rows_examined FROM performance_schema.events_statements_history
+                WHERE thread_id = PS_CURRENT_THREAD_ID()
+                ORDER BY event_id DESC LIMIT 1
+            """)
+            row = cursor.fetchone()
+            cursor.close()
+            return row[0] if row else None
+        except Error as e:
+            logger.debug(f"Could not read rows examined: {e}")
+            return None
+    
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
         except Exception as e:
-            logger.error(f"[CLIENT CALL] {func.__name__} failed with error: {e}")
+            if self._statement is not None:
+                self._statement["error"] = True
+            interrupted = self._interrupted_error(e)
+            if interrupted is not None:
+                raise interrupted from e
             raise
-    return wrapper
+        finally:
+            if self._statement is not None:
+                self._statement["elapsed"] += time.perf_counter() - start
+    
+    def _use_cached_statement(self, query):
+        """
+        Switch to the connection's prepared cursor for this SQL text, preparing it on first use.
+        
+        The connector only re-executes a prepared statement when it is given the very string object
+        it was prepared from, so the cached text is returned for execution.
+        """
+        key = (query, bool(self.cursor_options.get("dictionary")))
+        entry = self.statements.get(key)
+        if entry is None:
+            STATEMENT_CACHE_STATS["misses"] += 1
+            entry = self.statements[key] = (query, self.raw_cursor_factory(**self.cursor_options))
+            while len(self.statements) > PREPARED_STATEMENT_CONFIG['cache_size']:
+                STATEMENT_CACHE_STATS["evictions"] += 1
+                self.statements.popitem(last=False)[1][1].close()  # Deallocates the server-side statement
+        else:
+            STATEMENT_CACHE_STATS["hits"] += 1
+            self.statements.move_to_end(key)
+        if not self._cached:
+            self.cursor.close()
+            self._cached = True
+        self.cursor = entry[1]
+        return entry[0]
+    
+    def execute(self, query, params=None):
+        if params:
+            logger.info(f"[SQL] {query} with params: {params}")
+        else:
+            logger.info(f"[SQL] {query}")
+        if self.statements is not None:
+            query = self._use_cached_statement(query)
+        self._begin_statement(query, params)
+        with trace_span("db.execute", kind=3) as span:
+            if span is not None:
+                digest, digest_text = digest_sql(query)
+                span["attributes"].update({"db.system": "mysql", "db.name": CURRENT_DATABASE, "db.statement": digest_text, "db.statement.digest": digest})
+            try:
+                result = self._timed(self.cursor.execute, self._prepare_deadline(query), params)
+            except Exception:
+                self._finish_statement()
+                raise
+            if span is not None:
+                span["attributes"]["db.rows_affected"] = self.cursor.rowcount
+        if self.server is not None:
+            if REPLICA_STATE and WRITE_STATEMENT_PATTERN.match(query):
+                note_session_write(self.server["datasource"])
+            if not self.server["dirty"] and SESSION_STATE_PATTERN.search(query):
+                self.server["dirty"] = True
+            use = USE_STATEMENT_PATTERN.match(query)
+            if use:
+                # Pooled connections are matched to checkouts by their selected database
+                self.server["database"] = use.group(1)
+        if not getattr(self.cursor, "with_rows", False):
+            self._finish_statement(consumed=True)
+        return result
+    
+    def fetchall(self):
+        with trace_span("db.fetch", kind=3) as span:
+            rows = self._timed(self.cursor.fetchall)
+            if span is not None:
+                span["attributes"]["db.rows_fetched"] = len(rows)
+        if self._statement is not None:
+            self._statement["rows"] += len(rows)
+            self._finish_statement(consumed=True)
+        return rows
+    
+    def fetchmany(self, size=1):
+        with trace_span("db.fetch", kind=3) as span:
+            rows = self._timed(self.cursor.fetchmany, size)
+            if span is not None:
+                span["attributes"]["db.rows_fetched"] = len(rows)
+        if self._statement is not None:
+            self._statement["rows"] += len(rows)
+            if len(rows) < size:
+                self._finish_statement(consumed=True)
+        return rows
+    
+    def fetchone(self):
+        row = self._timed(self.cursor.fetchone)
+        if self._statement is not None:
+            if row is None:
+                self._finish_statement(consumed=True)
+            else:
+                self._statement["rows"] += 1
+        return row
+    
+    def close(self):
+        self._finish_statement()
+        if self._cached:
+            # The prepared statement stays allocated for the next execution of the same SQL
+            return None
+        return self.cursor.close()
+    
+    def abandon(self):
+        """Stop reading the current result set; its unread rows are discarded when the connection closes"""
+        self._finish_statement()
+    
+    def watch_call(self):
+        """Bound the reads of a held result by the deadline and cancellation of the tool call now reading it"""
+        state = CALL_CONTEXT.get()
+        if self._statement is None or state is None:
+            return
+        if state["cancelled"]:
+            raise QueryCancelledError(f"{state['tool']} was cancelled")
+        self.unwatch()
+        self._watch = (state, start_statement_watch(state, self.connection_id, state["deadline"], self.server))
+    
+    def unwatch(self):
+        """Stop watching the statement between the tool calls reading a held result"""
+        if self._watch is not None:
+            stop_statement_watch(*self._watch)
+            self._watch = None
+    
+    def drain(self):
+        """Read and discard the rest of the current result set so the connection can run further statements"""
+        self._finish_statement()
+        while self.cursor.fetchmany(MEMORY_BUDGET_CONFIG['fetch_batch_size']):
+            pass
+    
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+    
+    @property
+    def lastrowid(self):
+        return self.cursor.lastrowid
+    
+    @property
+    def warning_count(self):
+        return getattr(self.cursor, "warning_count", 0)
+    
+    @property
+    def description(self):
+        return self.cursor.description
+    
+    @property
+    def column_names(self):
+        return self.cursor.column_names
+
+def install_logging_cursor(connection, server: Optional[Dict[str, Any]] = None) -> None:
+    """Monkey patch a connection so that every cursor it creates is a LoggingCursor"""
+    original_cursor = connection.cursor
+    
+    def logging_cursor(*args, **kwargs):
+        cursor = original_cursor(*args, **kwargs)
+        return LoggingCursor(cursor, original_cursor, getattr(connection, "connection_id", None), server, kwargs)
+    
+    connection.cursor = logging_cursor
+
+# Datasources and connection pools
+CURRENT_DATASOURCE: str = DEFAULT_DATASOURCE
+POOLS: Dict[Tuple[str, str, int], "ConnectionPool"] = {}  # (datasource, host, port) -> pool
+POOLS_LOCK = threading.Lock()
+DATASOURCE_HEALTH: Dict[str, Dict[str, Any]] = {}  # Datasource -> result of its last health check
+USE_STATEMENT_PATTERN = re.compile(r"^\s*USE\s+`?([^`\s;]+)`?", re.I)
+
+def get_datasource_config(datasource: Optional[str] = None) -> Dict[str, Any]:
+    """Connection settings of a datasource: DB_CONFIG overridden by the datasource's own keys"""
+    datasource = datasource or CURRENT_DATASOURCE
+    if datasource not in DATASOURCES:
+        raise Error(f"Unknown datasource '{datasource}' (configured: {', '.join(DATASOURCES)})")
+    connection_config = {key: value for key, value in DB_CONFIG.items() if key != 'database'}
+    connection_config.update({key: value for key, value in DATASOURCES[datasource].items() if key not in ('database', 'replicas')})
+    return connection_config
+
+def new_connection_state(datasource: str, connection_config: Dict[str, Any], database: Optional[str]) -> Dict[str, Any]:
+    """
+    Per-connection state shared with the connection's cursors: they kill statements through it, track
+    USE statements and session state changes in it and keep its prepared statement cache
+    """
+    return {"datasource": datasource, "host": connection_config['host'], "port": connection_config['port'],
+            "database": database, "dirty": False, "statements": OrderedDict()}
+
+def is_reusable_after(error: BaseException) -> bool:
+    """Whether a connection is still usable after a tool failed with this error"""
+    if isinstance(error, (QueryTimeoutError, QueryCancelledError)):
+        # The statement was killed with KILL QUERY; the session survives
+        return True
+    errno = getattr(error, "errno", None)
+    # Server errors (1000-1999, 3000+) leave the session intact; client errors (2000-2999) mean it is lost
+    return isinstance(error, Error) and errno is not None and not 2000 <= errno < 3000
+
+class ConnectionPool:
+    """Bounded pool of connections to one server of a datasource"""
+    
+    def __init__(self, datasource: str, connection_config: Dict[str, Any]):
+        self.datasource = datasource
+        self.connection_config = connection_config
+        self.name = f"{connection_config['host']}:{connection_config['port']}"
+        self.condition = threading.Condition()
+        self.idle: List[Dict[str, Any]] = []  # {"connection", "server", "returned_at"}, most recently returned last
+        self.open = 0
+        self.in_use = 0
+        self.stats = {"checkouts": 0, "created": 0, "discarded": 0, "timeouts": 0, "connect_errors": 0,
+                      "connect_seconds": 0.0, "wait_seconds": 0.0, "last_error": None, "last_error_at": None}
+    
+    def connect(self, database: Optional[str]) -> Tuple[Any, Dict[str, Any]]:
+        """Open a new connection and install the logging cursor on it"""
+        start = time.perf_counter()
+        try:
+            connection = mysql.connector.connect(**dict(self.connection_config, database=database) if database else self.connection_config)
+        except Exception as e:
+            with self.condition:
+                self.stats["connect_errors"] += 1
+                self.stats["last_error"] = str(e)
+                self.stats["last_error_at"] = datetime.now().isoformat()
+            raise
+        with self.condition:
+            self.stats["created"] += 1
+            self.stats["connect_seconds"] += time.perf_counter() - start
+        server = new_connection_state(self.datasource, self.connection_config, database)
+        install_logging_cursor(connection, server)
+        return connection, server
+    
+    def acquire(self, database: Optional[str]) -> Tuple[Any, Dict[str, Any]]:
+        """Check out a connection with `database` selected, waiting up to acquire_timeout for a free slot"""
+        wait_start = time.monotonic()
+        entry = None
+        with self.condition:
+            while True:
+                self.close_expired_idle()
+                index = self.find_idle(database)
+                if index is not None:
+                    entry = self.idle.pop(index)
+                    break
+                if self.idle and self.open >= POOL_CONFIG['max_size']:
+                    # Only connections with a database selected are idle and none can be deselected: replace one
+                    self.close_connection(self.idle.pop(0)["connection"])
+                    self.open -= 1
+                if self.open < POOL_CONFIG['max_size']:
+                    self.open += 1
+                    break
+                remaining = wait_start + POOL_CONFIG['acquire_timeout'] - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    raise Error(f"Timed out after {POOL_CONFIG['acquire_timeout']}s waiting for a connection to "
+                                f"datasource '{self.datasource}' ({self.name}, {POOL_CONFIG['max_size']} in use)")
+                self.condition.wait(remaining)
+            self.in_use += 1
+            self.stats["checkouts"] += 1
+            self.stats["wait_seconds"] += time.monotonic() - wait_start
+        
+        try:
+            if entry is not None and time.monotonic() - entry["returned_at"] > POOL_CONFIG['validate_after_idle'] and not entry["connection"].is_connected():
+                self.close_connection(entry["connection"])
+                entry = None
+            if entry is None:
+                return self.connect(database)
+            connection, server = entry["connection"], entry["server"]
+            if database and server["database"] != database:
+                connection.cmd_init_db(database)
+                server["database"] = database
+            return connection, server
+        except Exception:
+            if entry is not None:
+                self.close_connection(entry["connection"])
+            with self.condition:
+                self.open -= 1
+                self.in_use -= 1
+                self.condition.notify()
+            raise
+    
+    def find_idle(self, database: Optional[str]) -> Optional[int]:
+        """Index of the idle connection to reuse: the most recent one on `database`, else any one if it can switch"""
+        for index in range(len(self.idle) - 1, -1, -1):
+            if self.idle[index]["server"]["database"] == database:
+                return index
+        # A selected database can be changed with COM_INIT_DB but not cleared
+        return len(self.idle) - 1 if self.idle and database else None
+    
+    def release(self, connection, server: Dict[str, Any], reusable: bool) -> None:
+        """Return a connection: reset its session and keep it idle, or close it if it cannot be reused"""
+        try:
+            if reusable and getattr(connection, "unread_result", False):
+                # Results abandoned by a memory budget cannot be skipped cheaply
+                reusable = False
+            elif reusable and POOL_CONFIG['reset_on_release'] and server["dirty"]:
+                # The reset also deallocates the session's prepared statements
+                server["statements"].clear()
+                server["dirty"] = False
+                reusable = connection.cmd_reset_connection()
+            elif reusable and getattr(connection, "in_transaction", False):
+                connection.rollback()
+        except Exception as e:
+            logger.debug(f"Discarding pooled connection to {self.name}: {e}")
+            reusable = False
+        if not reusable:
+            self.close_connection(connection)
+        with self.condition:
+            self.in_use -= 1
+            if reusable:
+                self.idle.append({"connection": connection, "server": server, "returned_at": time.monotonic()})
+            else:
+                self.open -= 1
+                self.stats["discarded"] += 1
+            self.condition.notify()
+    
+    def close_expired_idle(self) -> None:
+        """Close idle connections unused for longer than idle_timeout (caller holds the condition)"""
+        now = time.monotonic()
+        while self.idle and now - self.idle[0]["returned_at"] > POOL_CONFIG['idle_timeout']:
+            self.close_connection(self.idle.pop(0)["connection"])
+            self.open -= 1
+    
+    @staticmethod
+    def close_connection(connection) -> None:
+        try:
+            connection.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled connection: {e}")
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current size and counters of the pool"""
+        with self.condition:
+            return dict(self.stats, server=self.name, open=self.open, in_use=self.in_use, idle=len(self.idle),
+                        connect_seconds=round(self.stats["connect_seconds"], 6), wait_seconds=round(self.stats["wait_seconds"], 6))
+
+def get_pool(datasource: str, connection_config: Dict[str, Any]) -> ConnectionPool:
+    """The pool for a datasource server, created on first use"""
+    key = (datasource, connection_config['host'], connection_config['port'])
+    pool = POOLS.get(key)
+    if pool is None:
+        with POOLS_LOCK:
+            pool = POOLS.get(key)
+            if pool is None:
+                pool = POOLS[key] = ConnectionPool(datasource, connection_config)
+    return pool
+
+def get_datasource_stats() -> Dict[str, Dict[str, Any]]:
+    """Pool, replica and health statistics per datasource"""
+    stats = {}
+    for datasource in DATASOURCES:
+        connection_config = get_datasource_config(datasource)
+        pools = [pool.snapshot() for key, pool in list(POOLS.items()) if key[0] == datasource]
+        stats[datasource] = {
+            "server": f"{connection_config['host']}:{connection_config['port']}",
+            "default_database": DATASOURCES[datasource].get('database'),
+            "current": datasource == CURRENT_DATASOURCE,
+            "pools": pools,
+            "replicas": [replica["name"] for replica in REPLICA_STATE if replica["datasource"] == datasource],
+            "health": DATASOURCE_HEALTH.get(datasource)
+        }
+    return stats
+
+# Read replica routing
+REPLICA_LOCK = threading.Lock()
+REPLICA_STATE: List[Dict[str, Any]] = [
+    {"name": f"{replica['host']}:{replica['port']}", "datasource": datasource, "host": replica['host'], "port": replica['port'],
+     "in_use": 0, "routed": 0, "healthy": True, "lag_seconds": None, "last_checked": None, "last_error": None}
+    for datasource, settings in DATASOURCES.items() for replica in settings.get('replicas', [])
+]
+REPLICA_ROUND_ROBIN = itertools.count()
+REPLICA_MONITOR_THREAD: Optional[threading.Thread] = None
+SESSION_LOCK = threading.Lock()
+SESSION_KEYS: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()  # MCP session -> key, forgotten with the session
+SESSION_LAST_WRITE: Dict[Tuple[str, str], float] = {}  # (session key, datasource) -> monotonic time of its last write
+READ_ONLY_STATEMENT_PATTERN = re.compile(r"^\s*(?:/\*.*?\*/\s*)*\(?\s*(SELECT|SHOW|DESCRIBE|DESC|EXPLAIN|WITH|TABLE)\b", re.I | re.S)
+LOCKING_READ_PATTERN = re.compile(r"\bFOR\s+(UPDATE|SHARE)\b|\bLOCK\s+IN\s+SHARE\s+MODE\b|\bINTO\s+(OUTFILE|DUMPFILE)\b|\b(INSERT|UPDATE|DELETE|REPLACE)\b", re.I)
+WRITE_STATEMENT_PATTERN = re.compile(r"^\s*(?:/\*.*?\*/\s*)*(INSERT|UPDATE|DELETE|REPLACE|CREATE|ALTER|DROP|RENAME|TRUNCATE|LOAD|CALL)\b", re.I | re.S)
+
+def is_read_only_statement(query: str) -> bool:
+    """Whether a statement can be served by a replica (plain reads, no locking reads or writes)"""
+    return bool(READ_ONLY_STATEMENT_PATTERN.match(query)) and not LOCKING_READ_PATTERN.search(SQL_LITERAL_PATTERN.sub("?", query))
+
+def get_session_key() -> str:
+    """
+    Identify the MCP session of the current request (a single key for stdio and direct calls).
+    
+    Keys are random rather than id(session), which a later session can reuse once the old one is freed.
+    """
+    try:
+        session = mcp.get_context().session
+    except Exception:
+        return "local"
+    with SESSION_LOCK:
+        key = SESSION_KEYS.get(session)
+        if key is None:
+            key = SESSION_KEYS[session] = uuid.uuid4().hex
+        return key
+
+def note_session_write(datasource: str) -> None:
+    """Record that the current session wrote to a datasource, so its reads stay on the primary for a while"""
+    now = time.monotonic()
+    key = get_session_key()
+    with SESSION_LOCK:
+        # Entries past the read-your-writes window no longer affect routing
+        expired = now - REPLICA_CONFIG['read_your_writes_seconds']
+        for stale in [entry for entry, written in SESSION_LAST_WRITE.items() if written <= expired]:
+            del SESSION_LAST_WRITE[stale]
+        SESSION_LAST_WRITE[(key, datasource)] = now
+
+def check_replica_lag(replica: Dict[str, Any]) -> None:
+    """Refresh one replica's health and replication lag"""
+    try:
+        credentials = get_datasource_config(replica["datasource"])
+        connection = mysql.connector.connect(host=replica["host"], port=replica["port"], user=credentials['user'],
+                                             password=credentials['password'], connect_timeout=credentials['connect_timeout'])
+        try:
+            cursor = connection.cursor(dictionary=True)
+            try:
+                cursor.execute("SHOW REPLICA STATUS")
+            except Error:
+                # MySQL before 8.0.22
+                cursor.execute("SHOW SLAVE STATUS")
+            status = cursor.fetchone()
+            cursor.fetchall()
+            cursor.close()
+        finally:
+            connection.close()
+        lag = None
+        if status:
+            lag = status.get("Seconds_Behind_Source", status.get("Seconds_Behind_Master"))
+        replica["lag_seconds"] = float(lag) if lag is not None else None
+        # No replication status or a stopped SQL thread (NULL lag) means the data may be arbitrarily stale
+        replica["healthy"] = lag is not None
+        replica["last_error"] = None if lag is not None else "replication not running"
+    except Exception as e:
+        replica["healthy"] = False
+        replica["last_error"] = str(e)
+    replica["last_checked"] = datetime.now().isoformat()
+    if not replica["healthy"]:
+        logger.warning(f"Replica {replica['name']} of datasource '{replica['datasource']}' unavailable for reads: {replica['last_error']}")
+
+def run_replica_monitor() -> None:
+    """Monitor thread: periodically check the lag of every replica"""
+    while True:
+        for replica in REPLICA_STATE:
+            check_replica_lag(replica)
+        time.sleep(REPLICA_CONFIG['lag_check_interval'])
+
+def choose_read_replica(datasource: str) -> Optional[Dict[str, Any]]:
+    """
+    Pick a replica of a datasource for the current tool call, or None to use its primary.
+    
+    Replicas are used for read-only calls only, never within the read-your-writes window of a
+    session that wrote, and only while healthy and within the lag threshold.
+    """
+    state = CALL_CONTEXT.get()
+    replicas = [replica for replica in REPLICA_STATE if replica["datasource"] == datasource]
+    if not replicas or state is None or not state.get("read_only"):
+        return None
+    last_write = SESSION_LAST_WRITE.get((get_session_key(), datasource))
+    if last_write is not None and time.monotonic() - last_write < REPLICA_CONFIG['read_your_writes_seconds']:
+        return None
+    
+    global REPLICA_MONITOR_THREAD
+    if REPLICA_MONITOR_THREAD is None:
+        with REPLICA_LOCK:
+            if REPLICA_MONITOR_THREAD is None:
+                for replica in REPLICA_STATE:
+                    check_replica_lag(replica)
+                REPLICA_MONITOR_THREAD = threading.Thread(target=run_replica_monitor, name="mcp-replica-monitor", daemon=True)
+                REPLICA_MONITOR_THREAD.start()
+    
+    candidates = [replica for replica in replicas
+                  if replica["healthy"] and replica["lag_seconds"] is not None and replica["lag_seconds"] <= REPLICA_CONFIG['max_lag_seconds']]
+    if not candidates:
+        if not REPLICA_CONFIG['fallback_to_primary']:
+            raise Error(f"No read replica of datasource '{datasource}' within the lag threshold is available")
+        return None
+    with REPLICA_LOCK:
+        if REPLICA_CONFIG['balancing'] == "least_connections":
+            replica = min(candidates, key=lambda candidate: candidate["in_use"])
+        else:
+            replica = candidates[next(REPLICA_ROUND_ROBIN) % len(candidates)]
+        replica["in_use"] += 1
+        replica["routed"] += 1
+    return replica
+
+def release_read_replica(replica: Optional[Dict[str, Any]]) -> None:
+    """Return a replica chosen by choose_read_replica"""
+    if replica is not None:
+        with REPLICA_LOCK:
+            replica["in_use"] -= 1
 
 @contextmanager
-def get_mysql_connection():
-    """Context manager for MySQL connections with automatic cleanup and SQL logging"""
+def open_connection(datasource: str, database: Optional[str], config_overrides: Dict[str, Any]):
+    """
+    Check out a connection to a datasource (its primary or a read replica) with SQL logging installed
+    
+    Connections come from the datasource server's pool unless config_overrides are given, in which
+    case a dedicated connection is opened and closed after use.
+    """
     connection = None
+    server = None
+    pool = None
+    reusable = False
+    connection_config = get_datasource_config(datasource)
+    replica = choose_read_replica(datasource) if "host" not in config_overrides else None
     try:
-        # Create connection config based on current database
-        connection_config = {
-            'host': DB_CONFIG['host'],
-            'port': DB_CONFIG['port'],
-            'user': DB_CONFIG['user'],
-            'password': DB_CONFIG['password'],
-            'autocommit': DB_CONFIG['autocommit'],
-            'charset': DB_CONFIG['charset'],
-            'collation': DB_CONFIG['collation'],
-            'connect_timeout': DB_CONFIG['connect_timeout'],
-            'read_timeout': DB_CONFIG['read_timeout'],
-            'write_timeout': DB_CONFIG['write_timeout']
-        }
+        if replica is not None:
+            connection_config.update(host=replica["host"], port=replica["port"])
+        connection_config.update(config_overrides)
+        if POOL_CONFIG['enabled'] and not config_overrides:
+            pool = get_pool(datasource, connection_config)
         
-        # Only add database if one is currently selected
-        if CURRENT_DATABASE:
-            connection_config['database'] = CURRENT_DATABASE
+        acquire_start = time.perf_counter()
+        with trace_span("db.connect", {"db.name": database, "server.address": connection_config['host'], "mcp.datasource": datasource}, kind=3):
+            if pool is not None:
+                connection, server = pool.acquire(database)
+            else:
+                connection = mysql.connector.connect(**dict(connection_config, database=database) if database else connection_config)
+                server = new_connection_state(datasource, connection_config, database)
+                # Wrap the connection's cursors to log SQL statements and collect digest statistics
+                install_logging_cursor(connection, server)
+        record_connection_acquired(time.perf_counter() - acquire_start)
+        logger.debug(f"MySQL connection acquired from datasource '{datasource}'{' for database ' + database if database else ' (no database)'}"
+                     f"{' on replica ' + replica['name'] if replica else ''}")
         
-        connection = mysql.connector.connect(**connection_config)
-        if connection.is_connected():
-            logger.debug(f"MySQL connection established{' to database ' + CURRENT_DATABASE if CURRENT_DATABASE else ' (no database)'}")
-            
-            # Create a custom cursor class that logs SQL statements
-            class LoggingCursor:
-                def __init__(self, cursor):
-                    self.cursor = cursor
-                
-                def execute(self, query, params=None):
-                    if params:
-                        logger.info(f"[SQL] {query} with params: {params}")
-                    else:
-                        logger.info(f"[SQL] {query}")
-                    return self.cursor.execute(query, params)
-                
-                def fetchall(self):
-                    return self.cursor.fetchall()
-                
-                def fetchone(self):
-                    return self.cursor.fetchone()
-                
-                def close(self):
-                    return self.cursor.close()
-                
-                @property
-                def rowcount(self):
-                    return self.cursor.rowcount
-                
-                @property
-                def lastrowid(self):
-                    return self.cursor.lastrowid
-            
-            # Monkey patch the connection's cursor method
-            original_cursor = connection.cursor
-            
-            def logging_cursor(*args, **kwargs):
-                cursor = original_cursor(*args, **kwargs)
-                return LoggingCursor(cursor)
-            
-            connection.cursor = logging_cursor
-            
-            yield connection
-        else:
-            raise Error("Failed to establish MySQL connection")
-    except Error as e:
-        logger.error(f"MySQL connection error: {e}")
+        yield connection
+        reusable = True
+    except BaseException as e:
+        reusable = is_reusable_after(e)
+        if isinstance(e, Error):
+            logger.error(f"MySQL connection error: {e}")
         raise
     finally:
-        if connection and connection.is_connected():
-            connection.close()
-            logger.debug("MySQL connection closed")
+        release_read_replica(replica)
+        if connection:
+            record_connection_released()
+            if pool is not None:
+                pool.release(connection, server, reusable)
+            elif connection.is_connected():
+                connection.close()
+                logger.debug("MySQL connection closed")
+
+@contextmanager
+def get_mysql_connection(database: Optional[str] = None, datasource: Optional[str] = None, **config_overrides):
+    """
+    Context manager for MySQL connections with automatic cleanup and SQL logging
+    
+    Args:
+        database: Database to connect to (default: the currently selected database)
+        datasource: Datasource to connect to (default: the currently selected datasource)
+        config_overrides: Connection settings that replace the datasource's values (e.g. read_timeout);
+            such connections bypass the pool
+    """
+    with open_connection(datasource or CURRENT_DATASOURCE, database or CURRENT_DATABASE, config_overrides) as connection:
+        yield connection
 
 @contextmanager
-def get_mysql_connection_no_db():
+def get_mysql_connection_no_db(datasource: Optional[str] = None):
     """Context manager for MySQL connections without database specification and SQL logging"""
-    connection = None
-    try:
-        connection = mysql.connector.connect(
-            host=DB_CONFIG['host'],
-            port=DB_CONFIG['port'],
-            user=DB_CONFIG['user'],
-            password=DB_CONFIG['password']
-        )
-        if connection.is_connected():
-            logger.debug("MySQL connection established (no database)")
-            
-            # Create a custom cursor class that logs SQL statements
-            class LoggingCursor:
-                def __init__(self, cursor):
-                    self.cursor = cursor
-                
-                def execute(self, query, params=None):
-                    if params:
-                        logger.info(f"[SQL] {query} with params: {params}")
-                    else:
-                        logger.info(f"[SQL] {query}")
-                    return self.cursor.execute(query, params)
-                
-                def fetchall(self):
-                    return self.cursor.fetchall()
-                
-                def fetchone(self):
-                    return self.cursor.fetchone()
-                
-                def close(self):
-                    return self.cursor.close()
-                
-                @property
-                def rowcount(self):
-                    return self.cursor.rowcount
-                
-                @property
-                def lastrowid(self):
-                    return self.cursor.lastrowid
-            
-            # Monkey patch the connection's cursor method
-            original_cursor = connection.cursor
-            
-            def logging_cursor(*args, **kwargs):
-                cursor = original_cursor(*args, **kwargs)
-                return LoggingCursor(cursor)
-            
-            connection.cursor = logging_cursor
-            
-            yield connection
-        else:
-            raise Error("Failed to establish MySQL connection")
-    except Error as e:
-        logger.error(f"MySQL connection error: {e}")
-        raise
-    finally:
-        if connection and connection.is_connected():
-            connection.close()
-            logger.debug("MySQL connection closed (no database)")
+    with open_connection(datasource or CURRENT_DATASOURCE, None, {}) as connection:
+        yield connection
 
 def validate_table_name(table_name: str) -> bool:
     """Validate table name to prevent SQL injection"""
@@ -247,12 +1527,16 @@ def validate_sql_query(query: str) -> bool:
 
 def format_result(data: Any, message: str = "Success") -> Dict[str, Any]:
     """Standardize result format"""
-    return {
-        "status": "success",
-        "message": message,
-        "data": data,
-        "timestamp": datetime.now().isoformat()
-    }
+    with trace_span("format_result") as span:
+        result = {
+            "status": "success",
+            "message": message,
+            "data": data,
+            "timestamp": datetime.now().isoformat()
+        }
+        if span is not None and isinstance(data, dict) and isinstance(data.get("count"), int):
+            span["attributes"]["mcp.result.rows"] = data["count"]
+        return result
 
 def format_error(error: str, message: str = "Error occurred") -> Dict[str, Any]:
     """Standardize error format"""
@@ -263,10 +1547,71 @@ def format_error(error: str, message: str = "Error occurred") -> Dict[str, Any]:
         "timestamp": datetime.now().isoformat()
     }
 
-# Tool: Test database connection
-@log_client_call
-@mcp.tool()
-def test_connection() -> Dict[str, Any]:
+def estimate_row_size(row: Any) -> int:
+    """Estimate the in-memory size of a fetched row (tuple or dict) in bytes"""
+    values = row.values() if isinstance(row, dict) else row
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in values)
+
+def get_memory_budget(tool_name: str) -> Optional[int]:
+    """Memory budget in bytes for the rows fetched by one call of a tool (None when disabled)"""
+    if not MEMORY_BUDGET_CONFIG['enabled']:
+        return None
+    return MEMORY_BUDGET_CONFIG['tool_bytes'].get(tool_name, MEMORY_BUDGET_CONFIG['default_bytes'])
+
+def fetch_rows_within_budget(cursor, tool_name: str, skip_rows: int = 0, shares: int = 1) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    Fetch a result set in batches, stopping once the tool's memory budget is reached.
+    
+    Row sizes are estimated as rows arrive. At least one row is always returned so a continuation
+    makes progress. The cursor is closed when the result is exhausted; when the budget is hit the
+    unread rows are abandoned and discarded with the connection.
+    
+    Args:
+        cursor: Cursor with an executed statement
+        tool_name: Tool whose budget applies
+        skip_rows: Rows to read and discard before collecting (continuation of a truncated result)
+        shares: Number of result sets splitting the call's budget equally (e.g. shards of one query)
+        
+    Returns:
+        Tuple of (rows, budget info with truncated, estimated_bytes and budget_bytes)
+    """
+    budget = get_memory_budget(tool_name)
+    if budget is not None:
+        budget //= max(1, shares)
+    batch_size = MEMORY_BUDGET_CONFIG['fetch_batch_size']
+    rows = []
+    estimated_bytes = 0
+    truncated = False
+    
+    while skip_rows > 0:
+        skipped = cursor.fetchmany(min(batch_size, skip_rows))
+        if not skipped:
+            break
+        skip_rows -= len(skipped)
+    
+    while not truncated:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        for row in batch:
+            size = estimate_row_size(row)
+            if budget is not None and rows and estimated_bytes + size > budget:
+                truncated = True
+                break
+            rows.append(row)
+            estimated_bytes += size
+    
+    if truncated:
+        cursor.abandon()
+        logger.warning(f"Memory budget of {budget} bytes reached in {tool_name} after {len(rows)} rows, result truncated")
+    else:
+        cursor.close()
+    return rows, {"truncated": truncated, "estimated_bytes": estimated_bytes, "budget_bytes": budget}
+
+# Tool: Test database connection
+@mcp.tool()
+@log_client_call
+def test_connection() -> Dict[str, Any]:
     """
     Tests the database connection and returns server information.
     
@@ -291,8 +1636,8 @@ def test_connection() -> Dict[str, Any]:
         return format_error(e, "Database connection failed")
 
 # Tool: List all tables
-@log_client_call
 @mcp.tool()
+@log_client_call
 def list_tables() -> Dict[str, Any]:
     """
     Lists all tables in the database.
@@ -316,8 +1661,8 @@ def list_tables() -> Dict[str, Any]:
         return format_error(e, "Failed to list tables")
 
 # Tool: Get table schema
-@log_client_call
 @mcp.tool()
+@log_client_call
 def get_table_schema(table_name: str) -> Dict[str, Any]:
     """
     Fetches the schema of the specified table.
@@ -358,8 +1703,8 @@ def get_table_schema(table_name: str) -> Dict[str, Any]:
         return format_error(e, f"Failed to get schema for table '{table_name}'")
 
 # Tool: Read data from table
-@log_client_call
 @mcp.tool()
+@log_client_call
 def read_table(table_name: str, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
     """
     Reads data from the specified table and returns it.
@@ -396,22 +1741,28 @@ def read_table(table_name: str, limit: int = 100, offset: int = 0) -> Dict[str,
             query = f"SELECT * FROM {table_name} LIMIT {limit} OFFSET {offset}"
             
             cursor.execute(query)
-            rows = cursor.fetchall()
-            cursor.close()
+            rows, budget = fetch_rows_within_budget(cursor, "read_table")
             
-            return format_result({
+            result = {
                 "data": rows,
                 "count": len(rows),
                 "table": table_name,
-                "database": CURRENT_DATABASE
-            }, f"Retrieved {len(rows)} rows from table '{table_name}' in database '{CURRENT_DATABASE}'")
+                "database": CURRENT_DATABASE,
+                "truncated": budget["truncated"]
+            }
+            message = f"Retrieved {len(rows)} rows from table '{table_name}' in database '{CURRENT_DATABASE}'"
+            if budget["truncated"]:
+                result["continuation"] = {"offset": offset + len(rows), "limit": limit - len(rows)}
+                result["memory_budget_bytes"] = budget["budget_bytes"]
+                message += " (truncated by memory budget, continue with the returned offset)"
+            return format_result(result, message)
     except Exception as e:
         logger.error(f"Failed to read from table '{table_name}': {e}")
         return format_error(e, f"Failed to read from table '{table_name}'")
 
 # Tool: Write data to table
-@log_client_call
 @mcp.tool()
+@log_client_call
 def write_table(table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Writes a row of data to the specified table.
@@ -434,7 +1785,7 @@ def write_table(table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
     
     try:
         with get_mysql_connection() as connection:
-            cursor = connection.cursor()
+            cursor = connection.cursor(prepared=True)
             
             # Generate SQL for INSERT
             columns = ', '.join(data.keys())
@@ -455,8 +1806,8 @@ def write_table(table_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
         return format_error(e, f"Failed to write to table '{table_name}'")
 
 # Tool: Update data in table
-@log_client_call
 @mcp.tool()
+@log_client_call
 def update_table(table_name: str, data: Dict[str, Any], where_conditions: Dict[str, Any]) -> Dict[str, Any]:
     """
     Updates data in the specified table based on where conditions.
@@ -483,7 +1834,7 @@ def update_table(table_name: str, data: Dict[str, Any], where_conditions: Dict[s
     
     try:
         with get_mysql_connection() as connection:
-            cursor = connection.cursor()
+            cursor = connection.cursor(prepared=True)
             
             # Build UPDATE query
             set_clause = ', '.join([f"{k} = %s" for k in data.keys()])
@@ -506,8 +1857,8 @@ def update_table(table_name: str, data: Dict[str, Any], where_conditions: Dict[s
         return format_error(e, f"Failed to update table '{table_name}'")
 
 # Tool: Delete data from table
-@log_client_call
 @mcp.tool()
+@log_client_call
 def delete_from_table(table_name: str, where_conditions: Dict[str, Any]) -> Dict[str, Any]:
     """
     Deletes data from the specified table based on where conditions.
@@ -530,7 +1881,7 @@ def delete_from_table(table_name: str, where_conditions: Dict[str, Any]) -> Dict
     
     try:
         with get_mysql_connection() as connection:
-            cursor = connection.cursor()
+            cursor = connection.cursor(prepared=True)
             
             # Build DELETE query
             where_clause = ' AND '.join([f"{k} = %s" for k in where_conditions.keys()])
@@ -548,1272 +1899,5580 @@ def delete_from_table(table_name: str, where_conditions: Dict[str, Any]) -> Dict
         logger.error(f"Failed to delete from table '{table_name}': {e}")
         return format_error(e, f"Failed to delete from table '{table_name}'")
 
+# Cost guard for execute_sql
+COST_GUARD_CACHE: "OrderedDict[Tuple[str, Optional[str], str], Dict[str, Any]]" = OrderedDict()
+COST_GUARD_LOCK = threading.Lock()
+COST_GUARD_STATS = {"hits": 0, "misses": 0}
+EXPLAINABLE_STATEMENT_PATTERN = re.compile(r"^\s*(?:/\*.*?\*/\s*)*\(?\s*(SELECT|WITH|UPDATE|DELETE|INSERT|REPLACE|TABLE)\b", re.I | re.S)
+
+CACHE_STATS_PROVIDERS["cost_guard"] = lambda: (COST_GUARD_STATS["hits"], COST_GUARD_STATS["misses"])
+
+def estimate_rows_examined(plan: Dict[str, Any]) -> int:
+    """
+    Estimate the rows a plan examines from EXPLAIN FORMAT=JSON.
+    
+    Table accesses are taken in join order; each one is scanned once per row produced by the
+    preceding part of the join (nested loop), so a cross join multiplies its inputs.
+    """
+    tables: List[Dict[str, Any]] = []
+    walk_explain_plan(plan, tables, {})
+    examined = 0
+    prefix_rows = 1
+    for table in tables:
+        per_scan = int(table.get("rows_examined_per_scan") or 0)
+        examined += per_scan * prefix_rows
+        produced = table.get("rows_produced_per_join")
+        if produced is None:
+            produced = per_scan * float(table.get("filtered") or 100) / 100
+        prefix_rows = max(int(produced), 1)
+    return examined
+
+def get_cost_guard_verdict(connection, query: str, params: Any = None) -> Optional[Dict[str, Any]]:
+    """
+    Get the cost guard verdict for a statement, from the digest cache or by running EXPLAIN.
+    
+    Parameter values only fill the placeholders of the EXPLAIN; verdicts are cached per digest.
+    
+    Returns:
+        Dict with verdict ('allow', 'confirm' or 'reject'), estimates and whether it was cached,
+        or None when the guard is disabled or the statement cannot be explained
+    """
+    if not COST_GUARD_CONFIG['enabled'] or not EXPLAINABLE_STATEMENT_PATTERN.match(query):
+        return None
+    
+    key = (CURRENT_DATASOURCE, CURRENT_DATABASE, digest_sql(query)[0])
+    now = time.monotonic()
+    with COST_GUARD_LOCK:
+        cached = COST_GUARD_CACHE.get(key)
+        if cached and now - cached["checked_at"] < COST_GUARD_CONFIG['cache_ttl_seconds']:
+            COST_GUARD_CACHE.move_to_end(key)
+            COST_GUARD_STATS["hits"] += 1
+            return dict(cached, cached=True)
+        COST_GUARD_STATS["misses"] += 1
+    
+    try:
+        cursor = connection.cursor()
+        plan = explain_json(cursor, query, params)
+        cursor.close()
+    except Exception as e:
+        # Statements EXPLAIN cannot handle are left to fail (or succeed) on their own
+        logger.warning(f"Cost guard could not EXPLAIN query, allowing it: {e}")
+        return None
+    
+    query_cost = get_plan_cost(plan) or 0.0
+    rows_examined = estimate_rows_examined(plan)
+    if rows_examined > COST_GUARD_CONFIG['reject_rows_examined'] or query_cost > COST_GUARD_CONFIG['reject_query_cost']:
+        verdict = "reject"
+    elif rows_examined > COST_GUARD_CONFIG['confirm_rows_examined'] or query_cost > COST_GUARD_CONFIG['confirm_query_cost']:
+        verdict = "confirm"
+    else:
+        verdict = "allow"
+    
+    entry = {"verdict": verdict, "query_cost": query_cost, "rows_examined": rows_examined, "checked_at": now}
+    with COST_GUARD_LOCK:
+        COST_GUARD_CACHE[key] = entry
+        COST_GUARD_CACHE.move_to_end(key)
+        while len(COST_GUARD_CACHE) > COST_GUARD_CONFIG['cache_size']:
+            COST_GUARD_CACHE.popitem(last=False)
+    return dict(entry, cached=False)
+
+# Result store: rows in a compact binary format, spilled to a memory-mapped temporary file past a threshold
+RESULT_STORE_LOCK = threading.Lock()
+RESULT_STORE_USAGE = {"disk_bytes": 0, "open": 0, "spilled": 0}
+ROW_INDEX_STRIDE = 64  # Byte offset of every 64th row is indexed; pages seek to the nearest one and scan forward
+ROW_LENGTH = struct.Struct("<I")
+ROW_INT64 = struct.Struct("<q")
+ROW_DOUBLE = struct.Struct("<d")
+ROW_NONE, ROW_INT, ROW_FLOAT, ROW_STR, ROW_BYTES, ROW_DECIMAL, ROW_DATETIME, ROW_DATE, ROW_TIMEDELTA, ROW_PICKLE = range(10)
+
+def encode_row(values, out: bytearray) -> None:
+    """Append one length-prefixed row of tagged values to a buffer"""
+    start = len(out)
+    out += b"\0\0\0\0"
+    for value in values:
+        kind = type(value)
+        if value is None:
+            out.append(ROW_NONE)
+        elif kind is int and -(1 << 63) <= value < (1 << 63):
+            out.append(ROW_INT)
+            out += ROW_INT64.pack(value)
+        elif kind is float:
+            out.append(ROW_FLOAT)
+            out += ROW_DOUBLE.pack(value)
+        elif kind is timedelta:
+            out.append(ROW_TIMEDELTA)
+            out += ROW_INT64.pack((value.days * 86400 + value.seconds) * 1000000 + value.microseconds)
+        else:
+            if kind is str:
+                tag, data = ROW_STR, value.encode("utf-8")
+            elif kind is bytes or kind is bytearray:
+                tag, data = ROW_BYTES, bytes(value)
+            elif kind is Decimal:
+                tag, data = ROW_DECIMAL, str(value).encode("ascii")
+            elif kind is datetime:
+                tag, data = ROW_DATETIME, value.isoformat().encode("ascii")
+            elif kind is date:
+                tag, data = ROW_DATE, value.isoformat().encode("ascii")
+            else:
+                tag, data = ROW_PICKLE, pickle.dumps(value)
+            out.append(tag)
+            out += ROW_LENGTH.pack(len(data))
+            out += data
+    ROW_LENGTH.pack_into(out, start, len(out) - start - 4)
+
+def decode_row(data, position: int, end: int) -> List[Any]:
+    """Decode the tagged values of one row stored between two offsets"""
+    values = []
+    while position < end:
+        tag = data[position]
+        position += 1
+        if tag == ROW_NONE:
+            values.append(None)
+        elif tag == ROW_INT:
+            values.append(ROW_INT64.unpack_from(data, position)[0])
+            position += 8
+        elif tag == ROW_FLOAT:
+            values.append(ROW_DOUBLE.unpack_from(data, position)[0])
+            position += 8
+        elif tag == ROW_TIMEDELTA:
+            values.append(timedelta(microseconds=ROW_INT64.unpack_from(data, position)[0]))
+            position += 8
+        else:
+            length = ROW_LENGTH.unpack_from(data, position)[0]
+            raw = bytes(data[position + 4:position + 4 + length])
+            position += 4 + length
+            if tag == ROW_STR:
+                values.append(raw.decode("utf-8"))
+            elif tag == ROW_BYTES:
+                values.append(raw)
+            elif tag == ROW_DECIMAL:
+                values.append(Decimal(raw.decode("ascii")))
+            elif tag == ROW_DATETIME:
+                values.append(datetime.fromisoformat(raw.decode("ascii")))
+            elif tag == ROW_DATE:
+                values.append(date.fromisoformat(raw.decode("ascii")))
+            else:
+                values.append(pickle.loads(raw))
+    return values
+
+class ResultStore:
+    """
+    Append-only store of result rows for paging.
+    
+    Rows are encoded as length-prefixed tagged values. They stay in an in-memory buffer up to
+    memory_threshold_bytes, after which the buffer is flushed to an anonymous temporary file that
+    is memory-mapped for reading once the store is sealed, so stored rows cost disk rather than RSS.
+    Appends fail once the result or the process-wide disk quota is exhausted.
+    """
+    
+    def __init__(self, columns: List[str], dictionary: bool = True):
+        # Dictionary rows hold one value per distinct column name
+        self.columns = list(dict.fromkeys(columns)) if dictionary else list(columns)
+        self.dictionary = dictionary
+        self.buffer = bytearray()  # Rows after the spilled ones
+        self.file = None
+        self.mapping = None
+        self.file_bytes = 0
+        self.index = array("Q")
+        self.count = 0
+        self.full = False
+        with RESULT_STORE_LOCK:
+            RESULT_STORE_USAGE["open"] += 1
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    @property
+    def nbytes(self) -> int:
+        return self.file_bytes + len(self.buffer)
+    
+    def append(self, row: Any) -> bool:
+        """Store a row; False when the store is full and the row was not stored"""
+        if self.full:
+            return False
+        start = len(self.buffer)
+        encode_row(row.values() if self.dictionary else row, self.buffer)
+        if self.nbytes > RESULT_STORE_CONFIG['max_result_bytes']:
+            del self.buffer[start:]
+            self.full = True
+            return False
+        if self.count % ROW_INDEX_STRIDE == 0:
+            self.index.append(self.file_bytes + start)
+        self.count += 1
+        if len(self.buffer) >= RESULT_STORE_CONFIG['memory_threshold_bytes'] and not self.spill():
+            # Out of disk quota: keep what is buffered and accept no more rows
+            self.full = True
+        return True
+    
+    def spill(self) -> bool:
+        """Move the buffered rows to the temporary file, within the disk quota"""
+        size = len(self.buffer)
+        with RESULT_STORE_LOCK:
+            if RESULT_STORE_USAGE["disk_bytes"] + size > RESULT_STORE_CONFIG['max_disk_bytes']:
+                return False
+            RESULT_STORE_USAGE["disk_bytes"] += size
+            RESULT_STORE_USAGE["spilled"] += self.file is None
+        if self.file is None:
+            self.file = tempfile.TemporaryFile(prefix="mcp_result_", dir=RESULT_STORE_CONFIG['directory'])
+        self.file.write(self.buffer)
+        self.file_bytes += size
+        self.buffer = bytearray()
+        return True
+    
+    def seal(self) -> None:
+        """Finish appending and map the spilled rows for reading"""
+        self.full = True
+        if self.file is not None and self.mapping is None:
+            self.file.flush()
+            self.mapping = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def rows(self, start: int, count: int) -> List[Any]:
+        """Decode up to `count` rows starting at row number `start` (the store must be sealed)"""
+        rows = []
+        number = start - start % ROW_INDEX_STRIDE
+        offset = self.index[number // ROW_INDEX_STRIDE] if start < self.count else 0
+        while number < min(start + count, self.count):
+            data, position = (self.mapping, offset) if offset < self.file_bytes else (self.buffer, offset - self.file_bytes)
+            length = ROW_LENGTH.unpack_from(data, position)[0]
+            if number >= start:
+                values = decode_row(data, position + 4, position + 4 + length)
+                rows.append(dict(zip(self.columns, values)) if self.dictionary else tuple(values))
+            offset += 4 + length
+            number += 1
+        return rows
+    
+    def close(self) -> None:
+        """Unmap and delete the temporary file and release its disk quota"""
+        if self.mapping is not None:
+            self.mapping.close()
+            self.mapping = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        with RESULT_STORE_LOCK:
+            RESULT_STORE_USAGE["disk_bytes"] -= self.file_bytes
+            RESULT_STORE_USAGE["open"] -= 1
+        self.file_bytes = 0
+        self.buffer = bytearray()
+
+# Server-held cursors (execute_sql page_size / fetch_cursor / close_cursor)
+RESULT_CURSORS: Dict[str, Dict[str, Any]] = {}  # cursor_id -> held connection with its partly read result
+RESULT_CURSORS_LOCK = threading.Lock()
+
+def close_held_connection(stack: ExitStack, error: Optional[BaseException] = None) -> None:
+    """Return a connection held across tool calls to its pool, which decides from the error whether to reuse it"""
+    try:
+        if error is None:
+            stack.close()
+        else:
+            stack.__exit__(type(error), error, error.__traceback__)
+    except Exception as e:
+        logger.debug(f"Error releasing held connection: {e}")
+
+def close_result_cursor(handle: Dict[str, Any], error: Optional[BaseException] = None) -> None:
+    """Unregister a cursor, delete its stored rows and release its connection (discarded by the pool if rows are left unread)"""
+    with RESULT_CURSORS_LOCK:
+        RESULT_CURSORS.pop(handle["cursor_id"], None)
+    if handle["store"] is not None:
+        handle["store"].close()
+    if handle["stack"] is not None:
+        handle["cursor"].abandon()
+        close_held_connection(handle["stack"], error)
+
+def expire_result_cursors() -> None:
+    """Close cursors that were not read for idle_timeout_seconds, freeing their connections"""
+    cutoff = time.monotonic() - CURSOR_CONFIG['idle_timeout_seconds']
+    with RESULT_CURSORS_LOCK:
+        expired = [handle for handle in RESULT_CURSORS.values() if handle["last_used"] < cutoff]
+    for handle in expired:
+        # Cursors being read by a running call are left for the next sweep
+        if handle["lock"].acquire(blocking=False):
+            try:
+                logger.info(f"Closing cursor '{handle['cursor_id']}' idle for over {CURSOR_CONFIG['idle_timeout_seconds']}s")
+                close_result_cursor(handle)
+            finally:
+                handle["lock"].release()
+
+def find_result_cursor(cursor_id: str) -> Optional[Dict[str, Any]]:
+    """The current session's cursor for a cursor_id, marked as used"""
+    with RESULT_CURSORS_LOCK:
+        handle = RESULT_CURSORS.get(cursor_id)
+        if handle is None or handle["session"] != get_session_key():
+            return None
+        handle["last_used"] = time.monotonic()
+        return handle
+
+def store_cursor_result(handle: Dict[str, Any]) -> None:
+    """
+    Read a cursor's result into a result store so that its connection can be released.
+    
+    Reading stops when the store is full; the remaining rows are then streamed from the held connection.
+    """
+    cursor = handle["cursor"]
+    store = handle["store"] = ResultStore(cursor.column_names)
+    batch_size = MEMORY_BUDGET_CONFIG['fetch_batch_size']
+    try:
+        while not handle["exhausted"]:
+            batch = cursor.fetchmany(batch_size)
+            handle["exhausted"] = len(batch) < batch_size
+            for index, row in enumerate(batch):
+                if not store.append(row):
+                    handle["pending"].extend(batch[index:])
+                    return
+        handle["stored_all"] = True
+    finally:
+        store.seal()
+
+def cursor_has_more(handle: Dict[str, Any]) -> bool:
+    """Whether rows remain after the ones returned so far"""
+    store = handle["store"]
+    return (store is not None and handle["position"] < len(store)) or bool(handle["pending"]) or not handle["exhausted"]
+
+def fetch_cursor_page(handle: Dict[str, Any], size: int) -> Tuple[List[Any], bool]:
+    """
+    Read the next page of a cursor: up to `size` rows within the fetch_cursor memory budget.
+    
+    Stored rows are served first, then rows streamed from the held connection. Rows read past the
+    end of a page are kept for the next one, so a page cut short by the budget loses nothing.
+    
+    Returns:
+        Tuple of (rows, whether the memory budget cut the page short)
+    """
+    budget = get_memory_budget("fetch_cursor")
+    cursor, pending, store = handle["cursor"], handle["pending"], handle["store"]
+    rows = []
+    estimated_bytes = 0
+    cursor.watch_call()
+    try:
+        while len(rows) < size:
+            wanted = min(MEMORY_BUDGET_CONFIG['fetch_batch_size'], size - len(rows))
+            from_store = store is not None and handle["position"] < len(store)
+            if from_store:
+                batch = store.rows(handle["position"], wanted)
+            else:
+                if not pending and not handle["exhausted"]:
+                    # One row past the page tells whether more rows follow
+                    pending.extend(cursor.fetchmany(wanted + 1))
+                    handle["exhausted"] = len(pending) < wanted + 1
+                batch = [pending.popleft() for _ in range(min(wanted, len(pending)))]
+            if not batch:
+                break
+            accepted = 0
+            for row in batch:
+                row_size = estimate_row_size(row)
+                if budget is not None and rows and estimated_bytes + row_size > budget:
+                    break
+                rows.append(row)
+                estimated_bytes += row_size
+                accepted += 1
+            if from_store:
+                handle["position"] += accepted
+            else:
+                pending.extendleft(reversed(batch[accepted:]))
+            if accepted < len(batch):
+                return rows, True
+        stored_left = store is not None and handle["position"] < len(store)
+        if not stored_left and not pending and not handle["exhausted"]:
+            pending.extend(cursor.fetchmany(1))
+            handle["exhausted"] = not pending
+        return rows, False
+    finally:
+        cursor.unwatch()
+
+def cursor_page_result(handle: Dict[str, Any], rows: List[Any], truncated: bool) -> Dict[str, Any]:
+    """Result payload for one page of a cursor"""
+    handle["rows_returned"] += len(rows)
+    has_more = cursor_has_more(handle)
+    result = {
+        "data": rows,
+        "count": len(rows),
+        "cursor_id": handle["cursor_id"] if has_more else None,
+        "has_more": has_more,
+        "rows_returned": handle["rows_returned"],
+        "database": handle["database"],
+        "truncated": truncated
+    }
+    if handle["stored_all"]:
+        result["total_rows"] = len(handle["store"])
+        result["position"] = handle["position"]
+    return result
+
 # Tool: Execute custom SQL query
-@log_client_call
 @mcp.tool()
-def execute_sql(query: str) -> Dict[str, Any]:
+@log_client_call
+def execute_sql(query: str, params: List[Any] = None, offset: int = 0, timeout_seconds: float = None, confirm: bool = False,
+                page_size: int = None) -> Dict[str, Any]:
     """
     Executes a custom SQL query and returns the result.
     
     Args:
         query: SQL query to execute (any valid SQL)
+        params: Values for %s placeholders in the query; the statement is then prepared on the server,
+            sent with the binary protocol and reused by later calls with the same query text
+        offset: Number of result rows to skip, used to continue a result truncated by the memory budget (default: 0)
+        timeout_seconds: Execution deadline for this call; the query is stopped on the server when it passes (default: per-tool setting)
+        confirm: Run a query the cost guard flagged as expensive (default: False)
+        page_size: Return only the first page of this many rows and keep the rest on the server behind
+            a cursor_id for fetch_cursor (default: return the whole result)
         
     Returns:
         Dict containing query results
     """
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
+    
     if not CURRENT_DATABASE:
         return format_error("No database selected", "Please use switch_database() to select a database first")
     
     if not validate_sql_query(query):
         return format_error("Invalid query", "Query validation failed")
     
+    if offset < 0:
+        return format_error("Invalid offset", "Offset must be a positive integer")
+    
+    if page_size is not None:
+        if page_size < 1:
+            return format_error("Invalid page size", "page_size must be a positive integer")
+        if offset:
+            return format_error("Invalid options", "offset cannot be combined with page_size, page through the result with fetch_cursor()")
+        page_size = min(page_size, SECURITY_CONFIG['max_results'])
+        expire_result_cursors()
+        session = get_session_key()
+        with RESULT_CURSORS_LOCK:
+            open_cursors = sum(1 for handle in RESULT_CURSORS.values() if handle["session"] == session)
+        if open_cursors >= CURSOR_CONFIG['max_open']:
+            return format_error(f"{open_cursors} cursors are open (limit {CURSOR_CONFIG['max_open']})",
+                                "Too many open cursors: read them to the end or close_cursor() them first")
+    
+    set_call_read_only(is_read_only_statement(query))
+    
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor(dictionary=True)
+        with ExitStack() as stack:
+            connection = stack.enter_context(get_mysql_connection())
+            guard = get_cost_guard_verdict(connection, query, params)
+            if guard and guard["verdict"] == "reject":
+                return format_error(
+                    f"Estimated {guard['rows_examined']} rows examined, query cost {guard['query_cost']}",
+                    "Query rejected by the cost guard: estimated cost exceeds the configured limit"
+                )
+            if guard and guard["verdict"] == "confirm" and not confirm:
+                return format_error(
+                    f"Estimated {guard['rows_examined']} rows examined, query cost {guard['query_cost']}",
+                    "Query flagged as expensive by the cost guard: re-run with confirm=True to execute it"
+                )
             
-            cursor.execute(query)
-            rows = cursor.fetchall()
-            cursor.close()
+            cursor = connection.cursor(prepared=True, dictionary=True) if params else connection.cursor(dictionary=True)
+            cursor.held = page_size is not None
+            cursor.execute(query, params or None)
             
-            return format_result({
+            if page_size is not None:
+                handle = {"cursor_id": uuid.uuid4().hex[:12], "session": session, "cursor": cursor, "stack": None,
+                          "store": None, "position": 0, "stored_all": False, "pending": deque(), "exhausted": False,
+                          "page_size": page_size, "rows_returned": 0, "database": CURRENT_DATABASE,
+                          "lock": threading.Lock(), "last_used": time.monotonic()}
+                try:
+                    if RESULT_STORE_CONFIG['enabled']:
+                        store_cursor_result(handle)
+                    rows, truncated = fetch_cursor_page(handle, page_size)
+                    result = cursor_page_result(handle, rows, truncated)
+                except BaseException:
+                    if handle["store"] is not None:
+                        handle["store"].close()
+                    raise
+                if result["has_more"] and not handle["stored_all"]:
+                    # The connection stays checked out, streaming the rest of the result as it is fetched
+                    handle["stack"] = stack.pop_all()
+                else:
+                    cursor.close()
+                if result["has_more"]:
+                    with RESULT_CURSORS_LOCK:
+                        RESULT_CURSORS[handle["cursor_id"]] = handle
+                else:
+                    close_result_cursor(handle)
+                if guard:
+                    result["cost_guard"] = {key: guard[key] for key in ("verdict", "query_cost", "rows_examined", "cached")}
+                message = f"Query executed successfully, returned {len(rows)} rows from database '{CURRENT_DATABASE}'"
+                if result["has_more"]:
+                    message += f", more rows available with fetch_cursor('{handle['cursor_id']}')"
+                return format_result(result, message)
+            
+            rows, budget = fetch_rows_within_budget(cursor, "execute_sql", skip_rows=offset)
+            
+            result = {
                 "data": rows,
                 "count": len(rows),
-                "database": CURRENT_DATABASE
-            }, f"Query executed successfully, returned {len(rows)} rows from database '{CURRENT_DATABASE}'")
+                "database": CURRENT_DATABASE,
+                "truncated": budget["truncated"]
+            }
+            if guard:
+                result["cost_guard"] = {key: guard[key] for key in ("verdict", "query_cost", "rows_examined", "cached")}
+            message = f"Query executed successfully, returned {len(rows)} rows from database '{CURRENT_DATABASE}'"
+            if budget["truncated"]:
+                # Continuing re-runs the query and skips the rows already returned; use a deterministic ORDER BY
+                result["continuation"] = {"offset": offset + len(rows)}
+                result["memory_budget_bytes"] = budget["budget_bytes"]
+                message += " (truncated by memory budget, continue with the returned offset)"
+            return format_result(result, message)
     except Exception as e:
         logger.error(f"Failed to execute SQL query: {e}")
         return format_error(e, "Failed to execute SQL query")
 
-# Tool: Create table
-@log_client_call
+# Tool: Fetch the next page of a cursor
 @mcp.tool()
-def create_table(table_name: str, columns: List[Dict[str, Any]], options: Dict[str, Any] = None) -> Dict[str, Any]:
+@log_client_call
+def fetch_cursor(cursor_id: str, size: int = None, position: int = None) -> Dict[str, Any]:
     """
-    Creates a new table with the specified columns and options.
+    Fetches the next page of a result held by execute_sql(page_size=...), without re-running the query.
     
     Args:
-        table_name: Name of the table to create
-        columns: List of column definitions, each containing:
-                - name: Column name
-                - type: Data type (e.g., 'INT', 'VARCHAR(100)', 'DECIMAL(10,2)')
-                - constraints: List of constraints (e.g., ['NOT NULL', 'PRIMARY KEY', 'AUTO_INCREMENT'])
-                - default: Default value (optional)
-        options: Additional table options (e.g., engine, charset, collation)
+        cursor_id: Cursor returned by execute_sql
+        size: Number of rows to return (default: the cursor's page_size)
+        position: Row number to read from instead of the next page; only for results held entirely
+            in the result store (those report total_rows)
         
     Returns:
-        Dict containing operation status
+        Dict containing the rows, whether more rows follow and the cursor_id to continue with
     """
-    if not CURRENT_DATABASE:
-        return format_error("No database selected", "Please use switch_database() to select a database first")
+    if size is not None and size < 1:
+        return format_error("Invalid size", "size must be a positive integer")
     
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
+    if position is not None and position < 0:
+        return format_error("Invalid position", "position must be a non-negative integer")
     
-    if not columns or not isinstance(columns, list):
-        return format_error("Invalid columns", "Columns must be a non-empty list")
+    expire_result_cursors()
+    handle = find_result_cursor(cursor_id)
+    if handle is None:
+        return format_error(f"Unknown cursor_id '{cursor_id}'", "Cursor not found: it was read to the end, closed or expired")
     
+    if not handle["lock"].acquire(timeout=POOL_CONFIG['acquire_timeout']):
+        return format_error(f"Cursor '{cursor_id}' is busy", "Another call of this session is still reading the cursor")
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Build CREATE TABLE statement
-            column_definitions = []
-            for column in columns:
-                if not isinstance(column, dict) or 'name' not in column or 'type' not in column:
-                    return format_error("Invalid column definition", "Each column must have 'name' and 'type'")
-                
-                col_name = column['name']
-                col_type = column['type']
-                
-                # Validate column name
-                if not validate_table_name(col_name):
-                    return format_error("Invalid column name", f"Column name '{col_name}' contains invalid characters")
-                
-                # Build column definition
-                col_def = f"`{col_name}` {col_type}"
-                
-                # Add constraints
-                if 'constraints' in column and isinstance(column['constraints'], list):
-                    for constraint in column['constraints']:
-                        if isinstance(constraint, str):
-                            col_def += f" {constraint}"
-                
-                # Add default value
-                if 'default' in column:
-                    if column['default'] is None:
-                        col_def += " DEFAULT NULL"
-                    elif isinstance(column['default'], str):
-                        col_def += f" DEFAULT '{column['default']}'"
-                    else:
-                        col_def += f" DEFAULT {column['default']}"
-                
-                column_definitions.append(col_def)
-            
-            # Build the complete CREATE TABLE statement
-            create_sql = f"CREATE TABLE `{table_name}` (\n  "
-            create_sql += ",\n  ".join(column_definitions)
-            create_sql += "\n)"
-            
-            # Add table options
-            if options:
-                if 'engine' in options:
-                    create_sql += f" ENGINE={options['engine']}"
-                if 'charset' in options:
-                    create_sql += f" CHARACTER SET {options['charset']}"
-                if 'collation' in options:
-                    create_sql += f" COLLATE {options['collation']}"
-            
-            # Execute the CREATE TABLE statement
-            cursor.execute(create_sql)
-            cursor.close()
-            
-            return format_result({
-                "table_name": table_name,
-                "columns": len(columns),
-                "sql": create_sql,
-                "database": CURRENT_DATABASE
-            }, f"Table '{table_name}' created successfully in database '{CURRENT_DATABASE}'")
+        if position is not None:
+            if not handle["stored_all"]:
+                return format_error("Cursor is streamed", "position needs a result held entirely in the result store, read it page by page")
+            handle["position"] = min(position, len(handle["store"]))
+        rows, truncated = fetch_cursor_page(handle, min(size or handle["page_size"], SECURITY_CONFIG['max_results']))
+        result = cursor_page_result(handle, rows, truncated)
+        if not result["has_more"]:
+            close_result_cursor(handle)
+        message = f"Fetched {len(rows)} rows from cursor '{cursor_id}' ({handle['rows_returned']} in total)"
+        message += ", more rows available" if result["has_more"] else ", result complete"
+        return format_result(result, message)
     except Exception as e:
-        logger.error(f"Failed to create table '{table_name}': {e}")
-        return format_error(e, f"Failed to create table '{table_name}'")
+        logger.error(f"Failed to fetch from cursor '{cursor_id}': {e}")
+        close_result_cursor(handle, e)
+        return format_error(e, "Failed to fetch from cursor, the cursor was closed")
+    finally:
+        handle["lock"].release()
 
-# Tool: Create table from SQL
+# Tool: Close a cursor
+@mcp.tool()
 @log_client_call
+def close_cursor(cursor_id: str) -> Dict[str, Any]:
+    """
+    Closes a cursor opened by execute_sql(page_size=...) before it is read to the end, freeing its connection.
+    
+    Args:
+        cursor_id: Cursor returned by execute_sql
+        
+    Returns:
+        Dict containing the number of rows returned through the cursor
+    """
+    handle = find_result_cursor(cursor_id)
+    if handle is None:
+        return format_error(f"Unknown cursor_id '{cursor_id}'", "Cursor not found: it was read to the end, closed or expired")
+    
+    try:
+        with handle["lock"]:
+            close_result_cursor(handle)
+        expire_result_cursors()
+        return format_result({"cursor_id": cursor_id, "rows_returned": handle["rows_returned"]},
+                             f"Cursor '{cursor_id}' closed after returning {handle['rows_returned']} rows")
+    except Exception as e:
+        logger.error(f"Failed to close cursor '{cursor_id}': {e}")
+        return format_error(e, "Failed to close cursor")
+
+def run_batch_statement(connection, index: int, statement: Dict[str, Any], shares: int, confirm: bool) -> Dict[str, Any]:
+    """Execute one statement of a batch; errors are recorded on its result instead of raised"""
+    start = time.perf_counter()
+    result = {"index": index, "status": "success", "error": None}
+    try:
+        guard = get_cost_guard_verdict(connection, statement["query"], statement.get("params"))
+        if guard and (guard["verdict"] == "reject" or (guard["verdict"] == "confirm" and not confirm)):
+            raise Error(f"Cost guard {'rejected' if guard['verdict'] == 'reject' else 'requires confirm=True for'} the statement: "
+                        f"estimated {guard['rows_examined']} rows examined, query cost {guard['query_cost']}")
+        
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(statement["query"], statement.get("params"))
+        if cursor.description:
+            rows, budget = fetch_rows_within_budget(cursor, "execute_batch", shares=shares)
+            result.update(data=rows, count=len(rows), truncated=budget["truncated"])
+            if budget["truncated"]:
+                # Later statements share the connection, so the unread rows must be drained now
+                connection.consume_results()
+        else:
+            result.update(rows_affected=cursor.rowcount, last_insert_id=cursor.lastrowid)
+            cursor.close()
+    except Exception as e:
+        logger.error(f"Batch statement {index} failed: {e}")
+        result.update(status="error", error=str(e))
+    result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return result
+
+def run_batch_statement_on_own_connection(index: int, statement: Dict[str, Any], shares: int, confirm: bool) -> Dict[str, Any]:
+    """Execute one statement of a parallel batch on its own pooled connection"""
+    try:
+        with get_mysql_connection() as connection:
+            return run_batch_statement(connection, index, statement, shares, confirm)
+    except Exception as e:
+        return {"index": index, "status": "error", "error": str(e), "elapsed_ms": None}
+
+# Tool: Execute a batch of SQL statements
 @mcp.tool()
-def create_table_from_sql(create_table_sql: str) -> Dict[str, Any]:
+@log_client_call
+def execute_batch(statements: List[Dict[str, Any]], transaction: bool = False, parallel: bool = False,
+                  stop_on_error: bool = False, confirm: bool = False, timeout_seconds: float = None) -> Dict[str, Any]:
     """
-    Creates a table using a raw CREATE TABLE SQL statement.
+    Executes a list of SQL statements in one call and returns a result per statement.
+    
+    Statements run in order on one connection. A failing statement does not affect the others
+    unless stop_on_error is set; in a transaction, any failure rolls the whole batch back.
     
     Args:
-        create_table_sql: Complete CREATE TABLE SQL statement
+        statements: Statements to run, each {"query": "...", "params": [...] or {...}} (params optional, %s / %(name)s placeholders)
+        transaction: Run all statements in one transaction, committed only if every statement succeeds (default: False)
+        parallel: Run the statements concurrently on separate connections; they must not depend on each other (default: False)
+        stop_on_error: Skip the remaining statements after the first failure (default: False)
+        confirm: Run statements the cost guard flagged as expensive (default: False)
+        timeout_seconds: Execution deadline for the whole batch (default: per-tool setting)
         
     Returns:
-        Dict containing operation status
+        Dict containing one result per statement
     """
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
+    
     if not CURRENT_DATABASE:
         return format_error("No database selected", "Please use switch_database() to select a database first")
     
-    if not create_table_sql or not isinstance(create_table_sql, str):
-        return format_error("Invalid SQL", "CREATE TABLE SQL statement must be a non-empty string")
+    if not statements:
+        return format_error("No statements", "statements must contain at least one statement")
     
-    # Basic validation for CREATE TABLE statements
-    sql_lower = create_table_sql.strip().lower()
-    if not sql_lower.startswith('create table'):
-        return format_error("Invalid SQL", "Only CREATE TABLE statements are allowed")
+    if len(statements) > BATCH_CONFIG['max_statements']:
+        return format_error("Too many statements", f"A batch can contain at most {BATCH_CONFIG['max_statements']} statements")
     
-    # Check for potentially dangerous operations
-    dangerous_keywords = ['drop', 'delete', 'update', 'insert', 'grant', 'revoke', 'execute']
-    for keyword in dangerous_keywords:
-        if keyword in sql_lower:
-            return format_error("Invalid SQL", f"SQL statement contains forbidden keyword: {keyword}")
+    for index, statement in enumerate(statements):
+        if not isinstance(statement, dict) or not validate_sql_query(statement.get("query")):
+            return format_error("Invalid statement", f"Statement {index} must be an object with a non-empty 'query'")
+        if not isinstance(statement.get("params"), (list, dict, type(None))):
+            return format_error("Invalid statement", f"Statement {index} 'params' must be a list or an object")
+    
+    if parallel and (transaction or stop_on_error):
+        return format_error("Invalid options", "parallel cannot be combined with transaction or stop_on_error")
+    
+    set_call_read_only(not transaction and all(is_read_only_statement(statement["query"]) for statement in statements))
     
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Execute the CREATE TABLE statement
-            cursor.execute(create_table_sql)
-            cursor.close()
-            
-            # Extract table name from SQL for response
-            # Simple extraction - look for table name after CREATE TABLE
-            import re
-            table_match = re.search(r'create\s+table\s+(?:if\s+not\s+exists\s+)?`?(\w+)`?', sql_lower)
-            table_name = table_match.group(1) if table_match else "unknown"
-            
-            return format_result({
-                "table_name": table_name,
-                "sql": create_table_sql,
-                "database": CURRENT_DATABASE
-            }, f"Table '{table_name}' created successfully in database '{CURRENT_DATABASE}'")
+        if parallel:
+            # Workers share the call's deadline, cancellation and replica routing through a copy of its context
+            with ThreadPoolExecutor(max_workers=min(BATCH_CONFIG['max_parallel'], len(statements)), thread_name_prefix="mcp-batch") as executor:
+                futures = [executor.submit(copy_context().run, run_batch_statement_on_own_connection, index, statement, len(statements), confirm)
+                           for index, statement in enumerate(statements)]
+                results = [future.result() for future in futures]
+        else:
+            results = []
+            with get_mysql_connection() as connection:
+                if transaction:
+                    connection.start_transaction()
+                for index, statement in enumerate(statements):
+                    if results and results[-1]["status"] != "success" and (stop_on_error or transaction):
+                        results.append({"index": index, "status": "skipped", "error": None, "elapsed_ms": None})
+                        continue
+                    results.append(run_batch_statement(connection, index, statement, len(statements), confirm))
+                
+                failed = next((result for result in results if result["status"] == "error"), None)
+                if transaction and failed:
+                    connection.rollback()
+                    return format_error(f"Statement {failed['index']}: {failed['error']}",
+                                        "Batch transaction rolled back, no statement was applied")
+                if transaction:
+                    connection.commit()
+        
+        succeeded = sum(1 for result in results if result["status"] == "success")
+        failed_count = sum(1 for result in results if result["status"] == "error")
+        skipped = len(results) - succeeded - failed_count
+        return format_result({
+            "results": results,
+            "statements": len(results),
+            "succeeded": succeeded,
+            "failed": failed_count,
+            "skipped": skipped,
+            "transaction": "committed" if transaction else None,
+            "database": CURRENT_DATABASE
+        }, f"Executed batch of {len(results)} statements: {succeeded} succeeded, {failed_count} failed, {skipped} skipped")
     except Exception as e:
-        logger.error(f"Failed to create table from SQL: {e}")
-        return format_error(e, "Failed to create table from SQL")
+        logger.error(f"Failed to execute batch: {e}")
+        return format_error(e, "Failed to execute batch")
 
-# Tool: Get table statistics
-@log_client_call
+# Prepared statement handles (prepare_statement / execute_prepared / deallocate_prepared)
+PREPARED_HANDLES: Dict[str, Dict[str, Any]] = {}  # statement_id -> handle
+PINNED_CONNECTIONS: Dict[Tuple[str, str, Optional[str]], Dict[str, Any]] = {}  # (session, datasource, database) -> pinned connection
+PREPARED_LOCK = threading.Lock()
+PREPARED_PLACEHOLDER_PATTERN = re.compile(r"(?<!%)%s")
+
+def pin_connection(datasource: str, database: Optional[str]) -> Dict[str, Any]:
+    """The session's pinned connection to a datasource and database, checked out of the pool on first use"""
+    key = (get_session_key(), datasource, database)
+    with PREPARED_LOCK:
+        pin = PINNED_CONNECTIONS.get(key)
+    if pin is not None:
+        return pin
+    stack = ExitStack()
+    connection = stack.enter_context(open_connection(datasource, database, {}))
+    pin = {"key": key, "stack": stack, "connection": connection, "lock": threading.Lock(), "handles": set(), "last_used": time.monotonic()}
+    with PREPARED_LOCK:
+        existing = PINNED_CONNECTIONS.setdefault(key, pin)
+    if existing is not pin:
+        stack.close()
+    return existing
+
+def unpin_connection(pin: Dict[str, Any], error: Optional[BaseException] = None) -> None:
+    """Drop a pinned connection and its handles and return the connection to its pool (the caller holds pin["lock"] or it is idle)"""
+    with PREPARED_LOCK:
+        if PINNED_CONNECTIONS.get(pin["key"]) is pin:
+            del PINNED_CONNECTIONS[pin["key"]]
+        for statement_id in pin["handles"]:
+            PREPARED_HANDLES.pop(statement_id, None)
+        pin["handles"].clear()
+    close_held_connection(pin["stack"], error)
+
+def expire_prepared_handles() -> None:
+    """Deallocate handles unused for idle_timeout_seconds and release pinned connections left without handles"""
+    cutoff = time.monotonic() - PREPARED_STATEMENT_CONFIG['idle_timeout_seconds']
+    with PREPARED_LOCK:
+        for handle in [handle for handle in PREPARED_HANDLES.values() if handle["last_used"] < cutoff]:
+            del PREPARED_HANDLES[handle["statement_id"]]
+            handle["pin"]["handles"].discard(handle["statement_id"])
+        idle_pins = [pin for pin in PINNED_CONNECTIONS.values() if not pin["handles"] and pin["last_used"] < cutoff]
+    for pin in idle_pins:
+        # Pins in use by a running call are left for the next sweep
+        if pin["lock"].acquire(blocking=False):
+            try:
+                unpin_connection(pin)
+            finally:
+                pin["lock"].release()
+
+def find_prepared_handle(statement_id: str) -> Optional[Dict[str, Any]]:
+    """The current session's handle for a statement_id, marked as used"""
+    with PREPARED_LOCK:
+        handle = PREPARED_HANDLES.get(statement_id)
+        if handle is None or handle["session"] != get_session_key():
+            return None
+        handle["last_used"] = handle["pin"]["last_used"] = time.monotonic()
+        return handle
+
+def run_prepared_statement(handle: Dict[str, Any], params: List[Any], offset: int, confirm: bool) -> Tuple[Dict[str, Any], str]:
+    """Execute a prepared handle on its pinned connection (the caller holds the pin's lock)"""
+    connection = handle["pin"]["connection"]
+    guard = get_cost_guard_verdict(connection, handle["query"], params)
+    if guard and (guard["verdict"] == "reject" or (guard["verdict"] == "confirm" and not confirm)):
+        raise Error(f"Cost guard {'rejected' if guard['verdict'] == 'reject' else 'requires confirm=True for'} the statement: "
+                    f"estimated {guard['rows_examined']} rows examined, query cost {guard['query_cost']}")
+    
+    cursor = connection.cursor(prepared=True, dictionary=True)
+    cursor.execute(handle["query"], params)
+    handle["executions"] += 1
+    result = {"statement_id": handle["statement_id"], "database": handle["database"], "executions": handle["executions"]}
+    if guard:
+        result["cost_guard"] = {key: guard[key] for key in ("verdict", "query_cost", "rows_examined", "cached")}
+    if not cursor.description:
+        result.update(rows_affected=cursor.rowcount, last_insert_id=cursor.lastrowid)
+        cursor.close()
+        return result, f"Prepared statement executed successfully, {cursor.rowcount} rows affected"
+    
+    rows, budget = fetch_rows_within_budget(cursor, "execute_prepared", skip_rows=offset)
+    result.update(data=rows, count=len(rows), truncated=budget["truncated"])
+    message = f"Prepared statement executed successfully, returned {len(rows)} rows"
+    if budget["truncated"]:
+        # The pinned connection serves the handle's next execution, so the unread rows must be drained now
+        cursor.drain()
+        result["continuation"] = {"offset": offset + len(rows)}
+        result["memory_budget_bytes"] = budget["budget_bytes"]
+        message += " (truncated by memory budget, continue with the returned offset)"
+    return result, message
+
+def describe_prepared_statement(connection, query: str) -> Tuple[int, Optional[List[str]]]:
+    """
+    Prepare a statement once to validate it and return its parameter count and result column names.
+    
+    The pure-Python connector returns a dict from cmd_stmt_prepare, the C extension a CMySQLPrepStmt that
+    is closed by passing it back and only knows its result columns after execution (None here).
+    """
+    prepared = connection.cmd_stmt_prepare(PREPARED_PLACEHOLDER_PATTERN.sub("?", query).encode())
+    if isinstance(prepared, dict):
+        connection.cmd_stmt_close(prepared["statement_id"])
+        return len(prepared["parameters"]), [column[0] for column in prepared["columns"]]
+    connection.cmd_stmt_close(prepared)
+    return prepared.param_count, None
+
+# Tool: Prepare a statement
 @mcp.tool()
-def get_table_stats(table_name: str) -> Dict[str, Any]:
+@log_client_call
+def prepare_statement(query: str) -> Dict[str, Any]:
     """
-    Gets statistics about the specified table.
+    Prepares a SQL statement on the server and returns a handle to execute it repeatedly with execute_prepared.
+    
+    Handles belong to the client session and the current database. They keep one pooled connection
+    pinned per database until they are deallocated or expire after being unused for a while.
     
     Args:
-        table_name: Name of the table to get statistics for
+        query: SQL statement with %s placeholders for its parameters
         
     Returns:
-        Dict containing table statistics
+        Dict containing the statement_id, the number of parameters and the result columns
+        (None when the connector only reports them on execution)
     """
     if not CURRENT_DATABASE:
         return format_error("No database selected", "Please use switch_database() to select a database first")
     
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
+    if not validate_sql_query(query):
+        return format_error("Invalid query", "Query validation failed")
     
+    expire_prepared_handles()
+    session = get_session_key()
+    with PREPARED_LOCK:
+        open_handles = sum(1 for handle in PREPARED_HANDLES.values() if handle["session"] == session)
+    if open_handles >= PREPARED_STATEMENT_CONFIG['max_handles']:
+        return format_error(f"{open_handles} prepared statements are open (limit {PREPARED_STATEMENT_CONFIG['max_handles']})",
+                            "Too many prepared statements: deallocate_prepared() unused handles first")
+    
+    pin = None
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Get row count
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
-            
-            # Get table size information
-            cursor.execute(f"""
-                SELECT 
-                    table_name,
-                    table_rows,
-                    data_length,
-                    index_length,
-                    (data_length + index_length) as total_size
-                FROM information_schema.tables 
-                WHERE table_schema = DATABASE() AND table_name = %s
-            """, (table_name,))
-            
-            table_info = cursor.fetchone()
-            cursor.close()
-            
-            if table_info:
-                stats = {
-                    "table_name": table_info[0],
-                    "estimated_rows": table_info[1],
-                    "actual_rows": row_count,
-                    "data_size_bytes": table_info[2],
-                    "index_size_bytes": table_info[3],
-                    "total_size_bytes": table_info[4],
-                    "database": CURRENT_DATABASE
-                }
-            else:
-                stats = {
-                    "row_count": row_count,
-                    "database": CURRENT_DATABASE
-                }
-            
-            return format_result(stats, f"Statistics retrieved for table '{table_name}' in database '{CURRENT_DATABASE}'")
+        pin = pin_connection(CURRENT_DATASOURCE, CURRENT_DATABASE)
+        with pin["lock"]:
+            # Validate the statement and read its parameter count; it is prepared for reuse on first execution
+            logger.info(f"[SQL] PREPARE {query}")
+            parameter_count, columns = describe_prepared_statement(pin["connection"], query)
+        
+        handle = {
+            "statement_id": uuid.uuid4().hex[:12],
+            "session": session,
+            "query": query,
+            "parameter_count": parameter_count,
+            "columns": columns,
+            "datasource": CURRENT_DATASOURCE,
+            "database": CURRENT_DATABASE,
+            "pin": pin,
+            "executions": 0,
+            "last_used": time.monotonic()
+        }
+        with PREPARED_LOCK:
+            if PINNED_CONNECTIONS.get(pin["key"]) is not pin:
+                raise Error("The pinned connection was released concurrently, prepare the statement again")
+            PREPARED_HANDLES[handle["statement_id"]] = handle
+            pin["handles"].add(handle["statement_id"])
+            pin["last_used"] = handle["last_used"]
+        
+        return format_result({
+            "statement_id": handle["statement_id"],
+            "parameter_count": handle["parameter_count"],
+            "columns": handle["columns"],
+            "datasource": CURRENT_DATASOURCE,
+            "database": CURRENT_DATABASE
+        }, f"Statement prepared with {handle['parameter_count']} parameters in database '{CURRENT_DATABASE}'")
     except Exception as e:
-        logger.error(f"Failed to get stats for table '{table_name}': {e}")
-        return format_error(e, f"Failed to get stats for table '{table_name}'")
+        logger.error(f"Failed to prepare statement: {e}")
+        if pin is not None and not pin["handles"] and pin["lock"].acquire(blocking=False):
+            try:
+                unpin_connection(pin, e)
+            finally:
+                pin["lock"].release()
+        return format_error(e, "Failed to prepare statement")
 
-# Tool: Search data in table
-@log_client_call
+# Tool: Execute a prepared statement
 @mcp.tool()
-def search_table(table_name: str, search_column: str, search_value: str, limit: int = 50) -> Dict[str, Any]:
+@log_client_call
+def execute_prepared(statement_id: str, params: List[Any] = None, offset: int = 0, timeout_seconds: float = None, confirm: bool = False) -> Dict[str, Any]:
     """
-    Searches for data in a specific column of the table.
+    Executes a statement prepared with prepare_statement using the binary protocol.
     
     Args:
-        table_name: Name of the table to search in
-        search_column: Name of the column to search in
-        search_value: Value to search for
-        limit: Maximum number of results to return (default: 50)
+        statement_id: Handle returned by prepare_statement
+        params: Values for the statement's placeholders, in order
+        offset: Number of result rows to skip, used to continue a result truncated by the memory budget (default: 0)
+        timeout_seconds: Execution deadline for this call; the statement is stopped on the server when it passes (default: per-tool setting)
+        confirm: Run a statement the cost guard flagged as expensive (default: False)
         
     Returns:
-        Dict containing search results
+        Dict containing the result rows or the affected row count
     """
-    if not CURRENT_DATABASE:
-        return format_error("No database selected", "Please use switch_database() to select a database first")
-    
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
     
-    if not validate_table_name(search_column):
-        return format_error("Invalid column name", "Column name contains invalid characters")
+    if offset < 0:
+        return format_error("Invalid offset", "Offset must be a positive integer")
     
-    if limit < 0:
-        return format_error("Invalid limit", "Limit must be a positive integer")
+    expire_prepared_handles()
+    handle = find_prepared_handle(statement_id)
+    if handle is None:
+        return format_error(f"Unknown statement_id '{statement_id}'",
+                            "Prepared statement not found: it was deallocated or expired, prepare it again")
     
-    # Apply security limit
-    if limit > SECURITY_CONFIG['max_results']:
-        limit = SECURITY_CONFIG['max_results']
+    params = params or []
+    if len(params) != handle["parameter_count"]:
+        return format_error(f"Expected {handle['parameter_count']} parameters, got {len(params)}", "Wrong number of parameters")
     
+    pin = handle["pin"]
+    if not pin["lock"].acquire(timeout=POOL_CONFIG['acquire_timeout']):
+        return format_error(f"Connection pinned for statement '{statement_id}' is busy",
+                            "Another call of this session is still using the prepared statement's connection")
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor(dictionary=True)
-            
-            query = f"SELECT * FROM {table_name} WHERE {search_column} LIKE %s LIMIT {limit}"
-            
-            search_pattern = f"%{search_value}%"
-            cursor.execute(query, (search_pattern,))
-            rows = cursor.fetchall()
-            cursor.close()
-            
-            return format_result({
-                "data": rows,
-                "count": len(rows),
-                "search_column": search_column,
-                "search_value": search_value,
-                "database": CURRENT_DATABASE
-            }, f"Found {len(rows)} matching rows in table '{table_name}' in database '{CURRENT_DATABASE}'")
+        result, message = run_prepared_statement(handle, params, offset, confirm)
+        return format_result(result, message)
     except Exception as e:
-        logger.error(f"Failed to search table '{table_name}': {e}")
-        return format_error(e, f"Failed to search table '{table_name}'")
+        logger.error(f"Failed to execute prepared statement '{statement_id}': {e}")
+        if not is_reusable_after(e):
+            # The session is lost together with every statement prepared in it
+            unpin_connection(pin, e)
+        return format_error(e, "Failed to execute prepared statement")
+    finally:
+        pin["lock"].release()
 
-# Tool: Get database information
-@log_client_call
+# Tool: Deallocate a prepared statement
 @mcp.tool()
-def get_database_info() -> Dict[str, Any]:
+@log_client_call
+def deallocate_prepared(statement_id: str) -> Dict[str, Any]:
     """
-    Gets comprehensive information about the database.
+    Deallocates a prepared statement handle; the pinned connection returns to the pool with its last handle.
     
+    Args:
+        statement_id: Handle returned by prepare_statement
+        
     Returns:
-        Dict containing database information
+        Dict containing the handle's execution count
     """
-    if not CURRENT_DATABASE:
-        return format_error("No database selected", "Please use switch_database() to select a database first")
+    with PREPARED_LOCK:
+        handle = PREPARED_HANDLES.get(statement_id)
+        if handle is None or handle["session"] != get_session_key():
+            return format_error(f"Unknown statement_id '{statement_id}'", "Prepared statement not found: it was already deallocated or expired")
+        del PREPARED_HANDLES[statement_id]
+        pin = handle["pin"]
+        pin["handles"].discard(statement_id)
+        released = not pin["handles"]
+        if released and PINNED_CONNECTIONS.get(pin["key"]) is pin:
+            # Deregistered right away so that a concurrent prepare_statement pins a new connection
+            del PINNED_CONNECTIONS[pin["key"]]
     
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Get database name
-            cursor.execute("SELECT DATABASE()")
-            database_name = cursor.fetchone()[0]
-            
-            # Get table count
-            cursor.execute("SHOW TABLES")
-            tables = cursor.fetchall()
-            table_count = len(tables)
-            
-            # Get database size
-            cursor.execute("""
-                SELECT 
-                    SUM(data_length + index_length) as total_size,
-                    SUM(data_length) as data_size,
-                    SUM(index_length) as index_size
-                FROM information_schema.tables 
-                WHERE table_schema = DATABASE()
-            """)
-            
-            size_info = cursor.fetchone()
-            cursor.close()
-            
-            info = {
-                "database_name": database_name,
-                "table_count": table_count,
-                "total_size_bytes": size_info[0] if size_info[0] else 0,
-                "data_size_bytes": size_info[1] if size_info[1] else 0,
-                "index_size_bytes": size_info[2] if size_info[2] else 0
-            }
-            
-            return format_result(info, f"Database information retrieved for '{database_name}'")
+        if released:
+            with pin["lock"]:
+                unpin_connection(pin)
+        expire_prepared_handles()
+        return format_result({
+            "statement_id": statement_id,
+            "executions": handle["executions"],
+            "connection_released": released
+        }, f"Prepared statement '{statement_id}' deallocated after {handle['executions']} executions")
     except Exception as e:
-        logger.error(f"Failed to get database info: {e}")
-        return format_error(e, "Failed to get database information")
+        logger.error(f"Failed to deallocate prepared statement '{statement_id}': {e}")
+        return format_error(e, "Failed to deallocate prepared statement")
 
-# Tool: List all databases
-@log_client_call
-@mcp.tool()
-def list_databases() -> Dict[str, Any]:
+# Scatter-gather helpers for execute_sql_sharded
+SHARD_CLAUSE_PATTERN = re.compile(r"(SELECT|FROM|WHERE|GROUP\s+BY|HAVING|WINDOW|ORDER\s+BY|LIMIT|UNION|INTERSECT|EXCEPT|INTO|FOR)\b", re.I)
+AGGREGATE_CALL_PATTERN = re.compile(r"\b(COUNT|SUM|MIN|MAX|AVG|GROUP_CONCAT|JSON_ARRAYAGG|JSON_OBJECTAGG|STD|STDDEV\w*|VAR_\w+|VARIANCE|BIT_AND|BIT_OR|BIT_XOR)\s*\(", re.I)
+MERGEABLE_AGGREGATE_PATTERN = re.compile(r"^\s*(COUNT|SUM|MIN|MAX)\s*\((?!\s*DISTINCT\b)(?:[^()]|\([^()]*\))*\)\s*(?:(?:AS\s+)?`?\w+`?)?\s*$", re.I | re.S)
+SELECT_ALIAS_PATTERN = re.compile(r"\s+(?:AS\s+)?`?(\w+)`?\s*$", re.I)
+LIMIT_CLAUSE_PATTERN = re.compile(r"LIMIT\s+(\d+)(?:\s*,\s*(\d+)|\s+OFFSET\s+(\d+))?\s*;?\s*$", re.I)
+ORDER_DIRECTION_PATTERN = re.compile(r"\s+(ASC|DESC)\s*$", re.I)
+
+def find_top_level_clauses(query: str) -> Dict[str, int]:
+    """Positions of the first top-level occurrence of each clause keyword (outside parentheses, quotes and comments)"""
+    clauses = {}
+    depth = 0
+    index = 0
+    length = len(query)
+    while index < length:
+        char = query[index]
+        if char in "'\"`":
+            index += 1
+            while index < length and query[index] != char:
+                index += 2 if query[index] == "\\" else 1
+        elif query.startswith("/*", index):
+            end = query.find("*/", index + 2)
+            index = length if end < 0 else end + 1
+        elif char == "#" or query.startswith("-- ", index):
+            end = query.find("\n", index)
+            index = length if end < 0 else end
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and (index == 0 or not (query[index - 1].isalnum() or query[index - 1] in "_$")):
+            match = SHARD_CLAUSE_PATTERN.match(query, index)
+            if match:
+                clauses.setdefault(re.sub(r"\s+", " ", match.group(1).upper()), index)
+                index = match.end() - 1
+        index += 1
+    return clauses
+
+def get_clause_text(query: str, clauses: Dict[str, int], name: str) -> Optional[str]:
+    """Text of a top-level clause without its keyword, up to the next clause"""
+    start = clauses.get(name)
+    if start is None:
+        return None
+    following = [position for position in clauses.values() if position > start]
+    return query[SHARD_CLAUSE_PATTERN.match(query, start).end():min(following) if following else len(query)]
+
+def split_top_level(text: str) -> List[str]:
+    """Split a clause at top-level commas (outside parentheses and quotes)"""
+    items, depth, quote, current = [], 0, None, ""
+    for char in text:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in "'\"`":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            items.append(current.strip())
+            current = ""
+            continue
+        current += char
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+def strip_subqueries(expression: str) -> str:
+    """Replace parenthesized subqueries in an expression with '?', leaving its own function calls"""
+    match = re.search(r"\(\s*SELECT\b", expression, re.I)
+    while match:
+        depth, end = 0, match.start()
+        for end in range(match.start(), len(expression)):
+            depth += {"(": 1, ")": -1}.get(expression[end], 0)
+            if depth == 0:
+                break
+        expression = expression[:match.start()] + "?" + expression[end + 1:]
+        match = re.search(r"\(\s*SELECT\b", expression, re.I)
+    return expression
+
+def normalize_expression(expression: str) -> str:
+    """Compare select-list and ORDER BY expressions ignoring case, whitespace and backticks"""
+    return re.sub(r"[\s`]+", "", expression).lower()
+
+def plan_shard_merge(query: str) -> Dict[str, Any]:
     """
-    Lists all databases on the MySQL server.
+    Work out how the per-shard results of a SELECT combine into one result.
     
-    Returns:
-        Dict containing list of database names
+    The merge mode is 'aggregate' (COUNT/SUM/MIN/MAX re-aggregated per GROUP BY group), 'ordered'
+    (k-way merge on the ORDER BY keys) or 'concat'; groups of a GROUP BY without aggregates are
+    deduplicated like DISTINCT rows. Every GROUP BY expression must be a column of the select list.
+    A trailing LIMIT is applied to the merged result, so shards return the first offset + limit
+    rows, or all groups for aggregates.
+    
+    Raises:
+        ValueError: When shard results cannot be combined into the result of the query
     """
+    clauses = find_top_level_clauses(query)
+    for keyword in ("UNION", "INTERSECT", "EXCEPT", "INTO"):
+        if keyword in clauses:
+            raise ValueError(f"{keyword} queries cannot be merged across shards, run them per database")
+    if "SELECT" not in clauses or "FROM" not in clauses:
+        raise ValueError("Only SELECT ... FROM queries can be run across shards")
+    
+    select_text = get_clause_text(query, clauses, "SELECT")
+    distinct = re.match(r"\s*DISTINCT\b", select_text, re.I) is not None
+    select_items = split_top_level(re.sub(r"^\s*(DISTINCT|ALL)\b", "", select_text, flags=re.I))
+    order_by = []
+    for item in split_top_level(get_clause_text(query, clauses, "ORDER BY") or ""):
+        direction = ORDER_DIRECTION_PATTERN.search(item)
+        order_by.append((item[:direction.start()] if direction else item, bool(direction) and direction.group(1).upper() == "DESC"))
+    
+    limit, offset, shard_query = None, 0, query
+    if "LIMIT" in clauses:
+        match = LIMIT_CLAUSE_PATTERN.match(query, clauses["LIMIT"])
+        if not match:
+            raise ValueError("Only a trailing LIMIT n [OFFSET m] with literal numbers can be merged across shards")
+        if match.group(2) is not None:
+            offset, limit = int(match.group(1)), int(match.group(2))
+        else:
+            limit, offset = int(match.group(1)), int(match.group(3) or 0)
+        shard_query = query[:clauses["LIMIT"]].rstrip()
+    
+    aggregates = {}
+    for index, item in enumerate(select_items):
+        if AGGREGATE_CALL_PATTERN.search(strip_subqueries(item)):
+            match = MERGEABLE_AGGREGATE_PATTERN.match(item)
+            if not match:
+                raise ValueError(f"'{item}' cannot be re-aggregated across shards; select plain COUNT/SUM/MIN/MAX "
+                                 f"(e.g. SUM(x) and COUNT(x) instead of AVG(x)) and combine them from the result")
+            aggregates[index] = match.group(1).upper()
+    having = get_clause_text(query, clauses, "HAVING")
+    if having is not None and (aggregates or AGGREGATE_CALL_PATTERN.search(strip_subqueries(having))):
+        raise ValueError("HAVING would filter per-shard partial aggregates; filter the merged result instead")
+    
+    group_by = []
+    group_text = get_clause_text(query, clauses, "GROUP BY")
+    if group_text is not None:
+        if re.search(r"\bWITH\s+ROLLUP\s*$", group_text, re.I):
+            raise ValueError("GROUP BY ... WITH ROLLUP cannot be merged across shards")
+        for expression in split_top_level(group_text):
+            index = find_select_item(ORDER_DIRECTION_PATTERN.sub("", expression), select_items)
+            if index is None or index in aggregates:
+                raise ValueError(f"GROUP BY {expression} must be a non-aggregate column of the select list for shard results to be merged")
+            group_by.append(index)
+    
+    if aggregates:
+        mode = "aggregate"
+    else:
+        mode = "ordered" if order_by else "concat"
+        if limit is not None:
+            shard_query += f" LIMIT {offset + limit}"
+    return {"mode": mode, "shard_query": shard_query, "select_items": select_items, "aggregates": aggregates,
+            "group_by": group_by, "order_by": order_by, "distinct": distinct, "limit": limit, "offset": offset}
+
+def find_select_item(expression: str, select_items: List[str]) -> Optional[int]:
+    """Index of the select-list item an expression refers to (position, alias or expression), None if there is none"""
+    text = expression.strip()
+    if text.isdigit():
+        return int(text) - 1 if 1 <= int(text) <= len(select_items) else None
+    normalized = normalize_expression(text)
+    for index, item in enumerate(select_items):
+        alias = SELECT_ALIAS_PATTERN.search(item)
+        expression = normalize_expression(SELECT_ALIAS_PATTERN.sub("", item))
+        if normalized in (normalize_expression(item), expression, alias and alias.group(1).lower()):
+            return index
+        # A qualified column on one side only (t.status / status)
+        if expression.split(".")[-1] == normalized.split(".")[-1] and "." in expression + normalized and "(" not in expression:
+            return index
+    return None
+
+def resolve_result_column(expression: str, select_items: List[str], columns: List[str]) -> str:
+    """Map an ORDER BY expression to a result column (position, name, alias or select-list expression)"""
+    text = expression.strip()
+    if text.isdigit() and 1 <= int(text) <= len(columns):
+        return columns[int(text) - 1]
+    normalized = normalize_expression(text)
+    for column in columns:
+        if normalize_expression(column) in (normalized, normalized.split(".")[-1]):
+            return column
+    if len(select_items) == len(columns):
+        index = find_select_item(text, select_items)
+        if index is not None:
+            return columns[index]
+    raise ValueError(f"ORDER BY {text} must be a column of the result for shard results to be merged")
+
+def compare_sort_values(left: Any, right: Any) -> int:
+    """Compare two values in MySQL's ascending order (NULLs first, strings case-insensitive like the default collations)"""
+    if left is None or right is None:
+        return 0 if left is right else -1 if left is None else 1
+    if isinstance(left, str) and isinstance(right, str):
+        left, right = left.casefold(), right.casefold()
+    return 0 if left == right else -1 if left < right else 1
+
+def make_sort_key(order_columns: List[Tuple[str, bool]]) -> Callable:
+    """Sort key for result rows ordered by (column, descending) pairs"""
+    def compare(left: Dict[str, Any], right: Dict[str, Any]) -> int:
+        for column, descending in order_columns:
+            result = compare_sort_values(left[column], right[column])
+            if result:
+                return -result if descending else result
+        return 0
+    return cmp_to_key(compare)
+
+def merge_aggregate_rows(shard_rows: List[List[Dict[str, Any]]], columns: List[str], aggregates: Dict[int, str],
+                         group_columns: List[str]) -> List[Dict[str, Any]]:
+    """Re-aggregate per-shard COUNT/SUM/MIN/MAX rows by their GROUP BY columns (one group without GROUP BY)"""
+    groups: Dict[tuple, Dict[str, Any]] = {}
+    for rows in shard_rows:
+        for row in rows:
+            key = tuple(row[column] for column in group_columns)
+            merged = groups.get(key)
+            if merged is None:
+                groups[key] = dict(row)
+                continue
+            for index, function in aggregates.items():
+                column = columns[index]
+                value, current = row[column], merged[column]
+                if value is None:
+                    continue
+                if current is None:
+                    merged[column] = value
+                elif function in ("COUNT", "SUM"):
+                    merged[column] = current + value
+                elif function == "MIN":
+                    merged[column] = value if compare_sort_values(value, current) < 0 else current
+                else:
+                    merged[column] = value if compare_sort_values(value, current) > 0 else current
+    return list(groups.values())
+
+def unique_rows(rows, columns: List[str]):
+    """Drop rows whose values repeat an earlier row (SELECT DISTINCT across shards)"""
+    seen = set()
+    for row in rows:
+        key = tuple(row[column] for column in columns)
+        if key not in seen:
+            seen.add(key)
+            yield row
+
+def merge_shard_results(plan: Dict[str, Any], shards: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Combine the rows of successful shards according to the merge plan, then apply OFFSET/LIMIT"""
+    columns = shards[0]["columns"]
+    if (plan["mode"] == "aggregate" or plan["group_by"]) and len(plan["select_items"]) != len(columns):
+        raise ValueError("Aggregate and GROUP BY queries across shards must list their columns explicitly (no *)")
+    group_columns = [columns[index] for index in plan["group_by"]]
+    order_columns = [(resolve_result_column(expression, plan["select_items"], columns), descending)
+                     for expression, descending in plan["order_by"]]
+    
+    if plan["mode"] == "aggregate":
+        rows = iter(merge_aggregate_rows([shard["rows"] for shard in shards], columns, plan["aggregates"], group_columns))
+        if order_columns:
+            rows = iter(sorted(rows, key=make_sort_key(order_columns)))
+    else:
+        for shard in shards:
+            for row in shard["rows"]:
+                row["_database"] = shard["database"]
+        if plan["mode"] == "ordered":
+            # Every shard's rows are already sorted: stream a k-way merge and stop at the limit
+            rows = heapq.merge(*[shard["rows"] for shard in shards], key=make_sort_key(order_columns))
+        else:
+            rows = itertools.chain.from_iterable(shard["rows"] for shard in shards)
+        if plan["distinct"]:
+            rows = unique_rows(rows, columns)
+        if group_columns:
+            # The same group can come from several shards
+            rows = unique_rows(rows, group_columns)
+    
+    stop = plan["offset"] + plan["limit"] if plan["limit"] is not None else None
+    return list(itertools.islice(rows, plan["offset"], stop))
+
+def query_shard(database: str, query: str, shares: int) -> Dict[str, Any]:
+    """Run a query on one shard database; errors are recorded on the shard instead of raised"""
+    start = time.perf_counter()
+    shard = {"database": database, "columns": None, "rows": [], "truncated": False, "error": None}
     try:
-        # Connect without specifying database to get server-level access
-        with get_mysql_connection_no_db() as connection:
-            cursor = connection.cursor()
-            cursor.execute("SHOW DATABASES")
-            databases = [row[0] for row in cursor.fetchall()]
-            cursor.close()
-            
-            return format_result({"databases": databases}, f"Found {len(databases)} databases")
+        with get_mysql_connection(database) as connection:
+            cursor = connection.cursor(dictionary=True)
+            cursor.execute(query)
+            shard["columns"] = list(cursor.column_names)
+            shard["rows"], budget = fetch_rows_within_budget(cursor, "execute_sql_sharded", shares=shares)
+            shard["truncated"] = budget["truncated"]
     except Exception as e:
-        logger.error(f"Failed to list databases: {e}")
-        return format_error(e, "Failed to list databases")
+        logger.error(f"Shard query failed on database '{database}': {e}")
+        shard["error"] = str(e)
+    shard["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return shard
 
-# Tool: Create database
-@log_client_call
+# Tool: Execute SQL query across shard databases
 @mcp.tool()
-def create_database(database_name: str, charset: str = None, collation: str = None) -> Dict[str, Any]:
+@log_client_call
+def execute_sql_sharded(query: str, databases: List[str] = None, database_pattern: str = None, max_parallel: int = None,
+                        allow_partial: bool = False, timeout_seconds: float = None) -> Dict[str, Any]:
     """
-    Creates a new database.
+    Runs the same SELECT on several identically structured databases in parallel and merges the results.
+    
+    COUNT/SUM/MIN/MAX are re-aggregated across shards per GROUP BY group, ORDER BY results are
+    k-way merged, and LIMIT/OFFSET apply to the merged result. Non-aggregate rows carry the
+    shard they came from in '_database'.
     
     Args:
-        database_name: Name of the database to create
-        charset: Character set for the database (default: from config)
-        collation: Collation for the database (default: from config)
+        query: SELECT query to run on every shard
+        databases: Names of the shard databases
+        database_pattern: SQL LIKE pattern selecting the shard databases instead (e.g. 'orders\\_%')
+        max_parallel: Shards queried concurrently (default: configured max_parallel)
+        allow_partial: Merge the shards that succeeded when others fail (default: False)
+        timeout_seconds: Execution deadline for the whole call (default: per-tool setting)
         
     Returns:
-        Dict containing operation status
+        Dict containing the merged rows and per-shard statistics
     """
-    if not validate_table_name(database_name):  # Reuse table name validation for database names
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
+    
+    if not validate_sql_query(query) or not is_read_only_statement(query):
+        return format_error("Invalid query", "Only read-only SELECT queries can be run across shards")
+    
+    if bool(databases) == bool(database_pattern):
+        return format_error("Invalid shard selection", "Specify either databases or database_pattern")
+    
+    if databases and not all(validate_table_name(database) for database in databases):
         return format_error("Invalid database name", "Database name contains invalid characters")
     
-    if len(database_name) > DB_MANAGEMENT_CONFIG['max_database_name_length']:
-        return format_error("Database name too long", f"Database name must be {DB_MANAGEMENT_CONFIG['max_database_name_length']} characters or less")
+    if max_parallel is not None and max_parallel < 1:
+        return format_error("Invalid max_parallel", "max_parallel must be a positive integer")
     
-    # Use default values from config if not provided
-    charset = charset or DB_MANAGEMENT_CONFIG['default_charset']
-    collation = collation or DB_MANAGEMENT_CONFIG['default_collation']
+    try:
+        plan = plan_shard_merge(query)
+    except ValueError as e:
+        return format_error(e, "Query cannot be merged across shards")
+    
+    set_call_read_only(True)
     
     try:
-        # Connect without specifying database
-        with get_mysql_connection_no_db() as connection:
-            cursor = connection.cursor()
-            
-            # Create database with charset and collation
-            query = f"CREATE DATABASE IF NOT EXISTS `{database_name}` CHARACTER SET {charset} COLLATE {collation}"
-            cursor.execute(query)
-            
-            cursor.close()
-            
-            result_data = {
-                "database_name": database_name,
-                "charset": charset,
-                "collation": collation
-            }
-            
+        if database_pattern:
+            with get_mysql_connection_no_db() as connection:
+                cursor = connection.cursor()
+                cursor.execute("SELECT schema_name FROM information_schema.schemata WHERE schema_name LIKE %s ORDER BY schema_name",
+                               (database_pattern,))
+                databases = [row[0] for row in cursor.fetchall()]
+                cursor.close()
+            if not databases:
+                return format_error("No databases found", f"No databases match the pattern '{database_pattern}'")
+        databases = list(dict.fromkeys(databases))
+        if len(databases) > SHARD_QUERY_CONFIG['max_databases']:
+            return format_error("Too many databases", f"{len(databases)} databases exceed the limit of {SHARD_QUERY_CONFIG['max_databases']}")
+        
+        # Workers share the call's deadline, cancellation and replica routing through a copy of its context
+        workers = min(max_parallel or SHARD_QUERY_CONFIG['max_parallel'], len(databases))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mcp-shard") as executor:
+            futures = [executor.submit(copy_context().run, query_shard, database, plan["shard_query"], len(databases))
+                       for database in databases]
+            shards = [future.result() for future in futures]
+        
+        failed = [shard for shard in shards if shard["error"]]
+        if failed and (not allow_partial or len(failed) == len(shards)):
+            return format_error("; ".join(f"{shard['database']}: {shard['error']}" for shard in failed[:5]),
+                                f"Query failed on {len(failed)} of {len(shards)} databases")
+        succeeded = [shard for shard in shards if not shard["error"]]
+        shard_stats = [{"database": shard["database"], "rows": len(shard["rows"]), "elapsed_ms": shard["elapsed_ms"],
+                        "truncated": shard["truncated"], "error": shard["error"]} for shard in shards]
+        rows = merge_shard_results(plan, succeeded)
+        
+        result = {
+            "data": rows,
+            "count": len(rows),
+            "merge": plan["mode"],
+            "databases": len(databases),
+            "shards": shard_stats,
+            "truncated": any(shard["truncated"] for shard in succeeded)
+        }
+        message = f"Query executed on {len(succeeded)} databases, returned {len(rows)} merged rows"
+        if failed:
+            result["failed_databases"] = [shard["database"] for shard in failed]
+            message += f" ({len(failed)} databases failed and were skipped)"
+        if result["truncated"]:
+            result["memory_budget_bytes"] = get_memory_budget("execute_sql_sharded")
+            message += " (shard results truncated by memory budget, the merged result may be incomplete)"
+        return format_result(result, message)
+    except ValueError as e:
+        return format_error(e, "Query cannot be merged across shards")
+    except Exception as e:
+        logger.error(f"Failed to execute sharded SQL query: {e}")
+        return format_error(e, "Failed to execute sharded SQL query")
+
+# Tool: Create table
+@mcp.tool()
+@log_client_call
+def create_table(table_name: str, columns: List[Dict[str, Any]], options: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    Creates a new table with the specified columns and options.
+    
+    Args:
+        table_name: Name of the table to create
+        columns: List of column definitions, each containing:
+                - name: Column name
+                - type: Data type (e.g., 'INT', 'VARCHAR(100)', 'DECIMAL(10,2)')
+                - constraints: List of constraints (e.g., ['NOT NULL', 'PRIMARY KEY', 'AUTO_INCREMENT'])
+                - default: Default value (optional)
+        options: Additional table options (e.g., engine, charset, collation)
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    if not columns or not isinstance(columns, list):
+        return format_error("Invalid columns", "Columns must be a non-empty list")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Build CREATE TABLE statement
+            column_definitions = []
+            for column in columns:
+                if not isinstance(column, dict) or 'name' not in column or 'type' not in column:
+                    return format_error("Invalid column definition", "Each column must have 'name' and 'type'")
+                
+                col_name = column['name']
+                col_type = column['type']
+                
+                # Validate column name
+                if not validate_table_name(col_name):
+                    return format_error("Invalid column name", f"Column name '{col_name}' contains invalid characters")
+                
+                # Build column definition
+                col_def = f"`{col_name}` {col_type}"
+                
+                # Add constraints
+                if 'constraints' in column and isinstance(column['constraints'], list):
+                    for constraint in column['constraints']:
+                        if isinstance(constraint, str):
+                            col_def += f" {constraint}"
+                
+                # Add default value
+                if 'default' in column:
+                    if column['default'] is None:
+                        col_def += " DEFAULT NULL"
+                    elif isinstance(column['default'], str):
+                        col_def += f" DEFAULT '{column['default']}'"
+                    else:
+                        col_def += f" DEFAULT {column['default']}"
+                
+                column_definitions.append(col_def)
+            
+            # Build the complete CREATE TABLE statement
+            create_sql = f"CREATE TABLE `{table_name}` (\n  "
+            create_sql += ",\n  ".join(column_definitions)
+            create_sql += "\n)"
+            
+            # Add table options
+            if options:
+                if 'engine' in options:
+                    create_sql += f" ENGINE={options['engine']}"
+                if 'charset' in options:
+                    create_sql += f" CHARACTER SET {options['charset']}"
+                if 'collation' in options:
+                    create_sql += f" COLLATE {options['collation']}"
+            
+            # Execute the CREATE TABLE statement
+            cursor.execute(create_sql)
+            cursor.close()
+            
+            return format_result({
+                "table_name": table_name,
+                "columns": len(columns),
+                "sql": create_sql,
+                "database": CURRENT_DATABASE
+            }, f"Table '{table_name}' created successfully in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to create table '{table_name}': {e}")
+        return format_error(e, f"Failed to create table '{table_name}'")
+
+# Tool: Create table from SQL
+@mcp.tool()
+@log_client_call
+def create_table_from_sql(create_table_sql: str) -> Dict[str, Any]:
+    """
+    Creates a table using a raw CREATE TABLE SQL statement.
+    
+    Args:
+        create_table_sql: Complete CREATE TABLE SQL statement
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not create_table_sql or not isinstance(create_table_sql, str):
+        return format_error("Invalid SQL", "CREATE TABLE SQL statement must be a non-empty string")
+    
+    # Basic validation for CREATE TABLE statements
+    sql_lower = create_table_sql.strip().lower()
+    if not sql_lower.startswith('create table'):
+        return format_error("Invalid SQL", "Only CREATE TABLE statements are allowed")
+    
+    # Check for potentially dangerous operations
+    dangerous_keywords = ['drop', 'delete', 'update', 'insert', 'grant', 'revoke', 'execute']
+    for keyword in dangerous_keywords:
+        if keyword in sql_lower:
+            return format_error("Invalid SQL", f"SQL statement contains forbidden keyword: {keyword}")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Execute the CREATE TABLE statement
+            cursor.execute(create_table_sql)
+            cursor.close()
+            
+            # Extract table name from SQL for response
+            # Simple extraction - look for table name after CREATE TABLE
+            import re
+            table_match = re.search(r'create\s+table\s+(?:if\s+not\s+exists\s+)?`?(\w+)`?', sql_lower)
+            table_name = table_match.group(1) if table_match else "unknown"
+            
+            return format_result({
+                "table_name": table_name,
+                "sql": create_table_sql,
+                "database": CURRENT_DATABASE
+            }, f"Table '{table_name}' created successfully in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to create table from SQL: {e}")
+        return format_error(e, "Failed to create table from SQL")
+
+# Tool: Get table statistics
+@mcp.tool()
+@log_client_call
+def get_table_stats(table_name: str) -> Dict[str, Any]:
+    """
+    Gets statistics about the specified table.
+    
+    Args:
+        table_name: Name of the table to get statistics for
+        
+    Returns:
+        Dict containing table statistics
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Get row count
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            row_count = cursor.fetchone()[0]
+            
+            # Get table size information
+            cursor.execute(f"""
+                SELECT 
+                    table_name,
+                    table_rows,
+                    data_length,
+                    index_length,
+                    (data_length + index_length) as total_size
+                FROM information_schema.tables 
+                WHERE table_schema = DATABASE() AND table_name = %s
+            """, (table_name,))
+            
+            table_info = cursor.fetchone()
+            cursor.close()
+            
+            if table_info:
+                stats = {
+                    "table_name": table_info[0],
+                    "estimated_rows": table_info[1],
+                    "actual_rows": row_count,
+                    "data_size_bytes": table_info[2],
+                    "index_size_bytes": table_info[3],
+                    "total_size_bytes": table_info[4],
+                    "database": CURRENT_DATABASE
+                }
+            else:
+                stats = {
+                    "row_count": row_count,
+                    "database": CURRENT_DATABASE
+                }
+            
+            return format_result(stats, f"Statistics retrieved for table '{table_name}' in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to get stats for table '{table_name}': {e}")
+        return format_error(e, f"Failed to get stats for table '{table_name}'")
+
+# Tool: Search data in table
+@mcp.tool()
+@log_client_call
+def search_table(table_name: str, search_column: str, search_value: str, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    """
+    Searches for data in a specific column of the table.
+    
+    Args:
+        table_name: Name of the table to search in
+        search_column: Name of the column to search in
+        search_value: Value to search for
+        limit: Maximum number of results to return (default: 50)
+        offset: Number of matching rows to skip (default: 0)
+        
+    Returns:
+        Dict containing search results
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    if not validate_table_name(search_column):
+        return format_error("Invalid column name", "Column name contains invalid characters")
+    
+    if limit < 0:
+        return format_error("Invalid limit", "Limit must be a positive integer")
+    
+    if offset < 0:
+        return format_error("Invalid offset", "Offset must be a positive integer")
+    
+    # Apply security limit
+    if limit > SECURITY_CONFIG['max_results']:
+        limit = SECURITY_CONFIG['max_results']
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor(prepared=True, dictionary=True)
+            
+            query = f"SELECT * FROM {table_name} WHERE {search_column} LIKE %s LIMIT %s OFFSET %s"
+            
+            search_pattern = f"%{search_value}%"
+            cursor.execute(query, (search_pattern, limit, offset))
+            rows, budget = fetch_rows_within_budget(cursor, "search_table")
+            
+            result = {
+                "data": rows,
+                "count": len(rows),
+                "search_column": search_column,
+                "search_value": search_value,
+                "database": CURRENT_DATABASE,
+                "truncated": budget["truncated"]
+            }
+            message = f"Found {len(rows)} matching rows in table '{table_name}' in database '{CURRENT_DATABASE}'"
+            if budget["truncated"]:
+                result["continuation"] = {"offset": offset + len(rows), "limit": limit - len(rows)}
+                result["memory_budget_bytes"] = budget["budget_bytes"]
+                message += " (truncated by memory budget, continue with the returned offset)"
+            return format_result(result, message)
+    except Exception as e:
+        logger.error(f"Failed to search table '{table_name}': {e}")
+        return format_error(e, f"Failed to search table '{table_name}'")
+
+# Tool: Get database information
+@mcp.tool()
+@log_client_call
+def get_database_info() -> Dict[str, Any]:
+    """
+    Gets comprehensive information about the database.
+    
+    Returns:
+        Dict containing database information
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Get database name
+            cursor.execute("SELECT DATABASE()")
+            database_name = cursor.fetchone()[0]
+            
+            # Get table count
+            cursor.execute("SHOW TABLES")
+            tables = cursor.fetchall()
+            table_count = len(tables)
+            
+            # Get database size
+            cursor.execute("""
+                SELECT 
+                    SUM(data_length + index_length) as total_size,
+                    SUM(data_length) as data_size,
+                    SUM(index_length) as index_size
+                FROM information_schema.tables 
+                WHERE table_schema = DATABASE()
+            """)
+            
+            size_info = cursor.fetchone()
+            cursor.close()
+            
+            info = {
+                "database_name": database_name,
+                "table_count": table_count,
+                "total_size_bytes": size_info[0] if size_info[0] else 0,
+                "data_size_bytes": size_info[1] if size_info[1] else 0,
+                "index_size_bytes": size_info[2] if size_info[2] else 0
+            }
+            
+            return format_result(info, f"Database information retrieved for '{database_name}'")
+    except Exception as e:
+        logger.error(f"Failed to get database info: {e}")
+        return format_error(e, "Failed to get database information")
+
+# Tool: List all databases
+@mcp.tool()
+@log_client_call
+def list_databases() -> Dict[str, Any]:
+    """
+    Lists all databases on the MySQL server.
+    
+    Returns:
+        Dict containing list of database names
+    """
+    try:
+        # Connect without specifying database to get server-level access
+        with get_mysql_connection_no_db() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SHOW DATABASES")
+            databases = [row[0] for row in cursor.fetchall()]
+            cursor.close()
+            
+            return format_result({"databases": databases}, f"Found {len(databases)} databases")
+    except Exception as e:
+        logger.error(f"Failed to list databases: {e}")
+        return format_error(e, "Failed to list databases")
+
+# Tool: Create database
+@mcp.tool()
+@log_client_call
+def create_database(database_name: str, charset: str = None, collation: str = None) -> Dict[str, Any]:
+    """
+    Creates a new database.
+    
+    Args:
+        database_name: Name of the database to create
+        charset: Character set for the database (default: from config)
+        collation: Collation for the database (default: from config)
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not validate_table_name(database_name):  # Reuse table name validation for database names
+        return format_error("Invalid database name", "Database name contains invalid characters")
+    
+    if len(database_name) > DB_MANAGEMENT_CONFIG['max_database_name_length']:
+        return format_error("Database name too long", f"Database name must be {DB_MANAGEMENT_CONFIG['max_database_name_length']} characters or less")
+    
+    # Use default values from config if not provided
+    charset = charset or DB_MANAGEMENT_CONFIG['default_charset']
+    collation = collation or DB_MANAGEMENT_CONFIG['default_collation']
+    
+    try:
+        # Connect without specifying database
+        with get_mysql_connection_no_db() as connection:
+            cursor = connection.cursor()
+            
+            # Create database with charset and collation
+            query = f"CREATE DATABASE IF NOT EXISTS `{database_name}` CHARACTER SET {charset} COLLATE {collation}"
+            cursor.execute(query)
+            
+            cursor.close()
+            
+            result_data = {
+                "database_name": database_name,
+                "charset": charset,
+                "collation": collation
+            }
+            
             # Auto-switch to new database if configured
             if DB_MANAGEMENT_CONFIG['auto_switch_on_create']:
                 switch_result = switch_database(database_name)
                 if switch_result['status'] == 'success':
                     result_data['auto_switched'] = True
             
-            return format_result(result_data, f"Database '{database_name}' created successfully")
+            return format_result(result_data, f"Database '{database_name}' created successfully")
+    except Exception as e:
+        logger.error(f"Failed to create database '{database_name}': {e}")
+        return format_error(e, f"Failed to create database '{database_name}'")
+
+# Tool: Delete database
+@mcp.tool()
+@log_client_call
+def delete_database(database_name: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Deletes a database.
+    
+    Args:
+        database_name: Name of the database to delete
+        force: If True, drops the database even if it doesn't exist (default: False)
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not validate_table_name(database_name):
+        return format_error("Invalid database name", "Database name contains invalid characters")
+    
+    # Check if it's a protected database
+    if database_name.lower() in SECURITY_CONFIG['protected_databases']:
+        if not DB_MANAGEMENT_CONFIG['allow_system_db_operations']:
+            return format_error("Cannot delete system database", f"Database '{database_name}' is a system database and cannot be deleted")
+    
+    try:
+        # Create backup before deletion if configured
+        backup_created = False
+        if DB_MANAGEMENT_CONFIG['backup_before_delete'] and not force:
+            backup_name = f"{database_name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            backup_result = copy_database(database_name, backup_name)
+            if backup_result['status'] == 'success':
+                backup_created = True
+                logger.info(f"Backup created: {backup_name}")
+        
+        # Connect without specifying database
+        with get_mysql_connection_no_db() as connection:
+            cursor = connection.cursor()
+            
+            if force:
+                query = f"DROP DATABASE IF EXISTS `{database_name}`"
+            else:
+                query = f"DROP DATABASE `{database_name}`"
+            
+            cursor.execute(query)
+            
+            cursor.close()
+            
+            result_data = {
+                "database_name": database_name,
+                "force": force
+            }
+            
+            if backup_created:
+                result_data['backup_created'] = True
+            
+            return format_result(result_data, f"Database '{database_name}' deleted successfully")
+    except Exception as e:
+        logger.error(f"Failed to delete database '{database_name}': {e}")
+        return format_error(e, f"Failed to delete database '{database_name}'")
+
+# Tool: Switch database
+@mcp.tool()
+@log_client_call
+def switch_database(database_name: str) -> Dict[str, Any]:
+    """
+    Switches to a different database.
+    
+    Args:
+        database_name: Name of the database to switch to
+        
+    Returns:
+        Dict containing operation status
+    """
+    global CURRENT_DATABASE
+    
+    if not validate_table_name(database_name):
+        return format_error("Invalid database name", "Database name contains invalid characters")
+    
+    try:
+        # Test connection to the new database
+        with get_mysql_connection(database_name) as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT DATABASE()")
+            current_db = cursor.fetchone()[0]
+            cursor.close()
+        
+        # Update the global variable
+        previous_database = CURRENT_DATABASE
+        CURRENT_DATABASE = database_name
+        
+        return format_result({
+            "previous_database": previous_database,
+            "current_database": database_name,
+            "datasource": CURRENT_DATASOURCE
+        }, f"Successfully switched to database '{database_name}'")
+    except Exception as e:
+        logger.error(f"Failed to switch to database '{database_name}': {e}")
+        return format_error(e, f"Failed to switch to database '{database_name}'")
+
+# Tool: Get database details
+@mcp.tool()
+@log_client_call
+def get_database_details(database_name: str = None) -> Dict[str, Any]:
+    """
+    Gets detailed information about a specific database.
+    
+    Args:
+        database_name: Name of the database (if None, uses current database)
+        
+    Returns:
+        Dict containing database details
+    """
+    if database_name and not validate_table_name(database_name):
+        return format_error("Invalid database name", "Database name contains invalid characters")
+    
+    try:
+        # Connect to the specified database or current database
+        with get_mysql_connection(database_name) as connection:
+            cursor = connection.cursor()
+            
+            # Get database name
+            cursor.execute("SELECT DATABASE()")
+            current_db = cursor.fetchone()[0]
+            
+            # Get table count
+            cursor.execute("SHOW TABLES")
+            tables = cursor.fetchall()
+            table_count = len(tables)
+            
+            # Get database size and other details
+            cursor.execute("""
+                SELECT 
+                    table_schema,
+                    SUM(data_length + index_length) as total_size,
+                    SUM(data_length) as data_size,
+                    SUM(index_length) as index_size,
+                    COUNT(*) as table_count
+                FROM information_schema.tables 
+                WHERE table_schema = %s
+                GROUP BY table_schema
+            """, (current_db,))
+            
+            db_info = cursor.fetchone()
+            cursor.close()
+        
+        if db_info:
+            details = {
+                "database_name": db_info[0],
+                "table_count": db_info[4],
+                "total_size_bytes": db_info[1] if db_info[1] else 0,
+                "data_size_bytes": db_info[2] if db_info[2] else 0,
+                "index_size_bytes": db_info[3] if db_info[3] else 0,
+                "tables": [table[0] for table in tables]
+            }
+        else:
+            details = {
+                "database_name": current_db,
+                "table_count": table_count,
+                "total_size_bytes": 0,
+                "data_size_bytes": 0,
+                "index_size_bytes": 0,
+                "tables": [table[0] for table in tables]
+            }
+        
+        return format_result(details, f"Database details retrieved for '{current_db}'")
+    except Exception as e:
+        logger.error(f"Failed to get database details for '{database_name}': {e}")
+        return format_error(e, f"Failed to get database details for '{database_name}'")
+
+# Tool: Copy database
+@mcp.tool()
+@log_client_call
+def copy_database(source_database: str, target_database: str) -> Dict[str, Any]:
+    """
+    Creates a copy of an existing database.
+    
+    Args:
+        source_database: Name of the source database
+        target_database: Name of the target database
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not validate_table_name(source_database) or not validate_table_name(target_database):
+        return format_error("Invalid database name", "Database name contains invalid characters")
+    
+    try:
+        # Connect without specifying database
+        with get_mysql_connection_no_db() as connection:
+            cursor = connection.cursor()
+            
+            # Create target database
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{target_database}`")
+            
+            # Get all tables from source database
+            cursor.execute(f"SHOW TABLES FROM `{source_database}`")
+            tables = cursor.fetchall()
+            
+            copied_tables = []
+            for table in tables:
+                table_name = table[0]
+                
+                # Get table structure
+                cursor.execute(f"SHOW CREATE TABLE `{source_database}`.`{table_name}`")
+                create_table_sql = cursor.fetchone()[1]
+                
+                # Create table in target database
+                create_table_sql = create_table_sql.replace(f"`{source_database}`.", "")
+                cursor.execute(f"USE `{target_database}`")
+                cursor.execute(create_table_sql)
+                
+                # Copy data
+                cursor.execute(f"INSERT INTO `{target_database}`.`{table_name}` SELECT * FROM `{source_database}`.`{table_name}`")
+                copied_tables.append(table_name)
+            
+            cursor.close()
+            
+            return format_result({
+                "source_database": source_database,
+                "target_database": target_database,
+                "copied_tables": copied_tables,
+                "table_count": len(copied_tables)
+            }, f"Successfully copied database '{source_database}' to '{target_database}'")
+    except Exception as e:
+        logger.error(f"Failed to copy database '{source_database}' to '{target_database}': {e}")
+        return format_error(e, f"Failed to copy database '{source_database}' to '{target_database}'")
+
+# Tool: Rename database
+@mcp.tool()
+@log_client_call
+def rename_database(old_name: str, new_name: str) -> Dict[str, Any]:
+    """
+    Renames a database by creating a copy and dropping the original.
+    
+    Args:
+        old_name: Current name of the database
+        new_name: New name for the database
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not validate_table_name(old_name) or not validate_table_name(new_name):
+        return format_error("Invalid database name", "Database name contains invalid characters")
+    
+    try:
+        # First copy the database
+        copy_result = copy_database(old_name, new_name)
+        if copy_result['status'] == 'error':
+            return copy_result
+        
+        # Then delete the old database
+        delete_result = delete_database(old_name, force=True)
+        if delete_result['status'] == 'error':
+            return delete_result
+        
+        return format_result({
+            "old_name": old_name,
+            "new_name": new_name
+        }, f"Successfully renamed database '{old_name}' to '{new_name}'")
+    except Exception as e:
+        logger.error(f"Failed to rename database '{old_name}' to '{new_name}': {e}")
+        return format_error(e, f"Failed to rename database '{old_name}' to '{new_name}'")
+
+# Tool: Get current database
+@mcp.tool()
+@log_client_call
+def get_current_database() -> Dict[str, Any]:
+    """
+    Gets the name of the currently selected database.
+    
+    Returns:
+        Dict containing current database name
+    """
+    try:
+        return format_result({
+            "current_database": CURRENT_DATABASE,
+            "current_datasource": CURRENT_DATASOURCE
+        }, f"Current database is '{CURRENT_DATABASE if CURRENT_DATABASE else 'None (no database selected)'}'")
+    except Exception as e:
+        logger.error(f"Failed to get current database: {e}")
+        return format_error(e, "Failed to get current database")
+
+# Tool: Switch datasource
+@mcp.tool()
+@log_client_call
+def switch_datasource(datasource_name: str) -> Dict[str, Any]:
+    """
+    Switches to a different configured datasource (MySQL server or cluster).
+    
+    Args:
+        datasource_name: Name of the datasource to switch to (see list_datasources)
+        
+    Returns:
+        Dict containing operation status
+    """
+    global CURRENT_DATASOURCE, CURRENT_DATABASE
+    
+    if datasource_name not in DATASOURCES:
+        return format_error(f"Unknown datasource '{datasource_name}'", f"Configured datasources: {', '.join(DATASOURCES)}")
+    
+    try:
+        # Test connection to the new datasource before switching
+        database = DATASOURCES[datasource_name].get('database')
+        with get_mysql_connection(database, datasource_name) as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT VERSION()")
+            version = cursor.fetchone()[0]
+            cursor.close()
+        
+        previous_datasource, previous_database = CURRENT_DATASOURCE, CURRENT_DATABASE
+        CURRENT_DATASOURCE = datasource_name
+        CURRENT_DATABASE = database
+        
+        return format_result({
+            "previous_datasource": previous_datasource,
+            "previous_database": previous_database,
+            "current_datasource": datasource_name,
+            "current_database": database,
+            "server_version": version
+        }, f"Successfully switched to datasource '{datasource_name}'")
+    except Exception as e:
+        logger.error(f"Failed to switch to datasource '{datasource_name}': {e}")
+        return format_error(e, f"Failed to switch to datasource '{datasource_name}'")
+
+# Tool: List datasources
+@mcp.tool()
+@log_client_call
+def list_datasources(check: bool = False) -> Dict[str, Any]:
+    """
+    Lists the configured datasources with their connection pool and health statistics.
+    
+    Args:
+        check: Ping every datasource to refresh its health and latency
+        
+    Returns:
+        Dict containing the datasources
+    """
+    try:
+        if check:
+            for datasource in DATASOURCES:
+                start = time.perf_counter()
+                try:
+                    with get_mysql_connection_no_db(datasource) as connection:
+                        cursor = connection.cursor()
+                        cursor.execute("SELECT 1")
+                        cursor.fetchall()
+                        cursor.close()
+                    DATASOURCE_HEALTH[datasource] = {"healthy": True, "latency_ms": round((time.perf_counter() - start) * 1000, 3),
+                                                     "error": None, "checked_at": datetime.now().isoformat()}
+                except Exception as e:
+                    DATASOURCE_HEALTH[datasource] = {"healthy": False, "latency_ms": None,
+                                                     "error": str(e), "checked_at": datetime.now().isoformat()}
+        
+        datasources = get_datasource_stats()
+        return format_result({
+            "current_datasource": CURRENT_DATASOURCE,
+            "datasources": datasources,
+            "count": len(datasources)
+        }, f"Found {len(datasources)} datasources")
+    except Exception as e:
+        logger.error(f"Failed to list datasources: {e}")
+        return format_error(e, "Failed to list datasources")
+
+# Tool: Delete table
+@mcp.tool()
+@log_client_call
+def delete_table(table_name: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Deletes a table from the current database.
+    
+    Args:
+        table_name: Name of the table to delete
+        force: If True, drops the table even if it doesn't exist (default: False)
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            if force:
+                query = f"DROP TABLE IF EXISTS `{table_name}`"
+            else:
+                query = f"DROP TABLE `{table_name}`"
+            
+            cursor.execute(query)
+            cursor.close()
+            
+            return format_result({
+                "table_name": table_name,
+                "force": force,
+                "database": CURRENT_DATABASE
+            }, f"Table '{table_name}' deleted successfully from database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to delete table '{table_name}': {e}")
+        return format_error(e, f"Failed to delete table '{table_name}'")
+
+# Tool: Truncate table
+@mcp.tool()
+@log_client_call
+def truncate_table(table_name: str) -> Dict[str, Any]:
+    """
+    Truncates a table (removes all data but keeps the structure).
+    
+    Args:
+        table_name: Name of the table to truncate
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Get row count before truncation
+            cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
+            row_count = cursor.fetchone()[0]
+            
+            # Truncate the table
+            cursor.execute(f"TRUNCATE TABLE `{table_name}`")
+            cursor.close()
+            
+            return format_result({
+                "table_name": table_name,
+                "rows_removed": row_count,
+                "database": CURRENT_DATABASE
+            }, f"Table '{table_name}' truncated successfully, removed {row_count} rows from database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to truncate table '{table_name}': {e}")
+        return format_error(e, f"Failed to truncate table '{table_name}'")
+
+# Online schema change helpers
+ONLINE_DDL_UNSUPPORTED_ERRNOS = (
+    errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED,
+    errorcode.ER_ALTER_OPERATION_NOT_SUPPORTED_REASON
+)
+
+def get_online_alter_candidates() -> List[Dict[str, Optional[str]]]:
+    """Return the ALGORITHM/LOCK combinations to request, in order of preference"""
+    candidates = []
+    if ONLINE_DDL_CONFIG['try_instant']:
+        candidates.append({"algorithm": "INSTANT", "lock": None})
+    if ONLINE_DDL_CONFIG['try_inplace']:
+        candidates.append({"algorithm": "INPLACE", "lock": "NONE"})
+    return candidates
+
+def build_algorithm_clause(candidate: Dict[str, Optional[str]]) -> str:
+    """Build the ', ALGORITHM=..., LOCK=...' suffix for an ALTER TABLE statement"""
+    clause = f", ALGORITHM={candidate['algorithm']}"
+    if candidate['lock']:
+        clause += f", LOCK={candidate['lock']}"
+    return clause
+
+def get_primary_key_columns(cursor, table_name: str) -> List[str]:
+    """Get the primary key columns of a table in the current database, in index order"""
+    cursor.execute("""
+        SELECT column_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = 'PRIMARY'
+        ORDER BY seq_in_index
+    """, (table_name,))
+    return [row[0] for row in cursor.fetchall()]
+
+def get_column_names(cursor, table_name: str) -> List[str]:
+    """Get the column names of a table in the current database, in ordinal order"""
+    cursor.execute("""
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s
+        ORDER BY ordinal_position
+    """, (table_name,))
+    return [row[0] for row in cursor.fetchall()]
+
+def get_foreign_keys(cursor, table_name: str) -> List[Dict[str, str]]:
+    """Foreign keys declared on a table or referencing it, in the current database"""
+    cursor.execute("""
+        SELECT constraint_name, table_name, referenced_table_name
+        FROM information_schema.referential_constraints
+        WHERE constraint_schema = DATABASE() AND (table_name = %s OR referenced_table_name = %s)
+        ORDER BY table_name, constraint_name
+    """, (table_name, table_name))
+    return [{"name": row[0], "table": row[1], "referenced_table": row[2]} for row in cursor.fetchall()]
+
+def get_table_triggers(cursor, table_name: str) -> List[str]:
+    """Names of the triggers defined on a table in the current database"""
+    cursor.execute("""
+        SELECT trigger_name FROM information_schema.triggers
+        WHERE trigger_schema = DATABASE() AND event_object_table = %s ORDER BY action_order
+    """, (table_name,))
+    return [row[0] for row in cursor.fetchall()]
+
+def get_existing_tables(cursor, table_names: List[str]) -> List[str]:
+    """Those of the given names that are tables or views in the current database"""
+    placeholders = ", ".join(["%s"] * len(table_names))
+    cursor.execute(f"SELECT table_name FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name IN ({placeholders})",
+                   tuple(table_names))
+    wanted = {name.lower() for name in table_names}
+    return [row[0] for row in cursor.fetchall() if str(row[0]).lower() in wanted]
+
+def ensure_helper_tables_free(cursor, table_name: str, helper_tables: List[str]) -> None:
+    """Refuse to work on a table whose helper table names are already taken, instead of dropping those tables"""
+    existing = get_existing_tables(cursor, helper_tables)
+    if existing:
+        raise ValueError(f"Table(s) {', '.join(existing)} already exist; online ALTER of '{table_name}' needs these names "
+                         f"for its helper tables, rename or drop them first")
+
+def probe_online_alter(cursor, table_name: str, alter_clause: str, allow_foreign_keys: bool = False) -> Dict[str, Any]:
+    """
+    Determine which online algorithm MySQL would accept for an ALTER TABLE without touching the table.
+    
+    The ALTER is tried against an empty copy created with CREATE TABLE ... LIKE, so the check
+    is instant regardless of table size. MySQL validates ALGORITHM/LOCK before doing any work.
+    The real table can still be refused an algorithm the copy accepted (row format history,
+    FULLTEXT indexes, partitioning); the real ALTER requests the algorithm explicitly, so that
+    case fails or falls back as configured instead of silently copying the table.
+    """
+    probe_table = f"_{table_name}_ddlprobe"[:64]
+    plan = {"algorithm": "COPY", "lock": "SHARED", "online": False}
+    ensure_helper_tables_free(cursor, table_name, [probe_table])
+    cursor.execute(f"CREATE TABLE `{probe_table}` LIKE `{table_name}`")
+    try:
+        for candidate in get_online_alter_candidates():
+            try:
+                cursor.execute(f"ALTER TABLE `{probe_table}` {alter_clause}{build_algorithm_clause(candidate)}")
+            except Error as e:
+                if e.errno in ONLINE_DDL_UNSUPPORTED_ERRNOS:
+                    logger.debug(f"ALGORITHM={candidate['algorithm']} not supported for `{table_name}`: {e}")
+                    # The failed ALTER leaves the probe table unchanged, so the next candidate starts clean
+                    continue
+                raise
+            plan = {"algorithm": candidate['algorithm'], "lock": candidate['lock'] or "DEFAULT", "online": True}
+            break
+    finally:
+        cursor.execute(f"DROP TABLE IF EXISTS `{probe_table}`")
+    
+    primary_key = get_primary_key_columns(cursor, table_name)
+    foreign_keys = get_foreign_keys(cursor, table_name)
+    triggers = get_table_triggers(cursor, table_name)
+    plan["probe"] = "empty_copy"
+    plan["note"] = "Probed on an empty CREATE TABLE ... LIKE copy; the real table may still be refused this algorithm"
+    plan["shadow_copy_available"] = bool(primary_key) and (allow_foreign_keys or not foreign_keys) and not triggers
+    plan["primary_key"] = primary_key
+    plan["foreign_keys"] = foreign_keys
+    plan["triggers"] = triggers
+    return plan
+
+def shadow_copy_alter(cursor, table_name: str, alter_clause: str, allow_foreign_keys: bool = False) -> Dict[str, Any]:
+    """
+    Apply an ALTER TABLE through a shadow table without blocking writes.
+    
+    The new definition is applied to an empty copy, triggers on the original table keep the copy
+    in sync while existing rows are copied in primary key chunks, and the two tables are then
+    swapped with a single atomic RENAME TABLE.
+    
+    CREATE TABLE ... LIKE does not copy foreign keys, and the RENAME leaves foreign keys of other
+    tables pointing at the old table, so tables involved in foreign keys are refused unless
+    allow_foreign_keys is set; the lost constraints are then listed in the result. Tables with
+    triggers of their own are always refused: the RENAME would leave them on the old table.
+    Existing tables with the helper names (_<table>_new, _<table>_old) are never dropped.
+    """
+    primary_key = get_primary_key_columns(cursor, table_name)
+    if not primary_key:
+        raise ValueError(f"Table '{table_name}' has no primary key; shadow-table migration requires one")
+    foreign_keys = get_foreign_keys(cursor, table_name)
+    if foreign_keys and not allow_foreign_keys:
+        names = ", ".join(f"{fk['table']}.{fk['name']}" for fk in foreign_keys)
+        raise ValueError(f"Table '{table_name}' is involved in foreign keys ({names}) that a shadow-table migration would drop "
+                         f"or leave pointing at the old table; pass allow_foreign_keys=True to proceed anyway")
+    table_triggers = get_table_triggers(cursor, table_name)
+    if table_triggers:
+        raise ValueError(f"Table '{table_name}' has triggers ({', '.join(table_triggers)}) that a shadow-table migration "
+                         f"would leave on the old table; drop and recreate them around a blocking ALTER instead")
+    
+    shadow_table = f"_{table_name}_new"[:64]
+    old_table = f"_{table_name}_old"[:64]
+    triggers = {event: f"_{table_name}_osc_{event.lower()}"[:64] for event in ("INSERT", "UPDATE", "DELETE")}
+    created_triggers = []
+    ensure_helper_tables_free(cursor, table_name, [shadow_table, old_table])
+    
+    cursor.execute(f"CREATE TABLE `{shadow_table}` LIKE `{table_name}`")
+    try:
+        cursor.execute(f"ALTER TABLE `{shadow_table}` {alter_clause}")
+        
+        # Only columns present on both sides are carried over; added columns take their defaults
+        shadow_columns = set(get_column_names(cursor, shadow_table))
+        columns = [col for col in get_column_names(cursor, table_name) if col in shadow_columns]
+        missing_key = [col for col in primary_key if col not in shadow_columns]
+        if missing_key:
+            raise ValueError(f"Primary key column(s) {missing_key} would be removed; shadow-table migration requires a stable primary key")
+        
+        column_list = ", ".join(f"`{col}`" for col in columns)
+        key_list = ", ".join(f"`{col}`" for col in primary_key)
+        new_values = ", ".join(f"NEW.`{col}`" for col in columns)
+        old_key_match = " AND ".join(f"`{col}` = OLD.`{col}`" for col in primary_key)
+        
+        # Triggers replay concurrent writes onto the shadow table while the copy is in progress
+        cursor.execute(f"""
+            CREATE TRIGGER `{triggers['INSERT']}` AFTER INSERT ON `{table_name}` FOR EACH ROW
+            REPLACE INTO `{shadow_table}` ({column_list}) VALUES ({new_values})
+        """)
+        created_triggers.append(triggers['INSERT'])
+        cursor.execute(f"""
+            CREATE TRIGGER `{triggers['UPDATE']}` AFTER UPDATE ON `{table_name}` FOR EACH ROW
+            BEGIN
+                DELETE IGNORE FROM `{shadow_table}` WHERE {old_key_match};
+                REPLACE INTO `{shadow_table}` ({column_list}) VALUES ({new_values});
+            END
+        """)
+        created_triggers.append(triggers['UPDATE'])
+        cursor.execute(f"""
+            CREATE TRIGGER `{triggers['DELETE']}` AFTER DELETE ON `{table_name}` FOR EACH ROW
+            DELETE IGNORE FROM `{shadow_table}` WHERE {old_key_match}
+        """)
+        created_triggers.append(triggers['DELETE'])
+        
+        # Copy existing rows in primary key order, one bounded chunk at a time
+        chunk_size = ONLINE_DDL_CONFIG['shadow_chunk_size']
+        key_placeholders = ", ".join(["%s"] * len(primary_key))
+        copied_rows = 0
+        chunks = 0
+        lower_bound = None
+        while True:
+            lower_clause = f"WHERE ({key_list}) > ({key_placeholders})" if lower_bound else ""
+            cursor.execute(
+                f"SELECT {key_list} FROM `{table_name}` {lower_clause} ORDER BY {key_list} LIMIT 1 OFFSET {chunk_size - 1}",
+                lower_bound
+            )
+            upper_bound = cursor.fetchone()
+            
+            conditions = []
+            params = []
+            if lower_bound:
+                conditions.append(f"({key_list}) > ({key_placeholders})")
+                params.extend(lower_bound)
+            if upper_bound:
+                conditions.append(f"({key_list}) <= ({key_placeholders})")
+                params.extend(upper_bound)
+            where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+            
+            cursor.execute(
+                f"INSERT IGNORE INTO `{shadow_table}` ({column_list}) "
+                f"SELECT {column_list} FROM `{table_name}` {where_clause} LOCK IN SHARE MODE",
+                tuple(params) or None
+            )
+            copied_rows += max(cursor.rowcount, 0)
+            chunks += 1
+            
+            if not upper_bound:
+                break
+            lower_bound = tuple(upper_bound)
+            if ONLINE_DDL_CONFIG['shadow_chunk_pause']:
+                time.sleep(ONLINE_DDL_CONFIG['shadow_chunk_pause'])
+        
+        # Atomic swap; the triggers follow the original table to its new name. RENAME fails
+        # rather than overwrite an _old table created since the check above
+        cursor.execute(f"RENAME TABLE `{table_name}` TO `{old_table}`, `{shadow_table}` TO `{table_name}`")
+    except Exception:
+        # Only what this migration created is dropped
+        for trigger in created_triggers:
+            cursor.execute(f"DROP TRIGGER IF EXISTS `{trigger}`")
+        cursor.execute(f"DROP TABLE IF EXISTS `{shadow_table}`")
+        raise
+    
+    for trigger in created_triggers:
+        cursor.execute(f"DROP TRIGGER IF EXISTS `{trigger}`")
+    if ONLINE_DDL_CONFIG['drop_old_table']:
+        cursor.execute(f"DROP TABLE IF EXISTS `{old_table}`")
+    
+    return {
+        "method": "shadow_copy",
+        "algorithm": "SHADOW_COPY",
+        "lock": "NONE",
+        "copied_rows": copied_rows,
+        "chunks": chunks,
+        "old_table": None if ONLINE_DDL_CONFIG['drop_old_table'] else old_table,
+        "foreign_keys_lost": foreign_keys
+    }
+
+def execute_online_alter(cursor, table_name: str, alter_clause: str, dry_run: bool = False, shadow_copy: bool = False,
+                         allow_foreign_keys: bool = False) -> Dict[str, Any]:
+    """
+    Run ALTER TABLE with the least blocking algorithm available.
+    
+    Requests ALGORITHM=INSTANT, then ALGORITHM=INPLACE with LOCK=NONE. If neither is accepted the
+    change is applied through a shadow table when shadow_copy is set, or with a plain ALTER TABLE
+    when blocking fallbacks are allowed by ONLINE_DDL_CONFIG.
+    """
+    if dry_run:
+        plan = probe_online_alter(cursor, table_name, alter_clause, allow_foreign_keys)
+        if plan['online']:
+            plan['method'] = "online"
+        elif shadow_copy and plan['shadow_copy_available']:
+            plan['method'] = "shadow_copy"
+        elif ONLINE_DDL_CONFIG['allow_blocking_fallback']:
+            plan['method'] = "blocking"
+        else:
+            plan['method'] = "rejected"
+        return plan
+    
+    for candidate in get_online_alter_candidates():
+        try:
+            cursor.execute(f"ALTER TABLE `{table_name}` {alter_clause}{build_algorithm_clause(candidate)}")
+        except Error as e:
+            if e.errno in ONLINE_DDL_UNSUPPORTED_ERRNOS:
+                logger.info(f"ALGORITHM={candidate['algorithm']} not supported for `{table_name}`: {e}")
+                continue
+            raise
+        return {"method": "online", "algorithm": candidate['algorithm'], "lock": candidate['lock'] or "DEFAULT"}
+    
+    if shadow_copy:
+        return shadow_copy_alter(cursor, table_name, alter_clause, allow_foreign_keys)
+    
+    if not ONLINE_DDL_CONFIG['allow_blocking_fallback']:
+        raise ValueError("No online algorithm is available for this change and blocking ALTER TABLE is disabled; retry with shadow_copy=True")
+    
+    cursor.execute(f"ALTER TABLE `{table_name}` {alter_clause}")
+    return {"method": "blocking", "algorithm": "DEFAULT", "lock": "DEFAULT"}
+
+# Tool: Add column to table
+@mcp.tool()
+@log_client_call
+def add_column(table_name: str, column_name: str, column_type: str, constraints: List[str] = None, default_value: Any = None, after_column: str = None, dry_run: bool = False, shadow_copy: bool = False, allow_foreign_keys: bool = False) -> Dict[str, Any]:
+    """
+    Adds a new column to an existing table.
+    
+    The change is requested with ALGORITHM=INSTANT, then ALGORITHM=INPLACE, LOCK=NONE.
+    
+    Args:
+        table_name: Name of the table to modify
+        column_name: Name of the new column
+        column_type: Data type of the new column
+        constraints: List of constraints (e.g., ['NOT NULL', 'UNIQUE'])
+        default_value: Default value for the column
+        after_column: Name of the column to place the new column after (optional)
+        dry_run: If True, only report which algorithm would be used without changing the table
+        shadow_copy: If True, fall back to a shadow-table online migration when no online algorithm applies
+        allow_foreign_keys: If True, allow the shadow-table migration on a table involved in foreign keys (they are not carried over)
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    if not validate_table_name(column_name):
+        return format_error("Invalid column name", "Column name contains invalid characters")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Build ALTER TABLE clause
+            alter_clause = f"ADD COLUMN `{column_name}` {column_type}"
+            
+            # Add constraints
+            if constraints and isinstance(constraints, list):
+                for constraint in constraints:
+                    if isinstance(constraint, str):
+                        alter_clause += f" {constraint}"
+            
+            # Add default value
+            if default_value is not None:
+                if isinstance(default_value, str):
+                    alter_clause += f" DEFAULT '{default_value}'"
+                else:
+                    alter_clause += f" DEFAULT {default_value}"
+            
+            # Add position
+            if after_column and validate_table_name(after_column):
+                alter_clause += f" AFTER `{after_column}`"
+            
+            alter_result = execute_online_alter(cursor, table_name, alter_clause, dry_run=dry_run, shadow_copy=shadow_copy,
+                                                allow_foreign_keys=allow_foreign_keys)
+            cursor.close()
+            
+            if dry_run:
+                return format_result({
+                    "table_name": table_name,
+                    "column_name": column_name,
+                    "plan": alter_result,
+                    "database": CURRENT_DATABASE
+                }, f"Adding column '{column_name}' to table '{table_name}' would use method '{alter_result['method']}' (ALGORITHM={alter_result['algorithm']})")
+            
+            return format_result({
+                "table_name": table_name,
+                "column_name": column_name,
+                "column_type": column_type,
+                "constraints": constraints or [],
+                "default_value": default_value,
+                "after_column": after_column,
+                "online_ddl": alter_result,
+                "database": CURRENT_DATABASE
+            }, f"Column '{column_name}' added successfully to table '{table_name}' in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to add column '{column_name}' to table '{table_name}': {e}")
+        return format_error(e, f"Failed to add column '{column_name}' to table '{table_name}'")
+
+# Tool: Drop column from table
+@mcp.tool()
+@log_client_call
+def drop_column(table_name: str, column_name: str, dry_run: bool = False, shadow_copy: bool = False, allow_foreign_keys: bool = False) -> Dict[str, Any]:
+    """
+    Removes a column from an existing table.
+    
+    The change is requested with ALGORITHM=INSTANT, then ALGORITHM=INPLACE, LOCK=NONE.
+    
+    Args:
+        table_name: Name of the table to modify
+        column_name: Name of the column to remove
+        dry_run: If True, only report which algorithm would be used without changing the table
+        shadow_copy: If True, fall back to a shadow-table online migration when no online algorithm applies
+        allow_foreign_keys: If True, allow the shadow-table migration on a table involved in foreign keys (they are not carried over)
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    if not validate_table_name(column_name):
+        return format_error("Invalid column name", "Column name contains invalid characters")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Build ALTER TABLE clause
+            alter_clause = f"DROP COLUMN `{column_name}`"
+            
+            alter_result = execute_online_alter(cursor, table_name, alter_clause, dry_run=dry_run, shadow_copy=shadow_copy,
+                                                allow_foreign_keys=allow_foreign_keys)
+            cursor.close()
+            
+            if dry_run:
+                return format_result({
+                    "table_name": table_name,
+                    "column_name": column_name,
+                    "plan": alter_result,
+                    "database": CURRENT_DATABASE
+                }, f"Dropping column '{column_name}' from table '{table_name}' would use method '{alter_result['method']}' (ALGORITHM={alter_result['algorithm']})")
+            
+            return format_result({
+                "table_name": table_name,
+                "column_name": column_name,
+                "online_ddl": alter_result,
+                "database": CURRENT_DATABASE
+            }, f"Column '{column_name}' dropped successfully from table '{table_name}' in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to drop column '{column_name}' from table '{table_name}': {e}")
+        return format_error(e, f"Failed to drop column '{column_name}' from table '{table_name}'")
+
+# Tool: Modify column in table
+@mcp.tool()
+@log_client_call
+def modify_column(table_name: str, column_name: str, new_type: str, new_constraints: List[str] = None, new_default: Any = None, dry_run: bool = False, shadow_copy: bool = False, allow_foreign_keys: bool = False) -> Dict[str, Any]:
+    """
+    Modifies an existing column in a table.
+    
+    The change is requested with ALGORITHM=INSTANT, then ALGORITHM=INPLACE, LOCK=NONE.
+    
+    Args:
+        table_name: Name of the table to modify
+        column_name: Name of the column to modify
+        new_type: New data type for the column
+        new_constraints: New constraints for the column
+        new_default: New default value for the column
+        dry_run: If True, only report which algorithm would be used without changing the table
+        shadow_copy: If True, fall back to a shadow-table online migration when no online algorithm applies
+        allow_foreign_keys: If True, allow the shadow-table migration on a table involved in foreign keys (they are not carried over)
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    if not validate_table_name(column_name):
+        return format_error("Invalid column name", "Column name contains invalid characters")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Build ALTER TABLE clause
+            alter_clause = f"MODIFY COLUMN `{column_name}` {new_type}"
+            
+            # Add constraints
+            if new_constraints and isinstance(new_constraints, list):
+                for constraint in new_constraints:
+                    if isinstance(constraint, str):
+                        alter_clause += f" {constraint}"
+            
+            # Add default value
+            if new_default is not None:
+                if isinstance(new_default, str):
+                    alter_clause += f" DEFAULT '{new_default}'"
+                else:
+                    alter_clause += f" DEFAULT {new_default}"
+            
+            alter_result = execute_online_alter(cursor, table_name, alter_clause, dry_run=dry_run, shadow_copy=shadow_copy,
+                                                allow_foreign_keys=allow_foreign_keys)
+            cursor.close()
+            
+            if dry_run:
+                return format_result({
+                    "table_name": table_name,
+                    "column_name": column_name,
+                    "plan": alter_result,
+                    "database": CURRENT_DATABASE
+                }, f"Modifying column '{column_name}' in table '{table_name}' would use method '{alter_result['method']}' (ALGORITHM={alter_result['algorithm']})")
+            
+            return format_result({
+                "table_name": table_name,
+                "column_name": column_name,
+                "new_type": new_type,
+                "new_constraints": new_constraints or [],
+                "new_default": new_default,
+                "online_ddl": alter_result,
+                "database": CURRENT_DATABASE
+            }, f"Column '{column_name}' modified successfully in table '{table_name}' in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to modify column '{column_name}' in table '{table_name}': {e}")
+        return format_error(e, f"Failed to modify column '{column_name}' in table '{table_name}'")
+
+# Tool: Rename table
+@mcp.tool()
+@log_client_call
+def rename_table(old_table_name: str, new_table_name: str) -> Dict[str, Any]:
+    """
+    Renames a table in the current database.
+    
+    Args:
+        old_table_name: Current name of the table
+        new_table_name: New name for the table
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(old_table_name):
+        return format_error("Invalid old table name", "Old table name contains invalid characters")
+    
+    if not validate_table_name(new_table_name):
+        return format_error("Invalid new table name", "New table name contains invalid characters")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            
+            # Build RENAME TABLE statement
+            rename_sql = f"RENAME TABLE `{old_table_name}` TO `{new_table_name}`"
+            
+            cursor.execute(rename_sql)
+            cursor.close()
+            
+            return format_result({
+                "old_table_name": old_table_name,
+                "new_table_name": new_table_name,
+                "database": CURRENT_DATABASE
+            }, f"Table '{old_table_name}' renamed successfully to '{new_table_name}' in database '{CURRENT_DATABASE}'")
     except Exception as e:
-        logger.error(f"Failed to create database '{database_name}': {e}")
-        return format_error(e, f"Failed to create database '{database_name}'")
+        logger.error(f"Failed to rename table '{old_table_name}' to '{new_table_name}': {e}")
+        return format_error(e, f"Failed to rename table '{old_table_name}' to '{new_table_name}'")
 
-# Tool: Delete database
-@log_client_call
+# Tool: Get table indexes
 @mcp.tool()
-def delete_database(database_name: str, force: bool = False) -> Dict[str, Any]:
+@log_client_call
+def get_table_indexes(table_name: str) -> Dict[str, Any]:
     """
-    Deletes a database.
+    Gets information about indexes on the specified table.
     
     Args:
-        database_name: Name of the database to delete
-        force: If True, drops the database even if it doesn't exist (default: False)
+        table_name: Name of the table to get indexes for
         
     Returns:
-        Dict containing operation status
+        Dict containing index information
     """
-    if not validate_table_name(database_name):
-        return format_error("Invalid database name", "Database name contains invalid characters")
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
     
-    # Check if it's a protected database
-    if database_name.lower() in SECURITY_CONFIG['protected_databases']:
-        if not DB_MANAGEMENT_CONFIG['allow_system_db_operations']:
-            return format_error("Cannot delete system database", f"Database '{database_name}' is a system database and cannot be deleted")
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
     
     try:
-        # Create backup before deletion if configured
-        backup_created = False
-        if DB_MANAGEMENT_CONFIG['backup_before_delete'] and not force:
-            backup_name = f"{database_name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            backup_result = copy_database(database_name, backup_name)
-            if backup_result['status'] == 'success':
-                backup_created = True
-                logger.info(f"Backup created: {backup_name}")
-        
-        # Connect without specifying database
-        with get_mysql_connection_no_db() as connection:
+        with get_mysql_connection() as connection:
             cursor = connection.cursor()
             
-            if force:
-                query = f"DROP DATABASE IF EXISTS `{database_name}`"
+            # Get index information
+            cursor.execute(f"SHOW INDEX FROM `{table_name}`")
+            indexes = cursor.fetchall()
+            cursor.close()
+            
+            # Process index information
+            index_info = {}
+            for row in indexes:
+                index_name = row[2]
+                if index_name not in index_info:
+                    index_info[index_name] = {
+                        "name": index_name,
+                        "type": "UNIQUE" if row[1] == 0 else "NONUNIQUE",
+                        "columns": []
+                    }
+                
+                index_info[index_name]["columns"].append({
+                    "column_name": row[4],
+                    "seq_in_index": row[3],
+                    "collation": row[5],
+                    "cardinality": row[6],
+                    "sub_part": row[7],
+                    "packed": row[8],
+                    "null": row[9],
+                    "index_type": row[10]
+                })
+            
+            return format_result({
+                "table_name": table_name,
+                "indexes": list(index_info.values()),
+                "index_count": len(index_info),
+                "database": CURRENT_DATABASE
+            }, f"Retrieved {len(index_info)} indexes for table '{table_name}' in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to get indexes for table '{table_name}': {e}")
+        return format_error(e, f"Failed to get indexes for table '{table_name}'")
+
+# Index audit helpers
+def get_index_definitions(cursor, table_name: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Get index definitions of one table, or all tables, in the current database from information_schema.STATISTICS"""
+    query = """
+        SELECT table_name, index_name, non_unique, column_name, sub_part, index_type
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+    """
+    params = None
+    if table_name:
+        query += " AND table_name = %s"
+        params = (table_name,)
+    query += " ORDER BY table_name, index_name, seq_in_index"
+    cursor.execute(query, params)
+    
+    tables: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for table, index_name, non_unique, column_name, sub_part, index_type in cursor.fetchall():
+        index = tables.setdefault(table, {}).setdefault(index_name, {
+            "name": index_name,
+            "unique": non_unique == 0,
+            "index_type": index_type,
+            "columns": []
+        })
+        # Prefix lengths are part of the definition: (name(10)) does not cover (name)
+        index["columns"].append(f"{column_name}({sub_part})" if sub_part else column_name)
+    return tables
+
+def find_redundant_indexes(indexes: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Find duplicate and left-prefix-redundant indexes among the indexes of one table"""
+    findings = []
+    names = sorted(indexes, key=lambda n: (n != "PRIMARY", not indexes[n]["unique"], n))
+    for name in names:
+        index = indexes[name]
+        if name == "PRIMARY":
+            continue
+        for other_name in names:
+            other = indexes[other_name]
+            if other_name == name or other["index_type"] != index["index_type"]:
+                continue
+            if index["index_type"] in ("FULLTEXT", "SPATIAL") and other["columns"] != index["columns"]:
+                continue
+            
+            if other["columns"] == index["columns"]:
+                # Keep the stronger (primary/unique) definition, or the first by name when equal
+                if names.index(other_name) > names.index(name):
+                    continue
+                kind = "duplicate"
+            elif other["columns"][:len(index["columns"])] == index["columns"]:
+                # A unique prefix still enforces a constraint the longer index does not
+                if index["unique"]:
+                    continue
+                kind = "redundant_prefix"
             else:
-                query = f"DROP DATABASE `{database_name}`"
+                continue
             
-            cursor.execute(query)
+            findings.append({
+                "index_name": name,
+                "columns": index["columns"],
+                "kind": kind,
+                "covered_by": other_name,
+                "covered_by_columns": other["columns"]
+            })
+            break
+    return findings
+
+def get_unused_indexes(cursor) -> Tuple[set, str]:
+    """Get (table, index) pairs with no recorded use since server start, from sys or performance_schema"""
+    try:
+        cursor.execute("""
+            SELECT object_name, index_name FROM sys.schema_unused_indexes
+            WHERE object_schema = DATABASE()
+        """)
+        return {(row[0], row[1]) for row in cursor.fetchall()}, "sys.schema_unused_indexes"
+    except Error as e:
+        logger.debug(f"sys.schema_unused_indexes not available, using performance_schema: {e}")
+    
+    cursor.execute("""
+        SELECT object_name, index_name
+        FROM performance_schema.table_io_waits_summary_by_index_usage
+        WHERE object_schema = DATABASE() AND index_name IS NOT NULL
+          AND index_name != 'PRIMARY' AND count_star = 0
+    """)
+    return {(row[0], row[1]) for row in cursor.fetchall()}, "performance_schema.table_io_waits_summary_by_index_usage"
+
+def get_index_sizes(cursor) -> Dict[Tuple[str, str], int]:
+    """Estimate index sizes in bytes from mysql.innodb_index_stats (empty if not readable)"""
+    try:
+        cursor.execute("""
+            SELECT table_name, index_name, stat_value * @@innodb_page_size
+            FROM mysql.innodb_index_stats
+            WHERE database_name = DATABASE() AND stat_name = 'size'
+        """)
+        return {(row[0], row[1]): int(row[2]) for row in cursor.fetchall()}
+    except Error as e:
+        logger.debug(f"Index sizes not available from mysql.innodb_index_stats: {e}")
+        return {}
+
+# Tool: Audit table indexes
+@mcp.tool()
+@log_client_call
+def audit_indexes(table_name: str = None, include_unused: bool = True) -> Dict[str, Any]:
+    """
+    Finds duplicate, left-prefix-redundant and unused indexes and suggests DROP INDEX statements.
+    
+    The suggested statements are only returned, never executed.
+    
+    Args:
+        table_name: Name of the table to audit (if None, audits every table in the current database)
+        include_unused: Whether to report indexes with no recorded use since server start
+        
+    Returns:
+        Dict containing findings, estimated sizes and suggested DROP INDEX statements
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if table_name and not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    try:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
             
+            tables = get_index_definitions(cursor, table_name)
+            sizes = get_index_sizes(cursor)
+            unused, unused_source = get_unused_indexes(cursor) if include_unused else (set(), None)
+            
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Uptime'")
+            uptime_row = cursor.fetchone()
             cursor.close()
+        
+        findings = []
+        for table, indexes in tables.items():
+            flagged = set()
+            for finding in find_redundant_indexes(indexes):
+                finding["table_name"] = table
+                findings.append(finding)
+                flagged.add(finding["index_name"])
             
-            result_data = {
-                "database_name": database_name,
-                "force": force
-            }
+            for index_name, index in indexes.items():
+                if (table, index_name) in unused and index_name != "PRIMARY" and index_name not in flagged:
+                    findings.append({
+                        "table_name": table,
+                        "index_name": index_name,
+                        "columns": index["columns"],
+                        # Unique indexes enforce constraints even when no query reads them
+                        "kind": "unused_unique" if index["unique"] else "unused"
+                    })
+        
+        drop_statements = []
+        for finding in findings:
+            finding["estimated_size_bytes"] = sizes.get((finding["table_name"], finding["index_name"]))
+            if finding["kind"] != "unused_unique":
+                drop_statements.append(f"ALTER TABLE `{finding['table_name']}` DROP INDEX `{finding['index_name']}`;")
+        
+        reclaimable = sum(f["estimated_size_bytes"] or 0 for f in findings if f["kind"] != "unused_unique")
+        
+        return format_result({
+            "findings": findings,
+            "finding_count": len(findings),
+            "estimated_reclaimable_bytes": reclaimable,
+            "drop_statements": drop_statements,
+            "unused_source": unused_source,
+            "server_uptime_seconds": int(uptime_row[1]) if uptime_row else None,
+            "tables_audited": len(tables),
+            "database": CURRENT_DATABASE
+        }, f"Found {len(findings)} index issues in {len(tables)} tables in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to audit indexes: {e}")
+        return format_error(e, "Failed to audit indexes")
+
+# Index build job tracking
+INDEX_BUILD_JOBS: Dict[str, Dict[str, Any]] = {}
+INDEX_BUILD_LOCK = threading.Lock()
+
+def register_index_build_job(table_name: str, index_name: str, create_sql: str, database: str, background: bool) -> Dict[str, Any]:
+    """Register a new index build job and prune the oldest finished jobs"""
+    job = {
+        "job_id": uuid.uuid4().hex[:12],
+        "table_name": table_name,
+        "index_name": index_name,
+        "database": database,
+        "datasource": CURRENT_DATASOURCE,
+        "sql": create_sql,
+        "background": background,
+        "status": "pending",
+        "algorithm": None,
+        "lock": None,
+        "connection_id": None,
+        "cancel_requested": False,
+        "error": None,
+        "created_at": datetime.now().isoformat(),
+        "started_at": None,
+        "finished_at": None,
+        "started_monotonic": None,
+        "duration_seconds": None
+    }
+    with INDEX_BUILD_LOCK:
+        INDEX_BUILD_JOBS[job['job_id']] = job
+        finished = [j for j in INDEX_BUILD_JOBS.values() if j['status'] not in ("pending", "running")]
+        for old_job in finished[:max(0, len(finished) - INDEX_BUILD_CONFIG['max_jobs_retained'])]:
+            del INDEX_BUILD_JOBS[old_job['job_id']]
+    return job
+
+# Settings the stage instruments had before the first running index build enabled them, per datasource
+STAGE_INSTRUMENT_STATE: Dict[str, Dict[str, Any]] = {}
+STAGE_INSTRUMENT_LOCK = threading.Lock()
+
+def enable_stage_instruments(cursor, datasource: str) -> bool:
+    """
+    Enable the InnoDB ALTER stage instruments and stage consumers (best effort, needs UPDATE on performance_schema).
+    
+    The settings are global, so the previous values are recorded by the first build that enables them
+    and put back by restore_stage_instruments when the last running build on the datasource finishes.
+    Returns whether the caller must call restore_stage_instruments.
+    """
+    with STAGE_INSTRUMENT_LOCK:
+        state = STAGE_INSTRUMENT_STATE.get(datasource)
+        if state:
+            state["users"] += 1
+            return True
+        try:
+            cursor.execute("SELECT NAME, ENABLED, TIMED FROM performance_schema.setup_instruments WHERE NAME LIKE 'stage/innodb/alter%'")
+            instruments = [row for row in cursor.fetchall() if (row[1], row[2]) != ("YES", "YES")]
+            cursor.execute("SELECT NAME, ENABLED FROM performance_schema.setup_consumers WHERE NAME LIKE 'events_stages_%'")
+            consumers = [row for row in cursor.fetchall() if row[1] != "YES"]
+            cursor.execute("UPDATE performance_schema.setup_instruments SET ENABLED = 'YES', TIMED = 'YES' WHERE NAME LIKE 'stage/innodb/alter%'")
+            cursor.execute("UPDATE performance_schema.setup_consumers SET ENABLED = 'YES' WHERE NAME LIKE 'events_stages_%'")
+        except Error as e:
+            logger.warning(f"Could not enable performance_schema stage instruments, progress will not be reported: {e}")
+            return False
+        STAGE_INSTRUMENT_STATE[datasource] = {"users": 1, "instruments": instruments, "consumers": consumers}
+        return True
+
+def restore_stage_instruments(datasource: str) -> None:
+    """Put back the stage instrument and consumer settings once no index build on the datasource needs them"""
+    with STAGE_INSTRUMENT_LOCK:
+        state = STAGE_INSTRUMENT_STATE[datasource]
+        state["users"] -= 1
+        if state["users"]:
+            return
+        del STAGE_INSTRUMENT_STATE[datasource]
+        try:
+            with get_mysql_connection_no_db(datasource) as connection:
+                cursor = connection.cursor()
+                for name, enabled, timed in state["instruments"]:
+                    cursor.execute("UPDATE performance_schema.setup_instruments SET ENABLED = %s, TIMED = %s WHERE NAME = %s", (enabled, timed, name))
+                for name, enabled in state["consumers"]:
+                    cursor.execute("UPDATE performance_schema.setup_consumers SET ENABLED = %s WHERE NAME = %s", (enabled, name))
+                cursor.close()
+        except Exception as e:
+            logger.warning(f"Could not restore performance_schema stage instrument settings on '{datasource}': {e}")
+
+def run_index_build(job: Dict[str, Any]) -> None:
+    """Execute an index build job on a dedicated connection, recording its outcome on the job"""
+    instruments_enabled = False
+    try:
+        with get_mysql_connection(job['database'], job['datasource'], read_timeout=INDEX_BUILD_CONFIG['read_timeout']) as connection:
+            cursor = connection.cursor()
+            job['connection_id'] = connection.connection_id
             
-            if backup_created:
-                result_data['backup_created'] = True
+            if INDEX_BUILD_CONFIG['enable_stage_instruments']:
+                instruments_enabled = enable_stage_instruments(cursor, job['datasource'])
             
-            return format_result(result_data, f"Database '{database_name}' deleted successfully")
+            job['status'] = "running"
+            job['started_at'] = datetime.now().isoformat()
+            job['started_monotonic'] = time.monotonic()
+            
+            executed = False
+            if INDEX_BUILD_CONFIG['online']:
+                try:
+                    cursor.execute(f"{job['sql']} ALGORITHM=INPLACE LOCK=NONE")
+                    job['algorithm'], job['lock'] = "INPLACE", "NONE"
+                    executed = True
+                except Error as e:
+                    if e.errno not in ONLINE_DDL_UNSUPPORTED_ERRNOS:
+                        raise
+                    logger.info(f"Online index build not supported for `{job['table_name']}`, using default algorithm: {e}")
+            
+            if not executed:
+                cursor.execute(job['sql'])
+                job['algorithm'], job['lock'] = "DEFAULT", "DEFAULT"
+            
+            cursor.close()
+            job['status'] = "completed"
     except Exception as e:
-        logger.error(f"Failed to delete database '{database_name}': {e}")
-        return format_error(e, f"Failed to delete database '{database_name}'")
+        if job['cancel_requested'] and isinstance(e, Error) and e.errno == errorcode.ER_QUERY_INTERRUPTED:
+            job['status'] = "cancelled"
+        else:
+            job['status'] = "failed"
+        job['error'] = str(e)
+        raise
+    finally:
+        if instruments_enabled:
+            restore_stage_instruments(job['datasource'])
+        job['connection_id'] = None
+        job['finished_at'] = datetime.now().isoformat()
+        if job['started_monotonic'] is not None:
+            job['duration_seconds'] = round(time.monotonic() - job['started_monotonic'], 3)
 
-# Tool: Switch database
+def run_index_build_in_background(job: Dict[str, Any]) -> None:
+    """Thread target for background index builds; failures are recorded on the job"""
+    try:
+        run_index_build(job)
+    except Exception as e:
+        logger.error(f"Background index build {job['job_id']} for '{job['index_name']}' on '{job['table_name']}' ended with status '{job['status']}': {e}")
+
+def get_index_build_progress(job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Read the current ALTER stage of a job's connection from performance_schema.events_stages_current"""
+    connection_id = job['connection_id']
+    with get_mysql_connection_no_db(job['datasource']) as connection:
+        cursor = connection.cursor()
+        cursor.execute("""
+            SELECT s.event_name, s.work_completed, s.work_estimated
+            FROM performance_schema.events_stages_current s
+            JOIN performance_schema.threads t ON t.thread_id = s.thread_id
+            WHERE t.processlist_id = %s
+        """, (connection_id,))
+        row = cursor.fetchone()
+        cursor.close()
+    
+    if not row:
+        return None
+    
+    stage, completed, estimated = row
+    progress = {"stage": stage, "work_completed": completed, "work_estimated": estimated, "percent": None}
+    if completed is not None and estimated:
+        progress["percent"] = round(100.0 * completed / estimated, 2)
+    return progress
+
+def snapshot_index_build_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the externally visible view of an index build job, including live progress and ETA"""
+    snapshot = {k: v for k, v in job.items() if k not in ("started_monotonic", "cancel_requested")}
+    if job['status'] != "running" or not job['connection_id']:
+        return snapshot
+    
+    elapsed = time.monotonic() - job['started_monotonic']
+    snapshot['elapsed_seconds'] = round(elapsed, 3)
+    try:
+        progress = get_index_build_progress(job)
+    except Exception as e:
+        logger.warning(f"Failed to read progress for index build {job['job_id']}: {e}")
+        progress = None
+    
+    snapshot['progress'] = progress
+    if progress and progress['percent']:
+        # Stage work units are roughly linear in time within an ALTER, so extrapolate from elapsed time
+        snapshot['eta_seconds'] = round(elapsed * (100.0 - progress['percent']) / progress['percent'], 1)
+    return snapshot
+
+# Tool: Create index on table
+@mcp.tool()
+@log_client_call
+def create_index(table_name: str, index_name: str, columns: List[str], index_type: str = "BTREE", unique: bool = False, background: bool = False) -> Dict[str, Any]:
+    """
+    Creates an index on the specified table.
+    
+    The build requests ALGORITHM=INPLACE, LOCK=NONE so concurrent writes are not blocked.
+    
+    Args:
+        table_name: Name of the table to create index on
+        index_name: Name of the index
+        columns: List of column names to include in the index
+        index_type: Type of index (e.g., 'BTREE', 'HASH')
+        unique: Whether the index should be unique
+        background: If True, return immediately with a job id; use get_index_build_status() to follow it
+        
+    Returns:
+        Dict containing operation status
+    """
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    if not validate_table_name(index_name):
+        return format_error("Invalid index name", "Index name contains invalid characters")
+    
+    if not columns or not isinstance(columns, list):
+        return format_error("Invalid columns", "Columns must be a non-empty list")
+    
+    # Validate column names
+    for col in columns:
+        if not validate_table_name(col):
+            return format_error("Invalid column name", f"Column name '{col}' contains invalid characters")
+    
+    try:
+        # Build CREATE INDEX statement
+        unique_clause = "UNIQUE" if unique else ""
+        columns_clause = ", ".join([f"`{col}`" for col in columns])
+        
+        create_sql = f"CREATE {unique_clause} INDEX `{index_name}` ON `{table_name}` ({columns_clause}) USING {index_type}"
+        
+        job = register_index_build_job(table_name, index_name, create_sql, CURRENT_DATABASE, background)
+        
+        if background:
+            threading.Thread(target=run_index_build_in_background, args=(job,), name=f"index-build-{job['job_id']}", daemon=True).start()
+            return format_result({
+                "job_id": job['job_id'],
+                "status": job['status'],
+                "table_name": table_name,
+                "index_name": index_name,
+                "database": CURRENT_DATABASE
+            }, f"Index '{index_name}' build started in background on table '{table_name}' (job {job['job_id']})")
+        
+        run_index_build(job)
+        
+        return format_result({
+            "table_name": table_name,
+            "index_name": index_name,
+            "columns": columns,
+            "index_type": index_type,
+            "unique": unique,
+            "job_id": job['job_id'],
+            "algorithm": job['algorithm'],
+            "lock": job['lock'],
+            "duration_seconds": job['duration_seconds'],
+            "database": CURRENT_DATABASE
+        }, f"Index '{index_name}' created successfully on table '{table_name}' in database '{CURRENT_DATABASE}'")
+    except Exception as e:
+        logger.error(f"Failed to create index '{index_name}' on table '{table_name}': {e}")
+        return format_error(e, f"Failed to create index '{index_name}' on table '{table_name}'")
+
+# Tool: Get index build status
+@mcp.tool()
+@log_client_call
+def get_index_build_status(job_id: str = None) -> Dict[str, Any]:
+    """
+    Reports the status, progress and ETA of index builds started by create_index.
+    
+    Progress is read from performance_schema.events_stages_current (work_completed/work_estimated).
+    
+    Args:
+        job_id: Id of the index build job (if None, lists all known jobs)
+        
+    Returns:
+        Dict containing job status information
+    """
+    try:
+        if job_id:
+            job = INDEX_BUILD_JOBS.get(job_id)
+            if not job:
+                return format_error("Job not found", f"No index build job with id '{job_id}'")
+            snapshot = snapshot_index_build_job(job)
+            return format_result(snapshot, f"Index build {job_id} is {snapshot['status']}")
+        
+        with INDEX_BUILD_LOCK:
+            jobs = list(INDEX_BUILD_JOBS.values())
+        snapshots = [snapshot_index_build_job(job) for job in jobs]
+        return format_result({"jobs": snapshots, "count": len(snapshots)}, f"Found {len(snapshots)} index build jobs")
+    except Exception as e:
+        logger.error(f"Failed to get index build status: {e}")
+        return format_error(e, "Failed to get index build status")
+
+# Tool: Cancel index build
+@mcp.tool()
 @log_client_call
+def cancel_index_build(job_id: str) -> Dict[str, Any]:
+    """
+    Cancels a running index build by killing its query on the server.
+    
+    Args:
+        job_id: Id of the index build job to cancel
+        
+    Returns:
+        Dict containing operation status
+    """
+    job = INDEX_BUILD_JOBS.get(job_id)
+    if not job:
+        return format_error("Job not found", f"No index build job with id '{job_id}'")
+    
+    if job['status'] != "running" or not job['connection_id']:
+        return format_error("Job not running", f"Index build {job_id} is {job['status']} and cannot be cancelled")
+    
+    try:
+        job['cancel_requested'] = True
+        with get_mysql_connection_no_db(job['datasource']) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"KILL QUERY {int(job['connection_id'])}")
+            cursor.close()
+        
+        return format_result({
+            "job_id": job_id,
+            "index_name": job['index_name'],
+            "table_name": job['table_name'],
+            "connection_id": job['connection_id']
+        }, f"Cancellation requested for index build {job_id}")
+    except Exception as e:
+        logger.error(f"Failed to cancel index build {job_id}: {e}")
+        return format_error(e, f"Failed to cancel index build {job_id}")
+
+# Tool: Drop index from table
 @mcp.tool()
-def switch_database(database_name: str) -> Dict[str, Any]:
+@log_client_call
+def drop_index(table_name: str, index_name: str) -> Dict[str, Any]:
     """
-    Switches to a different database.
+    Removes an index from the specified table.
     
     Args:
-        database_name: Name of the database to switch to
+        table_name: Name of the table to remove index from
+        index_name: Name of the index to remove
         
     Returns:
         Dict containing operation status
     """
-    global CURRENT_DATABASE
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
     
-    if not validate_table_name(database_name):
-        return format_error("Invalid database name", "Database name contains invalid characters")
+    if not validate_table_name(table_name):
+        return format_error("Invalid table name", "Table name contains invalid characters")
+    
+    if not validate_table_name(index_name):
+        return format_error("Invalid index name", "Index name contains invalid characters")
     
     try:
-        # Test connection to the new database
-        connection_config = {
-            'host': DB_CONFIG['host'],
-            'port': DB_CONFIG['port'],
-            'user': DB_CONFIG['user'],
-            'password': DB_CONFIG['password'],
-            'database': database_name
-        }
-        
-        test_connection = mysql.connector.connect(**connection_config)
-        
-        if test_connection.is_connected():
-            # Create a custom cursor class that logs SQL statements
-            class LoggingCursor:
-                def __init__(self, cursor):
-                    self.cursor = cursor
-                
-                def execute(self, query, params=None):
-                    if params:
-                        logger.info(f"[SQL] {query} with params: {params}")
-                    else:
-                        logger.info(f"[SQL] {query}")
-                    return self.cursor.execute(query, params)
-                
-                def fetchall(self):
-                    return self.cursor.fetchall()
-                
-                def fetchone(self):
-                    return self.cursor.fetchone()
-                
-                def close(self):
-                    return self.cursor.close()
-            
-            # Monkey patch the connection's cursor method
-            original_cursor = test_connection.cursor
-            
-            def logging_cursor(*args, **kwargs):
-                cursor = original_cursor(*args, **kwargs)
-                return LoggingCursor(cursor)
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
             
-            test_connection.cursor = logging_cursor
+            # Build DROP INDEX statement
+            drop_sql = f"DROP INDEX `{index_name}` ON `{table_name}`"
             
-            cursor = test_connection.cursor()
-            cursor.execute("SELECT DATABASE()")
-            current_db = cursor.fetchone()[0]
+            cursor.execute(drop_sql)
             cursor.close()
-            test_connection.close()
-            
-            # Update the global variable
-            previous_database = CURRENT_DATABASE
-            CURRENT_DATABASE = database_name
             
             return format_result({
-                "previous_database": previous_database,
-                "current_database": database_name
-            }, f"Successfully switched to database '{database_name}'")
+                "table_name": table_name,
+                "index_name": index_name,
+                "database": CURRENT_DATABASE
+            }, f"Index '{index_name}' dropped successfully from table '{table_name}' in database '{CURRENT_DATABASE}'")
     except Exception as e:
-        logger.error(f"Failed to switch to database '{database_name}': {e}")
-        return format_error(e, f"Failed to switch to database '{database_name}'")
+        logger.error(f"Failed to drop index '{index_name}' from table '{table_name}': {e}")
+        return format_error(e, f"Failed to drop index '{index_name}' from table '{table_name}'")
 
-# Tool: Get database details
-@log_client_call
+# Tool: Get query digest statistics
 @mcp.tool()
-def get_database_details(database_name: str = None) -> Dict[str, Any]:
+@log_client_call
+def get_query_stats(top_n: int = 20, order_by: str = "total_time", reset: bool = False) -> Dict[str, Any]:
     """
-    Gets detailed information about a specific database.
+    Gets per-digest statistics for the SQL statements executed by this server.
+    
+    Statements are normalized into digests (literals stripped) by the cursor layer, so calls to
+    execute_sql, read_table, search_table and every other tool are aggregated by statement shape.
     
     Args:
-        database_name: Name of the database (if None, uses current database)
+        top_n: Number of digests to return (default: 20)
+        order_by: Sort key: 'total_time', 'avg_time', 'max_time', 'calls', 'errors' or 'rows_returned'
+        reset: If True, clear the statistics after reading them
         
     Returns:
-        Dict containing database details
+        Dict containing the top digests and summary counters
     """
-    if database_name and not validate_table_name(database_name):
-        return format_error("Invalid database name", "Database name contains invalid characters")
+    sort_keys = {
+        "total_time": lambda s: s["total_time_ms"],
+        "avg_time": lambda s: s["total_time_ms"] / s["calls"] if s["calls"] else 0,
+        "max_time": lambda s: s["max_time_ms"],
+        "calls": lambda s: s["calls"],
+        "errors": lambda s: s["errors"],
+        "rows_returned": lambda s: s["rows_returned"]
+    }
+    
+    if order_by not in sort_keys:
+        return format_error("Invalid order_by", f"order_by must be one of: {', '.join(sort_keys)}")
+    
+    if top_n < 0:
+        return format_error("Invalid top_n", "top_n must be a positive integer")
+    
+    global QUERY_DIGEST_EVICTIONS
     
     try:
-        # Connect to the specified database or current database
-        if database_name:
-            # Create a temporary connection to the specified database
-            connection_config = DB_CONFIG.copy()
-            connection_config['database'] = database_name
-            
-            connection = mysql.connector.connect(**connection_config)
-            
-            if connection.is_connected():
-                # Create a custom cursor class that logs SQL statements
-                class LoggingCursor:
-                    def __init__(self, cursor):
-                        self.cursor = cursor
-                    
-                    def execute(self, query, params=None):
-                        if params:
-                            logger.info(f"[SQL] {query} with params: {params}")
-                        else:
-                            logger.info(f"[SQL] {query}")
-                        return self.cursor.execute(query, params)
-                    
-                    def fetchall(self):
-                        return self.cursor.fetchall()
-                    
-                    def fetchone(self):
-                        return self.cursor.fetchone()
-                    
-                    def close(self):
-                        return self.cursor.close()
-                
-                # Monkey patch the connection's cursor method
-                original_cursor = connection.cursor
-                
-                def logging_cursor(*args, **kwargs):
-                    cursor = original_cursor(*args, **kwargs)
-                    return LoggingCursor(cursor)
-                
-                connection.cursor = logging_cursor
-                
-                cursor = connection.cursor()
-                
-                # Get database name
-                cursor.execute("SELECT DATABASE()")
-                current_db = cursor.fetchone()[0]
-                
-                # Get table count
-                cursor.execute("SHOW TABLES")
-                tables = cursor.fetchall()
-                table_count = len(tables)
-                
-                # Get database size and other details
-                cursor.execute("""
-                    SELECT 
-                        table_schema,
-                        SUM(data_length + index_length) as total_size,
-                        SUM(data_length) as data_size,
-                        SUM(index_length) as index_size,
-                        COUNT(*) as table_count
-                    FROM information_schema.tables 
-                    WHERE table_schema = %s
-                    GROUP BY table_schema
-                """, (current_db,))
-                
-                db_info = cursor.fetchone()
-                cursor.close()
-                connection.close()
-        else:
-            # Use the standard connection manager for current database
-            with get_mysql_connection() as connection:
-                cursor = connection.cursor()
-                
-                # Get database name
-                cursor.execute("SELECT DATABASE()")
-                current_db = cursor.fetchone()[0]
-                
-                # Get table count
-                cursor.execute("SHOW TABLES")
-                tables = cursor.fetchall()
-                table_count = len(tables)
-                
-                # Get database size and other details
-                cursor.execute("""
-                    SELECT 
-                        table_schema,
-                        SUM(data_length + index_length) as total_size,
-                        SUM(data_length) as data_size,
-                        SUM(index_length) as index_size,
-                        COUNT(*) as table_count
-                    FROM information_schema.tables 
-                    WHERE table_schema = %s
-                    GROUP BY table_schema
-                """, (current_db,))
-                
-                db_info = cursor.fetchone()
-                cursor.close()
+        with QUERY_DIGEST_LOCK:
+            digests = [dict(stats, latency_histogram=list(stats["latency_histogram"])) for stats in QUERY_DIGEST_STATS.values()]
+            evictions = QUERY_DIGEST_EVICTIONS
+            if reset:
+                QUERY_DIGEST_STATS.clear()
+                QUERY_DIGEST_EVICTIONS = 0
         
-        if db_info:
-            details = {
-                "database_name": db_info[0],
-                "table_count": db_info[4],
-                "total_size_bytes": db_info[1] if db_info[1] else 0,
-                "data_size_bytes": db_info[2] if db_info[2] else 0,
-                "index_size_bytes": db_info[3] if db_info[3] else 0,
-                "tables": [table[0] for table in tables]
-            }
-        else:
-            details = {
-                "database_name": current_db,
-                "table_count": table_count,
-                "total_size_bytes": 0,
-                "data_size_bytes": 0,
-                "index_size_bytes": 0,
-                "tables": [table[0] for table in tables]
-            }
+        digests.sort(key=sort_keys[order_by], reverse=True)
+        buckets = QUERY_STATS_CONFIG['latency_buckets_ms']
+        bucket_labels = [f"<={bound}ms" for bound in buckets] + [f">{buckets[-1]}ms"]
         
-        return format_result(details, f"Database details retrieved for '{current_db}'")
+        top = []
+        for stats in digests[:top_n]:
+            stats["avg_time_ms"] = round(stats["total_time_ms"] / stats["calls"], 3) if stats["calls"] else 0
+            stats["total_time_ms"] = round(stats["total_time_ms"], 3)
+            stats["min_time_ms"] = round(stats["min_time_ms"] or 0, 3)
+            stats["max_time_ms"] = round(stats["max_time_ms"], 3)
+            stats["latency_histogram"] = dict(zip(bucket_labels, stats["latency_histogram"]))
+            stats.pop("sample_params", None)
+            top.append(stats)
+        
+        return format_result({
+            "digests": top,
+            "tracked_digests": len(digests),
+            "total_calls": sum(s["calls"] for s in digests),
+            "total_errors": sum(s["errors"] for s in digests),
+            "evicted_digests": evictions,
+            "order_by": order_by,
+            "reset": reset
+        }, f"Returned {len(top)} of {len(digests)} query digests ordered by {order_by}")
     except Exception as e:
-        logger.error(f"Failed to get database details for '{database_name}': {e}")
-        return format_error(e, f"Failed to get database details for '{database_name}'")
+        logger.error(f"Failed to get query stats: {e}")
+        return format_error(e, "Failed to get query statistics")
 
-# Tool: Copy database
-@log_client_call
-@mcp.tool()
-def copy_database(source_database: str, target_database: str) -> Dict[str, Any]:
-    """
-    Creates a copy of an existing database.
+# Index advisor helpers
+# Statements the advisor extracts condition columns from; deliberately narrower than EXPLAINABLE_STATEMENT_PATTERN
+ADVISABLE_STATEMENT_PATTERN = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b", re.I)
+CONDITION_COLUMN_PATTERN = re.compile(
+    r"`\w+`\.`(\w+)`\.`(\w+)`\s*(<=>|>=|<=|<>|!=|=|<|>|\bin\b|\blike\b|\bbetween\b|\bis\s+null\b)\s*('%)?",
+    re.I
+)
+TABLE_REFERENCE_PATTERN = re.compile(
+    r"\b(?:FROM|JOIN|UPDATE)\s+`?(\w+)`?(?:\.`?(\w+)`?)?(?:\s+(?:AS\s+)?`?(\w+)`?)?",
+    re.I
+)
+SQL_CLAUSE_KEYWORDS = {"where", "on", "using", "join", "inner", "left", "right", "cross", "straight_join",
+                       "natural", "group", "order", "limit", "set", "having", "for", "lock", "union", "force", "use", "ignore"}
+
+def get_workload_queries(source: str, top_n: int) -> List[Dict[str, Any]]:
+    """Collect representative statements for the current database, heaviest first"""
+    queries = []
+    if source == "server":
+        with QUERY_DIGEST_LOCK:
+            digests = [dict(stats) for stats in QUERY_DIGEST_STATS.values()]
+        digests.sort(key=lambda s: s["total_time_ms"], reverse=True)
+        for stats in digests:
+            query = stats["sample_query"]
+            if not ADVISABLE_STATEMENT_PATTERN.match(query) or re.search(r"information_schema|performance_schema", query, re.I):
+                continue
+            queries.append({
+                "digest": stats["digest"],
+                "digest_text": stats["digest_text"],
+                "query": query,
+                "params": stats["sample_params"],
+                "calls": stats["calls"],
+                "total_time_ms": stats["total_time_ms"]
+            })
+    else:
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("""
+                SELECT digest, digest_text, query_sample_text, count_star, sum_timer_wait / 1000000000
+                FROM performance_schema.events_statements_summary_by_digest
+                WHERE schema_name = %s AND query_sample_text IS NOT NULL
+                ORDER BY sum_timer_wait DESC
+                LIMIT %s
+            """, (CURRENT_DATABASE, top_n * 4))
+            rows = cursor.fetchall()
+            cursor.close()
+        for digest, digest_text, query, calls, total_time_ms in rows:
+            if not query or not ADVISABLE_STATEMENT_PATTERN.match(query):
+                continue
+            queries.append({
+                "digest": digest,
+                "digest_text": digest_text,
+                "query": query,
+                "params": None,
+                "calls": int(calls),
+                "total_time_ms": float(total_time_ms or 0)
+            })
+    return queries[:top_n]
+
+def explain_json(cursor, query: str, params: Any = None) -> Dict[str, Any]:
+    """Run EXPLAIN FORMAT=JSON for a statement and return the parsed plan"""
+    cursor.execute(f"EXPLAIN FORMAT=JSON {query}", params or None)
+    row = cursor.fetchone()
+    cursor.fetchall()
+    return json.loads(row[0])
+
+def get_plan_cost(plan: Dict[str, Any]) -> Optional[float]:
+    """Get the optimizer's total cost estimate from an EXPLAIN FORMAT=JSON plan"""
+    cost = plan.get("query_block", {}).get("cost_info", {}).get("query_cost")
+    return float(cost) if cost is not None else None
+
+def walk_explain_plan(node: Any, tables: List[Dict[str, Any]], flags: Dict[str, bool]) -> None:
+    """Collect table access nodes and filesort/temporary flags from an EXPLAIN FORMAT=JSON tree"""
+    if isinstance(node, dict):
+        if node.get("using_filesort"):
+            flags["using_filesort"] = True
+        if node.get("using_temporary_table"):
+            flags["using_temporary_table"] = True
+        table = node.get("table")
+        if isinstance(table, dict) and "table_name" in table:
+            tables.append(table)
+        for value in node.values():
+            walk_explain_plan(value, tables, flags)
+    elif isinstance(node, list):
+        for item in node:
+            walk_explain_plan(item, tables, flags)
+
+def get_table_aliases(query: str) -> Dict[str, str]:
+    """Map table aliases (and plain table names) used in a statement to the underlying table names"""
+    aliases = {}
+    for first, second, alias in TABLE_REFERENCE_PATTERN.findall(query):
+        table = second or first
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_CLAUSE_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+def get_clause_columns(query: str, clause: str, alias: str, single_table: bool) -> List[str]:
+    """Extract the columns of one table from an ORDER BY or GROUP BY clause"""
+    match = re.search(rf"\b{clause}\s+BY\s+(.+?)(?:\bHAVING\b|\bORDER\b|\bLIMIT\b|\bFOR\b|\bLOCK\b|\bWITH\b|$)", query, re.I | re.S)
+    if not match:
+        return []
+    columns = []
+    for item in match.group(1).split(","):
+        column_match = re.match(r"\s*(?:`?(\w+)`?\.)?`?(\w+)`?\s*(?:ASC|DESC)?\s*$", item, re.I)
+        if not column_match:
+            # Expressions cannot be served by a plain index
+            break
+        qualifier, column = column_match.groups()
+        if qualifier == alias or (qualifier is None and single_table):
+            columns.append(column)
+        else:
+            break
+    return columns
+
+def get_existing_index_columns(cursor, table_name: str) -> Dict[str, List[str]]:
+    """Get the column lists of all indexes on a table in the current database"""
+    cursor.execute("""
+        SELECT index_name, column_name
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s
+        ORDER BY index_name, seq_in_index
+    """, (table_name,))
+    indexes: Dict[str, List[str]] = {}
+    for index_name, column_name in cursor.fetchall():
+        indexes.setdefault(index_name, []).append(column_name)
+    return indexes
+
+def propose_index_for_access(query: str, table: Dict[str, Any], flags: Dict[str, bool], table_name: str, single_table: bool, table_columns: List[str]) -> List[str]:
+    """Derive a composite index (equality columns, then a sort or range column) for one table access"""
+    alias = table["table_name"]
+    equality_columns: List[str] = []
+    range_columns: List[str] = []
+    for condition_alias, column, operator, leading_wildcard in CONDITION_COLUMN_PATTERN.findall(table.get("attached_condition", "")):
+        operator = operator.lower()
+        if condition_alias != alias or column not in table_columns or operator in ("<>", "!="):
+            continue
+        if operator in ("=", "<=>", "in") or operator.startswith("is"):
+            if column not in equality_columns:
+                equality_columns.append(column)
+        elif not (operator == "like" and leading_wildcard):
+            if column not in range_columns:
+                range_columns.append(column)
     
-    Args:
-        source_database: Name of the source database
-        target_database: Name of the target database
-        
-    Returns:
-        Dict containing operation status
-    """
-    if not validate_table_name(source_database) or not validate_table_name(target_database):
-        return format_error("Invalid database name", "Database name contains invalid characters")
+    candidate = list(equality_columns)
+    sort_columns = []
+    if flags.get("using_filesort") or flags.get("using_temporary_table"):
+        sort_columns = get_clause_columns(query, "GROUP", alias, single_table) or get_clause_columns(query, "ORDER", alias, single_table)
     
-    try:
-        # Connect without specifying database
-        with get_mysql_connection_no_db() as connection:
-            cursor = connection.cursor()
+    if sort_columns and all(col in table_columns for col in sort_columns):
+        candidate += [col for col in sort_columns if col not in candidate]
+    elif range_columns:
+        # Only the first range column can use the index; later ones are filtered row by row
+        candidate += [col for col in range_columns[:1] if col not in candidate]
+    
+    return candidate[:INDEX_ADVISOR_CONFIG['max_index_columns']]
+
+def build_index_candidates(cursor, workload: List[Dict[str, Any]]) -> Tuple[Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]], List[Dict[str, Any]]]:
+    """Explain each workload query and aggregate proposed indexes by (table, columns)"""
+    candidates: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]] = {}
+    analyzed = []
+    table_columns_cache: Dict[str, List[str]] = {}
+    index_cache: Dict[str, Dict[str, List[str]]] = {}
+    
+    for item in workload:
+        try:
+            plan = explain_json(cursor, item["query"], item["params"])
+        except Exception as e:
+            analyzed.append({"digest": item["digest"], "digest_text": item["digest_text"], "skipped": str(e)})
+            continue
+        
+        tables: List[Dict[str, Any]] = []
+        flags = {"using_filesort": False, "using_temporary_table": False}
+        walk_explain_plan(plan, tables, flags)
+        aliases = get_table_aliases(item["query"])
+        single_table = len(tables) == 1
+        
+        problems = []
+        for table in tables:
+            access_type = table.get("access_type")
+            rows = int(table.get("rows_examined_per_scan") or 0)
+            full_scan = access_type in ("ALL", "index")
+            if not (full_scan or flags["using_filesort"] or flags["using_temporary_table"]):
+                continue
+            if rows < INDEX_ADVISOR_CONFIG['min_rows_examined']:
+                continue
             
-            # Create target database
-            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{target_database}`")
+            table_name = aliases.get(table["table_name"], table["table_name"])
+            if not validate_table_name(table_name):
+                continue
+            if table_name not in table_columns_cache:
+                table_columns_cache[table_name] = get_column_names(cursor, table_name)
+                index_cache[table_name] = get_existing_index_columns(cursor, table_name)
+            if not table_columns_cache[table_name]:
+                continue
             
-            # Get all tables from source database
-            cursor.execute(f"SHOW TABLES FROM `{source_database}`")
-            tables = cursor.fetchall()
+            problems.append({
+                "table": table_name,
+                "access_type": access_type,
+                "rows_examined_per_scan": rows,
+                "key": table.get("key"),
+                "full_scan": full_scan
+            })
             
-            copied_tables = []
-            for table in tables:
-                table_name = table[0]
-                
-                # Get table structure
-                cursor.execute(f"SHOW CREATE TABLE `{source_database}`.`{table_name}`")
-                create_table_sql = cursor.fetchone()[1]
-                
-                # Create table in target database
-                create_table_sql = create_table_sql.replace(f"`{source_database}`.", "")
-                cursor.execute(f"USE `{target_database}`")
-                cursor.execute(create_table_sql)
-                
-                # Copy data
-                cursor.execute(f"INSERT INTO `{target_database}`.`{table_name}` SELECT * FROM `{source_database}`.`{table_name}`")
-                copied_tables.append(table_name)
+            columns = propose_index_for_access(item["query"], table, flags, table_name, single_table, table_columns_cache[table_name])
+            if not columns:
+                continue
             
-            cursor.close()
+            # An existing index that starts with the proposed columns already serves this access
+            covering_index = next((name for name, cols in index_cache[table_name].items() if cols[:len(columns)] == columns), None)
+            if covering_index:
+                problems[-1]["existing_index"] = covering_index
+                continue
             
-            return format_result({
-                "source_database": source_database,
-                "target_database": target_database,
-                "copied_tables": copied_tables,
-                "table_count": len(copied_tables)
-            }, f"Successfully copied database '{source_database}' to '{target_database}'")
-    except Exception as e:
-        logger.error(f"Failed to copy database '{source_database}' to '{target_database}': {e}")
-        return format_error(e, f"Failed to copy database '{source_database}' to '{target_database}'")
+            filtered = float(table.get("filtered") or 100.0)
+            rows_after = max(1, int(rows * filtered / 100.0))
+            key = (table_name, tuple(columns))
+            candidate = candidates.setdefault(key, {
+                "table": table_name,
+                "columns": columns,
+                "digests": [],
+                "calls": 0,
+                "total_time_ms": 0.0,
+                "estimated_rows_per_call_before": 0,
+                "estimated_rows_per_call_after": 0
+            })
+            candidate["digests"].append(item["digest"])
+            candidate["calls"] += item["calls"]
+            candidate["total_time_ms"] += item["total_time_ms"]
+            candidate["estimated_rows_per_call_before"] = max(candidate["estimated_rows_per_call_before"], rows)
+            candidate["estimated_rows_per_call_after"] = max(candidate["estimated_rows_per_call_after"], rows_after)
+        
+        analyzed.append({
+            "digest": item["digest"],
+            "digest_text": item["digest_text"],
+            "calls": item["calls"],
+            "total_time_ms": round(item["total_time_ms"], 3),
+            "query_cost": get_plan_cost(plan),
+            "using_filesort": flags["using_filesort"],
+            "using_temporary_table": flags["using_temporary_table"],
+            "problems": problems
+        })
+    
+    return candidates, analyzed
 
-# Tool: Rename database
-@log_client_call
+def validate_index_candidate(cursor, candidate: Dict[str, Any], workload_by_digest: Dict[str, Dict[str, Any]], make_visible: bool) -> Dict[str, Any]:
+    """Build a candidate as an invisible index and compare plan costs with and without it"""
+    index_name = f"{INDEX_ADVISOR_CONFIG['index_name_prefix']}{candidate['table']}_{'_'.join(candidate['columns'])}"[:64]
+    columns_clause = ", ".join(f"`{col}`" for col in candidate["columns"])
+    
+    queries = [workload_by_digest[digest] for digest in candidate["digests"] if digest in workload_by_digest]
+    costs_before = [get_plan_cost(explain_json(cursor, q["query"], q["params"])) or 0.0 for q in queries]
+    
+    cursor.execute(f"CREATE INDEX `{index_name}` ON `{candidate['table']}` ({columns_clause}) INVISIBLE")
+    state = "dropped"
+    try:
+        try:
+            cursor.execute("SET SESSION optimizer_switch = 'use_invisible_indexes=on'")
+            plans_after = [explain_json(cursor, q["query"], q["params"]) for q in queries]
+        finally:
+            cursor.execute("SET SESSION optimizer_switch = 'use_invisible_indexes=off'")
+        
+        costs_after = [get_plan_cost(plan) or 0.0 for plan in plans_after]
+        used = any(index_name in json.dumps(plan) for plan in plans_after)
+        improved = used and sum(costs_after) < sum(costs_before)
+        
+        if improved and make_visible:
+            cursor.execute(f"ALTER TABLE `{candidate['table']}` ALTER INDEX `{index_name}` VISIBLE")
+            state = "visible"
+        elif improved:
+            state = "invisible"
+    finally:
+        # The trial index is only kept when it helped; on any failure it must not stay behind as write overhead
+        if state == "dropped":
+            try:
+                cursor.execute(f"DROP INDEX `{index_name}` ON `{candidate['table']}`")
+            except Error as e:
+                state = "drop_failed"
+                logger.error(f"Failed to drop trial index `{index_name}` on `{candidate['table']}`, drop it manually: {e}")
+    
+    return {
+        "index_name": index_name,
+        "used_by_optimizer": used,
+        "cost_before": round(sum(costs_before), 2),
+        "cost_after": round(sum(costs_after), 2),
+        "state": state
+    }
+
+# Tool: Advise indexes from observed workload
 @mcp.tool()
-def rename_database(old_name: str, new_name: str) -> Dict[str, Any]:
+@log_client_call
+def advise_indexes(source: str = "server", top_n: int = 20, validate: bool = False, make_visible: bool = False) -> Dict[str, Any]:
     """
-    Renames a database by creating a copy and dropping the original.
+    Proposes composite indexes for the current database from the observed query workload.
+    
+    Representative statements are explained with EXPLAIN FORMAT=JSON; full scans, filesorts and
+    temporary tables are turned into index candidates ranked by the time spent in affected queries.
     
     Args:
-        old_name: Current name of the database
-        new_name: New name for the database
+        source: Workload source: 'server' (this server's digest statistics) or 'performance_schema'
+                (performance_schema.events_statements_summary_by_digest)
+        top_n: Number of heaviest statements to analyze (default: 20)
+        validate: If True, build candidates as invisible indexes and compare plan costs (MySQL 8.0+)
+        make_visible: If True, make validated indexes that lower the plan cost visible; otherwise they stay invisible
         
     Returns:
-        Dict containing operation status
+        Dict containing proposed indexes and the analyzed statements
     """
-    if not validate_table_name(old_name) or not validate_table_name(new_name):
-        return format_error("Invalid database name", "Database name contains invalid characters")
+    if not CURRENT_DATABASE:
+        return format_error("No database selected", "Please use switch_database() to select a database first")
+    
+    if source not in ("server", "performance_schema"):
+        return format_error("Invalid source", "Source must be 'server' or 'performance_schema'")
+    
+    if top_n <= 0:
+        return format_error("Invalid top_n", "top_n must be a positive integer")
     
     try:
-        # First copy the database
-        copy_result = copy_database(old_name, new_name)
-        if copy_result['status'] == 'error':
-            return copy_result
+        workload = get_workload_queries(source, top_n)
+        workload_by_digest = {item["digest"]: item for item in workload}
         
-        # Then delete the old database
-        delete_result = delete_database(old_name, force=True)
-        if delete_result['status'] == 'error':
-            return delete_result
+        with get_mysql_connection() as connection:
+            cursor = connection.cursor()
+            candidates, analyzed = build_index_candidates(cursor, workload)
+            
+            proposals = sorted(candidates.values(), key=lambda c: c["total_time_ms"], reverse=True)
+            for rank, proposal in enumerate(proposals):
+                columns_clause = ", ".join(f"`{col}`" for col in proposal["columns"])
+                index_name = f"{INDEX_ADVISOR_CONFIG['index_name_prefix']}{proposal['table']}_{'_'.join(proposal['columns'])}"[:64]
+                proposal["total_time_ms"] = round(proposal["total_time_ms"], 3)
+                proposal["estimated_benefit_ratio"] = round(proposal["estimated_rows_per_call_before"] / proposal["estimated_rows_per_call_after"], 1)
+                proposal["create_sql"] = f"CREATE INDEX `{index_name}` ON `{proposal['table']}` ({columns_clause})"
+                
+                if validate and rank < INDEX_ADVISOR_CONFIG['max_validations']:
+                    try:
+                        proposal["validation"] = validate_index_candidate(cursor, proposal, workload_by_digest, make_visible)
+                    except Exception as e:
+                        logger.warning(f"Failed to validate index candidate on '{proposal['table']}' {proposal['columns']}: {e}")
+                        proposal["validation"] = {"error": str(e)}
+            cursor.close()
         
         return format_result({
-            "old_name": old_name,
-            "new_name": new_name
-        }, f"Successfully renamed database '{old_name}' to '{new_name}'")
+            "source": source,
+            "proposals": proposals,
+            "analyzed_statements": analyzed,
+            "database": CURRENT_DATABASE
+        }, f"Analyzed {len(analyzed)} statements and proposed {len(proposals)} indexes in database '{CURRENT_DATABASE}'")
     except Exception as e:
-        logger.error(f"Failed to rename database '{old_name}' to '{new_name}': {e}")
-        return format_error(e, f"Failed to rename database '{old_name}' to '{new_name}'")
+        logger.error(f"Failed to advise indexes: {e}")
+        return format_error(e, "Failed to advise indexes")
 
-# Tool: Get current database
-@log_client_call
-@mcp.tool()
-def get_current_database() -> Dict[str, Any]:
+# Data file helpers (local CSV / JSON Lines / Parquet files below DATA_FILE_CONFIG['directory'])
+DATA_FILE_FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+DATA_FILE_COMPRESSIONS = {"gzip": ".gz", "zstd": ".zst"}
+INTEGER_DATA_TYPES = {"tinyint", "smallint", "mediumint", "int", "integer", "bigint"}
+ARROW_INTEGER_TYPES = {FieldType.TINY, FieldType.SHORT, FieldType.INT24, FieldType.LONG, FieldType.LONGLONG, FieldType.YEAR, FieldType.BIT}
+ARROW_BINARY_TYPES = {FieldType.TINY_BLOB, FieldType.MEDIUM_BLOB, FieldType.LONG_BLOB, FieldType.BLOB,
+                      FieldType.STRING, FieldType.VAR_STRING, FieldType.VARCHAR}
+BINARY_CHARSET_ID = 63
+
+class ExportStoppedError(Exception):
+    """An export part was stopped because another part of the same export failed"""
+
+def resolve_data_file_path(file_path: str) -> str:
+    """Absolute path of a file below the data file directory; paths leading outside it are rejected"""
+    root = os.path.realpath(DATA_FILE_CONFIG['directory'])
+    path = os.path.realpath(os.path.join(root, file_path))
+    if path == root or os.path.commonpath([root, path]) != root:
+        raise ValueError(f"'{file_path}' is outside the data file directory {DATA_FILE_CONFIG['directory']}")
+    return path
+
+def resolve_compression(path: str, compression: Optional[str]) -> Optional[str]:
+    """Compression of a data file: as requested, else implied by the file extension ('none' disables it)"""
+    if compression is None:
+        compression = next((name for name, suffix in DATA_FILE_COMPRESSIONS.items() if path.endswith(suffix)), None)
+    elif compression == "none":
+        compression = None
+    if compression is not None and compression not in DATA_FILE_COMPRESSIONS:
+        raise ValueError(f"Unknown compression '{compression}' (supported: {', '.join(DATA_FILE_COMPRESSIONS)}, none)")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package")
+    return compression
+
+def part_file_path(path: str, part: int) -> str:
+    """Path of one part of a split file: orders.csv.gz -> orders.part001.csv.gz"""
+    directory, name = os.path.split(path)
+    suffixes = ""
+    for known in (DATA_FILE_COMPRESSIONS.values(), DATA_FILE_FORMATS.values()):
+        suffix = next((suffix for suffix in known if name.endswith(suffix) and len(name) > len(suffix)), "")
+        name, suffixes = name[:len(name) - len(suffix)], suffix + suffixes
+    return os.path.join(directory, f"{name}.part{part:03d}{suffixes}")
+
+def open_data_file(path: str, mode: str, compression: Optional[str]):
+    """Open a data file as a binary stream ('r' or 'w'), compressing or decompressing gzip / zstd on the fly"""
+    level = DATA_FILE_CONFIG['compression_level']
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=level) if mode == "w" else gzip.open(path, "rb")
+    raw = open(path, mode + "b")
+    if compression == "zstd":
+        try:
+            if mode == "w":
+                return zstandard.ZstdCompressor(level=level).stream_writer(raw)
+            return zstandard.ZstdDecompressor().stream_reader(raw)
+        except BaseException:
+            raw.close()
+            raise
+    return raw
+
+def format_time_value(value: timedelta) -> str:
+    """MySQL TIME literal for a timedelta, e.g. -01:30:00 or 838:59:59.500000"""
+    magnitude = abs(value)
+    seconds = magnitude.days * 86400 + magnitude.seconds
+    text = f"{'-' if value < timedelta(0) else ''}{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    return text + (f".{magnitude.microseconds:06d}" if magnitude.microseconds else "")
+
+def to_data_file_value(value: Any) -> Any:
+    """Portable form of a column value in CSV and JSON Lines files (binary that is not UTF-8 becomes a 0x... hex literal)"""
+    if isinstance(value, (bytes, bytearray)):
+        try:
+            return value.decode("utf-8")
+        except UnicodeDecodeError:
+            return "0x" + value.hex()
+    if isinstance(value, timedelta):
+        return format_time_value(value)
+    if isinstance(value, (datetime, date, Decimal)):
+        return str(value)
+    if isinstance(value, set):
+        return ",".join(sorted(value))
+    return value
+
+def arrow_schema(columns: List[str], description: List[tuple]) -> "pyarrow.Schema":
+    """Arrow schema for a result set, from the MySQL column types of its cursor description"""
+    fields = []
+    for name, column in zip(columns, description):
+        type_code, flags = column[1], column[7]
+        binary = len(column) > 8 and column[8] == BINARY_CHARSET_ID
+        if type_code in ARROW_INTEGER_TYPES:
+            arrow_type = pyarrow.uint64() if type_code == FieldType.LONGLONG and flags & FieldFlag.UNSIGNED else pyarrow.int64()
+        elif type_code in (FieldType.FLOAT, FieldType.DOUBLE):
+            arrow_type = pyarrow.float64()
+        elif type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+            arrow_type = pyarrow.timestamp("us")
+        elif type_code in (FieldType.DATE, FieldType.NEWDATE):
+            arrow_type = pyarrow.date32()
+        elif type_code == FieldType.TIME:
+            arrow_type = pyarrow.duration("us")
+        elif type_code == FieldType.GEOMETRY or (type_code in ARROW_BINARY_TYPES and binary):
+            arrow_type = pyarrow.binary()
+        else:
+            arrow_type = pyarrow.string()  # DECIMAL stays exact as text, like JSON / ENUM / SET
+        fields.append(pyarrow.field(name, arrow_type))
+    return pyarrow.schema(fields)
+
+def to_arrow_value(value: Any, arrow_type: "pyarrow.DataType") -> Any:
+    """Column value in the Python type pyarrow expects for a field"""
+    if value is None:
+        return None
+    if arrow_type == pyarrow.string():
+        value = to_data_file_value(value)
+        return value if isinstance(value, str) else str(value)
+    if arrow_type == pyarrow.binary():
+        return value.encode("utf-8") if isinstance(value, str) else bytes(value)
+    return value
+
+class DataFileWriter:
     """
-    Gets the name of the currently selected database.
+    Writes chunks of result rows to a CSV, JSON Lines or Parquet file.
     
-    Returns:
-        Dict containing current database name
+    With binary_as_hex, values of binary columns are always written as 0x... hex, so that text
+    columns and binary columns holding UTF-8 cannot be confused when the file is loaded back.
+    """
+    
+    def __init__(self, path: str, file_format: str, compression: Optional[str], columns: List[str], description: List[tuple],
+                 binary_as_hex: bool = False):
+        self.file_format = file_format
+        self.columns = columns
+        self.binary_columns = [binary_as_hex and len(column) > 8 and column[8] == BINARY_CHARSET_ID for column in description]
+        if file_format == "parquet":
+            # Parquet compresses its pages itself
+            self.schema = arrow_schema(columns, description)
+            self.stream = pyarrow.parquet.ParquetWriter(path, self.schema, compression=compression or "snappy")
+        else:
+            self.stream = open_data_file(path, "w", compression)
+            if file_format == "csv":
+                self._write_csv([columns])
+    
+    def _write_csv(self, rows: List[Any]) -> None:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        self.stream.write(buffer.getvalue().encode("utf-8"))
+    
+    def _convert(self, row: tuple) -> List[Any]:
+        return ["0x" + bytes(value).hex() if binary and isinstance(value, (bytes, bytearray)) else to_data_file_value(value)
+                for value, binary in zip(row, self.binary_columns)]
+    
+    def write(self, rows: List[tuple]) -> None:
+        """Append one chunk of rows"""
+        if self.file_format == "csv":
+            null = DATA_FILE_CONFIG['csv_null']
+            self._write_csv([[null if value is None else value for value in self._convert(row)] for row in rows])
+        elif self.file_format == "jsonl":
+            lines = [json.dumps(dict(zip(self.columns, self._convert(row))), ensure_ascii=False, default=str) for row in rows]
+            self.stream.write(("\n".join(lines) + "\n").encode("utf-8"))
+        else:
+            arrays = [pyarrow.array([to_arrow_value(row[index], field.type) for row in rows], type=field.type)
+                      for index, field in enumerate(self.schema)]
+            self.stream.write_table(pyarrow.Table.from_arrays(arrays, schema=self.schema))
+    
+    def close(self) -> None:
+        self.stream.close()
+
+def export_cursor_rows(cursor, path: str, file_format: str, compression: Optional[str], stop: Optional[threading.Event] = None,
+                       binary_as_hex: bool = False) -> Dict[str, Any]:
+    """
+    Stream the result of an executed (unbuffered) cursor into a file, one chunk of rows at a time.
+    
+    The file is written under a temporary name and renamed when complete, so readers never see a partial export.
     """
+    start = time.perf_counter()
+    temporary_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    writer = DataFileWriter(temporary_path, file_format, compression, list(cursor.column_names), cursor.description, binary_as_hex)
+    rows_written = 0
     try:
-        return format_result({
-            "current_database": CURRENT_DATABASE
-        }, f"Current database is '{CURRENT_DATABASE if CURRENT_DATABASE else 'None (no database selected)'}'")
-    except Exception as e:
-        logger.error(f"Failed to get current database: {e}")
-        return format_error(e, "Failed to get current database")
+        try:
+            while True:
+                if stop is not None and stop.is_set():
+                    raise ExportStoppedError("Export stopped because another part failed")
+                rows = cursor.fetchmany(DATA_FILE_CONFIG['chunk_rows'])
+                if not rows:
+                    break
+                writer.write(rows)
+                rows_written += len(rows)
+        finally:
+            writer.close()
+        os.replace(temporary_path, path)
+    except BaseException:
+        cursor.abandon()  # The unread rest of the result is discarded with the connection
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    return {"file": path, "rows": rows_written, "bytes": os.path.getsize(path),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)}
 
-# Tool: Delete table
-@log_client_call
+def validate_export_options(file_path: str, file_format: str, compression: Optional[str], overwrite: bool, parts: int = 1) -> Tuple[List[str], Optional[str]]:
+    """Resolve the output files and compression of an export; raises ValueError for unusable options"""
+    if file_format not in DATA_FILE_FORMATS:
+        raise ValueError(f"Unknown format '{file_format}' (supported: {', '.join(DATA_FILE_FORMATS)})")
+    if file_format == "parquet" and pyarrow is None:
+        raise ValueError("Parquet files require the 'pyarrow' package")
+    path = resolve_data_file_path(file_path)
+    if file_format == "parquet":
+        compression = None if compression in (None, "none") else compression
+        if compression not in (None, *DATA_FILE_COMPRESSIONS):
+            raise ValueError(f"Unknown compression '{compression}' (supported: {', '.join(DATA_FILE_COMPRESSIONS)}, none)")
+    else:
+        compression = resolve_compression(path, compression)
+    paths = [path] if parts == 1 else [part_file_path(path, part) for part in range(1, parts + 1)]
+    existing = [candidate for candidate in paths if os.path.exists(candidate)]
+    if existing and not overwrite:
+        raise ValueError(f"{existing[0]} already exists (pass overwrite=True to replace it)")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return paths, compression
+
+def export_summary(files: List[Dict[str, Any]], file_format: str, compression: Optional[str], elapsed: float) -> Dict[str, Any]:
+    """Result of an export: its files with row and byte counts, and the throughput"""
+    rows = sum(item["rows"] for item in files)
+    return {
+        "files": [dict(item, file=os.path.relpath(item["file"], os.path.realpath(DATA_FILE_CONFIG['directory']))) for item in files],
+        "format": file_format,
+        "compression": compression,
+        "rows": rows,
+        "bytes": sum(item["bytes"] for item in files),
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else None
+    }
+
+# Tool: Export query result to a file
 @mcp.tool()
-def delete_table(table_name: str, force: bool = False) -> Dict[str, Any]:
+@log_client_call
+def export_query(query: str, file_path: str, file_format: str = "csv", compression: str = None, params: List[Any] = None,
+                 overwrite: bool = False, timeout_seconds: float = None) -> Dict[str, Any]:
     """
-    Deletes a table from the current database.
+    Streams the result of a SELECT into a local CSV, JSON Lines or Parquet file.
+    
+    Rows are read from the server in chunks and written as they arrive, so memory use does not
+    grow with the size of the result.
     
     Args:
-        table_name: Name of the table to delete
-        force: If True, drops the table even if it doesn't exist (default: False)
+        query: Read-only SELECT query
+        file_path: Output file, relative to the data file directory
+        file_format: 'csv', 'jsonl' or 'parquet' (requires pyarrow) (default: 'csv')
+        compression: 'gzip', 'zstd' (requires zstandard) or 'none' (default: from the file extension)
+        params: Values for %s placeholders in the query
+        overwrite: Replace an existing file (default: False)
+        timeout_seconds: Execution deadline for this call (default: per-tool setting)
         
     Returns:
-        Dict containing operation status
+        Dict containing the written file, row and byte counts and rows per second
     """
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
+    
     if not CURRENT_DATABASE:
         return format_error("No database selected", "Please use switch_database() to select a database first")
     
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
+    if not validate_sql_query(query) or not is_read_only_statement(query):
+        return format_error("Invalid query", "Only read-only SELECT queries can be exported")
+    
+    try:
+        paths, compression = validate_export_options(file_path, file_format, compression, overwrite)
+    except ValueError as e:
+        return format_error(e, "Invalid export options")
+    
+    set_call_read_only(True)
     
     try:
+        start = time.perf_counter()
         with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            if force:
-                query = f"DROP TABLE IF EXISTS `{table_name}`"
-            else:
-                query = f"DROP TABLE `{table_name}`"
-            
-            cursor.execute(query)
+            cursor = connection.cursor(prepared=True) if params else connection.cursor()
+            cursor.execute(query, params or None)
+            exported = export_cursor_rows(cursor, paths[0], file_format, compression)
             cursor.close()
-            
-            return format_result({
-                "table_name": table_name,
-                "force": force,
-                "database": CURRENT_DATABASE
-            }, f"Table '{table_name}' deleted successfully from database '{CURRENT_DATABASE}'")
+        result = export_summary([exported], file_format, compression, time.perf_counter() - start)
+        return format_result(result, f"Exported {result['rows']} rows to {result['files'][0]['file']} ({result['rows_per_second']} rows/s)")
     except Exception as e:
-        logger.error(f"Failed to delete table '{table_name}': {e}")
-        return format_error(e, f"Failed to delete table '{table_name}'")
+        logger.error(f"Failed to export query: {e}")
+        return format_error(e, "Failed to export query")
 
-# Tool: Truncate table
-@log_client_call
+def export_table_part(database: str, query: str, params: Tuple[Any, ...], path: str, file_format: str,
+                      compression: Optional[str], stop: threading.Event) -> Dict[str, Any]:
+    """Export one primary key range of a table on its own connection; the first failure stops the other parts"""
+    try:
+        with get_mysql_connection(database) as connection:
+            cursor = connection.cursor()
+            cursor.execute(query, params or None)
+            exported = export_cursor_rows(cursor, path, file_format, compression, stop)
+            cursor.close()
+            return exported
+    except BaseException:
+        stop.set()
+        raise
+
+# Tool: Export table to files
 @mcp.tool()
-def truncate_table(table_name: str) -> Dict[str, Any]:
+@log_client_call
+def export_table(table_name: str, file_path: str, file_format: str = "csv", compression: str = None, columns: List[str] = None,
+                 parts: int = 1, overwrite: bool = False, timeout_seconds: float = None) -> Dict[str, Any]:
     """
-    Truncates a table (removes all data but keeps the structure).
+    Streams a table into a local CSV, JSON Lines or Parquet file, or several files exported in parallel.
+    
+    With parts > 1 the table is split into that many ranges of its (integer) primary key, each
+    exported on its own connection into name.partNNN.ext; the parts are not one consistent snapshot.
     
     Args:
-        table_name: Name of the table to truncate
+        table_name: Name of the table to export
+        file_path: Output file, relative to the data file directory
+        file_format: 'csv', 'jsonl' or 'parquet' (requires pyarrow) (default: 'csv')
+        compression: 'gzip', 'zstd' (requires zstandard) or 'none' (default: from the file extension)
+        columns: Columns to export (default: all)
+        parts: Number of primary key ranges exported in parallel (default: 1)
+        overwrite: Replace existing files (default: False)
+        timeout_seconds: Execution deadline for this call (default: per-tool setting)
         
     Returns:
-        Dict containing operation status
+        Dict containing the written files, row and byte counts and rows per second
     """
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
+    
     if not CURRENT_DATABASE:
         return format_error("No database selected", "Please use switch_database() to select a database first")
     
     if not validate_table_name(table_name):
         return format_error("Invalid table name", "Table name contains invalid characters")
     
+    if columns and not all(validate_table_name(column) for column in columns):
+        return format_error("Invalid column name", "Column name contains invalid characters")
+    
+    if parts < 1:
+        return format_error("Invalid parts", "parts must be a positive integer")
+    
     try:
-        with get_mysql_connection() as connection:
+        paths, compression = validate_export_options(file_path, file_format, compression, overwrite, parts)
+    except ValueError as e:
+        return format_error(e, "Invalid export options")
+    
+    set_call_read_only(True)
+    database = CURRENT_DATABASE
+    select_list = ", ".join(f"`{column}`" for column in columns) if columns else "*"
+    
+    try:
+        start = time.perf_counter()
+        ranges = [("", ())]
+        if parts > 1:
+            with get_mysql_connection() as connection:
+                cursor = connection.cursor()
+                key_columns = get_primary_key_columns(cursor, table_name)
+                if key_columns:
+                    cursor.execute("""
+                        SELECT data_type FROM information_schema.columns
+                        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+                    """, (table_name, key_columns[0]))
+                    row = cursor.fetchone()
+                if not key_columns or not row or str(row[0]).lower() not in INTEGER_DATA_TYPES:
+                    return format_error(f"Table '{table_name}' has no integer primary key",
+                                        "parts > 1 needs an integer primary key to split the table into ranges")
+                key = key_columns[0]
+                cursor.execute(f"SELECT MIN(`{key}`), MAX(`{key}`) FROM `{table_name}`")
+                low, high = cursor.fetchone()
+                cursor.close()
+            if low is not None:
+                step = -(-(int(high) - int(low) + 1) // parts)
+                ranges = [(f" WHERE `{key}` >= %s AND `{key}` < %s", (bound, bound + step)) for bound in range(int(low), int(high) + 1, step)]
+            # Parts beyond the key range are written empty so the file set is always complete
+            ranges += [(" WHERE FALSE", ())] * (parts - len(ranges))
+        
+        stop = threading.Event()
+        queries = [(f"SELECT {select_list} FROM `{table_name}`{where}", bounds) for where, bounds in ranges]
+        if len(queries) == 1:
+            files = [export_table_part(database, queries[0][0], queries[0][1], paths[0], file_format, compression, stop)]
+        else:
+            # Workers share the call's deadline and cancellation through a copy of its context
+            with ThreadPoolExecutor(max_workers=min(DATA_FILE_CONFIG['max_parallel'], parts), thread_name_prefix="mcp-export") as executor:
+                futures = [executor.submit(copy_context().run, export_table_part, database, query, bounds, path, file_format, compression, stop)
+                           for (query, bounds), path in zip(queries, paths)]
+                outcomes = []
+                for future in futures:
+                    try:
+                        outcomes.append(future.result())
+                    except Exception as e:
+                        outcomes.append(e)
+            errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+            if errors:
+                for outcome in outcomes:
+                    if not isinstance(outcome, Exception):
+                        os.remove(outcome["file"])
+                raise next((error for error in errors if not isinstance(error, ExportStoppedError)), errors[0])
+            files = outcomes
+        result = export_summary(files, file_format, compression, time.perf_counter() - start)
+        return format_result(result, f"Exported {result['rows']} rows of '{table_name}' to {len(files)} files ({result['rows_per_second']} rows/s)")
+    except Exception as e:
+        logger.error(f"Failed to export table {table_name}: {e}")
+        return format_error(e, "Failed to export table")
+
+# Data file import helpers
+BINARY_DATA_TYPES = {"binary", "varbinary", "tinyblob", "blob", "mediumblob", "longblob", "geometry", "point", "linestring",
+                     "polygon", "multipoint", "multilinestring", "multipolygon", "geometrycollection"}
+LOAD_DATA_REFUSED_ERRNOS = (errorcode.ER_CLIENT_LOCAL_FILES_DISABLED, errorcode.ER_NOT_ALLOWED_COMMAND, errorcode.CR_LOAD_DATA_LOCAL_INFILE_REJECTED)
+
+def resolve_file_format(path: str, file_format: Optional[str]) -> str:
+    """Format of a data file: as requested, else implied by its extension under any compression suffix"""
+    if file_format is None:
+        name = path
+        for suffix in DATA_FILE_COMPRESSIONS.values():
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        file_format = next((name_format for name_format, suffix in DATA_FILE_FORMATS.items() if name.endswith(suffix)), None)
+        if file_format is None:
+            raise ValueError(f"Cannot tell the format of '{os.path.basename(path)}' from its extension, pass file_format")
+    if file_format not in ("csv", "jsonl"):
+        raise ValueError(f"Cannot import '{file_format}' files (supported: csv, jsonl)")
+    return file_format
+
+# information_schema.columns.extra of VIRTUAL / STORED generated columns (not DEFAULT_GENERATED defaults)
+GENERATED_COLUMN_PATTERN = re.compile(r"\b(VIRTUAL|STORED) GENERATED\b", re.I)
+
+def get_column_types(cursor, table_name: str) -> Dict[str, str]:
+    """Column names and data types of a table in the current database, in ordinal order, without generated columns (they cannot be written)"""
+    cursor.execute("""
+        SELECT column_name, data_type, extra
+        FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s
+        ORDER BY ordinal_position
+    """, (table_name,))
+    return {row[0]: str(row[1]).lower() for row in cursor.fetchall() if not GENERATED_COLUMN_PATTERN.search(str(row[2] or ""))}
+
+def map_file_fields(fields: List[str], column_types: Dict[str, str], column_map: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """Table column for each file field: from column_map, else the column of the same name (case-insensitive)"""
+    by_name = {column.lower(): column for column in column_types}
+    mapping = {}
+    for field in fields:
+        column = (column_map or {}).get(field, field)
+        column = column if column in column_types else by_name.get(str(column).lower())
+        if column is not None:
+            mapping[field] = column
+    return mapping
+
+def to_column_value(value: Any, data_type: str) -> Any:
+    """Value of a file field for an INSERT into a column of the given data type (0x... hex into binary columns)"""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, str) and data_type in BINARY_DATA_TYPES and value[:2] == "0x":
+        try:
+            return bytes.fromhex(value[2:])
+        except ValueError:
+            return value
+    return value
+
+def read_data_file_records(path: str, file_format: str, compression: Optional[str]):
+    """
+    Records of a CSV file (dicts keyed by its header row) or JSON Lines file, as (line number, record, error).
+    
+    Lines that cannot be parsed are yielded with record None and the reason, for the quarantine file.
+    """
+    with open_data_file(path, "r", compression) as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+        if file_format == "csv":
+            reader = csv.reader(text)
+            header = [field.strip() for field in next(reader, None) or []]
+            null = DATA_FILE_CONFIG['csv_null']
+            for values in reader:
+                if not values:
+                    continue
+                if len(values) != len(header):
+                    yield reader.line_num, None, f"Expected {len(header)} fields, found {len(values)}: {values}"
+                    continue
+                yield reader.line_num, {field: None if value == null else value for field, value in zip(header, values)}, None
+        else:
+            for line_number, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f"Invalid JSON: {e}: {line.strip()[:200]}"
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, None, f"Expected a JSON object: {line.strip()[:200]}"
+                    continue
+                yield line_number, record, None
+
+def read_csv_header(path: str, compression: Optional[str]) -> Tuple[List[str], str]:
+    """Field names of a CSV file and its line terminator"""
+    with open_data_file(path, "r", compression) as raw:
+        first_line = raw.readline()
+    fields = next(csv.reader([first_line.decode("utf-8-sig")]), [])
+    return [field.strip() for field in fields], "\r\n" if first_line.endswith(b"\r\n") else "\n"
+
+def reject_import_record(job: Dict[str, Any], line_number: int, record: Any, error: Any) -> None:
+    """Write a rejected record with its line number and error to the quarantine file; too many rejections stop the import"""
+    entry = json.dumps({"line": line_number, "record": record, "error": str(error)}, ensure_ascii=False, default=str)
+    with job["lock"]:
+        if job["quarantine"] is None:
+            job["quarantine"] = open(job["quarantine_path"], "w", encoding="utf-8")
+        job["quarantine"].write(entry + "\n")
+        job["rows_rejected"] += 1
+        if job["rows_rejected"] > job["max_errors"]:
+            job["error"] = job["error"] or ValueError(f"More than {job['max_errors']} rows were rejected")
+            job["stop"].set()
+
+def is_row_error(error: Exception) -> bool:
+    """Whether a failed INSERT was refused for its values (quarantine the rows) rather than for the statement or connection"""
+    return isinstance(error, (mysql.connector.IntegrityError, mysql.connector.DataError)) or type(error) is mysql.connector.DatabaseError
+
+def insert_rows(cursor, table_name: str, columns: Tuple[str, ...], rows: List[List[Any]]) -> None:
+    """Insert rows with a single multi-row INSERT statement"""
+    row_placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    cursor.execute(f"INSERT INTO `{table_name}` ({', '.join(f'`{column}`' for column in columns)}) VALUES "
+                   + ", ".join([row_placeholders] * len(rows)), [value for values in rows for value in values])
+
+def insert_import_batch(database: str, table_name: str, columns: Tuple[str, ...], batch: List[Tuple[int, Any, List[Any]]], job: Dict[str, Any]) -> None:
+    """Insert one batch with a multi-row INSERT; if its values are refused, insert it row by row and quarantine the failures"""
+    if job["stop"].is_set():
+        return
+    with get_mysql_connection(database) as connection:
+        cursor = connection.cursor()
+        try:
+            # A multi-row INSERT is atomic, so a refused batch leaves nothing behind to retry around
+            insert_rows(cursor, table_name, columns, [values for _, _, values in batch])
+            loaded = len(batch)
+        except Error as e:
+            if not is_row_error(e):
+                raise
+            loaded = 0
+            for line_number, record, values in batch:
+                try:
+                    insert_rows(cursor, table_name, columns, [values])
+                    loaded += 1
+                except Error as row_error:
+                    if not is_row_error(row_error):
+                        raise
+                    reject_import_record(job, line_number, record, row_error)
+        cursor.close()
+    with job["lock"]:
+        job["rows_loaded"] += loaded
+        job["batches"] += 1
+
+def load_data_local_infile(path: str, table_name: str, fields: List[str], mapping: Dict[str, str],
+                           column_types: Dict[str, str], line_terminator: str) -> Optional[Dict[str, Any]]:
+    """
+    Load an uncompressed CSV file with LOAD DATA LOCAL INFILE; None when the INSERT path must be used instead.
+    
+    LOAD DATA reports rows it truncates, coerces or skips only as warnings, so the load runs in a
+    transaction that is rolled back when any warning was raised: the INSERT path then loads the file
+    and writes those rows to the quarantine file. Non-transactional tables always use the INSERT path.
+    """
+    root = os.path.realpath(DATA_FILE_CONFIG['directory'])
+    targets, assignments, params = [], [], [path, line_terminator]
+    for index, field in enumerate(fields):
+        column = mapping.get(field)
+        if column is None:
+            targets.append("@unused")
+            continue
+        targets.append(f"@field_{index}")
+        value = f"NULLIF(@field_{index}, %s)"
+        params.append(DATA_FILE_CONFIG['csv_null'])
+        if column_types[column] in BINARY_DATA_TYPES:
+            value = f"IF(LEFT(@field_{index}, 2) = '0x', UNHEX(SUBSTRING(@field_{index}, 3)), {value})"
+        assignments.append(f"`{column}` = {value}")
+    # Quotes are doubled rather than backslash-escaped in these files, hence ESCAPED BY ''
+    query = (f"LOAD DATA LOCAL INFILE %s INTO TABLE `{table_name}` CHARACTER SET utf8mb4 "
+             f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' LINES TERMINATED BY %s IGNORE 1 LINES "
+             f"({', '.join(targets)}) SET {', '.join(assignments)}")
+    try:
+        # The client only hands the server files below the data file directory
+        with get_mysql_connection(allow_local_infile_in_path=root) as connection:
             cursor = connection.cursor()
-            
-            # Get row count before truncation
-            cursor.execute(f"SELECT COUNT(*) FROM `{table_name}`")
-            row_count = cursor.fetchone()[0]
-            
-            # Truncate the table
-            cursor.execute(f"TRUNCATE TABLE `{table_name}`")
+            cursor.execute("SELECT @@GLOBAL.local_infile")
+            row = cursor.fetchone()
+            if not row or not row[0]:
+                cursor.close()
+                return None
+            cursor.execute("SELECT engine FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s", (table_name,))
+            row = cursor.fetchone()
+            if not row or str(row[0]).lower() != "innodb":
+                cursor.close()
+                return None
+            connection.start_transaction()
+            cursor.execute(query, params)
+            rows_loaded, warnings = max(cursor.rowcount, 0), cursor.warning_count
+            if warnings:
+                cursor.execute("SHOW WARNINGS LIMIT 3")
+                examples = "; ".join(str(warning[2]) for warning in cursor.fetchall())
+                connection.rollback()
+                cursor.close()
+                logger.info(f"LOAD DATA into {table_name} raised {warnings} warnings ({examples}), rolled back to load with INSERT batches")
+                return None
+            connection.commit()
             cursor.close()
-            
-            return format_result({
-                "table_name": table_name,
-                "rows_removed": row_count,
-                "database": CURRENT_DATABASE
-            }, f"Table '{table_name}' truncated successfully, removed {row_count} rows from database '{CURRENT_DATABASE}'")
-    except Exception as e:
-        logger.error(f"Failed to truncate table '{table_name}': {e}")
-        return format_error(e, f"Failed to truncate table '{table_name}'")
+            return {"rows_loaded": rows_loaded}
+    except Error as e:
+        if e.errno in LOAD_DATA_REFUSED_ERRNOS:
+            logger.info(f"LOAD DATA LOCAL INFILE not permitted, falling back to INSERT batches: {e}")
+            return None
+        raise
 
-# Tool: Add column to table
-@log_client_call
+# Tool: Import data file into a table
 @mcp.tool()
-def add_column(table_name: str, column_name: str, column_type: str, constraints: List[str] = None, default_value: Any = None, after_column: str = None) -> Dict[str, Any]:
+@log_client_call
+def import_file(table_name: str, file_path: str, file_format: str = None, compression: str = None, column_map: Dict[str, str] = None,
+                batch_rows: int = None, parallel: int = None, load_data: bool = True, max_errors: int = None,
+                timeout_seconds: float = None) -> Dict[str, Any]:
     """
-    Adds a new column to an existing table.
+    Loads a local CSV or JSON Lines file into an existing table.
+    
+    File fields are matched to table columns by name (or column_map); unmatched fields are ignored.
+    Uncompressed CSV files are loaded with LOAD DATA LOCAL INFILE when the server permits it and the
+    file loads without warnings; otherwise the file is streamed in multi-row INSERT batches on several
+    connections. Rows the server refuses are written with their line number and error to <file>.rejected.jsonl.
     
     Args:
-        table_name: Name of the table to modify
-        column_name: Name of the new column
-        column_type: Data type of the new column
-        constraints: List of constraints (e.g., ['NOT NULL', 'UNIQUE'])
-        default_value: Default value for the column
-        after_column: Name of the column to place the new column after (optional)
+        table_name: Name of the table to load into
+        file_path: Input file, relative to the data file directory
+        file_format: 'csv' (with a header row) or 'jsonl' (default: from the file extension)
+        compression: 'gzip', 'zstd' or 'none' (default: from the file extension)
+        column_map: File field name -> table column name, for fields named differently
+        batch_rows: Rows per INSERT statement (default: configured batch_rows)
+        parallel: Batches inserted concurrently (default: configured max_parallel)
+        load_data: Try LOAD DATA LOCAL INFILE for uncompressed CSV files (default: True)
+        max_errors: Stop after this many rejected rows (default: configured max_errors)
+        timeout_seconds: Execution deadline for this call (default: per-tool setting)
         
     Returns:
-        Dict containing operation status
+        Dict containing loaded and rejected row counts, the quarantine file and rows per second
     """
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
+    
     if not CURRENT_DATABASE:
         return format_error("No database selected", "Please use switch_database() to select a database first")
     
     if not validate_table_name(table_name):
         return format_error("Invalid table name", "Table name contains invalid characters")
     
-    if not validate_table_name(column_name):
-        return format_error("Invalid column name", "Column name contains invalid characters")
+    batch_rows = batch_rows or DATA_FILE_CONFIG['batch_rows']
+    parallel = parallel or DATA_FILE_CONFIG['max_parallel']
+    max_errors = DATA_FILE_CONFIG['max_errors'] if max_errors is None else max_errors
+    if batch_rows < 1 or parallel < 1 or max_errors < 0:
+        return format_error("Invalid options", "batch_rows and parallel must be positive, max_errors must not be negative")
+    
+    try:
+        path = resolve_data_file_path(file_path)
+        if not os.path.isfile(path):
+            raise ValueError(f"'{file_path}' does not exist in the data file directory")
+        file_format = resolve_file_format(path, file_format)
+        compression = resolve_compression(path, compression)
+    except ValueError as e:
+        return format_error(e, "Invalid import options")
     
+    database = CURRENT_DATABASE
     try:
+        start = time.perf_counter()
         with get_mysql_connection() as connection:
             cursor = connection.cursor()
-            
-            # Build ALTER TABLE statement
-            alter_sql = f"ALTER TABLE `{table_name}` ADD COLUMN `{column_name}` {column_type}"
-            
-            # Add constraints
-            if constraints and isinstance(constraints, list):
-                for constraint in constraints:
-                    if isinstance(constraint, str):
-                        alter_sql += f" {constraint}"
-            
-            # Add default value
-            if default_value is not None:
-                if isinstance(default_value, str):
-                    alter_sql += f" DEFAULT '{default_value}'"
-                else:
-                    alter_sql += f" DEFAULT {default_value}"
-            
-            # Add position
-            if after_column and validate_table_name(after_column):
-                alter_sql += f" AFTER `{after_column}`"
-            
-            cursor.execute(alter_sql)
+            column_types = get_column_types(cursor, table_name)
             cursor.close()
-            
-            return format_result({
-                "table_name": table_name,
-                "column_name": column_name,
-                "column_type": column_type,
-                "constraints": constraints or [],
-                "default_value": default_value,
-                "after_column": after_column,
-                "database": CURRENT_DATABASE
-            }, f"Column '{column_name}' added successfully to table '{table_name}' in database '{CURRENT_DATABASE}'")
+        if not column_types:
+            return format_error(f"Table '{table_name}' not found", "Failed to import file")
+        
+        result = {"table": table_name, "file": file_path, "format": file_format, "bytes": os.path.getsize(path)}
+        if file_format == "csv":
+            fields, line_terminator = read_csv_header(path, compression)
+            mapping = map_file_fields(fields, column_types, column_map)
+            if not mapping:
+                return format_error(f"None of the fields {fields[:20]} match a column of '{table_name}'", "Failed to import file")
+            result["ignored_fields"] = [field for field in fields if field not in mapping]
+            if load_data and compression is None and DATA_FILE_CONFIG['load_data_local']:
+                loaded = load_data_local_infile(path, table_name, fields, mapping, column_types, line_terminator)
+                if loaded is not None:
+                    elapsed = time.perf_counter() - start
+                    result.update(loaded, method="load_data", elapsed_seconds=round(elapsed, 3),
+                                  rows_per_second=round(loaded["rows_loaded"] / elapsed, 1) if elapsed else None)
+                    return format_result(result, f"Loaded {loaded['rows_loaded']} rows into '{table_name}' with LOAD DATA "
+                                                 f"({result['rows_per_second']} rows/s)")
+        
+        job = {"lock": threading.Lock(), "stop": threading.Event(), "error": None, "rows_read": 0, "rows_loaded": 0,
+               "rows_rejected": 0, "batches": 0, "max_errors": max_errors, "quarantine": None,
+               "quarantine_path": path + ".rejected.jsonl"}
+        if os.path.exists(job["quarantine_path"]):
+            os.remove(job["quarantine_path"])  # Left by an earlier import of the same file
+        ignored, mappings = set(), {}
+        slots = threading.BoundedSemaphore(parallel * 2)  # Batches read ahead of the loaders, bounding memory
+        
+        def batch_done(future):
+            slots.release()
+            error = future.exception()
+            if error is not None:
+                with job["lock"]:
+                    job["error"] = job["error"] or error
+                job["stop"].set()
+        
+        try:
+            # Loaders share the call's deadline and cancellation through a copy of its context
+            with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="mcp-import") as executor:
+                def submit(columns, batch):
+                    slots.acquire()
+                    executor.submit(copy_context().run, insert_import_batch, database, table_name, columns, batch, job).add_done_callback(batch_done)
+                
+                columns, batch = None, []
+                for line_number, record, error in read_data_file_records(path, file_format, compression):
+                    if job["stop"].is_set():
+                        break
+                    job["rows_read"] += 1
+                    if record is None:
+                        reject_import_record(job, line_number, None, error)
+                        continue
+                    fields = tuple(record)
+                    if fields not in mappings:
+                        mappings[fields] = map_file_fields(list(fields), column_types, column_map)
+                        ignored.update(field for field in fields if field not in mappings[fields])
+                    mapping = mappings[fields]
+                    if not mapping:
+                        reject_import_record(job, line_number, record, f"No field matches a column of '{table_name}'")
+                        continue
+                    row_columns = tuple(mapping.values())
+                    if row_columns != columns and batch:
+                        submit(columns, batch)
+                        batch = []
+                    columns = row_columns
+                    batch.append((line_number, record, [to_column_value(record[field], column_types[column]) for field, column in mapping.items()]))
+                    if len(batch) >= batch_rows:
+                        submit(columns, batch)
+                        batch = []
+                if batch and not job["stop"].is_set():
+                    submit(columns, batch)
+        finally:
+            if job["quarantine"] is not None:
+                job["quarantine"].close()
+        
+        elapsed = time.perf_counter() - start
+        result.update({
+            "method": "insert",
+            "rows_read": job["rows_read"],
+            "rows_loaded": job["rows_loaded"],
+            "rows_rejected": job["rows_rejected"],
+            "quarantine_file": os.path.relpath(job["quarantine_path"], os.path.realpath(DATA_FILE_CONFIG['directory'])) if job["rows_rejected"] else None,
+            "batches": job["batches"],
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(job["rows_loaded"] / elapsed, 1) if elapsed else None
+        })
+        if file_format == "jsonl":
+            result["ignored_fields"] = sorted(ignored)
+        if job["error"] is not None:
+            logger.error(f"Import into {table_name} stopped after {job['rows_loaded']} rows: {job['error']}")
+            rejected = f", {job['rows_rejected']} rejected to {result['quarantine_file']}" if job["rows_rejected"] else ""
+            return format_error(job["error"], f"Import stopped after loading {job['rows_loaded']} of {job['rows_read']} rows read{rejected} (loaded rows are kept)")
+        message = f"Loaded {job['rows_loaded']} rows into '{table_name}' ({result['rows_per_second']} rows/s)"
+        if job["rows_rejected"]:
+            message += f", {job['rows_rejected']} rows rejected to {result['quarantine_file']}"
+        return format_result(result, message)
     except Exception as e:
-        logger.error(f"Failed to add column '{column_name}' to table '{table_name}': {e}")
-        return format_error(e, f"Failed to add column '{column_name}' to table '{table_name}'")
+        logger.error(f"Failed to import {file_path} into {table_name}: {e}")
+        return format_error(e, "Failed to import file")
 
-# Tool: Drop column from table
-@log_client_call
+# Logical backup helpers
+BACKUP_MANIFEST_NAME = "manifest.json"
+BACKUP_FORMAT_VERSION = 1
+SNAPSHOT_OPTIONS = {"consistent_snapshot": True, "isolation_level": "REPEATABLE READ", "readonly": True}
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's bytes, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as data_file:
+        for block in iter(lambda: data_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def write_json_file(path: str, content: Any) -> None:
+    """Write a JSON file under a temporary name and rename it, so it is either complete or absent"""
+    temporary_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as json_file:
+        json.dump(content, json_file, indent=2, ensure_ascii=False, default=str)
+    os.replace(temporary_path, path)
+
+def open_snapshot_connections(stack: ExitStack, database: str, workers: int, consistent: bool) -> Tuple[List[Any], str, Optional[str]]:
+    """
+    Open the worker connections of a backup, each in a read-only consistent snapshot transaction.
+    
+    To share one point in time across workers, FLUSH TABLES WITH READ LOCK holds off writes while
+    every worker starts its snapshot; without the RELOAD privilege (or if the lock cannot be had
+    within snapshot_lock_wait_seconds) the backup falls back to a single snapshot connection.
+    
+    Returns:
+        (connections, snapshot mode 'shared' / 'single' / 'per_connection', gtid_executed at the snapshot)
+    """
+    def open_worker():
+        connection = stack.enter_context(get_mysql_connection(database))
+        connection.start_transaction(**SNAPSHOT_OPTIONS)
+        return connection
+    
+    if not consistent:
+        return [open_worker() for _ in range(workers)], "per_connection", None
+    if workers > 1:
+        with get_mysql_connection(database) as lock_connection:
+            cursor = lock_connection.cursor()
+            try:
+                cursor.execute(f"SET SESSION lock_wait_timeout = {int(DATA_FILE_CONFIG['snapshot_lock_wait_seconds'])}")
+                cursor.execute("FLUSH TABLES WITH READ LOCK")
+            except Error as e:
+                logger.warning(f"Cannot lock tables for a shared snapshot of {database}, backing up on one connection: {e}")
+            else:
+                try:
+                    connections = [open_worker() for _ in range(workers)]
+                    cursor.execute("SELECT @@GLOBAL.gtid_executed")
+                    gtid_executed = cursor.fetchone()[0]
+                finally:
+                    cursor.execute("UNLOCK TABLES")
+                cursor.close()
+                return connections, "shared", gtid_executed
+            cursor.close()
+    return [open_worker()], "single", None
+
+def dump_schema(cursor, database: str) -> Dict[str, Any]:
+    """CREATE statements of a database's tables, views, routines and triggers, with table columns, keys and size estimates"""
+    cursor.execute("""
+        SELECT table_name, table_type, table_rows FROM information_schema.tables
+        WHERE table_schema = %s ORDER BY table_name
+    """, (database,))
+    objects = cursor.fetchall()
+    schema = {"tables": [], "views": [], "routines": [], "triggers": []}
+    for name, table_type, estimated_rows in objects:
+        if table_type == "VIEW":
+            cursor.execute(f"SHOW CREATE VIEW `{name}`")
+            schema["views"].append({"name": name, "create_sql": cursor.fetchone()[1]})
+            continue
+        cursor.execute(f"SHOW CREATE TABLE `{name}`")
+        create_sql = cursor.fetchone()[1]
+        schema["tables"].append({"name": name, "create_sql": create_sql, "columns": get_column_types(cursor, name),
+                                 "primary_key": get_primary_key_columns(cursor, name), "estimated_rows": int(estimated_rows or 0)})
+    cursor.execute("""
+        SELECT routine_name, routine_type FROM information_schema.routines
+        WHERE routine_schema = %s ORDER BY routine_type, routine_name
+    """, (database,))
+    for name, routine_type in cursor.fetchall():
+        cursor.execute(f"SHOW CREATE {routine_type} `{name}`")
+        row = cursor.fetchone()
+        schema["routines"].append({"name": name, "type": routine_type, "sql_mode": row[1], "create_sql": row[2]})
+    cursor.execute("""
+        SELECT trigger_name FROM information_schema.triggers
+        WHERE trigger_schema = %s ORDER BY event_object_table, action_order
+    """, (database,))
+    for (name,) in cursor.fetchall():
+        cursor.execute(f"SHOW CREATE TRIGGER `{name}`")
+        row = cursor.fetchone()
+        schema["triggers"].append({"name": name, "sql_mode": row[1], "create_sql": row[2]})
+    return schema
+
+def plan_table_chunks(cursor, table: Dict[str, Any], chunk_rows: int) -> List[Dict[str, Any]]:
+    """
+    Split a table into primary key ranges of about chunk_rows rows (by its row estimate and key span).
+    
+    The first and last ranges are open-ended, so rows outside the key range seen here are still covered.
+    """
+    name, key_columns = table["name"], table["primary_key"]
+    chunks = max(1, -(-table["estimated_rows"] // chunk_rows))
+    if chunks > 1 and key_columns and table["columns"].get(key_columns[0]) in INTEGER_DATA_TYPES:
+        cursor.execute(f"SELECT MIN(`{key_columns[0]}`), MAX(`{key_columns[0]}`) FROM `{name}`")
+        low, high = cursor.fetchone()
+        if low is not None:
+            return key_range_chunks(name, key_columns[0], low, high, chunks)
+    return [{"table": name, "where": "", "params": (), "range": None}]
+
+def key_range_chunks(name: str, key: str, low: int, high: int, chunks: int) -> List[Dict[str, Any]]:
+    """Split an integer key's span low..high into about chunks ranges, the first and last open-ended"""
+    step = max(1, -(-(int(high) - int(low) + 1) // chunks))
+    bounds = list(range(int(low) + step, int(high) + 1, step))
+    if not bounds:
+        return [{"table": name, "where": "", "params": (), "range": None}]
+    edges = [None] + bounds + [None]
+    return [{"table": name,
+             "where": " WHERE " + " AND ".join(condition for condition, bound in ((f"`{key}` >= %s", low), (f"`{key}` < %s", high)) if bound is not None),
+             "params": tuple(bound for bound in (low, high) if bound is not None),
+             "range": [low, high]}
+            for low, high in zip(edges, edges[1:])]
+
+def run_backup_worker(connection, tasks: deque, directory: str, compression: Optional[str], stop: threading.Event) -> None:
+    """Dump chunks from the shared task queue on one snapshot connection until the queue is empty or another worker failed"""
+    suffix = DATA_FILE_FORMATS["jsonl"] + (DATA_FILE_COMPRESSIONS[compression] if compression else "")
+    try:
+        while not stop.is_set():
+            try:
+                task = tasks.popleft()
+            except IndexError:
+                return
+            path = os.path.join(directory, f"{task['table']}.{task['index']:05d}{suffix}")
+            cursor = connection.cursor()
+            # Generated columns are left out: the restore could not insert them and recomputes them anyway
+            column_list = ", ".join(f"`{column}`" for column in task["columns"])
+            cursor.execute(f"SELECT {column_list} FROM `{task['table']}`{task['where']}", task["params"] or None)
+            exported = export_cursor_rows(cursor, path, "jsonl", compression, stop, binary_as_hex=True)
+            cursor.close()
+            task["result"] = {"file": os.path.basename(path), "rows": exported["rows"], "bytes": exported["bytes"],
+                              "sha256": file_sha256(path), "range": task["range"]}
+    except BaseException:
+        stop.set()
+        raise
+
+# Tool: Back up database to local files
 @mcp.tool()
-def drop_column(table_name: str, column_name: str) -> Dict[str, Any]:
+@log_client_call
+def backup_database(directory: str, database_name: str = None, tables: List[str] = None, compression: str = "gzip",
+                    chunk_rows: int = None, parallel: int = None, consistent: bool = True, overwrite: bool = False,
+                    timeout_seconds: float = None) -> Dict[str, Any]:
     """
-    Removes a column from an existing table.
+    Writes a logical backup of a database: its schema and its table data in compressed chunk files.
+    
+    Tables are split into primary key chunks that several connections dump in parallel, all reading
+    the same consistent snapshot where the server allows it. A manifest.json written last lists
+    every object's CREATE statement and every chunk file with its row count and SHA-256.
     
     Args:
-        table_name: Name of the table to modify
-        column_name: Name of the column to remove
+        directory: Output directory, relative to the data file directory
+        database_name: Database to back up (default: the current database)
+        tables: Only back up these tables' data and definitions (default: all; views, routines and triggers are always included)
+        compression: 'gzip', 'zstd' (requires zstandard) or 'none' (default: 'gzip')
+        chunk_rows: Approximate rows per chunk file (default: configured backup_chunk_rows)
+        parallel: Connections dumping chunks concurrently (default: configured max_parallel)
+        consistent: Read all tables from one point in time (default: True)
+        overwrite: Write into a directory that already holds a backup (default: False)
+        timeout_seconds: Execution deadline for this call (default: per-tool setting)
         
     Returns:
-        Dict containing operation status
+        Dict containing the manifest path, snapshot mode, and row, chunk and byte counts per table
     """
-    if not CURRENT_DATABASE:
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
+    
+    database = database_name or CURRENT_DATABASE
+    if not database:
         return format_error("No database selected", "Please use switch_database() to select a database first")
     
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
+    if not validate_table_name(database) or (tables and not all(validate_table_name(table) for table in tables)):
+        return format_error("Invalid name", "Database or table name contains invalid characters")
     
-    if not validate_table_name(column_name):
-        return format_error("Invalid column name", "Column name contains invalid characters")
+    chunk_rows = chunk_rows or DATA_FILE_CONFIG['backup_chunk_rows']
+    parallel = parallel or DATA_FILE_CONFIG['max_parallel']
+    if chunk_rows < 1 or parallel < 1:
+        return format_error("Invalid options", "chunk_rows and parallel must be positive integers")
+    if POOL_CONFIG['enabled']:
+        parallel = min(parallel, max(1, POOL_CONFIG['max_size'] - 1))  # One pooled connection is needed for the snapshot lock
     
     try:
-        with get_mysql_connection() as connection:
+        compression = resolve_compression("", compression)
+        output = resolve_data_file_path(directory)
+        manifest_path = os.path.join(output, BACKUP_MANIFEST_NAME)
+        if os.path.exists(manifest_path) and not overwrite:
+            raise ValueError(f"'{directory}' already holds a backup (pass overwrite=True to replace it)")
+        os.makedirs(output, exist_ok=True)
+    except ValueError as e:
+        return format_error(e, "Invalid backup options")
+    
+    written = []
+    try:
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            connections, snapshot, gtid_executed = open_snapshot_connections(stack, database, parallel, consistent)
+            cursor = connections[0].cursor()
+            schema = dump_schema(cursor, database)
+            if tables:
+                missing = set(tables) - {table["name"] for table in schema["tables"]}
+                if missing:
+                    return format_error(f"Tables not found in '{database}': {', '.join(sorted(missing))}", "Failed to back up database")
+                schema["tables"] = [table for table in schema["tables"] if table["name"] in tables]
+            # Largest tables first, so the longest chunks do not start last
+            tasks = []
+            for table in sorted(schema["tables"], key=lambda table: -table["estimated_rows"]):
+                table["chunks"] = plan_table_chunks(cursor, table, chunk_rows)
+                for index, chunk in enumerate(table["chunks"]):
+                    chunk["index"] = index
+                    chunk["columns"] = list(table["columns"])
+                    tasks.append(chunk)
+            cursor.close()
+            
+            queue, stop = deque(tasks), threading.Event()
+            # Workers share the call's deadline and cancellation through a copy of its context
+            with ThreadPoolExecutor(max_workers=len(connections), thread_name_prefix="mcp-backup") as executor:
+                futures = [executor.submit(copy_context().run, run_backup_worker, connection, queue, output, compression, stop)
+                           for connection in connections]
+                errors = []
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        errors.append(e)
+            written = [os.path.join(output, task["result"]["file"]) for task in tasks if "result" in task]
+            if errors:
+                raise next((error for error in errors if not isinstance(error, ExportStoppedError)), errors[0])
+        
+        for table in schema["tables"]:
+            table["chunks"] = [chunk["result"] for chunk in table["chunks"]]
+            table["rows"] = sum(chunk["rows"] for chunk in table["chunks"])
+        elapsed = time.perf_counter() - start
+        rows = sum(table["rows"] for table in schema["tables"])
+        manifest = {
+            "format_version": BACKUP_FORMAT_VERSION,
+            "database": database,
+            "created_at": datetime.now().isoformat(),
+            "snapshot": snapshot,
+            "gtid_executed": gtid_executed,
+            "compression": compression,
+            "file_format": "jsonl",
+            **schema,
+            "rows": rows,
+            "bytes": sum(chunk["bytes"] for table in schema["tables"] for chunk in table["chunks"]),
+            "elapsed_seconds": round(elapsed, 3)
+        }
+        write_json_file(manifest_path, manifest)
+        
+        result = {
+            "manifest": os.path.relpath(manifest_path, os.path.realpath(DATA_FILE_CONFIG['directory'])),
+            "database": database,
+            "snapshot": snapshot,
+            "tables": [{"name": table["name"], "rows": table["rows"], "chunks": len(table["chunks"]),
+                        "bytes": sum(chunk["bytes"] for chunk in table["chunks"])} for table in schema["tables"]],
+            "views": len(schema["views"]),
+            "routines": len(schema["routines"]),
+            "triggers": len(schema["triggers"]),
+            "rows": rows,
+            "bytes": manifest["bytes"],
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed else None
+        }
+        return format_result(result, f"Backed up {len(schema['tables'])} tables ({rows} rows) of '{database}' "
+                                     f"with a {snapshot} snapshot ({result['rows_per_second']} rows/s)")
+    except Exception as e:
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+        logger.error(f"Failed to back up database {database}: {e}")
+        return format_error(e, "Failed to back up database")
+
+# Restore helpers
+RESTORE_JOBS: Dict[str, Dict[str, Any]] = {}
+RESTORE_JOBS_LOCK = threading.Lock()
+SECONDARY_INDEX_CLAUSE_PATTERN = re.compile(r"^(UNIQUE |FULLTEXT |SPATIAL )?KEY\s", re.I)
+FOREIGN_KEY_CLAUSE_PATTERN = re.compile(r"^CONSTRAINT\s+`(?:[^`]|``)+`\s+FOREIGN KEY\b", re.I)
+AUTO_INCREMENT_COLUMN_PATTERN = re.compile(r"^`((?:[^`]|``)+)`.*\bAUTO_INCREMENT\b", re.I)
+FIRST_KEY_COLUMN_PATTERN = re.compile(r"\(`((?:[^`]|``)+)`")
+RELAXED_LOAD_SESSION = "SET SESSION unique_checks = 0, foreign_key_checks = 0"
+
+def split_create_table(create_sql: str) -> Tuple[str, List[str], List[str]]:
+    """
+    Split SHOW CREATE TABLE output into a CREATE TABLE without secondary indexes and foreign keys, and those clauses.
+    
+    The index that an AUTO_INCREMENT column needs stays in the CREATE when the primary key does not lead with it.
+    """
+    lines = create_sql.split("\n")
+    end = next((index for index in range(len(lines) - 1, 0, -1) if lines[index].startswith(")")), None)
+    if end is None:
+        return create_sql, [], []
+    clauses = [line.strip().rstrip(",") for line in lines[1:end]]
+    auto_increment = next((match.group(1) for match in map(AUTO_INCREMENT_COLUMN_PATTERN.match, clauses) if match), None)
+    primary_key = next((clause for clause in clauses if clause.upper().startswith("PRIMARY KEY")), "")
+    first_key_column = FIRST_KEY_COLUMN_PATTERN.search(primary_key)
+    needs_key = auto_increment is not None and not (first_key_column and first_key_column.group(1) == auto_increment)
+    definitions, indexes, foreign_keys = [], [], []
+    for clause in clauses:
+        if SECONDARY_INDEX_CLAUSE_PATTERN.match(clause):
+            first_key_column = FIRST_KEY_COLUMN_PATTERN.search(clause)
+            if needs_key and first_key_column and first_key_column.group(1) == auto_increment:
+                needs_key = False
+                definitions.append(clause)
+            else:
+                indexes.append(clause)
+        elif FOREIGN_KEY_CLAUSE_PATTERN.match(clause):
+            foreign_keys.append(clause)
+        else:
+            definitions.append(clause)
+    create = lines[0] + "\n" + ",\n".join(f"  {definition}" for definition in definitions) + "\n" + "\n".join(lines[end:])
+    return create, indexes, foreign_keys
+
+def load_backup_manifest(directory: str) -> Tuple[str, Dict[str, Any]]:
+    """Read and check the manifest of a backup directory; raises ValueError when it is missing or unsupported"""
+    path = resolve_data_file_path(directory)
+    manifest_path = os.path.join(path, BACKUP_MANIFEST_NAME)
+    if not os.path.isfile(manifest_path):
+        raise ValueError(f"'{directory}' has no {BACKUP_MANIFEST_NAME}; it is not a complete backup")
+    with open(manifest_path, encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get("format_version") != BACKUP_FORMAT_VERSION:
+        raise ValueError(f"Unsupported backup format version {manifest.get('format_version')}")
+    return path, manifest
+
+def update_restore_job(job: Dict[str, Any], **changes: Any) -> None:
+    """Apply changes to a restore job under its lock; keys ending in _add increment the counter they name"""
+    with job["lock"]:
+        for key, value in changes.items():
+            if key.endswith("_add"):
+                job[key[:-4]] += value
+            else:
+                job[key] = value
+
+def snapshot_restore_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the externally visible view of a restore job, with load percentage, throughput and ETA"""
+    with job["lock"]:
+        snapshot = {key: value for key, value in job.items() if key not in ("lock", "started_monotonic", "loading_started")}
+        snapshot["object_errors"] = list(job["object_errors"])
+        loading_started = job["loading_started"]
+    if snapshot["rows_total"]:
+        snapshot["percent"] = round(100.0 * snapshot["rows_loaded"] / snapshot["rows_total"], 2)
+    if loading_started is not None and snapshot["rows_loaded"]:
+        elapsed = snapshot["loading_seconds"] or time.monotonic() - loading_started
+        snapshot["rows_per_second"] = round(snapshot["rows_loaded"] / elapsed, 1)
+        if snapshot["phase"] == "loading":
+            snapshot["eta_seconds"] = round((snapshot["rows_total"] - snapshot["rows_loaded"]) / snapshot["rows_per_second"], 1)
+    return snapshot
+
+def run_restore_loader(job: Dict[str, Any], tasks: deque, directory: str, compression: Optional[str], batch_rows: int, stop: threading.Event) -> None:
+    """Load chunks from the shared queue on one connection with unique and foreign key checks relaxed, one transaction per chunk"""
+    try:
+        with get_mysql_connection(job["database"], job["datasource"]) as connection:
             cursor = connection.cursor()
+            cursor.execute(RELAXED_LOAD_SESSION)
+            while not stop.is_set():
+                try:
+                    table, chunk = tasks.popleft()
+                except IndexError:
+                    break
+                column_types = table["columns"]
+                connection.start_transaction()
+                columns, batch = None, []
+                for line_number, record, error in read_data_file_records(os.path.join(directory, chunk["file"]), "jsonl", compression):
+                    if record is None:
+                        raise ValueError(f"{chunk['file']} line {line_number}: {error}")
+                    if tuple(record) != columns or len(batch) >= batch_rows:
+                        if batch:
+                            insert_rows(cursor, table["name"], columns, batch)
+                            update_restore_job(job, rows_loaded_add=len(batch))
+                        columns, batch = tuple(record), []
+                    batch.append([to_column_value(value, column_types.get(column, "")) for column, value in record.items()])
+                if batch:
+                    insert_rows(cursor, table["name"], columns, batch)
+                    update_restore_job(job, rows_loaded_add=len(batch))
+                connection.commit()
+                update_restore_job(job, chunks_loaded_add=1)
+            cursor.close()
+    except BaseException:
+        stop.set()
+        raise
+
+def run_parallel(workers: int, target: Callable, arguments: List[tuple], prefix: str) -> None:
+    """Run target over argument tuples on a thread pool sharing the caller's context; raise the first real failure"""
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=prefix) as executor:
+        futures = [executor.submit(copy_context().run, target, *args) for args in arguments]
+        errors = []
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(e)
+    if errors:
+        raise next((error for error in errors if not isinstance(error, ExportStoppedError)), errors[0])
+
+def build_deferred_keys(job: Dict[str, Any], table_name: str, clauses: List[str]) -> None:
+    """Add a table's deferred secondary indexes in one ALTER TABLE, so InnoDB builds them in a single pass"""
+    with get_mysql_connection(job["database"], job["datasource"]) as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"ALTER TABLE `{table_name}` " + ", ".join(f"ADD {clause}" for clause in clauses))
+        cursor.close()
+    update_restore_job(job, indexes_built_add=len(clauses))
+
+def create_schema_objects(job: Dict[str, Any], manifest: Dict[str, Any], drop_existing: bool) -> None:
+    """Create routines, views (in dependency order) and triggers; failures are recorded on the job, not raised"""
+    source, target = manifest["database"], job["database"]
+    with get_mysql_connection(target, job["datasource"]) as connection:
+        cursor = connection.cursor()
+        
+        def record(errors: List[str]) -> None:
+            with job["lock"]:
+                job["object_errors"].extend(errors)
+        
+        def create(kind: str, item: Dict[str, Any]) -> Optional[Exception]:
+            try:
+                if drop_existing:
+                    cursor.execute(f"DROP {item.get('type', kind).upper()} IF EXISTS `{item['name']}`")
+                if item.get("sql_mode") is not None:
+                    cursor.execute("SET SESSION sql_mode = %s", (item["sql_mode"],))
+                create_sql = item["create_sql"]
+                if kind == "view" and source != target:
+                    # SHOW CREATE VIEW qualifies every table with the source database
+                    create_sql = create_sql.replace(f"`{source}`.", f"`{target}`.")
+                cursor.execute(create_sql)
+                return None
+            except Error as e:
+                return e
+        
+        for routine in manifest["routines"]:
+            error = create("routine", routine)
+            if error is not None:
+                record([f"{routine['type'].lower()} {routine['name']}: {error}"])
+        # A view can only be created after the views it selects from: retry until a round makes no progress
+        pending = list(manifest["views"])
+        while pending:
+            failed = [(view, create("view", view)) for view in pending]
+            remaining = [view for view, error in failed if error is not None]
+            if len(remaining) == len(pending):
+                record([f"view {view['name']}: {error}" for view, error in failed])
+                break
+            pending = remaining
+        for trigger in manifest["triggers"]:
+            error = create("trigger", trigger)
+            if error is not None:
+                record([f"trigger {trigger['name']}: {error}"])
+        cursor.close()
+
+def run_restore(job: Dict[str, Any], directory: str, manifest: Dict[str, Any], parallel: int, batch_rows: int,
+                drop_existing: bool, verify: bool) -> None:
+    """Restore a backup in phases: verify chunks, create tables, load data, build indexes, add foreign keys, create other objects"""
+    update_restore_job(job, status="running", started_at=datetime.now().isoformat())
+    try:
+        tables, database = manifest["tables"], job["database"]
+        compression = manifest.get("compression")
+        chunks = [(table, chunk) for table in tables for chunk in table["chunks"]]
+        
+        if verify:
+            update_restore_job(job, phase="verifying")
             
-            # Build ALTER TABLE statement
-            alter_sql = f"ALTER TABLE `{table_name}` DROP COLUMN `{column_name}`"
+            def verify_chunk(chunk):
+                if file_sha256(os.path.join(directory, chunk["file"])) != chunk["sha256"]:
+                    raise ValueError(f"Checksum mismatch for {chunk['file']}, the backup is damaged")
             
-            cursor.execute(alter_sql)
+            run_parallel(parallel, verify_chunk, [(chunk,) for _, chunk in chunks], "mcp-restore-verify")
+        
+        update_restore_job(job, phase="creating_tables")
+        deferred = {}
+        with get_mysql_connection_no_db(job["datasource"]) as connection:
+            cursor = connection.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database}`")
+            cursor.execute(f"USE `{database}`")
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+            for table in tables:
+                if drop_existing:
+                    cursor.execute(f"DROP TABLE IF EXISTS `{table['name']}`")
+                create_sql, indexes, foreign_keys = split_create_table(table["create_sql"])
+                cursor.execute(create_sql)
+                deferred[table["name"]] = (indexes, foreign_keys)
+                update_restore_job(job, tables_created_add=1)
             cursor.close()
-            
-            return format_result({
-                "table_name": table_name,
-                "column_name": column_name,
-                "database": CURRENT_DATABASE
-            }, f"Column '{column_name}' dropped successfully from table '{table_name}' in database '{CURRENT_DATABASE}'")
+        update_restore_job(job, indexes_total=sum(len(indexes) for indexes, _ in deferred.values()),
+                           foreign_keys_total=sum(len(foreign_keys) for _, foreign_keys in deferred.values()))
+        
+        # Largest chunks first, so the longest loads do not start last
+        update_restore_job(job, phase="loading", loading_started=time.monotonic())
+        tasks = deque(sorted(chunks, key=lambda item: -item[1]["rows"]))
+        stop = threading.Event()
+        run_parallel(min(parallel, len(tasks)), run_restore_loader,
+                     [(job, tasks, directory, compression, batch_rows, stop)] * min(parallel, len(tasks)), "mcp-restore")
+        update_restore_job(job, loading_seconds=round(time.monotonic() - job["loading_started"], 3))
+        
+        update_restore_job(job, phase="indexing")
+        run_parallel(parallel, build_deferred_keys,
+                     [(job, name, indexes) for name, (indexes, _) in deferred.items() if indexes], "mcp-restore-index")
+        
+        # Foreign keys last: the indexes on both the referencing and the referenced columns exist by now
+        update_restore_job(job, phase="foreign_keys")
+        with get_mysql_connection(database, job["datasource"]) as connection:
+            cursor = connection.cursor()
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+            for name, (_, foreign_keys) in deferred.items():
+                if foreign_keys:
+                    cursor.execute(f"ALTER TABLE `{name}` " + ", ".join(f"ADD {clause}" for clause in foreign_keys))
+                    update_restore_job(job, foreign_keys_added_add=len(foreign_keys))
+            cursor.close()
+        
+        update_restore_job(job, phase="objects")
+        create_schema_objects(job, manifest, drop_existing)
+        update_restore_job(job, phase="done", status="completed")
+    except Exception as e:
+        update_restore_job(job, status="failed", error=str(e))
+        raise
+    finally:
+        update_restore_job(job, finished_at=datetime.now().isoformat(),
+                           duration_seconds=round(time.monotonic() - job["started_monotonic"], 3))
+
+def run_restore_in_background(job: Dict[str, Any], *args: Any) -> None:
+    """Thread target for background restores; failures are recorded on the job"""
+    try:
+        run_restore(job, *args)
     except Exception as e:
-        logger.error(f"Failed to drop column '{column_name}' from table '{table_name}': {e}")
-        return format_error(e, f"Failed to drop column '{column_name}' from table '{table_name}'")
+        logger.error(f"Background restore {job['job_id']} into '{job['database']}' failed in phase '{job['phase']}': {e}")
 
-# Tool: Modify column in table
-@log_client_call
+# Tool: Restore database from a backup
 @mcp.tool()
-def modify_column(table_name: str, column_name: str, new_type: str, new_constraints: List[str] = None, new_default: Any = None) -> Dict[str, Any]:
+@log_client_call
+def restore_database(directory: str, database_name: str = None, tables: List[str] = None, parallel: int = None,
+                     batch_rows: int = None, drop_existing: bool = False, verify: bool = True, background: bool = False,
+                     timeout_seconds: float = None) -> Dict[str, Any]:
     """
-    Modifies an existing column in a table.
+    Restores a backup written by backup_database.
+    
+    Tables are created without secondary indexes and foreign keys, their chunks are loaded in
+    parallel with multi-row INSERTs and unique_checks / foreign_key_checks off, then each table's
+    indexes are built in one ALTER, foreign keys added, and routines, views and triggers created.
     
     Args:
-        table_name: Name of the table to modify
-        column_name: Name of the column to modify
-        new_type: New data type for the column
-        new_constraints: New constraints for the column
-        new_default: New default value for the column
+        directory: Backup directory, relative to the data file directory
+        database_name: Database to restore into, created if missing (default: the backed up database's name)
+        tables: Only restore these tables (default: all; views, routines and triggers are restored with all tables only)
+        parallel: Chunks loaded and tables indexed concurrently (default: configured max_parallel)
+        batch_rows: Rows per INSERT statement (default: configured batch_rows)
+        drop_existing: Drop tables, views, routines and triggers of the backup that already exist in the target database (default: False)
+        verify: Check every chunk's SHA-256 against the manifest before changing anything (default: True)
+        background: If True, return immediately with a job id; use get_restore_status() to follow it
+        timeout_seconds: Execution deadline for a foreground restore (default: per-tool setting)
         
     Returns:
-        Dict containing operation status
+        Dict containing the restore job: phase, tables, rows, indexes and foreign keys done, rows per second
     """
-    if not CURRENT_DATABASE:
-        return format_error("No database selected", "Please use switch_database() to select a database first")
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive")
+        set_call_timeout(timeout_seconds)
     
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
+    parallel = parallel or DATA_FILE_CONFIG['max_parallel']
+    batch_rows = batch_rows or DATA_FILE_CONFIG['batch_rows']
+    if parallel < 1 or batch_rows < 1:
+        return format_error("Invalid options", "parallel and batch_rows must be positive integers")
     
-    if not validate_table_name(column_name):
-        return format_error("Invalid column name", "Column name contains invalid characters")
+    try:
+        path, manifest = load_backup_manifest(directory)
+    except ValueError as e:
+        return format_error(e, "Invalid backup")
+    
+    database = database_name or manifest["database"]
+    if not validate_table_name(database) or (tables and not all(validate_table_name(table) for table in tables)):
+        return format_error("Invalid name", "Database or table name contains invalid characters")
+    
+    if tables:
+        missing = set(tables) - {table["name"] for table in manifest["tables"]}
+        if missing:
+            return format_error(f"Tables not in the backup: {', '.join(sorted(missing))}", "Invalid restore options")
+        manifest = dict(manifest, tables=[table for table in manifest["tables"] if table["name"] in tables], views=[], routines=[], triggers=[])
     
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Build ALTER TABLE statement
-            alter_sql = f"ALTER TABLE `{table_name}` MODIFY COLUMN `{column_name}` {new_type}"
-            
-            # Add constraints
-            if new_constraints and isinstance(new_constraints, list):
-                for constraint in new_constraints:
-                    if isinstance(constraint, str):
-                        alter_sql += f" {constraint}"
-            
-            # Add default value
-            if new_default is not None:
-                if isinstance(new_default, str):
-                    alter_sql += f" DEFAULT '{new_default}'"
-                else:
-                    alter_sql += f" DEFAULT {new_default}"
-            
-            cursor.execute(alter_sql)
-            cursor.close()
-            
-            return format_result({
-                "table_name": table_name,
-                "column_name": column_name,
-                "new_type": new_type,
-                "new_constraints": new_constraints or [],
-                "new_default": new_default,
-                "database": CURRENT_DATABASE
-            }, f"Column '{column_name}' modified successfully in table '{table_name}' in database '{CURRENT_DATABASE}'")
+        if not drop_existing:
+            with get_mysql_connection_no_db() as connection:
+                cursor = connection.cursor()
+                cursor.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = %s", (database,))
+                existing = {row[0] for row in cursor.fetchall()} & {table["name"] for table in manifest["tables"]}
+                cursor.close()
+            if existing:
+                return format_error(f"Tables already exist in '{database}': {', '.join(sorted(existing)[:10])}",
+                                    "Restore would overwrite existing tables (pass drop_existing=True to replace them)")
+        
+        job = {
+            "job_id": uuid.uuid4().hex[:12],
+            "directory": directory,
+            "source_database": manifest["database"],
+            "database": database,
+            "datasource": CURRENT_DATASOURCE,
+            "background": background,
+            "status": "pending",
+            "phase": "pending",
+            "error": None,
+            "tables": len(manifest["tables"]),
+            "tables_created": 0,
+            "chunks_total": sum(len(table["chunks"]) for table in manifest["tables"]),
+            "chunks_loaded": 0,
+            "rows_total": sum(table["rows"] for table in manifest["tables"]),
+            "rows_loaded": 0,
+            "indexes_total": 0,
+            "indexes_built": 0,
+            "foreign_keys_total": 0,
+            "foreign_keys_added": 0,
+            "object_errors": [],
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "duration_seconds": None,
+            "loading_seconds": None,
+            "started_monotonic": time.monotonic(),
+            "loading_started": None,
+            "lock": threading.Lock()
+        }
+        with RESTORE_JOBS_LOCK:
+            RESTORE_JOBS[job["job_id"]] = job
+            finished = [j for j in RESTORE_JOBS.values() if j["status"] not in ("pending", "running")]
+            for old_job in finished[:max(0, len(finished) - DATA_FILE_CONFIG['max_jobs_retained'])]:
+                del RESTORE_JOBS[old_job["job_id"]]
+        
+        arguments = (job, path, manifest, parallel, batch_rows, drop_existing, verify)
+        if background:
+            threading.Thread(target=run_restore_in_background, args=arguments, name=f"restore-{job['job_id']}", daemon=True).start()
+            return format_result(snapshot_restore_job(job), f"Restore of '{directory}' into '{database}' started in background (job {job['job_id']})")
+        
+        run_restore(*arguments)
+        snapshot = snapshot_restore_job(job)
+        message = f"Restored {job['tables']} tables ({job['rows_loaded']} rows) into '{database}' in {job['duration_seconds']}s"
+        if job["object_errors"]:
+            message += f" ({len(job['object_errors'])} views, routines or triggers could not be created)"
+        return format_result(snapshot, message)
     except Exception as e:
-        logger.error(f"Failed to modify column '{column_name}' in table '{table_name}': {e}")
-        return format_error(e, f"Failed to modify column '{column_name}' in table '{table_name}'")
+        logger.error(f"Failed to restore {directory} into {database}: {e}")
+        return format_error(e, "Failed to restore database")
 
-# Tool: Rename table
-@log_client_call
+# Tool: Get restore status
 @mcp.tool()
-def rename_table(old_table_name: str, new_table_name: str) -> Dict[str, Any]:
+@log_client_call
+def get_restore_status(job_id: str = None) -> Dict[str, Any]:
     """
-    Renames a table in the current database.
+    Reports the phase, progress and ETA of restores started by restore_database.
     
     Args:
-        old_table_name: Current name of the table
-        new_table_name: New name for the table
+        job_id: Id of the restore job (if None, lists all known jobs)
         
     Returns:
-        Dict containing operation status
+        Dict containing job status information
     """
-    if not CURRENT_DATABASE:
-        return format_error("No database selected", "Please use switch_database() to select a database first")
+    try:
+        if job_id:
+            job = RESTORE_JOBS.get(job_id)
+            if not job:
+                return format_error("Job not found", f"No restore job with id '{job_id}'")
+            snapshot = snapshot_restore_job(job)
+            return format_result(snapshot, f"Restore {job_id} is {snapshot['status']} (phase: {snapshot['phase']})")
+        
+        with RESTORE_JOBS_LOCK:
+            jobs = list(RESTORE_JOBS.values())
+        snapshots = [snapshot_restore_job(job) for job in jobs]
+        return format_result({"jobs": snapshots, "count": len(snapshots)}, f"Found {len(snapshots)} restore jobs")
+    except Exception as e:
+        logger.error(f"Failed to get restore status: {e}")
+        return format_error(e, "Failed to get restore status")
+
+# Table checksum helpers
+def row_checksum_expression(columns: List[str]) -> str:
+    """
+    SQL CRC32 of a row's values.
     
-    if not validate_table_name(old_table_name):
-        return format_error("Invalid old table name", "Old table name contains invalid characters")
+    Each value is prefixed with its byte length, so ('a#', 'b') and ('a', '#b') differ although the separator occurs in the data;
+    a trailing NULL flag per column keeps NULL apart from an empty string.
+    """
+    quoted = [f"`{column}`" for column in columns]
+    values = ", ".join(f"CONCAT(LENGTH({column}), ':', {column})" for column in quoted)
+    null_flags = "CONCAT(" + ", ".join(f"ISNULL({column})" for column in quoted) + ")"
+    return f"CRC32(CONCAT_WS('#', {values}, {null_flags}))"
+
+def describe_checksum_table(side: Dict[str, Any]) -> None:
+    """Add a compared table's columns, primary key, row estimate and integer key span to its side description"""
+    with get_mysql_connection(side["database"], side["datasource"]) as connection:
+        cursor = connection.cursor()
+        side["columns"] = get_column_types(cursor, side["table"])
+        if not side["columns"]:
+            raise ValueError(f"Table '{side['database']}.{side['table']}' does not exist")
+        side["primary_key"] = get_primary_key_columns(cursor, side["table"])
+        cursor.execute("SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = %s", (side["table"],))
+        row = cursor.fetchone()
+        side["estimated_rows"] = int(row[0] or 0) if row else 0
+        side["key_span"] = None
+        if side["primary_key"] and side["columns"].get(side["primary_key"][0]) in INTEGER_DATA_TYPES:
+            cursor.execute(f"SELECT MIN(`{side['primary_key'][0]}`), MAX(`{side['primary_key'][0]}`) FROM `{side['table']}`")
+            low, high = cursor.fetchone()
+            if low is not None:
+                side["key_span"] = (int(low), int(high))
+        cursor.close()
+
+def plan_checksum_chunks(sides: List[Dict[str, Any]], chunk_rows: int) -> List[Dict[str, Any]]:
+    """Primary key ranges shared by all sides, spanning the union of their key ranges"""
+    key_columns = sides[0]["primary_key"]
+    spans = [side["key_span"] for side in sides if side["key_span"]]
+    chunks = max(1, -(-max(side["estimated_rows"] for side in sides) // chunk_rows))
+    if chunks > 1 and spans and len(spans) == len(sides):
+        return key_range_chunks(sides[0]["table"], key_columns[0], min(low for low, _ in spans), max(high for _, high in spans), chunks)
+    return [{"table": sides[0]["table"], "where": "", "params": (), "range": None}]
+
+def checksum_chunk(side: Dict[str, Any], chunk: Dict[str, Any], expression: str, results: Dict[Tuple[str, int], Tuple[int, int]],
+                   index: int) -> None:
+    """Row count and BIT_XOR of the row checksums of one key range, computed on the server"""
+    with get_mysql_connection(side["database"], side["datasource"]) as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT COUNT(*), COALESCE(BIT_XOR({expression}), 0) FROM `{side['table']}`{chunk['where']}",
+                       chunk["params"] or None)
+        rows, checksum = cursor.fetchone()
+        cursor.close()
+    results[(side["name"], index)] = (int(rows), int(checksum))
+
+def fetch_row_checksums(side: Dict[str, Any], chunk: Dict[str, Any], key_columns: List[str], expression: str,
+                        results: Dict[Tuple[str, int], Dict[tuple, int]], index: int) -> None:
+    """Primary key and checksum of every row in one key range, to find the rows behind a mismatching chunk"""
+    keys = ", ".join(f"`{column}`" for column in key_columns)
+    with get_mysql_connection(side["database"], side["datasource"]) as connection:
+        cursor = connection.cursor()
+        cursor.execute(f"SELECT {keys}, {expression} FROM `{side['table']}`{chunk['where']}", chunk["params"] or None)
+        results[(side["name"], index)] = {tuple(row[:-1]): row[-1] for row in cursor.fetchall()}
+        cursor.close()
+
+def validate_checksum_options(chunk_rows: Optional[int], parallel: Optional[int],
+                              timeout_seconds: Optional[float]) -> Tuple[Optional[Dict[str, Any]], int, int]:
+    """Apply defaults and the timeout for the checksum tools; returns (error result or None, chunk_rows, parallel)"""
+    if timeout_seconds is not None:
+        if timeout_seconds <= 0:
+            return format_error("Invalid timeout", "timeout_seconds must be positive"), 0, 0
+        set_call_timeout(timeout_seconds)
+    chunk_rows = chunk_rows or CHECKSUM_CONFIG['chunk_rows']
+    parallel = parallel or CHECKSUM_CONFIG['max_parallel']
+    if chunk_rows < 1 or parallel < 1:
+        return format_error("Invalid options", "chunk_rows and parallel must be positive integers"), 0, 0
+    return None, chunk_rows, parallel
+
+# Tool: Checksum table
+@mcp.tool()
+@log_client_call
+def checksum_table(table_name: str, database_name: str = None, columns: List[str] = None, chunk_rows: int = None,
+                   parallel: int = None, timeout_seconds: float = None) -> Dict[str, Any]:
+    """
+    Computes a table checksum on the server, per primary key range and in parallel, without reading rows to the client.
     
-    if not validate_table_name(new_table_name):
-        return format_error("Invalid new table name", "New table name contains invalid characters")
+    Each range's checksum is BIT_XOR(CRC32(CONCAT_WS('#', columns..., NULL flags))) over its rows, and the table's
+    checksum is the XOR of the range checksums, so it does not depend on how the table was split.
+    
+    Args:
+        table_name: Name of the table
+        database_name: Database of the table (default: current database)
+        columns: Columns to include (default: all columns)
+        chunk_rows: Approximate rows per key range (default: configured chunk_rows)
+        parallel: Ranges checksummed concurrently (default: configured max_parallel)
+        timeout_seconds: Execution deadline for the whole call (default: per-tool setting)
+        
+    Returns:
+        Dict containing the row count, table checksum and per-range counts and checksums
+    """
+    database = database_name or CURRENT_DATABASE
+    if not validate_table_name(table_name) or not database or not validate_table_name(database) or \
+            (columns and not all(validate_table_name(column) for column in columns)):
+        return format_error("Invalid name", "Database, table or column name contains invalid characters")
+    error, chunk_rows, parallel = validate_checksum_options(chunk_rows, parallel, timeout_seconds)
+    if error:
+        return error
     
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Build RENAME TABLE statement
-            rename_sql = f"RENAME TABLE `{old_table_name}` TO `{new_table_name}`"
-            
-            cursor.execute(rename_sql)
-            cursor.close()
-            
-            return format_result({
-                "old_table_name": old_table_name,
-                "new_table_name": new_table_name,
-                "database": CURRENT_DATABASE
-            }, f"Table '{old_table_name}' renamed successfully to '{new_table_name}' in database '{CURRENT_DATABASE}'")
+        started = time.perf_counter()
+        side = {"name": "table", "database": database, "table": table_name, "datasource": CURRENT_DATASOURCE}
+        describe_checksum_table(side)
+        missing = [column for column in columns or [] if column not in side["columns"]]
+        if missing:
+            return format_error(f"Unknown columns: {', '.join(missing)}", "Invalid columns")
+        expression = row_checksum_expression(columns or list(side["columns"]))
+        chunks = plan_checksum_chunks([side], chunk_rows)
+        results = {}
+        run_parallel(min(parallel, len(chunks)), checksum_chunk,
+                     [(side, chunk, expression, results, index) for index, chunk in enumerate(chunks)], "mcp-checksum")
+        
+        checksum = 0
+        ranges = []
+        for index, chunk in enumerate(chunks):
+            rows, chunk_checksum = results[("table", index)]
+            checksum ^= chunk_checksum
+            ranges.append({"range": chunk["range"], "rows": rows, "checksum": f"{chunk_checksum:08x}"})
+        rows = sum(chunk["rows"] for chunk in ranges)
+        return format_result({
+            "database": database,
+            "table": table_name,
+            "columns": columns or list(side["columns"]),
+            "rows": rows,
+            "checksum": f"{checksum:08x}",
+            "chunks": ranges,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }, f"Checksummed {rows} rows of '{database}.{table_name}' in {len(ranges)} ranges")
     except Exception as e:
-        logger.error(f"Failed to rename table '{old_table_name}' to '{new_table_name}': {e}")
-        return format_error(e, f"Failed to rename table '{old_table_name}' to '{new_table_name}'")
+        logger.error(f"Failed to checksum table {database}.{table_name}: {e}")
+        return format_error(e, "Failed to checksum table")
 
-# Tool: Get table indexes
-@log_client_call
+# Tool: Compare tables
 @mcp.tool()
-def get_table_indexes(table_name: str) -> Dict[str, Any]:
+@log_client_call
+def compare_tables(table_name: str, target_database: str, target_table: str = None, source_database: str = None,
+                   target_datasource: str = None, columns: List[str] = None, chunk_rows: int = None, parallel: int = None,
+                   max_differences: int = None, timeout_seconds: float = None) -> Dict[str, Any]:
     """
-    Gets information about indexes on the specified table.
+    Compares a table with its copy (e.g. after copy_database or restore_database) and lists the differing primary keys.
+    
+    Both tables are split into the same primary key ranges and checksummed on the server in parallel; only the
+    ranges whose row count or checksum differ are read back, as primary key and row checksum, to find the rows
+    that are missing or changed. Columns are compared by their text form, so both tables should use the same
+    column types. Tables that are written to during the comparison can show spurious differences.
     
     Args:
-        table_name: Name of the table to get indexes for
+        table_name: Name of the source table
+        target_database: Database of the target table
+        target_table: Name of the target table (default: same as table_name)
+        source_database: Database of the source table (default: current database)
+        target_datasource: Datasource of the target table (default: current datasource)
+        columns: Columns to compare (default: all columns of the source table)
+        chunk_rows: Approximate rows per key range (default: configured chunk_rows)
+        parallel: Ranges checksummed concurrently across both tables (default: configured max_parallel)
+        max_differences: Differing keys listed (default: configured max_differences); all are counted
+        timeout_seconds: Execution deadline for the whole call (default: per-tool setting)
         
     Returns:
-        Dict containing index information
+        Dict containing whether the tables match, the mismatching ranges and the keys missing or changed on each side
     """
-    if not CURRENT_DATABASE:
-        return format_error("No database selected", "Please use switch_database() to select a database first")
-    
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
+    source_database = source_database or CURRENT_DATABASE
+    target_table = target_table or table_name
+    target_datasource = target_datasource or CURRENT_DATASOURCE
+    names = [table_name, target_table, target_database, source_database or ""] + list(columns or [])
+    if not all(validate_table_name(name) for name in names):
+        return format_error("Invalid name", "Database, table or column name contains invalid characters")
+    if target_datasource not in DATASOURCES:
+        return format_error(f"Unknown datasource '{target_datasource}'", f"Configured datasources: {', '.join(DATASOURCES)}")
+    if (source_database, table_name, CURRENT_DATASOURCE) == (target_database, target_table, target_datasource):
+        return format_error("Same table", "Source and target refer to the same table")
+    error, chunk_rows, parallel = validate_checksum_options(chunk_rows, parallel, timeout_seconds)
+    if error:
+        return error
+    max_differences = CHECKSUM_CONFIG['max_differences'] if max_differences is None else max_differences
     
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Get index information
-            cursor.execute(f"SHOW INDEX FROM `{table_name}`")
-            indexes = cursor.fetchall()
-            cursor.close()
-            
-            # Process index information
-            index_info = {}
-            for row in indexes:
-                index_name = row[2]
-                if index_name not in index_info:
-                    index_info[index_name] = {
-                        "name": index_name,
-                        "type": "UNIQUE" if row[1] == 0 else "NONUNIQUE",
-                        "columns": []
-                    }
-                
-                index_info[index_name]["columns"].append({
-                    "column_name": row[4],
-                    "seq_in_index": row[3],
-                    "collation": row[5],
-                    "cardinality": row[6],
-                    "sub_part": row[7],
-                    "packed": row[8],
-                    "null": row[9],
-                    "index_type": row[10]
-                })
-            
-            return format_result({
-                "table_name": table_name,
-                "indexes": list(index_info.values()),
-                "index_count": len(index_info),
-                "database": CURRENT_DATABASE
-            }, f"Retrieved {len(index_info)} indexes for table '{table_name}' in database '{CURRENT_DATABASE}'")
+        started = time.perf_counter()
+        source = {"name": "source", "database": source_database, "table": table_name, "datasource": CURRENT_DATASOURCE}
+        target = {"name": "target", "database": target_database, "table": target_table, "datasource": target_datasource}
+        sides = [source, target]
+        run_parallel(2, describe_checksum_table, [(side,) for side in sides], "mcp-checksum")
+        compared = columns or list(source["columns"])
+        missing = [f"{side['name']}.{column}" for side in sides for column in compared if column not in side["columns"]]
+        if missing:
+            return format_error(f"Columns missing: {', '.join(missing)}", "Tables do not have the compared columns")
+        key_columns = source["primary_key"] if source["primary_key"] == target["primary_key"] else []
+        expression = row_checksum_expression(compared)
+        chunks = plan_checksum_chunks(sides, chunk_rows) if key_columns else \
+            [{"table": table_name, "where": "", "params": (), "range": None}]
+        
+        checksums = {}
+        run_parallel(min(parallel, 2 * len(chunks)), checksum_chunk,
+                     [(side, chunk, expression, checksums, index) for index, chunk in enumerate(chunks) for side in sides], "mcp-checksum")
+        mismatched = [index for index in range(len(chunks)) if checksums[("source", index)] != checksums[("target", index)]]
+        
+        # Drill down into mismatching ranges only: their keys and row checksums are compared on the client
+        differences = {"missing_in_target": [], "missing_in_source": [], "changed": []}
+        difference_count = 0
+        if mismatched and key_columns:
+            rows = {}
+            run_parallel(min(parallel, 2 * len(mismatched)), fetch_row_checksums,
+                         [(side, chunks[index], key_columns, expression, rows, index) for index in mismatched for side in sides],
+                         "mcp-checksum")
+            for index in mismatched:
+                source_rows, target_rows = rows[("source", index)], rows[("target", index)]
+                found = {
+                    "missing_in_target": [key for key in source_rows if key not in target_rows],
+                    "missing_in_source": [key for key in target_rows if key not in source_rows],
+                    "changed": [key for key, checksum in source_rows.items() if key in target_rows and target_rows[key] != checksum]
+                }
+                for kind, keys in found.items():
+                    difference_count += len(keys)
+                    room = max(0, max_differences - sum(len(listed) for listed in differences.values()))
+                    differences[kind].extend(list(key) if len(key_columns) > 1 else key[0] for key in keys[:room])
+        
+        source_rows = sum(checksums[("source", index)][0] for index in range(len(chunks)))
+        target_rows = sum(checksums[("target", index)][0] for index in range(len(chunks)))
+        identical = not mismatched or (bool(key_columns) and difference_count == 0)
+        result = {
+            "source": {"datasource": source["datasource"], "database": source_database, "table": table_name, "rows": source_rows},
+            "target": {"datasource": target_datasource, "database": target_database, "table": target_table, "rows": target_rows},
+            "columns": compared,
+            "primary_key": key_columns,
+            "identical": identical,
+            "chunks": len(chunks),
+            "mismatched_chunks": [{"range": chunks[index]["range"],
+                                   "source_rows": checksums[("source", index)][0],
+                                   "target_rows": checksums[("target", index)][0]} for index in mismatched],
+            "difference_count": difference_count,
+            "differences": differences,
+            "truncated": difference_count > sum(len(listed) for listed in differences.values()),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+        if identical and mismatched:
+            message = f"Tables match, but {len(mismatched)} ranges changed while they were compared"
+        elif identical:
+            message = f"Tables match ({source_rows} rows in {len(chunks)} ranges)"
+        elif not key_columns:
+            message = "Tables differ; without a common primary key the differing rows cannot be listed"
+        else:
+            message = f"Tables differ: {difference_count} rows in {len(mismatched)} of {len(chunks)} ranges"
+        return format_result(result, message)
     except Exception as e:
-        logger.error(f"Failed to get indexes for table '{table_name}': {e}")
-        return format_error(e, f"Failed to get indexes for table '{table_name}'")
+        logger.error(f"Failed to compare {source_database}.{table_name} with {target_database}.{target_table}: {e}")
+        return format_error(e, "Failed to compare tables")
 
-# Tool: Create index on table
-@log_client_call
+# Tool: Get server metrics
 @mcp.tool()
-def create_index(table_name: str, index_name: str, columns: List[str], index_type: str = "BTREE", unique: bool = False) -> Dict[str, Any]:
+@log_client_call
+def get_metrics(output_format: str = "json") -> Dict[str, Any]:
     """
-    Creates an index on the specified table.
+    Gets operational metrics of this server (the same data served at /metrics on HTTP transports).
     
     Args:
-        table_name: Name of the table to create index on
-        index_name: Name of the index
-        columns: List of column names to include in the index
-        index_type: Type of index (e.g., 'BTREE', 'HASH')
-        unique: Whether the index should be unique
+        output_format: 'json' for structured metrics or 'prometheus' for the text exposition format
         
     Returns:
-        Dict containing operation status
+        Dict containing per-tool, statement, connection and cache metrics
     """
-    if not CURRENT_DATABASE:
-        return format_error("No database selected", "Please use switch_database() to select a database first")
-    
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
-    
-    if not validate_table_name(index_name):
-        return format_error("Invalid index name", "Index name contains invalid characters")
-    
-    if not columns or not isinstance(columns, list):
-        return format_error("Invalid columns", "Columns must be a non-empty list")
-    
-    # Validate column names
-    for col in columns:
-        if not validate_table_name(col):
-            return format_error("Invalid column name", f"Column name '{col}' contains invalid characters")
+    if output_format not in ("json", "prometheus"):
+        return format_error("Invalid output format", "Output format must be 'json' or 'prometheus'")
     
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Build CREATE INDEX statement
-            unique_clause = "UNIQUE" if unique else ""
-            columns_clause = ", ".join([f"`{col}`" for col in columns])
-            
-            create_sql = f"CREATE {unique_clause} INDEX `{index_name}` ON `{table_name}` ({columns_clause}) USING {index_type}"
-            
-            cursor.execute(create_sql)
-            cursor.close()
-            
-            return format_result({
-                "table_name": table_name,
-                "index_name": index_name,
-                "columns": columns,
-                "index_type": index_type,
-                "unique": unique,
-                "database": CURRENT_DATABASE
-            }, f"Index '{index_name}' created successfully on table '{table_name}' in database '{CURRENT_DATABASE}'")
+        if output_format == "prometheus":
+            return format_result({"metrics": render_prometheus_metrics()}, "Metrics rendered in Prometheus text format")
+        
+        snapshot = snapshot_metrics()
+        bucket_labels = [f"<={bound}s" for bound in METRICS_CONFIG['latency_buckets_seconds']] + ["+Inf"]
+        for histogram in list(snapshot["tools"].values()) + [snapshot["statements"], snapshot["connections"]]:
+            histogram["buckets"] = dict(zip(bucket_labels, histogram["buckets"]))
+        return format_result(snapshot, f"Metrics collected for {len(snapshot['tools'])} tools")
     except Exception as e:
-        logger.error(f"Failed to create index '{index_name}' on table '{table_name}': {e}")
-        return format_error(e, f"Failed to create index '{index_name}' on table '{table_name}'")
+        logger.error(f"Failed to get metrics: {e}")
+        return format_error(e, "Failed to get metrics")
 
-# Tool: Drop index from table
-@log_client_call
+# Tool: Start profiler
 @mcp.tool()
-def drop_index(table_name: str, index_name: str) -> Dict[str, Any]:
+@log_client_call
+def start_profiler(mode: str = "cprofile", duration_seconds: float = None, max_calls: int = None, tools: List[str] = None) -> Dict[str, Any]:
     """
-    Removes an index from the specified table.
+    Starts profiling tool calls in this running server.
     
     Args:
-        table_name: Name of the table to remove index from
-        index_name: Name of the index to remove
+        mode: 'cprofile' (deterministic, pstats output), 'sampling' (stack sampling, collapsed-stack output)
+              or 'memory' (tracemalloc peak allocation per tool call and top allocation sites)
+        duration_seconds: Stop automatically after this many seconds (capped by the configured maximum)
+        max_calls: Stop automatically after this many profiled tool calls
+        tools: Only profile these tools (default: all tools)
         
     Returns:
-        Dict containing operation status
+        Dict containing the profiling session
     """
-    if not CURRENT_DATABASE:
-        return format_error("No database selected", "Please use switch_database() to select a database first")
-    
-    if not validate_table_name(table_name):
-        return format_error("Invalid table name", "Table name contains invalid characters")
+    if not PROFILING_CONFIG['enabled']:
+        return format_error("Profiling disabled", "Profiling tools are disabled by PROFILING_ENABLED")
+    if mode not in ("cprofile", "sampling", "memory"):
+        return format_error("Invalid mode", "Mode must be 'cprofile', 'sampling' or 'memory'")
+    if (duration_seconds is not None and duration_seconds <= 0) or (max_calls is not None and max_calls <= 0):
+        return format_error("Invalid limit", "duration_seconds and max_calls must be positive")
     
-    if not validate_table_name(index_name):
-        return format_error("Invalid index name", "Index name contains invalid characters")
+    try:
+        session = start_profiler_session(mode, duration_seconds, max_calls, tools)
+        return format_result({
+            "session_id": session["session_id"],
+            "mode": mode,
+            "duration_seconds": min(duration_seconds or PROFILING_CONFIG['max_duration_seconds'], PROFILING_CONFIG['max_duration_seconds']),
+            "max_calls": max_calls,
+            "tools": tools,
+            "output_dir": PROFILING_CONFIG['output_dir']
+        }, f"Profiler started in {mode} mode")
+    except ValueError as e:
+        return format_error(e, "Profiler already running")
+    except Exception as e:
+        logger.error(f"Failed to start profiler: {e}")
+        return format_error(e, "Failed to start profiler")
+
+# Tool: Stop profiler
+@mcp.tool()
+@log_client_call
+def stop_profiler() -> Dict[str, Any]:
+    """
+    Stops the running profiler and returns its report.
     
+    Returns:
+        Dict containing the profile report and the paths of the dumped stats files
+    """
     try:
-        with get_mysql_connection() as connection:
-            cursor = connection.cursor()
-            
-            # Build DROP INDEX statement
-            drop_sql = f"DROP INDEX `{index_name}` ON `{table_name}`"
-            
-            cursor.execute(drop_sql)
-            cursor.close()
-            
-            return format_result({
-                "table_name": table_name,
-                "index_name": index_name,
-                "database": CURRENT_DATABASE
-            }, f"Index '{index_name}' dropped successfully from table '{table_name}' in database '{CURRENT_DATABASE}'")
+        report = stop_profiler_session()
+        if report is None:
+            return format_error("No profiler running", "Use start_profiler() to start a profiling session first")
+        return format_result(report, f"Profiler stopped after {report['profiled_calls']} profiled calls")
     except Exception as e:
-        logger.error(f"Failed to drop index '{index_name}' from table '{table_name}': {e}")
-        return format_error(e, f"Failed to drop index '{index_name}' from table '{table_name}'")
+        logger.error(f"Failed to stop profiler: {e}")
+        return format_error(e, "Failed to stop profiler")
+
+# Tool: Get profiler status
+@mcp.tool()
+@log_client_call
+def get_profiler_status() -> Dict[str, Any]:
+    """
+    Gets the running profiling session, or the report of the last finished one.
+    
+    Returns:
+        Dict containing the active session and the last report
+    """
+    session = PROFILER_SESSION
+    active = None
+    if session is not None:
+        active = {
+            "session_id": session["session_id"],
+            "mode": session["mode"],
+            "started_at": session["started_at"],
+            "elapsed_seconds": round(time.perf_counter() - session["started"], 3),
+            "profiled_calls": session["calls"],
+            "skipped_calls": session["skipped_calls"],
+            "max_calls": session["max_calls"],
+            "tools": sorted(session["tools"]) if session["tools"] else None
+        }
+    return format_result({"active": active, "last_report": LAST_PROFILE_REPORT},
+                         "Profiler running" if active else "No profiler running")
+
+# HTTP endpoint: Prometheus metrics (served by the sse / streamable-http transports)
+@mcp.custom_route(METRICS_CONFIG['path'], methods=["GET"])
+async def metrics_endpoint(request) -> PlainTextResponse:
+    """Serve metrics in the Prometheus text exposition format"""
+    return PlainTextResponse(render_prometheus_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 # Start the MCP server
 if __name__ == "__main__":
@@ -1822,4 +7481,5 @@ if __name__ == "__main__":
     else:
         logger.info(f"Starting {SERVER_CONFIG['name']} on {SERVER_CONFIG['host']}:{SERVER_CONFIG['port']}")
     logger.info(f"Database: {DB_CONFIG['host']}:{DB_CONFIG['port']} (no default database)")
+    logger.info(f"Datasources: {', '.join(DATASOURCES)} (current: {CURRENT_DATASOURCE})")
     mcp.run(transport=SERVER_CONFIG['transport'])
@@ -0,0 +1,456 @@
+#!/usr/bin/env python3
+"""
+Unit tests for MySQL MCP Server helpers that need no database
+Pure helpers are tested directly; tool paths run against the in-process MySQL stand-in (fake_mysql.py)
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('LOG_FILE', os.path.join(tempfile.gettempdir(), 'mcp_mysql_test_helpers.log'))
+
+import sqlite3
+import zlib
+
+import pytest
+from contextlib import nullcontext
+
+import fake_mysql
+import mcp_mysql_server as server
+
+@pytest.fixture
+def fake_server():
+    """Route connections to the MySQL stand-in with a database selected"""
+    previous = server.CURRENT_DATABASE
+    with fake_mysql.fake_mysql_connector(rows=25, columns=5, metadata_rows=3):
+        server.CURRENT_DATABASE = "bench"
+        try:
+            yield server
+        finally:
+            server.CURRENT_DATABASE = previous
+
+def test_online_alter_algorithm_clause():
+    """ALGORITHM / LOCK suffixes for online ALTER TABLE candidates"""
+    assert server.build_algorithm_clause({"algorithm": "INSTANT", "lock": None}) == ", ALGORITHM=INSTANT"
+    assert server.build_algorithm_clause({"algorithm": "INPLACE", "lock": "NONE"}) == ", ALGORITHM=INPLACE, LOCK=NONE"
+
+def test_online_alter_plan_marks_empty_copy_probe(fake_server):
+    """Dry runs say the probe ran on an empty copy and list foreign keys"""
+    result = fake_server.add_column("bench_table", "bench_col", "INT", dry_run=True)
+    plan = result['data']['plan']
+    assert plan['probe'] == "empty_copy"
+    assert plan['foreign_keys']
+    assert not plan['shadow_copy_available']
+
+def test_shadow_copy_refuses_foreign_keys(fake_server):
+    """Shadow-table migrations of tables involved in foreign keys need an explicit opt-in"""
+    with fake_server.get_mysql_connection() as connection:
+        cursor = connection.cursor()
+        with pytest.raises(ValueError, match="allow_foreign_keys"):
+            fake_server.shadow_copy_alter(cursor, "bench_table", "ADD COLUMN `x` INT")
+        cursor.close()
+
+def test_stage_instruments_restored_after_last_build(fake_server):
+    """Stage instrument settings are recorded by the first index build and restored after the last one"""
+    with fake_server.get_mysql_connection() as connection:
+        cursor = connection.cursor()
+        assert fake_server.enable_stage_instruments(cursor, "default")
+        assert fake_server.enable_stage_instruments(cursor, "default")
+        cursor.close()
+    assert fake_server.STAGE_INSTRUMENT_STATE["default"]["users"] == 2
+    fake_server.restore_stage_instruments("default")
+    assert fake_server.STAGE_INSTRUMENT_STATE["default"]["users"] == 1
+    fake_server.restore_stage_instruments("default")
+    assert "default" not in fake_server.STAGE_INSTRUMENT_STATE
+
+class RecordingCursor:
+    """Cursor that records statements, answers EXPLAIN with a fixed plan and can fail on chosen statements"""
+
+    def __init__(self, fail_on=None, error=ValueError):
+        self.statements = []
+        self.fail_on = fail_on
+        self.error = error
+        self.invisible_indexes = False
+
+    def execute(self, query, params=None):
+        self.statements.append(query)
+        if "use_invisible_indexes" in query:
+            self.invisible_indexes = "=on" in query
+        if self.fail_on and self.fail_on(self, query):
+            raise self.error(f"failed: {query}")
+
+    def fetchone(self):
+        return ('{"query_block": {"cost_info": {"query_cost": "10.0"}}}',)
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+def test_index_candidate_trial_index_dropped_on_error():
+    """A failure while costing a candidate does not leave the invisible trial index behind"""
+    cursor = RecordingCursor(fail_on=lambda c, query: query.startswith("EXPLAIN") and c.invisible_indexes)
+    candidate = {"table": "orders", "columns": ["customer_id"], "digests": ["d1"]}
+    workload = {"d1": {"query": "SELECT * FROM orders WHERE customer_id = 1", "params": None}}
+    with pytest.raises(ValueError):
+        server.validate_index_candidate(cursor, candidate, workload, make_visible=False)
+    assert cursor.statements[-1].startswith("DROP INDEX")
+    assert "use_invisible_indexes=off" in cursor.statements[-2]
+
+def test_index_candidate_without_benefit_is_dropped():
+    """Candidates the optimizer does not use are dropped again"""
+    cursor = RecordingCursor()
+    candidate = {"table": "orders", "columns": ["customer_id"], "digests": ["d1"]}
+    workload = {"d1": {"query": "SELECT * FROM orders WHERE customer_id = 1", "params": None}}
+    result = server.validate_index_candidate(cursor, candidate, workload, make_visible=False)
+    assert result['state'] == "dropped"
+    assert cursor.statements[-1].startswith("DROP INDEX")
+
+def test_tool_metrics_do_not_serialize_results_by_default():
+    """Tool call metrics count rows without serializing the result again unless response bytes are enabled"""
+    serialized = []
+
+    class Value:
+        def __str__(self):
+            serialized.append(True)
+            return "value"
+
+    server.begin_tool_call()
+    server.end_tool_call("metrics_test_tool", 0.01, False, {"status": "success", "data": {"count": 2, "rows": [Value(), Value()]}})
+    assert not serialized
+    assert server.TOOL_METRICS["metrics_test_tool"]["rows"] == 2
+    assert server.TOOL_METRICS["metrics_test_tool"]["bytes"] == 0
+
+class RecordingConnection:
+    """Connection handing out one RecordingCursor"""
+
+    def __init__(self, cursor):
+        self.recording_cursor = cursor
+
+    def cursor(self, *args, **kwargs):
+        return self.recording_cursor
+
+@pytest.mark.parametrize("query", [
+    "WITH recent AS (SELECT * FROM orders) SELECT * FROM recent",
+    "/* report */ SELECT * FROM orders",
+    "(SELECT id FROM orders) UNION (SELECT id FROM archive)",
+    "INSERT INTO totals SELECT customer_id, SUM(amount) FROM orders GROUP BY customer_id",
+    "REPLACE INTO totals SELECT * FROM staging",
+    "TABLE orders"
+])
+def test_cost_guard_explains_statement_forms(query):
+    """The cost guard recognises every statement form EXPLAIN accepts, not only the advisor's"""
+    assert server.EXPLAINABLE_STATEMENT_PATTERN.match(query)
+
+def test_advisor_pattern_is_separate_from_cost_guard():
+    """The index advisor's narrower pattern does not replace the cost guard's"""
+    assert server.ADVISABLE_STATEMENT_PATTERN.match("SELECT 1")
+    assert not server.ADVISABLE_STATEMENT_PATTERN.match("WITH x AS (SELECT 1) SELECT * FROM x")
+    assert server.EXPLAINABLE_STATEMENT_PATTERN is not server.ADVISABLE_STATEMENT_PATTERN
+
+def test_cost_guard_verdict_for_cte(monkeypatch):
+    """A CTE goes through EXPLAIN and gets a verdict"""
+    monkeypatch.setitem(server.COST_GUARD_CONFIG, 'enabled', True)
+    cursor = RecordingCursor()
+    verdict = server.get_cost_guard_verdict(RecordingConnection(cursor), "WITH recent AS (SELECT * FROM cte_orders) SELECT * FROM recent")
+    assert verdict is not None
+    assert verdict['verdict'] == "allow"
+    assert cursor.statements[0].startswith("EXPLAIN FORMAT=JSON WITH")
+
+@pytest.fixture
+def local_infile_server(fake_server, monkeypatch):
+    """Stand-in server that permits LOAD DATA LOCAL INFILE"""
+    execute = fake_mysql.FakeCursor.execute
+
+    def execute_with_local_infile(cursor, query, params=None):
+        if query.startswith("SELECT @@GLOBAL.local_infile"):
+            cursor._set_result(["@@GLOBAL.local_infile"], [(1,)])
+        else:
+            execute(cursor, query, params)
+
+    monkeypatch.setattr(fake_mysql.FakeCursor, "execute", execute_with_local_infile)
+    return fake_server
+
+@pytest.mark.parametrize("warnings, loaded", [(0, True), (3, False)])
+def test_load_data_rolled_back_on_warnings(local_infile_server, monkeypatch, warnings, loaded):
+    """LOAD DATA results with warnings are rolled back so the INSERT path can quarantine the bad rows"""
+    monkeypatch.setattr(fake_mysql.FakeCursor, "warning_count", warnings, raising=False)
+    result = local_infile_server.load_data_local_infile("/tmp/orders.csv", "bench_table", ["id", "name"], {"id": "id", "name": "name"},
+                                                        {"id": "int", "name": "varchar"}, "\n")
+    assert (result is not None) == loaded
+
+class RowsCursor(RecordingCursor):
+    """RecordingCursor whose queries return fixed rows"""
+
+    def __init__(self, rows):
+        super().__init__()
+        self.rows = rows
+
+    def fetchall(self):
+        return self.rows
+
+def test_column_types_skip_generated_columns():
+    """Generated columns cannot be written, so they are not listed; DEFAULT_GENERATED defaults are"""
+    cursor = RowsCursor([("id", "INT", "auto_increment"), ("total", "decimal", "STORED GENERATED"),
+                         ("label", "varchar", "VIRTUAL GENERATED"), ("created", "timestamp", "DEFAULT_GENERATED")])
+    assert server.get_column_types(cursor, "orders") == {"id": "int", "created": "timestamp"}
+
+def test_backup_selects_listed_columns(fake_server, monkeypatch, tmp_path):
+    """Backup chunks select the manifest's columns rather than SELECT *"""
+    statements = []
+    execute = fake_mysql.FakeCursor.execute
+
+    def recording_execute(cursor, query, params=None):
+        statements.append(query)
+        execute(cursor, query, params)
+
+    monkeypatch.setattr(fake_mysql.FakeCursor, "execute", recording_execute)
+    task = {"table": "bench_table", "where": "", "params": (), "range": None, "index": 0, "columns": ["col_0", "col_1"]}
+    with fake_server.get_mysql_connection() as connection:
+        fake_server.run_backup_worker(connection, server.deque([task]), str(tmp_path), None, server.threading.Event())
+    assert any(statement.startswith("SELECT `col_0`, `col_1` FROM `bench_table`") for statement in statements)
+    assert task["result"]["file"] == "bench_table.00000.jsonl"
+
+def test_split_create_table_defers_indexes_and_foreign_keys():
+    """Secondary indexes and foreign keys are split off; the key an AUTO_INCREMENT column needs stays"""
+    create_sql = ("CREATE TABLE `orders` (\n"
+                  "  `id` int NOT NULL AUTO_INCREMENT,\n"
+                  "  `tenant_id` int NOT NULL,\n"
+                  "  `customer_id` int DEFAULT NULL,\n"
+                  "  PRIMARY KEY (`tenant_id`,`id`),\n"
+                  "  KEY `idx_id` (`id`),\n"
+                  "  KEY `idx_customer` (`customer_id`),\n"
+                  "  CONSTRAINT `fk_customer` FOREIGN KEY (`customer_id`) REFERENCES `customers` (`id`)\n"
+                  ") ENGINE=InnoDB")
+    create, indexes, foreign_keys = server.split_create_table(create_sql)
+    assert "KEY `idx_id` (`id`)" in create
+    assert "idx_customer" not in create and "fk_customer" not in create
+    assert create.endswith(") ENGINE=InnoDB")
+    assert indexes == ["KEY `idx_customer` (`customer_id`)"]
+    assert foreign_keys == ["CONSTRAINT `fk_customer` FOREIGN KEY (`customer_id`) REFERENCES `customers` (`id`)"]
+
+@pytest.mark.parametrize("drop_existing", [False, True])
+def test_schema_objects_replaced_when_dropping_existing(monkeypatch, drop_existing):
+    """drop_existing drops the backup's views, routines and triggers before creating them"""
+    cursor = RecordingCursor(fail_on=lambda c, query: query.startswith("CREATE TRIGGER"), error=server.Error)
+    monkeypatch.setattr(server, "get_mysql_connection", lambda *args: nullcontext(RecordingConnection(cursor)))
+    job = {"database": "bench", "datasource": "default", "lock": server.threading.Lock(), "object_errors": []}
+    manifest = {"database": "bench",
+                "routines": [{"name": "total", "type": "FUNCTION", "create_sql": "CREATE FUNCTION total() RETURNS INT RETURN 1"}],
+                "views": [{"name": "recent", "create_sql": "CREATE VIEW recent AS SELECT 1"}],
+                "triggers": [{"name": "audit", "create_sql": "CREATE TRIGGER audit BEFORE INSERT ON orders FOR EACH ROW SET @x = 1"}]}
+    server.create_schema_objects(job, manifest, drop_existing)
+    drops = [statement for statement in cursor.statements if statement.startswith("DROP")]
+    expected = ["DROP FUNCTION IF EXISTS `total`", "DROP VIEW IF EXISTS `recent`", "DROP TRIGGER IF EXISTS `audit`"]
+    assert drops == (expected if drop_existing else [])
+    assert len(job["object_errors"]) == 1 and job["object_errors"][0].startswith("trigger audit")
+
+def test_key_range_chunks_cover_span_with_open_ends():
+    """Integer key spans become adjacent ranges whose first and last are open-ended"""
+    chunks = server.key_range_chunks("orders", "id", 1, 100, 4)
+    assert [chunk["range"] for chunk in chunks] == [[None, 26], [26, 51], [51, 76], [76, None]]
+    assert chunks[0]["where"] == " WHERE `id` < %s" and chunks[0]["params"] == (26,)
+    assert chunks[1]["where"] == " WHERE `id` >= %s AND `id` < %s" and chunks[1]["params"] == (26, 51)
+    assert server.key_range_chunks("orders", "id", 5, 5, 4) == [{"table": "orders", "where": "", "params": (), "range": None}]
+
+def mysql_string(value):
+    """MySQL's implicit conversion of a function argument to a string"""
+    return value if isinstance(value, str) else str(value)
+
+def evaluate_row_checksums(columns, rows):
+    """Evaluate row_checksum_expression in SQLite, with its MySQL string functions registered in MySQL semantics"""
+    connection = sqlite3.connect(":memory:")
+    connection.create_function("CONCAT", -1, lambda *args: None if None in args else "".join(map(mysql_string, args)))
+    connection.create_function("CONCAT_WS", -1, lambda separator, *args: separator.join(mysql_string(arg) for arg in args if arg is not None))
+    connection.create_function("LENGTH", 1, lambda value: None if value is None else len(mysql_string(value).encode()))
+    # ISNULL is an operator keyword in SQLite, so the function is registered under another name
+    connection.create_function("MYSQL_ISNULL", 1, lambda value: int(value is None))
+    connection.create_function("CRC32", 1, lambda value: zlib.crc32(mysql_string(value).encode()))
+    connection.execute(f"CREATE TABLE t ({', '.join(f'`{column}` TEXT' for column in columns)})")
+    connection.executemany(f"INSERT INTO t VALUES ({', '.join('?' for _ in columns)})", rows)
+    expression = server.row_checksum_expression(columns).replace("ISNULL(", "MYSQL_ISNULL(")
+    checksums = [row[0] for row in connection.execute(f"SELECT {expression} FROM t ORDER BY rowid")]
+    connection.close()
+    return checksums
+
+def test_row_checksum_separator_in_data_does_not_collide():
+    """Values containing the separator, and NULL versus empty strings, give different row checksums"""
+    shifted = evaluate_row_checksums(["a", "b"], [("a#", "b"), ("a", "#b")])
+    assert shifted[0] != shifted[1]
+    nulls = evaluate_row_checksums(["a", "b"], [("", None), (None, "")])
+    assert nulls[0] != nulls[1]
+
+def test_to_column_value_converts_file_fields():
+    """JSON values become JSON text and 0x... hex becomes bytes for binary columns only"""
+    assert server.to_column_value({"a": [1, "é"]}, "json") == '{"a": [1, "é"]}'
+    assert server.to_column_value("0x00ff", "varbinary") == b"\x00\xff"
+    assert server.to_column_value("0x00ff", "varchar") == "0x00ff"
+    assert server.to_column_value("0xzz", "blob") == "0xzz"
+    assert server.to_column_value(None, "blob") is None
+
+def test_watchdog_kills_statements_past_their_deadline(monkeypatch):
+    """The watchdog kills statements still running at their deadline and skips finished ones"""
+    killed = []
+    monkeypatch.setattr(server, "kill_query", lambda connection_id, reason, target=None: killed.append(connection_id))
+    state = server.new_call_state("watchdog_test_tool")
+    finished = server.start_statement_watch(state, 41, time.monotonic() + 0.05)
+    server.stop_statement_watch(state, finished)
+    running = server.start_statement_watch(state, 42, time.monotonic() + 0.05)
+    deadline = time.monotonic() + 5
+    while not killed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert killed == [42]
+    assert running["timed_out"] and not finished["timed_out"]
+    assert list(state["watches"].values()) == [running]
+
+def test_call_timeout_sets_deadline_in_call_context():
+    """set_call_timeout only applies inside a tool call and treats non-positive values as unbounded"""
+    server.set_call_timeout(5)
+    token = server.CALL_CONTEXT.set(server.new_call_state("watchdog_test_tool"))
+    try:
+        server.set_call_timeout(5)
+        state = server.CALL_CONTEXT.get()
+        assert state["timeout"] == 5 and state["deadline"] > time.monotonic()
+        server.set_call_timeout(0)
+        assert state["timeout"] is None and state["deadline"] is None
+    finally:
+        server.CALL_CONTEXT.reset(token)
+
+def test_max_execution_time_hint_placement():
+    """The hint goes after SELECT, merges into an existing hint comment and is skipped for other statements"""
+    assert server.add_max_execution_time_hint("SELECT * FROM t", 500) == "SELECT /*+ MAX_EXECUTION_TIME(500) */ * FROM t"
+    assert server.add_max_execution_time_hint("SELECT /*+ BKA(t) */ * FROM t", 500) == "SELECT /*+ MAX_EXECUTION_TIME(500) BKA(t) */ * FROM t"
+    assert server.add_max_execution_time_hint("UPDATE t SET a = 1", 500) is None
+
+class CExtPreparedStatement:
+    """Shape of the C extension's cmd_stmt_prepare result: a parameter count, closed by passing the object back"""
+
+    def __init__(self, statement):
+        self.param_count = statement.count(b"?")
+        self.closed = False
+
+@pytest.mark.parametrize("c_extension", [False, True])
+def test_prepare_statement_with_either_connector(fake_server, monkeypatch, c_extension):
+    """prepare_statement reads the parameter count from the pure-Python and the C extension connector"""
+    if c_extension:
+        prepared = []
+
+        def cmd_stmt_prepare(connection, statement):
+            prepared.append(CExtPreparedStatement(statement))
+            return prepared[-1]
+
+        def cmd_stmt_close(connection, statement):
+            statement.closed = True
+
+        monkeypatch.setattr(fake_mysql.FakeConnection, "cmd_stmt_prepare", cmd_stmt_prepare)
+        monkeypatch.setattr(fake_mysql.FakeConnection, "cmd_stmt_close", cmd_stmt_close)
+    result = fake_server.prepare_statement("SELECT * FROM bench_table WHERE id = %s AND col_1 = %s")
+    assert result['status'] == "success", result
+    assert result['data']['parameter_count'] == 2
+    assert result['data']['columns'] == (None if c_extension else [])
+    if c_extension:
+        assert prepared[0].closed
+    assert fake_server.deallocate_prepared(result['data']['statement_id'])['status'] == "success"
+
+@pytest.mark.parametrize("query, mode, group_by", [
+    ("SELECT status, COUNT(*) AS orders FROM t GROUP BY status", "aggregate", [0]),
+    ("SELECT t.status AS s, SUM(amount) FROM t GROUP BY s ORDER BY 2 DESC", "aggregate", [0]),
+    ("SELECT COUNT(*), MAX(amount) FROM t", "aggregate", []),
+    ("SELECT status FROM t GROUP BY status", "concat", [0]),
+    ("SELECT region, status FROM t GROUP BY 2, region ORDER BY region", "ordered", [1, 0])
+])
+def test_shard_merge_plan_groups(query, mode, group_by):
+    """GROUP BY expressions resolve to select-list positions"""
+    plan = server.plan_shard_merge(query)
+    assert plan["mode"] == mode
+    assert plan["group_by"] == group_by
+
+@pytest.mark.parametrize("query", [
+    "SELECT COUNT(*) FROM t GROUP BY status",
+    "SELECT status, COUNT(*) FROM t GROUP BY 2",
+    "SELECT status, COUNT(*) FROM t GROUP BY status WITH ROLLUP",
+    "SELECT status FROM t GROUP BY status HAVING COUNT(*) > 1",
+    "SELECT status, AVG(amount) FROM t GROUP BY status"
+])
+def test_shard_merge_plan_rejects_unmergeable_groups(query):
+    """Groups that are not select-list columns, or that are filtered per shard, cannot be merged"""
+    with pytest.raises(ValueError):
+        server.plan_shard_merge(query)
+
+def test_merge_aggregate_rows_per_group():
+    """Partial aggregates of the same group from several shards combine; NULLs are skipped"""
+    shard_rows = [[{"status": "new", "n": 2, "low": 5, "high": 9}, {"status": "paid", "n": 1, "low": None, "high": None}],
+                  [{"status": "new", "n": 3, "low": 1, "high": 4}, {"status": "paid", "n": 1, "low": 7, "high": 7}]]
+    merged = server.merge_aggregate_rows(shard_rows, ["status", "n", "low", "high"], {1: "COUNT", 2: "MIN", 3: "MAX"}, ["status"])
+    assert merged == [{"status": "new", "n": 5, "low": 1, "high": 9}, {"status": "paid", "n": 2, "low": 7, "high": 7}]
+    assert server.merge_aggregate_rows(shard_rows, ["status", "n", "low", "high"], {1: "COUNT", 2: "MIN", 3: "MAX"}, [])[0]["n"] == 7
+
+def test_merge_shard_results_deduplicates_groups():
+    """Groups of a GROUP BY without aggregates appear once however many shards return them"""
+    plan = server.plan_shard_merge("SELECT status FROM t GROUP BY status ORDER BY status LIMIT 2")
+    shards = [{"database": "s1", "columns": ["status"], "rows": [{"status": "new"}, {"status": "paid"}]},
+              {"database": "s2", "columns": ["status"], "rows": [{"status": "new"}, {"status": "shipped"}]}]
+    assert [row["status"] for row in server.merge_shard_results(plan, shards)] == ["new", "paid"]
+
+class ScriptedCursor(RecordingCursor):
+    """RecordingCursor answering fetchall with the rows of the first matching statement fragment"""
+
+    def __init__(self, answers):
+        super().__init__()
+        self.answers = answers
+
+    def fetchall(self):
+        return next((rows for fragment, rows in self.answers.items() if fragment in self.statements[-1]), [])
+
+def test_shadow_copy_refuses_tables_with_triggers(fake_server):
+    """The table's own triggers would stay on the old table after the RENAME"""
+    with fake_server.get_mysql_connection() as connection:
+        cursor = connection.cursor()
+        with pytest.raises(ValueError, match="has triggers"):
+            fake_server.shadow_copy_alter(cursor, "bench_table", "ADD COLUMN `x` INT", allow_foreign_keys=True)
+        cursor.close()
+
+@pytest.mark.parametrize("existing", ["_orders_new", "_orders_old"])
+def test_shadow_copy_keeps_existing_helper_name_tables(existing):
+    """A user table named like a helper table is reported, not dropped"""
+    cursor = ScriptedCursor({"statistics": [("id",)], "information_schema.tables": [(existing,)]})
+    with pytest.raises(ValueError, match=existing):
+        server.shadow_copy_alter(cursor, "orders", "ADD COLUMN `x` INT")
+    assert not any(statement.startswith(("DROP", "CREATE")) for statement in cursor.statements)
+
+def test_online_alter_probe_keeps_existing_probe_table():
+    """The probe refuses to run when _<table>_ddlprobe is an existing table"""
+    cursor = ScriptedCursor({"information_schema.tables": [("_orders_ddlprobe",)]})
+    with pytest.raises(ValueError, match="_orders_ddlprobe"):
+        server.probe_online_alter(cursor, "orders", "ADD COLUMN `x` INT")
+    assert not any(statement.startswith(("DROP", "CREATE")) for statement in cursor.statements)
+
+class Session:
+    """Stand-in for an MCP client session"""
+
+class RequestContext:
+    """Stand-in for the FastMCP request context of a session"""
+
+    def __init__(self, session):
+        self.session = session
+
+def test_session_keys_are_stable_and_not_reused(monkeypatch):
+    """A session keeps its key for its lifetime and every other session gets a fresh random one"""
+    first, second = Session(), Session()
+    monkeypatch.setattr(server.mcp, "get_context", lambda: RequestContext(first))
+    key = server.get_session_key()
+    assert server.get_session_key() == key
+    monkeypatch.setattr(server.mcp, "get_context", lambda: RequestContext(second))
+    assert server.get_session_key() != key
+
+def test_session_writes_outside_the_window_are_pruned(monkeypatch):
+    """Recording a write forgets sessions whose read-your-writes window has passed"""
+    monkeypatch.setattr(server, "SESSION_LAST_WRITE", {("gone", "default"): time.monotonic() - 3600})
+    server.note_session_write("default")
+    assert list(server.SESSION_LAST_WRITE) == [("local", "default")]